@@ -0,0 +1,36 @@
+"""add_endpoint_batch_mode
+
+Revision ID: b7e2c4a9d1f3
+Revises: 5ac5d119bda1
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4a9d1f3'
+down_revision: Union[str, None] = '5ac5d119bda1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the batch mode columns of endpoints.
+
+    Endpoints with a batch_size greater than 1 receive up to batch_size inputs per request,
+    rendered with batch_request_body_template; batch_response_path is the JSONPath to the
+    per-input outputs in the response.
+    """
+    op.add_column('endpoint', sa.Column('batch_size', sa.Integer(), nullable=True))
+    op.add_column('endpoint', sa.Column('batch_request_body_template', sa.JSON(), nullable=True))
+    op.add_column('endpoint', sa.Column('batch_response_path', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove the batch mode columns of endpoints."""
+    op.drop_column('endpoint', 'batch_response_path')
+    op.drop_column('endpoint', 'batch_request_body_template')
+    op.drop_column('endpoint', 'batch_size')
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.dialects.postgresql import ARRAY, JSON
 from sqlalchemy.orm import relationship
 
@@ -42,6 +42,11 @@ class Endpoint(Base, TagsMixin):
     response_mappings = Column(JSON)
     validation_rules = Column(JSON)
 
+    # Batch Mode (REST): up to batch_size inputs per request, disabled when not set
+    batch_size = Column(Integer, nullable=True)
+    batch_request_body_template = Column(JSON, nullable=True)
+    batch_response_path = Column(String, nullable=True)  # JSONPath to the per-input outputs
+
     # Status relationship (keeping existing relationship)
     status_id = Column(GUID(), ForeignKey("status.id"))
     status = relationship("Status", back_populates="endpoints")
@@ -13,6 +13,7 @@ from rhesis.backend.app.schemas.model import TestModelConnectionRequest, TestMod
 from rhesis.backend.app.services.model_connection import ModelConnectionService
 from rhesis.backend.app.utils.decorators import with_count_header
 from rhesis.backend.app.utils.database_exceptions import handle_database_exceptions
+from rhesis.backend.app.utils.llm_utils import invalidate_model_settings
 from rhesis.backend.app.utils.schema_factory import create_detailed_schema
 
 # Create the detailed schema for Model
@@ -137,6 +138,8 @@ def update_model(
     )
     if db_model is None:
         raise HTTPException(status_code=404, detail="Model not found")
+    # Drop evaluation models cached by workers for this organization
+    invalidate_model_settings(organization_id)
     return db_model
 
 
@@ -151,6 +154,8 @@ def delete_model(
     db_model = crud.delete_model(db, model_id=model_id, organization_id=organization_id, user_id=user_id)
     if db_model is None:
         raise HTTPException(status_code=404, detail="Model not found")
+    # Drop evaluation models cached by workers for this organization
+    invalidate_model_settings(organization_id)
     return db_model
 
 
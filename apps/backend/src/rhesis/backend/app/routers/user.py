@@ -15,6 +15,7 @@ from rhesis.backend.app.models.user import User
 from rhesis.backend.app.routers.auth import create_session_token
 from rhesis.backend.app.utils.decorators import with_count_header
 from rhesis.backend.app.utils.database_exceptions import handle_database_exceptions
+from rhesis.backend.app.utils.llm_utils import invalidate_model_settings
 from rhesis.backend.app.utils.rate_limit import INVITATION_RATE_LIMIT, user_limiter
 from rhesis.backend.app.utils.validation import validate_and_normalize_email
 from rhesis.backend.logging.rhesis_logger import logger
@@ -217,6 +218,10 @@ def update_user_settings(
     # Transaction commit is handled automatically by get_tenant_db_session context manager
     
     logger.info(f"Updated settings for user {db_user.email}")
+
+    # Model defaults may have changed - drop evaluation models cached by workers
+    if "models" in settings_dict and db_user.organization_id:
+        invalidate_model_settings(str(db_user.organization_id))
     
     return db_user.user_settings
 
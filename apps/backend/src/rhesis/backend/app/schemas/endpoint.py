@@ -41,6 +41,11 @@ class EndpointBase(Base):
     response_mappings: Optional[Dict[str, str]] = None
     validation_rules: Optional[Dict[str, Any]] = None
 
+    # Batch Mode
+    batch_size: Optional[int] = None
+    batch_request_body_template: Optional[Dict[str, Any]] = None
+    batch_response_path: Optional[str] = None
+
     project_id: Optional[UUID4] = None
     status_id: Optional[UUID4] = None
     user_id: Optional[UUID4] = None
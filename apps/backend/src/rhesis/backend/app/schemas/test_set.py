@@ -159,8 +159,12 @@ class TestSetExecutionRequest(BaseModel):
             return {"execution_mode": "Parallel"}
 
         # Validate execution_mode if provided
-        if "execution_mode" in v and v["execution_mode"] not in ["Parallel", "Sequential"]:
-            raise ValueError('execution_mode must be either "Parallel" or "Sequential"')
+        if "execution_mode" in v and v["execution_mode"] not in [
+            "Parallel",
+            "Sequential",
+            "Pipelined",
+        ]:
+            raise ValueError('execution_mode must be "Parallel", "Sequential" or "Pipelined"')
 
         # Set default execution_mode if not provided
         if "execution_mode" not in v:
@@ -1,13 +1,20 @@
+import asyncio
 import json
 import os
 import uuid
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from rhesis.backend.app.models.endpoint import Endpoint
-from rhesis.backend.app.services.invokers import create_invoker
+from rhesis.backend.app.services.endpoint_cache import endpoint_cache
+from rhesis.backend.app.services.invokers import (
+    BaseEndpointInvoker,
+    circuit_breaker,
+    concurrency_controller,
+    create_invoker,
+)
 
 
 class EndpointService:
@@ -44,19 +51,142 @@ class EndpointService:
             HTTPException: If endpoint is not found or invocation fails
         """
         # Fetch endpoint configuration with organization filtering (SECURITY CRITICAL)
-        endpoint = self._get_endpoint(db, endpoint_id, organization_id)
+        endpoint, invoker = self._get_endpoint_and_invoker(db, endpoint_id, organization_id)
 
         try:
-            # Create appropriate invoker based on protocol
-            invoker = create_invoker(endpoint)
+            with circuit_breaker.call(endpoint.id) as call:
+                # Fail fast while the endpoint's circuit is open
+                if call.rejected:
+                    return call.unavailable_response()
+
+                # Invoke the endpoint within its adaptive concurrency limit
+                with concurrency_controller.slot(endpoint.id) as slot:
+                    result = invoker.invoke(db, endpoint, input_data)
+                    slot.record(result)
+                call.record(result)
+            return result
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def ainvoke_endpoint(
+        self, db: Session, endpoint_id: str, input_data: Dict[str, Any], organization_id: str = None
+    ) -> Dict[str, Any]:
+        """
+        Invoke an endpoint without blocking the event loop.
+
+        Same contract as `invoke_endpoint`; many invocations can be in flight on one event
+        loop, each holding a slot of the endpoint's concurrency limit.
+
+        Args:
+            db: Database session
+            endpoint_id: ID of the endpoint to invoke
+            input_data: Input data to be mapped to the endpoint's request template
+            organization_id: Organization ID for security filtering (CRITICAL)
+
+        Returns:
+            Dict containing the mapped response from the endpoint
+
+        Raises:
+            HTTPException: If endpoint is not found or invocation fails
+        """
+        endpoint, invoker = await asyncio.to_thread(
+            self._get_endpoint_and_invoker, db, endpoint_id, organization_id
+        )
+
+        try:
+            with circuit_breaker.call(endpoint.id) as call:
+                if call.rejected:
+                    return call.unavailable_response()
+
+                async with concurrency_controller.aslot(endpoint.id) as slot:
+                    result = await invoker.ainvoke(db, endpoint, input_data)
+                    slot.record(result)
+                call.record(result)
+            return result
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    def get_batch_size(self, db: Session, endpoint_id: str, organization_id: str = None) -> int:
+        """Number of inputs the endpoint accepts per request; 1 if it has no batch mode."""
+        endpoint, invoker = self._get_endpoint_and_invoker(db, endpoint_id, organization_id)
+        return invoker.get_batch_size(endpoint)
+
+    def invoke_endpoint_batch(
+        self,
+        db: Session,
+        endpoint_id: str,
+        inputs: List[Dict[str, Any]],
+        organization_id: str = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Invoke an endpoint with several inputs, in one request if it has a batch mode.
+
+        The batch holds a single slot of the endpoint's concurrency limit. Callers split
+        inputs into batches of at most `get_batch_size` inputs.
+
+        Args:
+            db: Database session
+            endpoint_id: ID of the endpoint to invoke
+            inputs: Input data of every item, each mapped like the input of `invoke_endpoint`
+            organization_id: Organization ID for security filtering (CRITICAL)
+
+        Returns:
+            One mapped response per input, in the order of `inputs`
+
+        Raises:
+            HTTPException: If endpoint is not found or invocation fails
+        """
+        endpoint, invoker = self._get_endpoint_and_invoker(db, endpoint_id, organization_id)
 
-            # Invoke the endpoint
-            return invoker.invoke(db, endpoint, input_data)
+        try:
+            with circuit_breaker.call(endpoint.id) as call:
+                if call.rejected:
+                    return [call.unavailable_response() for _ in inputs]
+
+                with concurrency_controller.slot(endpoint.id) as slot:
+                    results = invoker.invoke_batch(db, endpoint, inputs)
+                    # Failures of the whole request are reported for every item
+                    first_result = results[0] if results else None
+                    slot.record(first_result)
+                call.record(first_result)
+            return results
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    def _get_endpoint_and_invoker(
+        self, db: Session, endpoint_id: str, organization_id: str = None
+    ) -> Tuple[Endpoint, BaseEndpointInvoker]:
+        """
+        Get the endpoint configuration and its invoker, cached per organization.
+
+        Returns:
+            The endpoint, a snapshot not bound to `db` if it was cached, and its invoker
+
+        Raises:
+            HTTPException: If endpoint is not found or its protocol is not supported
+        """
+        entry = endpoint_cache.get(organization_id, endpoint_id)
+        if entry is not None:
+            return entry.endpoint, entry.invoker
+
+        generation = endpoint_cache.get_generation(endpoint_id)
+        endpoint = self._get_endpoint(db, endpoint_id, organization_id)
+        try:
+            # Create appropriate invoker based on protocol
+            invoker = create_invoker(endpoint)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # This invocation uses the loaded endpoint, later ones share the cached snapshot
+        endpoint_cache.put(organization_id, endpoint, invoker, generation)
+        return endpoint, invoker
+
     def _get_endpoint(self, db: Session, endpoint_id: str, organization_id: str = None) -> Endpoint:
         """
         Get an endpoint by ID with organization filtering.
@@ -0,0 +1,188 @@
+"""
+Per-process cache of endpoint configurations and their invokers.
+
+Invoking an endpoint needs its configuration and an invoker for its protocol. Both are
+cached per organization and endpoint, so the invocations of a test run share one
+database query and one invoker:
+
+- Entries hold a detached snapshot of the endpoint (a transient `Endpoint` with the
+  column values), which can be shared by threads and outlives the session it was loaded
+  with. Changes made to the snapshot (such as a renewed `last_token`) are not persisted.
+- Cache keys include the organization id.
+- Committing a change to an endpoint (update or soft delete, from any code path) invalidates
+  its entries in this process and, through a generation counter in Redis, in all other
+  processes. The changes are collected by session event hooks registered below, so the data
+  layer doesn't depend on this cache. Entries also expire after
+  `ENDPOINT_CACHE_TTL_SECONDS` (default 60). Without Redis, changes could not reach
+  other processes, so nothing is cached.
+"""
+
+import copy
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from rhesis.backend.app.models.endpoint import Endpoint
+from rhesis.backend.app.utils.redis_client import get_redis_client
+from rhesis.backend.logging import logger
+
+ENDPOINT_CACHE_SIZE = 256
+DEFAULT_TTL_SECONDS = 60.0
+GENERATION_KEY_TEMPLATE = "rhesis:endpoint:{endpoint_id}:generation"
+# Session.info key of the endpoints changed in the session's transaction
+CHANGED_ENDPOINTS_INFO_KEY = "rhesis_changed_endpoints"
+
+
+@dataclass
+class CachedEndpoint:
+    endpoint: Endpoint
+    invoker: Any
+    updated_at: Optional[datetime]
+    generation: int
+    loaded_at: float
+
+
+def snapshot_endpoint(endpoint: Endpoint) -> Endpoint:
+    """Copy the column values of an endpoint into a transient instance."""
+    values = {
+        attribute.key: copy.deepcopy(getattr(endpoint, attribute.key))
+        for attribute in inspect(Endpoint).column_attrs
+    }
+    return Endpoint(**values)
+
+
+class EndpointCache:
+    """LRU cache of endpoint snapshots and invokers by organization and endpoint."""
+
+    def __init__(self, max_size: int = ENDPOINT_CACHE_SIZE):
+        self.max_size = max_size
+        self.ttl = float(os.getenv("ENDPOINT_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        self._entries: "OrderedDict[Tuple[str, str], CachedEndpoint]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(organization_id: Optional[str], endpoint_id: Any) -> Tuple[str, str]:
+        return (str(organization_id) if organization_id else "", str(endpoint_id))
+
+    @staticmethod
+    def get_generation(endpoint_id: Any) -> Optional[int]:
+        """
+        Current generation of the endpoint, incremented on every invalidation.
+
+        Returns:
+            The generation, or None if Redis is unavailable
+        """
+        client = get_redis_client()
+        if client is None:
+            return None
+        try:
+            value = client.get(GENERATION_KEY_TEMPLATE.format(endpoint_id=endpoint_id))
+            return int(value or 0)
+        except Exception as e:
+            logger.warning(f"Failed to read generation of endpoint {endpoint_id}: {str(e)}")
+            return None
+
+    def get(self, organization_id: Optional[str], endpoint_id: Any) -> Optional[CachedEndpoint]:
+        """Return the valid entry of an endpoint, or None if it must be loaded."""
+        key = self._key(organization_id, endpoint_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+
+        if (
+            time.monotonic() - entry.loaded_at > self.ttl
+            or self.get_generation(endpoint_id) != entry.generation
+        ):
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            return None
+        return entry
+
+    def put(
+        self,
+        organization_id: Optional[str],
+        endpoint: Endpoint,
+        invoker: Any,
+        generation: Optional[int],
+    ) -> Optional[CachedEndpoint]:
+        """
+        Cache a loaded endpoint and its invoker.
+
+        Args:
+            generation: Generation read before the endpoint was loaded, so an invalidation
+                during the load is not missed; nothing is cached if it is None
+        """
+        if generation is None:
+            return None
+
+        entry = CachedEndpoint(
+            endpoint=snapshot_endpoint(endpoint),
+            invoker=invoker,
+            updated_at=endpoint.updated_at,
+            generation=generation,
+            loaded_at=time.monotonic(),
+        )
+        key = self._key(organization_id, endpoint.id)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, endpoint_id: Any) -> None:
+        """Drop the entries of an endpoint in all processes."""
+        endpoint_id = str(endpoint_id)
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == endpoint_id]:
+                del self._entries[key]
+
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.incr(GENERATION_KEY_TEMPLATE.format(endpoint_id=endpoint_id))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate endpoint {endpoint_id}: {str(e)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+endpoint_cache = EndpointCache()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_endpoints(session: Session, flush_context: Any) -> None:
+    """Remember the endpoints updated or deleted by a flush until the transaction ends."""
+    changed = {
+        str(instance.id)
+        for instance in itertools.chain(session.dirty, session.deleted)
+        if isinstance(instance, Endpoint) and instance.id is not None
+    }
+    if changed:
+        session.info.setdefault(CHANGED_ENDPOINTS_INFO_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_endpoints(session: Session) -> None:
+    """Invalidate the endpoints changed by a committed transaction."""
+    for endpoint_id in session.info.pop(CHANGED_ENDPOINTS_INFO_KEY, ()):
+        endpoint_cache.invalidate(endpoint_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_endpoints(session: Session) -> None:
+    session.info.pop(CHANGED_ENDPOINTS_INFO_KEY, None)
@@ -4,9 +4,25 @@ from rhesis.backend.app.models.endpoint import Endpoint
 from rhesis.backend.app.models.enums import EndpointProtocol
 
 from .base import BaseEndpointInvoker
+from .circuit import EndpointCircuitBreaker, circuit_breaker
+from .concurrency import EndpointConcurrencyController, concurrency_controller
 from .rest_invoker import RestEndpointInvoker
+from .transport import get_transport_stats
 from .websocket_invoker import WebSocketEndpointInvoker
 
+__all__ = [
+    "BaseEndpointInvoker",
+    "EndpointCircuitBreaker",
+    "EndpointConcurrencyController",
+    "INVOKERS",
+    "RestEndpointInvoker",
+    "WebSocketEndpointInvoker",
+    "circuit_breaker",
+    "concurrency_controller",
+    "create_invoker",
+    "get_transport_stats",
+]
+
 # Registry of invokers by protocol
 INVOKERS: Dict[str, Type[BaseEndpointInvoker]] = {
     EndpointProtocol.REST.value: RestEndpointInvoker,
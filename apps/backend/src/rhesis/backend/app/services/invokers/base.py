@@ -1,19 +1,25 @@
+import asyncio
 import json
+import re
+import threading
 import uuid
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 
 import jsonpath_ng
 import requests
 from fastapi import HTTPException
-from jinja2 import Template
+from jinja2 import Environment, Template
 from sqlalchemy.orm import Session
 
 from rhesis.backend.app.models.endpoint import Endpoint
 from rhesis.backend.app.models.enums import EndpointAuthType
 from rhesis.backend.logging import logger
 
+from .token_cache import token_cache
+
 
 class BaseEndpointInvoker(ABC):
     """Base class for endpoint invokers with shared functionality."""
@@ -37,29 +43,76 @@ class BaseEndpointInvoker(ABC):
         """
         pass
 
+    async def ainvoke(
+        self, db: Session, endpoint: Endpoint, input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Invoke the endpoint without blocking the event loop.
+
+        Returns the same responses as `invoke`. Invokers without a native async
+        implementation run `invoke` in a worker thread.
+        """
+        return await asyncio.to_thread(self.invoke, db, endpoint, input_data)
+
+    def get_batch_size(self, endpoint: Endpoint) -> int:
+        """Number of inputs the endpoint accepts per request; 1 if it has no batch mode."""
+        return 1
+
+    def invoke_batch(
+        self, db: Session, endpoint: Endpoint, inputs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Invoke the endpoint with several inputs.
+
+        Returns one response per input, in the order of `inputs`. Invokers without a batch
+        protocol invoke the endpoint once per input.
+        """
+        return [self.invoke(db, endpoint, input_data) for input_data in inputs]
+
     # Shared authentication methods
     def _get_valid_token(self, db: Session, endpoint: Endpoint) -> Optional[str]:
         """Get a valid authentication token based on the endpoint's auth type."""
+        # Client credentials tokens are cached across workers and renewed before they expire
+        if endpoint.auth_type == EndpointAuthType.CLIENT_CREDENTIALS.value:
+            return self._get_client_credentials_token(db, endpoint)
+
         # Check if we have a valid cached token
         if endpoint.last_token and endpoint.last_token_expires_at:
             if endpoint.last_token_expires_at > datetime.utcnow():
                 return endpoint.last_token
 
-        # No valid cached token, get new one based on auth type
         if endpoint.auth_type == EndpointAuthType.BEARER_TOKEN.value:
             return endpoint.auth_token
-        elif endpoint.auth_type == EndpointAuthType.CLIENT_CREDENTIALS.value:
-            return self._get_client_credentials_token(db, endpoint)
 
         return None
 
     def _get_client_credentials_token(self, db: Session, endpoint: Endpoint) -> str:
-        """Get a new token using client credentials flow."""
+        """Get a token using client credentials flow, shared by all workers."""
         if not endpoint.token_url:
             raise HTTPException(
                 status_code=400, detail="Token URL is required for client credentials flow"
             )
 
+        try:
+            token = token_cache.get_token(
+                endpoint, lambda: self._request_client_credentials_token(endpoint)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Failed to get client credentials token: {str(e)}"
+            )
+
+        # Keep the token info on the endpoint, only when it changed. Invoked endpoints are
+        # detached snapshots of the endpoint cache, so this is not persisted: workers share
+        # the token through the token cache instead of the endpoint row.
+        if endpoint.last_token != token.access_token:
+            endpoint.last_token = token.access_token
+            endpoint.last_token_expires_at = datetime.utcfromtimestamp(token.expires_at)
+
+        return token.access_token
+
+    def _request_client_credentials_token(self, endpoint: Endpoint) -> Tuple[str, Optional[int]]:
+        """Request a new token from the token URL, returning (access_token, expires_in)."""
         # Prepare token request
         payload = {
             "client_id": endpoint.client_id,
@@ -76,24 +129,12 @@ class BaseEndpointInvoker(ABC):
         if endpoint.extra_payload:
             payload.update(endpoint.extra_payload)
 
-        try:
-            # Make token request
-            response = requests.post(endpoint.token_url, json=payload)
-            response.raise_for_status()
-            token_data = response.json()
-
-            # Update endpoint with new token info
-            endpoint.last_token = token_data["access_token"]
-            endpoint.last_token_expires_at = datetime.utcnow() + timedelta(
-                seconds=token_data.get("expires_in", 3600)
-            )
-            # Transaction commit is handled by the session context manager
+        logger.info(f"Requesting client credentials token for endpoint {endpoint.id}")
+        response = requests.post(endpoint.token_url, json=payload)
+        response.raise_for_status()
+        token_data = response.json()
 
-            return endpoint.last_token
-        except Exception as e:
-            raise HTTPException(
-                status_code=500, detail=f"Failed to get client credentials token: {str(e)}"
-            )
+        return token_data["access_token"], token_data.get("expires_in", 3600)
 
     # Shared error handling methods
     def _create_error_response(
@@ -127,49 +168,192 @@ class BaseEndpointInvoker(ABC):
         }
 
 
+# Number of compiled request templates and response mappings kept per process
+COMPILED_PLAN_CACHE_SIZE = 256
+
+SESSION_ID_PLACEHOLDER = "{{ session_id }}"
+
+# Batch template values consisting of a single expression keep the expression's type
+SINGLE_EXPRESSION_PATTERN = re.compile(r"^\s*\{\{(.+?)\}\}\s*$", re.DOTALL)
+_expression_environment = Environment()
+
+
+def get_endpoint_cache_key(endpoint: Endpoint, part: str) -> Optional[Tuple[str, Any, str]]:
+    """
+    Cache key of a compiled endpoint configuration part; changes when the endpoint does.
+
+    Endpoints that are not persisted yet have no key, so their parts are not cached.
+    """
+    if endpoint.id is None or endpoint.updated_at is None:
+        return None
+    return (str(endpoint.id), endpoint.updated_at, part)
+
+
+class CompiledPlanCache:
+    """Bounded, thread-safe LRU of compiled templates and expressions."""
+
+    def __init__(self, maxsize: int = COMPILED_PLAN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._plans: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compile(self, key: Optional[Hashable], compile_plan: Callable[[], Any]) -> Any:
+        if key is None:
+            return compile_plan()
+
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+
+        plan = compile_plan()
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+
+_template_plans = CompiledPlanCache()
+_mapping_plans = CompiledPlanCache()
+
+
 class TemplateRenderer:
     """Handles template rendering using Jinja2."""
 
-    def render(self, template_data: Any, input_data: Dict[str, Any]) -> Any:
+    @staticmethod
+    def _compile(template_data: Any) -> Tuple[Any, bool]:
+        """Compile a request template into (compiled template, uses session_id)."""
+        if isinstance(template_data, str):
+            return Template(template_data), SESSION_ID_PLACEHOLDER in template_data
+        if isinstance(template_data, dict):
+            compiled = {
+                key: Template(value) if isinstance(value, str) else value
+                for key, value in template_data.items()
+            }
+            return compiled, SESSION_ID_PLACEHOLDER in json.dumps(template_data)
+        return template_data, False
+
+    def render(
+        self,
+        template_data: Any,
+        input_data: Dict[str, Any],
+        cache_key: Optional[Hashable] = None,
+    ) -> Any:
+        """
+        Render a request template with the input data.
+
+        Args:
+            template_data: Template string or dictionary of templates
+            input_data: Variables available to the templates
+            cache_key: Key identifying the template (see `get_endpoint_cache_key`), so it
+                is compiled once and reused; without a key it is compiled on every call
+        """
+        compiled, uses_session_id = _template_plans.get_or_compile(
+            cache_key, lambda: self._compile(template_data)
+        )
+
         # Ensure session_id exists if it's referenced in template but missing from input
-        if isinstance(template_data, (dict, str)):
-            template_str = (
-                json.dumps(template_data) if isinstance(template_data, dict) else template_data
-            )
-            if "{{ session_id }}" in template_str and "session_id" not in input_data:
-                input_data = input_data.copy()
-                input_data["session_id"] = str(uuid.uuid4())
-                logger.info(f"Auto-generated session_id: {input_data['session_id']}")
+        if uses_session_id and "session_id" not in input_data:
+            input_data = input_data.copy()
+            input_data["session_id"] = str(uuid.uuid4())
+            logger.info(f"Auto-generated session_id: {input_data['session_id']}")
 
-        if isinstance(template_data, str):
-            template = Template(template_data)
-            rendered = template.render(**input_data)
+        if isinstance(compiled, Template):
+            rendered = compiled.render(**input_data)
             try:
                 return json.loads(rendered)
             except json.JSONDecodeError:
                 return rendered
-        elif isinstance(template_data, dict):
-            result = template_data.copy()
-            for key, value in result.items():
-                if isinstance(value, str):
-                    template = Template(value)
-                    result[key] = template.render(**input_data)
-            return result
+        elif isinstance(compiled, dict):
+            return {
+                key: value.render(**input_data) if isinstance(value, Template) else value
+                for key, value in compiled.items()
+            }
+        return compiled
+
+    @classmethod
+    def _compile_batch(cls, template_data: Any) -> Any:
+        if isinstance(template_data, str):
+            match = SINGLE_EXPRESSION_PATTERN.match(template_data)
+            if match and "{{" not in match.group(1):
+                return _expression_environment.compile_expression(match.group(1))
+            return Template(template_data)
+        if isinstance(template_data, dict):
+            return {key: cls._compile_batch(value) for key, value in template_data.items()}
+        if isinstance(template_data, list):
+            return [cls._compile_batch(value) for value in template_data]
         return template_data
 
+    @classmethod
+    def _render_batch(cls, compiled: Any, context: Dict[str, Any]) -> Any:
+        if isinstance(compiled, Template):
+            return compiled.render(**context)
+        if callable(compiled):
+            return compiled(**context)
+        if isinstance(compiled, dict):
+            return {key: cls._render_batch(value, context) for key, value in compiled.items()}
+        if isinstance(compiled, list):
+            return [cls._render_batch(value, context) for value in compiled]
+        return compiled
+
+    def render_batch(
+        self,
+        template_data: Any,
+        inputs: List[Dict[str, Any]],
+        cache_key: Optional[Hashable] = None,
+    ) -> Any:
+        """
+        Render a batch request template with several inputs.
+
+        The templates can use `inputs` (the `input` of every item) and `items` (the full
+        input data of every item). Nested values are rendered too, and a value consisting
+        of a single expression keeps its type, so `{"prompts": "{{ inputs }}"}` renders to
+        a list of prompts.
+        """
+        compiled = _template_plans.get_or_compile(
+            cache_key, lambda: self._compile_batch(template_data)
+        )
+        context = {"inputs": [item.get("input") for item in inputs], "items": inputs}
+        return self._render_batch(compiled, context)
+
 
 class ResponseMapper:
     """Handles response mapping using JSONPath."""
 
     def map_response(
-        self, response_data: Dict[str, Any], mappings: Dict[str, str]
+        self,
+        response_data: Dict[str, Any],
+        mappings: Dict[str, str],
+        cache_key: Optional[Hashable] = None,
     ) -> Dict[str, Any]:
+        """
+        Extract the mapped fields from a response.
+
+        Args:
+            response_data: The parsed response
+            mappings: Output keys mapped to JSONPath expressions
+            cache_key: Key identifying the mappings (see `get_endpoint_cache_key`), so the
+                expressions are parsed once and reused
+        """
         if not mappings:
             return response_data
 
+        expressions = _mapping_plans.get_or_compile(
+            cache_key,
+            lambda: [
+                (output_key, jsonpath_ng.parse(jsonpath))
+                for output_key, jsonpath in mappings.items()
+            ],
+        )
+
         result = {}
-        for output_key, jsonpath in mappings.items():
-            jsonpath_expr = jsonpath_ng.parse(jsonpath)
+        for output_key, jsonpath_expr in expressions:
             matches = jsonpath_expr.find(response_data)
             if matches:
                 result[output_key] = matches[0].value
@@ -177,3 +361,35 @@ class ResponseMapper:
                 # If no match found, set to None
                 result[output_key] = None
         return result
+
+    def map_batch_response(
+        self,
+        response_data: Any,
+        items_path: str,
+        mappings: Dict[str, str],
+        items_cache_key: Optional[Hashable] = None,
+        mappings_cache_key: Optional[Hashable] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Split a batch response into the mapped responses of its items.
+
+        Args:
+            response_data: The parsed response
+            items_path: JSONPath to the per-input outputs, either a list (`$.results`) or
+                its elements (`$.results[*]`)
+            mappings: Output keys mapped to JSONPath expressions, applied to every item;
+                items that are not objects become the `output` of their response
+        """
+        expression = _mapping_plans.get_or_compile(
+            items_cache_key, lambda: jsonpath_ng.parse(items_path)
+        )
+        values = [match.value for match in expression.find(response_data)]
+        if len(values) == 1 and isinstance(values[0], list):
+            values = values[0]
+
+        return [
+            self.map_response(item, mappings, mappings_cache_key)
+            if isinstance(item, dict)
+            else {"output": item}
+            for item in values
+        ]
@@ -0,0 +1,265 @@
+"""
+Per-endpoint circuit breaker shared across workers.
+
+The breaker keeps the state of every endpoint in Redis, so all workers fail fast once a
+target is down instead of each waiting out its own connection timeouts:
+
+- closed: invocations pass; `ENDPOINT_CIRCUIT_FAILURE_THRESHOLD` consecutive failures
+  (network errors, HTTP 502/503/504) open the circuit
+- open: invocations are rejected immediately with an `endpoint_unavailable` error for
+  `ENDPOINT_CIRCUIT_OPEN_SECONDS`
+- half-open: once the open interval has passed, a single worker sends a probe; a
+  successful probe closes the circuit and a failed probe opens it again
+
+Probes are leases with an expiry, so a probe held by a crashed worker does not keep the
+circuit half-open. When Redis is unavailable, invocations are never rejected.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from rhesis.backend.app.utils.redis_client import get_redis_client
+from rhesis.backend.logging import logger
+
+CIRCUIT_KEY_TEMPLATE = "rhesis:endpoint:{endpoint_id}:circuit"
+CIRCUIT_STATE_TTL_SECONDS = 24 * 60 * 60
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_OPEN_SECONDS = 30.0
+DEFAULT_PROBE_LEASE_SECONDS = 120.0
+
+UNAVAILABLE_ERROR_TYPES = {"network_error", "websocket_communication_error"}
+UNAVAILABLE_STATUS_CODES = {502, 503, 504}
+
+# KEYS: circuit hash
+# ARGV: now, open seconds, probe lease seconds, state ttl
+# Returns {decision, seconds until the next probe}; decision is 'pass', 'probe' or 'reject'
+_ALLOW_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+if state == 'closed' then
+    return {'pass', '0'}
+end
+
+local now = tonumber(ARGV[1])
+local opened_at = tonumber(redis.call('HGET', KEYS[1], 'opened_at') or 0)
+local reopen_in = opened_at + tonumber(ARGV[2]) - now
+if state == 'open' and reopen_in > 0 then
+    return {'reject', tostring(reopen_in)}
+end
+
+local probe_until = tonumber(redis.call('HGET', KEYS[1], 'probe_until') or 0)
+if state == 'half_open' and now < probe_until then
+    return {'reject', tostring(probe_until - now)}
+end
+
+redis.call('HSET', KEYS[1], 'state', 'half_open', 'probe_until', tostring(now + tonumber(ARGV[3])))
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {'probe', '0'}
+"""
+
+# KEYS: circuit hash
+# ARGV: now, outcome ('success', 'failure' or 'none'), probe ('1' or '0'), failure threshold,
+#       state ttl
+# Returns the transition: 'opened', 'closed' or 'none'
+_RECORD_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+local probe = ARGV[3] == '1'
+
+if ARGV[2] == 'none' then
+    if probe and state == 'half_open' then
+        redis.call('HSET', KEYS[1], 'probe_until', '0')
+    end
+    return 'none'
+end
+
+if ARGV[2] == 'success' then
+    if probe and state == 'half_open' then
+        redis.call('HSET', KEYS[1], 'state', 'closed', 'failures', '0')
+        redis.call('HDEL', KEYS[1], 'opened_at', 'probe_until')
+        return 'closed'
+    end
+    if state == 'closed' and tonumber(redis.call('HGET', KEYS[1], 'failures') or 0) > 0 then
+        redis.call('HSET', KEYS[1], 'failures', '0')
+    end
+    return 'none'
+end
+
+if state == 'closed' then
+    local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+    if failures < tonumber(ARGV[4]) then
+        return 'none'
+    end
+elseif not (probe and state == 'half_open') then
+    -- Failures of invocations started before the circuit opened change nothing
+    return 'none'
+end
+
+redis.call('HSET', KEYS[1], 'state', 'open', 'opened_at', ARGV[1], 'failures', '0')
+redis.call('HDEL', KEYS[1], 'probe_until')
+redis.call('HINCRBY', KEYS[1], 'opened', 1)
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return 'opened'
+"""
+
+
+def is_unavailable_response(result: Any) -> bool:
+    """Whether an invoker result indicates that the endpoint is unreachable."""
+    if not isinstance(result, dict) or not result.get("error"):
+        return False
+
+    if result.get("status_code") in UNAVAILABLE_STATUS_CODES:
+        return True
+
+    return result.get("error_type") in UNAVAILABLE_ERROR_TYPES
+
+
+class CircuitCall:
+    """Admission of one invocation by the circuit breaker."""
+
+    def __init__(self, endpoint_id: str, decision: str, retry_in: float = 0.0):
+        self.endpoint_id = endpoint_id
+        self.decision = decision
+        self.retry_in = retry_in
+        self.outcome = "none"
+
+    @property
+    def rejected(self) -> bool:
+        return self.decision == "reject"
+
+    @property
+    def probe(self) -> bool:
+        return self.decision == "probe"
+
+    def record(self, result: Any) -> None:
+        """Record the result of the admitted invocation."""
+        self.outcome = "failure" if is_unavailable_response(result) else "success"
+
+    def unavailable_response(self) -> Dict[str, Any]:
+        """Error response returned instead of invoking the endpoint while the circuit is open."""
+        message = (
+            f"Endpoint unavailable: invocations are suspended after repeated failures, "
+            f"next attempt in {self.retry_in:.0f}s"
+        )
+        return {
+            "output": message,
+            "error": True,
+            "error_type": "endpoint_unavailable",
+            "message": message,
+            "retry_after": round(self.retry_in, 1),
+        }
+
+
+class EndpointCircuitBreaker:
+    """Closed/open/half-open circuit per endpoint, shared across workers through Redis."""
+
+    def __init__(self):
+        self.enabled = os.getenv("ENDPOINT_CIRCUIT_ENABLED", "true").lower() == "true"
+        self.failure_threshold = int(
+            os.getenv("ENDPOINT_CIRCUIT_FAILURE_THRESHOLD", DEFAULT_FAILURE_THRESHOLD)
+        )
+        self.open_seconds = float(os.getenv("ENDPOINT_CIRCUIT_OPEN_SECONDS", DEFAULT_OPEN_SECONDS))
+        self.probe_lease_seconds = float(
+            os.getenv("ENDPOINT_CIRCUIT_PROBE_LEASE_SECONDS", DEFAULT_PROBE_LEASE_SECONDS)
+        )
+
+    @staticmethod
+    def _key(endpoint_id: str) -> str:
+        return CIRCUIT_KEY_TEMPLATE.format(endpoint_id=endpoint_id)
+
+    def allow(self, endpoint_id: str) -> CircuitCall:
+        """
+        Decide whether the endpoint may be invoked.
+
+        Returns:
+            The admission; it passes if Redis is unavailable
+        """
+        endpoint_id = str(endpoint_id)
+        client = get_redis_client() if self.enabled else None
+        if client is None:
+            return CircuitCall(endpoint_id, "pass")
+
+        try:
+            decision, retry_in = client.eval(
+                _ALLOW_SCRIPT,
+                1,
+                self._key(endpoint_id),
+                time.time(),
+                self.open_seconds,
+                self.probe_lease_seconds,
+                CIRCUIT_STATE_TTL_SECONDS,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to read circuit of endpoint {endpoint_id}: {e}")
+            return CircuitCall(endpoint_id, "pass")
+
+        decision = decision.decode() if isinstance(decision, bytes) else decision
+        if decision == "probe":
+            logger.info(f"Circuit of endpoint {endpoint_id} is half-open, sending a probe")
+        return CircuitCall(endpoint_id, decision, float(retry_in))
+
+    def record(self, call: CircuitCall) -> None:
+        """Update the circuit with the outcome of an admitted invocation."""
+        if call.rejected or (call.decision == "pass" and call.outcome == "none"):
+            return
+
+        client = get_redis_client()
+        if client is None:
+            return
+
+        try:
+            transition = client.eval(
+                _RECORD_SCRIPT,
+                1,
+                self._key(call.endpoint_id),
+                time.time(),
+                call.outcome,
+                "1" if call.probe else "0",
+                self.failure_threshold,
+                CIRCUIT_STATE_TTL_SECONDS,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update circuit of endpoint {call.endpoint_id}: {e}")
+            return
+
+        transition = transition.decode() if isinstance(transition, bytes) else transition
+        if transition == "opened":
+            logger.warning(
+                f"Circuit of endpoint {call.endpoint_id} opened, rejecting invocations "
+                f"for {self.open_seconds:.0f}s"
+            )
+        elif transition == "closed":
+            logger.info(f"Circuit of endpoint {call.endpoint_id} closed, resuming invocations")
+
+    @contextmanager
+    def call(self, endpoint_id: str) -> Iterator[CircuitCall]:
+        """Admit an invocation of the endpoint and record its outcome after the block."""
+        call = self.allow(endpoint_id)
+        try:
+            yield call
+        finally:
+            self.record(call)
+
+    def get_state(self, endpoint_id: str) -> Dict[str, Any]:
+        """Return the circuit state and counters of an endpoint."""
+        state: Dict[str, Any] = {"state": "closed", "failures": 0}
+        client = get_redis_client()
+        if client is None:
+            return state
+
+        try:
+            values = client.hgetall(self._key(str(endpoint_id)))
+        except Exception as e:
+            logger.warning(f"Failed to read circuit of endpoint {endpoint_id}: {e}")
+            return state
+
+        for key, value in values.items():
+            key = key.decode() if isinstance(key, bytes) else key
+            value = value.decode() if isinstance(value, bytes) else value
+            state[key] = value if key == "state" else float(value)
+        return state
+
+
+circuit_breaker = EndpointCircuitBreaker()
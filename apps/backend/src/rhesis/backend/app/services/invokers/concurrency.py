@@ -0,0 +1,324 @@
+"""
+Adaptive per-endpoint concurrency control shared across workers.
+
+Every worker acquires a slot for an endpoint before invoking it and releases it with the
+outcome of the invocation. The number of slots (the endpoint's concurrency limit) is kept
+in Redis and adjusted with additive-increase/multiplicative-decrease (AIMD):
+
+- successful invocations grow the limit by roughly one slot per window of requests, as
+  long as the smoothed latency stays close to the best latency observed
+- overload responses (HTTP 429/5xx, network failures) shrink the limit by
+  `ENDPOINT_CONCURRENCY_DECREASE_FACTOR`, at most once per decrease interval
+
+Slots are leases with an expiry, so slots held by crashed workers are reclaimed. The
+controller is opt-in (`ENDPOINT_CONCURRENCY_ENABLED=true`); when it is disabled or Redis is
+unavailable, invocations are not limited. Waiting for a slot is capped well below the time
+limits of test tasks, after which the endpoint is invoked without a slot.
+"""
+
+import asyncio
+import os
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from rhesis.backend.app.utils.redis_client import get_redis_client
+from rhesis.backend.logging import logger
+
+CONCURRENCY_STATE_KEY_TEMPLATE = "rhesis:endpoint:{endpoint_id}:concurrency"
+CONCURRENCY_SLOTS_KEY_TEMPLATE = "rhesis:endpoint:{endpoint_id}:slots"
+CONCURRENCY_STATE_TTL_SECONDS = 24 * 60 * 60
+
+DEFAULT_INITIAL_LIMIT = 4
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 64
+DEFAULT_DECREASE_FACTOR = 0.5
+DEFAULT_DECREASE_INTERVAL_SECONDS = 2.0
+DEFAULT_LATENCY_TOLERANCE = 2.0  # Stop increasing when latency exceeds 2x the best latency
+DEFAULT_SLOT_LEASE_SECONDS = 15 * 60
+DEFAULT_SLOT_WAIT_SECONDS = 60
+# Test tasks have soft time limits of 5 minutes per test; never wait close to them
+MAX_SLOT_WAIT_SECONDS = 2 * 60
+
+SLOT_POLL_MIN_SECONDS = 0.05
+SLOT_POLL_MAX_SECONDS = 1.0
+
+OVERLOAD_ERROR_TYPES = {"network_error", "websocket_communication_error"}
+OVERLOAD_STATUS_CODES = {408, 429}
+
+# KEYS: state hash, slots sorted set
+# ARGV: now, token, lease seconds, initial limit, state ttl
+_ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+local limit = tonumber(redis.call('HGET', KEYS[1], 'limit') or ARGV[4])
+if redis.call('ZCARD', KEYS[2]) < math.max(1, math.floor(limit)) then
+    redis.call('ZADD', KEYS[2], tonumber(ARGV[1]) + tonumber(ARGV[3]), ARGV[2])
+    redis.call('EXPIRE', KEYS[2], ARGV[5])
+    return 1
+end
+return 0
+"""
+
+# KEYS: state hash, slots sorted set
+# ARGV: now, token, outcome ('ok', 'overloaded' or 'none'), latency, initial limit,
+#       min limit, max limit, decrease factor, decrease interval, latency tolerance, state ttl
+_RELEASE_SCRIPT = """
+redis.call('ZREM', KEYS[2], ARGV[2])
+local limit = tonumber(redis.call('HGET', KEYS[1], 'limit') or ARGV[5])
+if ARGV[3] == 'none' then
+    return tostring(limit)
+end
+
+local now = tonumber(ARGV[1])
+local latency = tonumber(ARGV[4])
+local ewma = tonumber(redis.call('HGET', KEYS[1], 'latency_ewma') or latency)
+local best = tonumber(redis.call('HGET', KEYS[1], 'latency_best') or latency)
+ewma = 0.8 * ewma + 0.2 * latency
+-- Let the best latency drift towards the current one so it adapts to slower targets
+best = math.min(latency, best + 0.01 * (ewma - best))
+
+if ARGV[3] == 'overloaded' then
+    local last_decrease = tonumber(redis.call('HGET', KEYS[1], 'last_decrease') or 0)
+    if now - last_decrease >= tonumber(ARGV[9]) then
+        limit = math.max(tonumber(ARGV[6]), limit * tonumber(ARGV[8]))
+        redis.call('HSET', KEYS[1], 'last_decrease', tostring(now))
+    end
+    redis.call('HINCRBY', KEYS[1], 'overloaded', 1)
+elseif ewma <= best * tonumber(ARGV[10]) then
+    limit = math.min(tonumber(ARGV[7]), limit + 1 / math.max(limit, 1))
+end
+
+redis.call('HINCRBY', KEYS[1], 'requests', 1)
+redis.call('HSET', KEYS[1], 'limit', tostring(limit), 'latency_ewma', tostring(ewma),
+    'latency_best', tostring(best))
+redis.call('EXPIRE', KEYS[1], ARGV[11])
+return tostring(limit)
+"""
+
+
+def is_overload_response(result: Any) -> bool:
+    """Whether an invoker result indicates that the endpoint is overloaded."""
+    if not isinstance(result, dict) or not result.get("error"):
+        return False
+
+    status_code = result.get("status_code")
+    if isinstance(status_code, int) and (
+        status_code in OVERLOAD_STATUS_CODES or status_code >= 500
+    ):
+        return True
+
+    return result.get("error_type") in OVERLOAD_ERROR_TYPES
+
+
+class EndpointSlot:
+    """A concurrency slot held while invoking an endpoint."""
+
+    def __init__(self, endpoint_id: str, token: Optional[str]):
+        self.endpoint_id = endpoint_id
+        self.token = token
+        self.started_at = time.monotonic()
+        self.outcome = "none"
+        self.latency = 0.0
+
+    @property
+    def acquired(self) -> bool:
+        return self.token is not None
+
+    def record(self, result: Any) -> None:
+        """Record the result of the invocation made while holding the slot."""
+        self.latency = time.monotonic() - self.started_at
+        self.outcome = "overloaded" if is_overload_response(result) else "ok"
+
+
+class EndpointConcurrencyController:
+    """AIMD concurrency limits per endpoint, shared across workers through Redis."""
+
+    def __init__(self):
+        self.enabled = os.getenv("ENDPOINT_CONCURRENCY_ENABLED", "false").lower() == "true"
+        self.initial_limit = int(os.getenv("ENDPOINT_CONCURRENCY_INITIAL", DEFAULT_INITIAL_LIMIT))
+        self.min_limit = int(os.getenv("ENDPOINT_CONCURRENCY_MIN", DEFAULT_MIN_LIMIT))
+        self.max_limit = int(os.getenv("ENDPOINT_CONCURRENCY_MAX", DEFAULT_MAX_LIMIT))
+        self.decrease_factor = float(
+            os.getenv("ENDPOINT_CONCURRENCY_DECREASE_FACTOR", DEFAULT_DECREASE_FACTOR)
+        )
+        self.decrease_interval = DEFAULT_DECREASE_INTERVAL_SECONDS
+        self.latency_tolerance = DEFAULT_LATENCY_TOLERANCE
+        self.slot_lease_seconds = DEFAULT_SLOT_LEASE_SECONDS
+        self.slot_wait_seconds = min(
+            float(os.getenv("ENDPOINT_CONCURRENCY_WAIT_SECONDS", DEFAULT_SLOT_WAIT_SECONDS)),
+            MAX_SLOT_WAIT_SECONDS,
+        )
+
+    @staticmethod
+    def _keys(endpoint_id: str):
+        return [
+            CONCURRENCY_STATE_KEY_TEMPLATE.format(endpoint_id=endpoint_id),
+            CONCURRENCY_SLOTS_KEY_TEMPLATE.format(endpoint_id=endpoint_id),
+        ]
+
+    def _try_acquire(self, client, endpoint_id: str, token: str) -> bool:
+        return bool(
+            client.eval(
+                _ACQUIRE_SCRIPT,
+                2,
+                *self._keys(endpoint_id),
+                time.time(),
+                token,
+                self.slot_lease_seconds,
+                self.initial_limit,
+                CONCURRENCY_STATE_TTL_SECONDS,
+            )
+        )
+
+    def acquire(self, endpoint_id: str) -> EndpointSlot:
+        """
+        Wait for a free slot of the endpoint.
+
+        Returns:
+            The slot; it is not acquired (unlimited) if Redis is unavailable or the wait
+            timed out
+        """
+        endpoint_id = str(endpoint_id)
+        client = get_redis_client() if self.enabled else None
+        if client is None:
+            return EndpointSlot(endpoint_id, None)
+
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.slot_wait_seconds
+        delay = SLOT_POLL_MIN_SECONDS
+        try:
+            while True:
+                if self._try_acquire(client, endpoint_id, token):
+                    return EndpointSlot(endpoint_id, token)
+
+                if time.monotonic() >= deadline:
+                    return self._unlimited_slot(endpoint_id)
+
+                time.sleep(delay * random.uniform(0.5, 1.0))
+                delay = min(delay * 2, SLOT_POLL_MAX_SECONDS)
+        except Exception as e:
+            logger.warning(f"Failed to acquire concurrency slot of endpoint {endpoint_id}: {e}")
+            return EndpointSlot(endpoint_id, None)
+
+    async def aacquire(self, endpoint_id: str) -> EndpointSlot:
+        """
+        Wait for a free slot of the endpoint without blocking the event loop.
+
+        Redis calls run in a thread, as the client is synchronous.
+        """
+        endpoint_id = str(endpoint_id)
+        client = get_redis_client() if self.enabled else None
+        if client is None:
+            return EndpointSlot(endpoint_id, None)
+
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.slot_wait_seconds
+        delay = SLOT_POLL_MIN_SECONDS
+        try:
+            while True:
+                if await asyncio.to_thread(self._try_acquire, client, endpoint_id, token):
+                    return EndpointSlot(endpoint_id, token)
+
+                if time.monotonic() >= deadline:
+                    return self._unlimited_slot(endpoint_id)
+
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                delay = min(delay * 2, SLOT_POLL_MAX_SECONDS)
+        except Exception as e:
+            logger.warning(f"Failed to acquire concurrency slot of endpoint {endpoint_id}: {e}")
+            return EndpointSlot(endpoint_id, None)
+
+    @staticmethod
+    def _unlimited_slot(endpoint_id: str) -> EndpointSlot:
+        logger.warning(
+            f"Timed out waiting for a concurrency slot of endpoint {endpoint_id}, "
+            "invoking without a slot"
+        )
+        return EndpointSlot(endpoint_id, None)
+
+    def release(self, slot: EndpointSlot) -> Optional[float]:
+        """
+        Release a slot and adjust the endpoint's limit with the recorded outcome.
+
+        Returns:
+            The new concurrency limit, or None if the slot was not acquired
+        """
+        if not slot.acquired:
+            return None
+
+        client = get_redis_client()
+        if client is None:
+            return None
+
+        try:
+            limit = client.eval(
+                _RELEASE_SCRIPT,
+                2,
+                *self._keys(slot.endpoint_id),
+                time.time(),
+                slot.token,
+                slot.outcome,
+                slot.latency,
+                self.initial_limit,
+                self.min_limit,
+                self.max_limit,
+                self.decrease_factor,
+                self.decrease_interval,
+                self.latency_tolerance,
+                CONCURRENCY_STATE_TTL_SECONDS,
+            )
+            limit = float(limit)
+            if slot.outcome == "overloaded":
+                logger.info(
+                    f"Endpoint {slot.endpoint_id} is overloaded, concurrency limit: {limit:.2f}"
+                )
+            return limit
+        except Exception as e:
+            logger.warning(
+                f"Failed to release concurrency slot of endpoint {slot.endpoint_id}: {e}"
+            )
+            return None
+
+    @contextmanager
+    def slot(self, endpoint_id: str) -> Iterator[EndpointSlot]:
+        """Hold a slot of the endpoint for the duration of the block."""
+        slot = self.acquire(endpoint_id)
+        try:
+            yield slot
+        finally:
+            self.release(slot)
+
+    @asynccontextmanager
+    async def aslot(self, endpoint_id: str) -> AsyncIterator[EndpointSlot]:
+        """Hold a slot of the endpoint for the duration of the async block."""
+        slot = await self.aacquire(endpoint_id)
+        try:
+            yield slot
+        finally:
+            if slot.acquired:
+                await asyncio.to_thread(self.release, slot)
+
+    def get_state(self, endpoint_id: str) -> Dict[str, Any]:
+        """Return the current limit, in-flight count and counters of an endpoint."""
+        state = {"limit": float(self.initial_limit), "in_flight": 0}
+        client = get_redis_client()
+        if client is None:
+            return state
+
+        state_key, slots_key = self._keys(str(endpoint_id))
+        try:
+            values = client.hgetall(state_key)
+            state["in_flight"] = client.zcount(slots_key, time.time(), "+inf")
+        except Exception as e:
+            logger.warning(f"Failed to read concurrency state of endpoint {endpoint_id}: {e}")
+            return state
+
+        for key, value in values.items():
+            key = key.decode() if isinstance(key, bytes) else key
+            state[key] = float(value)
+        return state
+
+
+concurrency_controller = EndpointConcurrencyController()
@@ -1,5 +1,8 @@
+import asyncio
+import copy
 import json
-from typing import Any, Dict
+import time
+from typing import Any, Dict, List, Optional, Union
 
 import requests
 from fastapi import HTTPException
@@ -13,15 +16,40 @@ from tenacity import (
 )
 
 from rhesis.backend.app.models.endpoint import Endpoint
+from rhesis.backend.app.utils.phase_timer import timed_phase
 
 # Use rhesis logger
 from rhesis.backend.logging import logger
 
-from .base import BaseEndpointInvoker, ResponseMapper, TemplateRenderer
+from .base import (
+    BaseEndpointInvoker,
+    ResponseMapper,
+    TemplateRenderer,
+    get_endpoint_cache_key,
+)
+from .streaming import (
+    StreamAssembler,
+    StreamConsumer,
+    is_streaming_content_type,
+)
+from .transport import (
+    aread_limited_body,
+    get_async_transport,
+    get_max_response_bytes,
+    get_transport,
+    read_limited_body,
+)
+
+TRUNCATION_MARKER = "\n... [truncated: response exceeds {limit} bytes]"
 
 
 class RestEndpointInvoker(BaseEndpointInvoker):
-    """REST endpoint invoker with support for different auth types."""
+    """REST endpoint invoker with support for different auth types.
+
+    Requests are sent through the pooled keep-alive transport of the target origin, or its
+    async counterpart for `ainvoke`. Streamed responses (server-sent events, JSON lines)
+    are consumed incrementally.
+    """
 
     def __init__(self):
         super().__init__()
@@ -40,45 +68,234 @@ class RestEndpointInvoker(BaseEndpointInvoker):
             # Prepare request components
             method, headers, request_body, url = self._prepare_request(db, endpoint, input_data)
 
-            # Make request and handle response
-            response = self._make_request_without_raise(
-                self.request_handlers[method], url, headers, request_body
+            # Make request and handle response; streamed bodies are read as they arrive
+            started = time.perf_counter()
+            with timed_phase("network"):
+                response = self._make_request_without_raise(
+                    self.request_handlers[method], url, headers, request_body
+                )
+                truncated = False
+                if response.status_code >= 400 or not self._is_stream(response):
+                    # The request is sent with stream=True; read regular bodies right away
+                    truncated = read_limited_body(response)
+
+            return self._handle_response(
+                response, endpoint, method, url, headers, request_body, started, truncated
             )
 
-            # Log response summary
-            logger.info(f"Response received: {response.status_code}")
-
-            # Handle different response scenarios
-            if response.status_code >= 400:
-                return self._handle_http_error(response, method, url, headers, request_body)
+        except HTTPException:
+            # Re-raise HTTPExceptions (configuration errors that should still fail)
+            raise
+        except Exception as e:
+            return self._handle_invocation_error(e, locals())
 
-            return self._handle_successful_response(
-                response, endpoint, method, url, headers, request_body
+    async def ainvoke(
+        self, db: Session, endpoint: Endpoint, input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Invoke the REST endpoint through the async transport of the running event loop."""
+        try:
+            # Token requests and template rendering are blocking
+            method, headers, request_body, url = await asyncio.to_thread(
+                self._prepare_request, db, endpoint, input_data
             )
 
-        except requests.exceptions.RequestException as e:
-            return self._create_error_response(
-                error_type="network_error",
-                output_message=f"Network/connection error: {str(e)}",
-                message=f"Network/connection error: {str(e)}",
-                request_details=self._safe_request_details(locals(), "REST"),
+            body = {"params": request_body} if method == "GET" else {"json": request_body}
+            started = time.perf_counter()
+            with timed_phase("network"):
+                async with get_async_transport(url).stream(
+                    method, url, headers, **body
+                ) as streamed:
+                    if streamed.status_code < 400 and self._is_stream(streamed):
+                        mapped_response = await self._ahandle_stream_response(
+                            streamed, endpoint, started
+                        )
+                        if mapped_response is None:
+                            return self._handle_oversized_response(
+                                streamed, method, url, headers, request_body
+                            )
+                        return mapped_response
+                    response = await aread_limited_body(streamed)
+
+            truncated = read_limited_body(response)
+            return self._handle_response(
+                response, endpoint, method, url, headers, request_body, truncated=truncated
             )
+
         except HTTPException:
-            # Re-raise HTTPExceptions (configuration errors that should still fail)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+            return self._handle_invocation_error(e, locals())
+
+    def get_batch_size(self, endpoint: Endpoint) -> int:
+        """Configured batch size, or 1 unless the batch template and response path are set."""
+        if not (endpoint.batch_request_body_template and endpoint.batch_response_path):
+            return 1
+        return max(1, endpoint.batch_size or 1)
+
+    def invoke_batch(
+        self, db: Session, endpoint: Endpoint, inputs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Invoke the endpoint with all inputs in one request, if it has a batch mode.
+
+        The request body is rendered from `batch_request_body_template`, and the response
+        is split into one mapped response per input at `batch_response_path`. If the
+        request fails, every input gets the error response.
+        """
+        if self.get_batch_size(endpoint) == 1:
+            return super().invoke_batch(db, endpoint, inputs)
+
+        try:
+            method, headers, url = self._prepare_target(db, endpoint)
+            with timed_phase("template_render"):
+                request_body = self.template_renderer.render_batch(
+                    endpoint.batch_request_body_template,
+                    inputs,
+                    get_endpoint_cache_key(endpoint, "batch_request_body_template"),
+                )
+            logger.info(f"Sending batch of {len(inputs)} inputs")
+
+            with timed_phase("network"):
+                response = self._make_request_without_raise(
+                    self.request_handlers[method], url, headers, request_body
+                )
+                # Batch responses are mapped as a whole, so streamed bodies are read too
+                truncated = read_limited_body(response)
+
+            if response.status_code >= 400:
+                error = self._handle_http_error(
+                    response, method, url, headers, request_body, truncated
+                )
+            elif truncated:
+                error = self._handle_oversized_response(
+                    response, method, url, headers, request_body
+                )
+            else:
+                mapped = self._handle_batch_response(response, endpoint, len(inputs))
+                if isinstance(mapped, list):
+                    return mapped
+                error = mapped
+                error["request"] = self._create_request_details(method, url, headers, request_body)
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            error = self._handle_invocation_error(e, locals())
+
+        return [copy.deepcopy(error) for _ in inputs]
+
+    def _handle_batch_response(
+        self, response: requests.Response, endpoint: Endpoint, count: int
+    ) -> Union[List[Dict], Dict]:
+        """Split a batch response into mapped responses, or create an error response."""
+        try:
+            with timed_phase("response_mapping"):
+                responses = self.response_mapper.map_batch_response(
+                    response.json(),
+                    endpoint.batch_response_path,
+                    endpoint.response_mappings or {},
+                    get_endpoint_cache_key(endpoint, "batch_response_path"),
+                    get_endpoint_cache_key(endpoint, "response_mappings"),
+                )
+        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError) as json_error:
+            logger.error(f"JSON parsing error of batch response: {str(json_error)}")
+            error_message = "Invalid JSON batch response from endpoint"
+            return self._create_error_response(
+                error_type="json_parsing_error",
+                output_message=f"{error_message}. Response content: {response.text}",
+                message=f"{error_message} (status: {response.status_code})",
+                status_code=response.status_code,
+                json_error=str(json_error),
+            )
+
+        if len(responses) != count:
+            message = (
+                f"Batch response contains {len(responses)} outputs at "
+                f"{endpoint.batch_response_path} for {count} inputs"
+            )
+            logger.error(message)
+            return self._create_error_response(
+                error_type="batch_response_error",
+                output_message=message,
+                message=message,
+                status_code=response.status_code,
+                response_content=response.text,
+            )
+
+        return responses
+
+    def _handle_response(
+        self,
+        response: requests.Response,
+        endpoint: Endpoint,
+        method: str,
+        url: str,
+        headers: Dict,
+        request_body: Any,
+        started: Optional[float] = None,
+        truncated: bool = False,
+    ) -> Dict:
+        """Map the response, or create an error response for HTTP errors."""
+        # Log response summary
+        logger.info(f"Response received: {response.status_code}")
+
+        # Handle different response scenarios
+        if response.status_code >= 400:
+            return self._handle_http_error(
+                response, method, url, headers, request_body, truncated
+            )
+
+        if truncated:
+            return self._handle_oversized_response(response, method, url, headers, request_body)
+
+        if self._is_stream(response):
+            mapped_response = self._handle_stream_response(response, endpoint, started)
+            if mapped_response is None:
+                return self._handle_oversized_response(
+                    response, method, url, headers, request_body
+                )
+            return mapped_response
+
+        return self._handle_successful_response(
+            response, endpoint, method, url, headers, request_body
+        )
+
+    def _handle_invocation_error(self, error: Exception, local_vars: Dict) -> Dict:
+        """Create the error response for a failed invocation."""
+        if isinstance(error, requests.exceptions.RequestException):
             return self._create_error_response(
-                error_type="unexpected_error",
-                output_message=f"Unexpected error: {str(e)}",
-                message=f"Unexpected error: {str(e)}",
-                request_details=self._safe_request_details(locals(), "REST"),
+                error_type="network_error",
+                output_message=f"Network/connection error: {str(error)}",
+                message=f"Network/connection error: {str(error)}",
+                request_details=self._safe_request_details(local_vars, "REST"),
             )
 
+        logger.error(f"Unexpected error: {str(error)}", exc_info=True)
+        return self._create_error_response(
+            error_type="unexpected_error",
+            output_message=f"Unexpected error: {str(error)}",
+            message=f"Unexpected error: {str(error)}",
+            request_details=self._safe_request_details(local_vars, "REST"),
+        )
+
     def _prepare_request(
         self, db: Session, endpoint: Endpoint, input_data: Dict[str, Any]
     ) -> tuple:
         """Prepare all request components."""
+        method, headers, url = self._prepare_target(db, endpoint)
+
+        # Prepare body
+        with timed_phase("template_render"):
+            request_body = self.template_renderer.render(
+                endpoint.request_body_template or {},
+                input_data,
+                get_endpoint_cache_key(endpoint, "request_body_template"),
+            )
+
+        return method, headers, request_body, url
+
+    def _prepare_target(self, db: Session, endpoint: Endpoint) -> tuple:
+        """Prepare the method, headers and URL of a request."""
         logger.info(f"Invoking endpoint: {endpoint.name}")
 
         # Get method and validate
@@ -86,17 +303,14 @@ class RestEndpointInvoker(BaseEndpointInvoker):
         if method not in self.request_handlers:
             raise HTTPException(status_code=400, detail=f"Unsupported HTTP method: {method}")
 
-        # Prepare headers and body
+        # Prepare headers
         headers = self._prepare_headers(db, endpoint)
-        request_body = self.template_renderer.render(
-            endpoint.request_body_template or {}, input_data
-        )
 
         # Build URL
         url = endpoint.url + (endpoint.endpoint_path or "")
         logger.info(f"Making {method} request to: {url}")
 
-        return method, headers, request_body, url
+        return method, headers, url
 
     def _create_request_details(self, method: str, url: str, headers: Dict, body: Any) -> Dict:
         """Create request details dictionary."""
@@ -113,14 +327,24 @@ class RestEndpointInvoker(BaseEndpointInvoker):
         }
 
     def _handle_http_error(
-        self, response: requests.Response, method: str, url: str, headers: Dict, request_body: Any
+        self,
+        response: requests.Response,
+        method: str,
+        url: str,
+        headers: Dict,
+        request_body: Any,
+        truncated: bool = False,
     ) -> Dict:
         """Handle HTTP error responses."""
         logger.error(f"HTTP {response.status_code} error from {url}: {response.reason}")
 
+        response_content = response.text
+        if truncated:
+            response_content += TRUNCATION_MARKER.format(limit=get_max_response_bytes())
+
         error_output = f"HTTP {response.status_code} error from endpoint: {response.reason}"
-        if response.text:
-            error_output += f". Response content: {response.text}"
+        if response_content:
+            error_output += f". Response content: {response_content}"
 
         return self._create_error_response(
             error_type="http_error",
@@ -130,7 +354,25 @@ class RestEndpointInvoker(BaseEndpointInvoker):
             status_code=response.status_code,
             reason=response.reason,
             response_headers=dict(response.headers),
-            response_content=response.text,
+            response_content=response_content,
+            response_truncated=truncated,
+        )
+
+    def _handle_oversized_response(
+        self, response: requests.Response, method: str, url: str, headers: Dict, request_body: Any
+    ) -> Dict:
+        """Handle successful responses whose body exceeds the size limit."""
+        limit = get_max_response_bytes()
+        logger.error(f"Response from {url} exceeds the limit of {limit} bytes")
+
+        return self._create_error_response(
+            error_type="response_too_large",
+            output_message=f"Response from endpoint exceeds the limit of {limit} bytes",
+            message=f"Response from endpoint exceeds the limit of {limit} bytes",
+            request_details=self._create_request_details(method, url, headers, request_body),
+            status_code=response.status_code,
+            response_headers=dict(response.headers),
+            response_truncated=True,
         )
 
     def _handle_successful_response(
@@ -144,11 +386,14 @@ class RestEndpointInvoker(BaseEndpointInvoker):
     ) -> Dict:
         """Handle successful response with JSON parsing."""
         try:
-            response_data = response.json()
+            with timed_phase("response_mapping"):
+                response_data = response.json()
 
-            mapped_response = self.response_mapper.map_response(
-                response_data, endpoint.response_mappings or {}
-            )
+                mapped_response = self.response_mapper.map_response(
+                    response_data,
+                    endpoint.response_mappings or {},
+                    get_endpoint_cache_key(endpoint, "response_mappings"),
+                )
 
             return mapped_response
         except (json.JSONDecodeError, requests.exceptions.JSONDecodeError) as json_error:
@@ -176,13 +421,70 @@ class RestEndpointInvoker(BaseEndpointInvoker):
                 json_error=str(json_error),
             )
 
+    @staticmethod
+    def _is_stream(response: requests.Response) -> bool:
+        return is_streaming_content_type(response.headers.get("Content-Type"))
+
+    def _handle_stream_response(
+        self, response: requests.Response, endpoint: Endpoint, started: Optional[float]
+    ) -> Optional[Dict]:
+        """
+        Assemble a streamed response event by event, measuring time to first token.
+
+        Reading stops once the stream exceeds the response size limit; the connection is
+        then closed and None is returned.
+        """
+        consumer = self._create_stream_consumer(response, endpoint, started)
+        response.encoding = response.encoding or "utf-8"
+
+        with timed_phase("network"):
+            for line in response.iter_lines(decode_unicode=True):
+                if not consumer.feed(line):
+                    response.close()
+                    return None
+
+        return self._stream_result(consumer)
+
+    async def _ahandle_stream_response(
+        self, response: Any, endpoint: Endpoint, started: float
+    ) -> Optional[Dict]:
+        """Assemble a streamed httpx response like `_handle_stream_response`, without blocking."""
+        consumer = self._create_stream_consumer(response, endpoint, started)
+
+        async for line in response.aiter_lines():
+            if not consumer.feed(line):
+                # The transport closes the response when leaving its stream
+                return None
+
+        return self._stream_result(consumer)
+
+    def _create_stream_consumer(
+        self, response: Any, endpoint: Endpoint, started: Optional[float]
+    ) -> StreamConsumer:
+        assembler = StreamAssembler(
+            self.response_mapper,
+            endpoint.response_mappings or {},
+            get_endpoint_cache_key(endpoint, "response_mappings"),
+        )
+        return StreamConsumer(
+            response.headers["Content-Type"], assembler, get_max_response_bytes(), started
+        )
+
+    @staticmethod
+    def _stream_result(consumer: StreamConsumer) -> Dict:
+        mapped_response = consumer.result()
+        logger.info(f"Streamed response received: {mapped_response['streaming']}")
+        return mapped_response
+
     def _prepare_headers(self, db: Session, endpoint: Endpoint) -> Dict[str, str]:
         """Prepare request headers with proper authentication."""
-        headers = endpoint.request_headers or {"Content-Type": "application/json"}
+        # Copy, as the endpoint configuration may be shared by concurrent invocations
+        headers = dict(endpoint.request_headers or {"Content-Type": "application/json"})
 
         if endpoint.auth_type:
             # Get valid token based on auth type
-            auth_token = self._get_valid_token(db, endpoint)
+            with timed_phase("auth_token"):
+                auth_token = self._get_valid_token(db, endpoint)
 
             # Replace auth_token placeholder in headers
             if headers:
@@ -219,19 +521,19 @@ class RestEndpointInvoker(BaseEndpointInvoker):
     def _handle_post_request(
         self, url: str, headers: Dict[str, str], body: Any
     ) -> requests.Response:
-        return requests.post(url, headers=headers, json=body)
+        return get_transport(url).request("POST", url, headers=headers, json=body, stream=True)
 
     def _handle_get_request(
         self, url: str, headers: Dict[str, str], body: Any
     ) -> requests.Response:
-        return requests.get(url, headers=headers, params=body)
+        return get_transport(url).request("GET", url, headers=headers, params=body, stream=True)
 
     def _handle_put_request(
         self, url: str, headers: Dict[str, str], body: Any
     ) -> requests.Response:
-        return requests.put(url, headers=headers, json=body)
+        return get_transport(url).request("PUT", url, headers=headers, json=body, stream=True)
 
     def _handle_delete_request(
         self, url: str, headers: Dict[str, str], body: Any
     ) -> requests.Response:
-        return requests.delete(url, headers=headers, json=body)
+        return get_transport(url).request("DELETE", url, headers=headers, json=body, stream=True)
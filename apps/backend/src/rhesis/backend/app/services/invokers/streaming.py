@@ -0,0 +1,195 @@
+"""
+Incremental consumption of streamed endpoint responses.
+
+Targets that stream their answer (server-sent events, newline-delimited JSON, WebSocket
+token frames) are read event by event instead of buffering the whole body:
+
+- `StreamTimer` measures the time to the first token and the token rate. Every streamed
+  event counts as one token, as targets typically send one event per generated token.
+- `StreamAssembler` applies the endpoint's response mappings to every JSON event. String
+  values mapped to `output` are concatenated across events, other mapped fields keep the
+  last value found. Events that are not JSON are appended to the output as text.
+- `StreamConsumer` feeds the lines of a response through both as they arrive, from a
+  blocking or an async body alike, and stops at the response size limit.
+
+The statistics are added to the mapped response under `streaming`, and the time to the
+first token is reported as phase `time_to_first_token`.
+"""
+
+import json
+import time
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional
+
+from rhesis.backend.app.utils.phase_timer import record_phase
+
+STREAMING_CONTENT_TYPES = (
+    "text/event-stream",
+    "application/x-ndjson",
+    "application/jsonl",
+    "application/stream+json",
+)
+SSE_DONE_SENTINEL = "[DONE]"
+
+
+def is_streaming_content_type(content_type: Any) -> bool:
+    """Whether a response with this Content-Type header is a stream of events."""
+    if not isinstance(content_type, str):
+        return False
+    return content_type.split(";")[0].strip().lower() in STREAMING_CONTENT_TYPES
+
+
+class StreamEventParser:
+    """
+    Splits the lines of a streamed body into event payloads, one line at a time.
+
+    Server-sent events yield the (joined) data lines of each event; other streams yield
+    every non-empty line.
+    """
+
+    def __init__(self, content_type: str):
+        self._sse = content_type.lower().startswith("text/event-stream")
+        self._data: List[str] = []
+
+    def feed(self, line: str) -> Optional[str]:
+        """The payload completed by this line, if any."""
+        if not self._sse:
+            return line if line and line.strip() else None
+
+        if not line:
+            # A blank line dispatches the event
+            return self._dispatch()
+        if line.startswith("data:"):
+            value = line[5:]
+            self._data.append(value[1:] if value.startswith(" ") else value)
+        # Comments and event/id/retry fields carry no content
+        return None
+
+    def close(self) -> Optional[str]:
+        """The payload of an event left undispatched at the end of the body."""
+        return self._dispatch()
+
+    def _dispatch(self) -> Optional[str]:
+        payload = "\n".join(self._data)
+        self._data = []
+        return payload if payload and payload != SSE_DONE_SENTINEL else None
+
+
+def iter_stream_events(lines: Iterable[str], content_type: str) -> Iterator[str]:
+    """Yield the payloads of a streamed body as its lines arrive."""
+    parser = StreamEventParser(content_type)
+    for line in lines:
+        payload = parser.feed(line)
+        if payload is not None:
+            yield payload
+
+    payload = parser.close()
+    if payload is not None:
+        yield payload
+
+
+class StreamTimer:
+    """Measures time to first token and token rate of a streamed response."""
+
+    def __init__(self, started: Optional[float] = None):
+        # perf_counter() value of the moment the request was sent
+        self.started = started if started is not None else time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.last_token_at: Optional[float] = None
+        self.tokens = 0
+
+    def token(self) -> None:
+        now = time.perf_counter()
+        if self.first_token_at is None:
+            self.first_token_at = now
+            record_phase("time_to_first_token", now - self.started)
+        self.last_token_at = now
+        self.tokens += 1
+
+    def stats(self) -> Optional[Dict[str, Any]]:
+        """Time to first token, tokens and tokens per second after the first token."""
+        if self.first_token_at is None:
+            return None
+
+        generation_seconds = self.last_token_at - self.first_token_at
+        return {
+            "time_to_first_token_ms": round((self.first_token_at - self.started) * 1000, 2),
+            "duration_ms": round((self.last_token_at - self.started) * 1000, 2),
+            "tokens": self.tokens,
+            "tokens_per_second": (
+                round((self.tokens - 1) / generation_seconds, 2) if generation_seconds > 0 else None
+            ),
+        }
+
+
+class StreamAssembler:
+    """Assembles the mapped response of a stream event by event."""
+
+    def __init__(self, response_mapper, mappings: Dict[str, str], cache_key: Optional[Hashable]):
+        self._response_mapper = response_mapper
+        self._mappings = mappings
+        self._cache_key = cache_key
+        self._output: List[str] = []
+        self._fields: Dict[str, Any] = {key: None for key in mappings if key != "output"}
+
+    def add(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except json.JSONDecodeError:
+            self._output.append(payload)
+            return
+
+        if not isinstance(event, dict):
+            self._output.append(payload if isinstance(event, str) else str(event))
+            return
+
+        mapped = self._response_mapper.map_response(event, self._mappings, self._cache_key)
+        for key, value in mapped.items():
+            if value is None:
+                continue
+            if key == "output" and isinstance(value, str):
+                self._output.append(value)
+            elif key != "output":
+                self._fields[key] = value
+
+    def result(self) -> Dict[str, Any]:
+        return {**self._fields, "output": "".join(self._output) or None}
+
+
+class StreamConsumer:
+    """Assembles the mapped response of a stream line by line, timing its events."""
+
+    def __init__(
+        self,
+        content_type: str,
+        assembler: StreamAssembler,
+        max_bytes: int,
+        started: Optional[float] = None,
+    ):
+        self._parser = StreamEventParser(content_type)
+        self._assembler = assembler
+        self._timer = StreamTimer(started) if started is not None else None
+        self._max_bytes = max_bytes
+        self._size = 0
+
+    def feed(self, line: Any) -> bool:
+        """Consume a line of the body; False once the body exceeds the size limit."""
+        self._size += len(line.encode("utf-8") if isinstance(line, str) else line) + 1
+        if self._size > self._max_bytes:
+            return False
+
+        self._add(self._parser.feed(line))
+        return True
+
+    def result(self) -> Dict[str, Any]:
+        """The mapped response, with the statistics of the stream under `streaming`."""
+        self._add(self._parser.close())
+        mapped_response = self._assembler.result()
+        mapped_response["streaming"] = self._timer.stats() if self._timer else None
+        return mapped_response
+
+    def _add(self, payload: Optional[str]) -> None:
+        if payload is None:
+            return
+        if self._timer:
+            self._timer.token()
+        self._assembler.add(payload)
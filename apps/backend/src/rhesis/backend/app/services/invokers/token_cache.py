@@ -0,0 +1,236 @@
+"""
+Client credentials tokens shared by all workers.
+
+Tokens are cached in Redis per endpoint and credentials, and in-process in front of it,
+so a test run requests a token from the identity provider once instead of once per
+worker and session:
+
+- Single-flight refresh: the worker holding the refresh lock requests the token, other
+  workers wait for it to appear in Redis.
+- Proactive renewal: a token is renewed ahead of its expiry (10% of its lifetime, at least
+  60 seconds). While one worker renews it, the others keep using the current token.
+
+Tokens are stored encrypted with the database encryption key. Without Redis, tokens are
+only shared within the process.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from rhesis.backend.app.models.endpoint import Endpoint
+from rhesis.backend.app.utils.encryption import DecryptionError, EncryptionError, decrypt, encrypt
+from rhesis.backend.app.utils.redis_client import get_redis_client
+from rhesis.backend.logging import logger
+
+TOKEN_KEY_TEMPLATE = "rhesis:endpoint:{endpoint_id}:token:{fingerprint}"
+
+DEFAULT_EXPIRES_IN_SECONDS = 3600
+REFRESH_MARGIN_SECONDS = 60
+REFRESH_MARGIN_RATIO = 0.1
+# Tokens this close to their expiry are not handed out anymore
+EXPIRY_SKEW_SECONDS = 5
+REFRESH_LOCK_TTL_SECONDS = 30
+REFRESH_WAIT_SECONDS = 30
+REFRESH_POLL_MIN_SECONDS = 0.05
+REFRESH_POLL_MAX_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    access_token: str
+    expires_at: float
+    refresh_at: float
+
+    @classmethod
+    def issued(cls, access_token: str, expires_in: Optional[float]) -> "CachedToken":
+        """Create a token issued now that is valid for `expires_in` seconds."""
+        lifetime = float(expires_in or DEFAULT_EXPIRES_IN_SECONDS)
+        margin = min(max(REFRESH_MARGIN_SECONDS, lifetime * REFRESH_MARGIN_RATIO), lifetime / 2)
+        now = time.time()
+        return cls(access_token, now + lifetime, now + lifetime - margin)
+
+    def is_valid(self) -> bool:
+        return time.time() < self.expires_at - EXPIRY_SKEW_SECONDS
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.refresh_at
+
+    def encode(self) -> str:
+        # Tokens are secrets like the endpoint's last_token column, so they are encrypted
+        return json.dumps(
+            {
+                "access_token": encrypt(self.access_token),
+                "expires_at": self.expires_at,
+                "refresh_at": self.refresh_at,
+            }
+        )
+
+    @classmethod
+    def decode(cls, payload) -> "CachedToken":
+        data = json.loads(payload)
+        return cls(decrypt(data["access_token"]), data["expires_at"], data["refresh_at"])
+
+
+def get_credentials_fingerprint(endpoint: Endpoint) -> str:
+    """Hash of the token request settings, so changed credentials get a new token."""
+    settings = [
+        endpoint.token_url,
+        endpoint.client_id,
+        endpoint.client_secret,
+        endpoint.audience,
+        endpoint.scopes,
+        endpoint.extra_payload,
+    ]
+    return hashlib.sha256(json.dumps(settings, default=str).encode()).hexdigest()[:16]
+
+
+class ClientCredentialsTokenCache:
+    """Two-level (process and Redis) cache of client credentials tokens."""
+
+    def __init__(self):
+        self._tokens: Dict[str, CachedToken] = {}
+        self._refresh_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get_token(
+        self, endpoint: Endpoint, fetch: Callable[[], Tuple[str, Optional[float]]]
+    ) -> CachedToken:
+        """
+        Get a valid token for the endpoint, requesting one through `fetch` if needed.
+
+        Args:
+            endpoint: The endpoint using client credentials authentication
+            fetch: Requests a new token and returns (access_token, expires_in)
+
+        Returns:
+            A token that is valid for at least a few more seconds
+        """
+        key = TOKEN_KEY_TEMPLATE.format(
+            endpoint_id=endpoint.id, fingerprint=get_credentials_fingerprint(endpoint)
+        )
+
+        token = self._tokens.get(key)
+        if token is not None and token.is_fresh():
+            return token
+
+        # Single flight within the process, across workers through the Redis lock
+        with self._get_refresh_lock(key):
+            token = self._tokens.get(key)
+            if token is not None and token.is_fresh():
+                return token
+
+            shared = self._read_shared(key)
+            if shared is not None and shared.is_valid():
+                token = shared
+                if token.is_fresh():
+                    self._tokens[key] = token
+                    return token
+
+            token = self._refresh(key, fetch, token if token and token.is_valid() else None)
+            self._tokens[key] = token
+            return token
+
+    def clear(self) -> None:
+        """Forget the tokens cached in this process (e.g. in tests)."""
+        with self._lock:
+            self._tokens.clear()
+
+    def _get_refresh_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._refresh_locks.setdefault(key, threading.Lock())
+
+    def _read_shared(self, key: str) -> Optional[CachedToken]:
+        client = get_redis_client()
+        if client is None:
+            return None
+        try:
+            payload = client.get(key)
+            return CachedToken.decode(payload) if payload else None
+        except (RedisError, DecryptionError, ValueError, KeyError) as e:
+            logger.warning(f"Failed to read cached token: {str(e)}")
+            return None
+
+    def _refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Tuple[str, Optional[float]]],
+        current: Optional[CachedToken],
+    ) -> CachedToken:
+        """Renew the token, or wait for the worker holding the refresh lock to renew it."""
+        client = get_redis_client()
+        if client is None:
+            return self._fetch(fetch, current)
+
+        lock_key = f"{key}:lock"
+        deadline = time.monotonic() + REFRESH_WAIT_SECONDS
+        delay = REFRESH_POLL_MIN_SECONDS
+
+        locked = False
+        try:
+            while True:
+                locked = bool(client.set(lock_key, "1", nx=True, ex=REFRESH_LOCK_TTL_SECONDS))
+                if locked:
+                    break
+
+                # Another worker is renewing; the current token is still good meanwhile
+                if current is not None:
+                    return current
+
+                shared = self._read_shared(key)
+                if shared is not None and shared.is_valid():
+                    return shared
+
+                if time.monotonic() >= deadline:
+                    logger.warning("Timed out waiting for another worker to request a token")
+                    break
+
+                time.sleep(delay)
+                delay = min(delay * 2, REFRESH_POLL_MAX_SECONDS)
+        except RedisError as e:
+            logger.warning(f"Token cache unavailable: {str(e)}")
+
+        if not locked:
+            return self._fetch(fetch, current)
+
+        try:
+            # The previous lock holder may have renewed it just before releasing the lock
+            shared = self._read_shared(key)
+            if shared is not None and shared.is_fresh():
+                return shared
+
+            token = self._fetch(fetch, current)
+            ttl = int(token.expires_at - time.time())
+            if token is not current and ttl > 0:
+                client.set(key, token.encode(), ex=ttl)
+            return token
+        except (RedisError, EncryptionError) as e:
+            logger.warning(f"Failed to share token: {str(e)}")
+            return token
+        finally:
+            try:
+                client.delete(lock_key)
+            except RedisError as e:
+                logger.warning(f"Failed to release token refresh lock: {str(e)}")
+
+    @staticmethod
+    def _fetch(
+        fetch: Callable[[], Tuple[str, Optional[float]]], current: Optional[CachedToken]
+    ) -> CachedToken:
+        try:
+            access_token, expires_in = fetch()
+        except Exception:
+            # A failed renewal doesn't fail invocations while the current token is valid
+            if current is None:
+                raise
+            logger.warning("Token renewal failed, using the current token", exc_info=True)
+            return current
+        return CachedToken.issued(access_token, expires_in)
+
+
+token_cache = ClientCredentialsTokenCache()
@@ -0,0 +1,402 @@
+"""
+Pooled HTTP transport for REST endpoint invocations.
+
+Each worker process keeps one transport per target origin (scheme, host and port), so
+consecutive invocations of the same target reuse kept-alive connections instead of
+paying for a TCP connection and TLS handshake per test. Transports are created lazily
+and recreated after a fork.
+
+Configuration (environment variables):
+
+- `ENDPOINT_HTTP_POOL_SIZE`: connections kept per origin (default 10)
+- `ENDPOINT_HTTP_CONNECT_TIMEOUT` / `ENDPOINT_HTTP_READ_TIMEOUT`: timeouts in seconds
+- `ENDPOINT_HTTP2`: use HTTP/2 through httpx (requires the `h2` package)
+- `ENDPOINT_MAX_RESPONSE_BYTES`: response bodies are read up to this size (default 10 MiB)
+
+Async invocations use an `httpx.AsyncClient` per origin and event loop instead
+(`get_async_transport`), with the same pool settings. Bodies of httpx responses are
+streamed too, so no transport reads more than the size limit of a body.
+
+Cookies set by targets are never stored, so pooled transports don't leak state between
+invocations.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from rhesis.backend.logging import logger
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 10.0
+DEFAULT_READ_TIMEOUT_SECONDS = 600.0
+# Log the pool statistics of an origin every this many requests
+STATS_LOG_INTERVAL = 100
+DEFAULT_MAX_RESPONSE_BYTES = 10 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+
+_transports: Dict[str, "HttpTransport"] = {}
+_transports_pid: Optional[int] = None
+# Async clients are bound to the event loop they were created on
+_async_transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+
+class HttpTransport:
+    """Keep-alive connection pool to a single origin, based on a `requests.Session`."""
+
+    protocol = "HTTP/1.1"
+
+    def __init__(self, origin: str, pool_size: int, timeout: tuple):
+        self.origin = origin
+        self.timeout = timeout
+        self.requests = 0
+        self._counter_lock = threading.Lock()
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session = requests.Session()
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self._session.mount("http://", self._adapter)
+        self._session.mount("https://", self._adapter)
+
+    def _count_request(self) -> None:
+        with self._counter_lock:
+            self.requests += 1
+            count = self.requests
+        if count % STATS_LOG_INTERVAL == 0:
+            logger.info(f"HTTP transport statistics: {self.stats()}")
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        json: Any = None,
+        params: Any = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        self._count_request()
+        return self._session.request(
+            method,
+            url,
+            headers=headers,
+            json=json,
+            params=params,
+            timeout=self.timeout,
+            stream=stream,
+        )
+
+    def connections_opened(self) -> int:
+        pools = self._adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests sent, connections opened and requests served by a reused connection."""
+        connections = self.connections_opened()
+        return {
+            "origin": self.origin,
+            "protocol": self.protocol,
+            "requests": self.requests,
+            "connections": connections,
+            "reused": max(self.requests - connections, 0),
+        }
+
+    def close(self) -> None:
+        self._session.close()
+
+
+class Http2Transport(HttpTransport):
+    """HTTP/2 connection pool to a single origin, based on an `httpx.Client`."""
+
+    protocol = "HTTP/2"
+
+    def __init__(self, origin: str, pool_size: int, timeout: tuple):
+        import httpx
+
+        self.origin = origin
+        self.timeout = timeout
+        self.requests = 0
+        self._counter_lock = threading.Lock()
+        self._httpx = httpx
+        self._client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(timeout[1], connect=timeout[0]),
+        )
+        self._client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        json: Any = None,
+        params: Any = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        self._count_request()
+        try:
+            response = self._client.send(
+                self._client.build_request(method, url, headers=headers, json=json, params=params),
+                stream=True,
+            )
+        except self._httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except self._httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+        # The body is read through `raw` as it is consumed, like a streamed requests response
+        converted = _to_requests_response(response)
+        converted.raw = _HttpxBody(response, self._httpx)
+        if not stream:
+            # Read the body right away, as requests does for requests that aren't streamed
+            converted.content
+        return converted
+
+    def connections_opened(self) -> int:
+        # httpx doesn't count connections; report the ones currently open
+        pool = getattr(self._client._transport, "_pool", None)
+        return len(getattr(pool, "connections", []))
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class AsyncHttpTransport:
+    """Async connection pool to a single origin, based on an `httpx.AsyncClient`."""
+
+    def __init__(self, origin: str, pool_size: int, timeout: tuple, http2: bool = False):
+        import httpx
+
+        self.origin = origin
+        self.protocol = "HTTP/2" if http2 else "HTTP/1.1"
+        self.requests = 0
+        self._httpx = httpx
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(timeout[1], connect=timeout[0]),
+        )
+        self._client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        json: Any = None,
+        params: Any = None,
+    ) -> AsyncIterator[Any]:
+        """Send a request and yield the httpx response before its body is read."""
+        self.requests += 1
+        try:
+            async with self._client.stream(
+                method, url, headers=headers, json=json, params=params
+            ) as response:
+                yield response
+        except self._httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except self._httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        json: Any = None,
+        params: Any = None,
+    ) -> requests.Response:
+        async with self.stream(method, url, headers, json=json, params=params) as response:
+            return await aread_limited_body(response)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class _HttpxBody:
+    """File-like reader of a streamed httpx response, used as `requests.Response.raw`."""
+
+    def __init__(self, response, httpx):
+        self._response = response
+        self._chunks = response.iter_bytes()
+        self._httpx = httpx
+
+    def read(self, amount: Optional[int] = None) -> bytes:
+        # Chunks are returned as they arrive, whatever their size
+        try:
+            return next(self._chunks, b"")
+        except self._httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except self._httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def close(self) -> None:
+        self._response.close()
+
+
+def _to_requests_response(response, content: Any = False) -> requests.Response:
+    """Adapt an httpx response, so the invoker handles both transports the same way."""
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.reason = response.reason_phrase
+    converted.headers = CaseInsensitiveDict(response.headers)
+    converted.url = str(response.url)
+    converted.encoding = response.encoding
+    converted._content = content
+    return converted
+
+
+async def aread_limited_body(response, max_bytes: Optional[int] = None) -> requests.Response:
+    """
+    Read the body of a streamed httpx response until it exceeds `max_bytes`.
+
+    Reading stops at the first chunk past the limit, and the rest of the body is never
+    read. `read_limited_body` then cuts the returned response to the limit and reports
+    it as truncated.
+    """
+    max_bytes = max_bytes if max_bytes is not None else get_max_response_bytes()
+
+    chunks = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            break
+    return _to_requests_response(response, b"".join(chunks))
+
+
+def get_max_response_bytes() -> int:
+    return int(os.getenv("ENDPOINT_MAX_RESPONSE_BYTES", DEFAULT_MAX_RESPONSE_BYTES))
+
+
+def read_limited_body(response: requests.Response, max_bytes: Optional[int] = None) -> bool:
+    """
+    Read the body of a response up to `max_bytes`, so oversized bodies don't fill memory.
+
+    Bodies of streamed responses are read in chunks and reading stops at the limit; the
+    connection is then closed instead of being returned to the pool. Bodies that were
+    already read are cut to the limit.
+
+    Returns:
+        Whether the body was truncated
+    """
+    max_bytes = max_bytes if max_bytes is not None else get_max_response_bytes()
+
+    if getattr(response, "_content", False) is not False:
+        content = response.content
+        if not isinstance(content, bytes) or len(content) <= max_bytes:
+            return False
+        response._content = content[:max_bytes]
+        return True
+
+    chunks = []
+    size = 0
+    truncated = False
+    for chunk in response.iter_content(READ_CHUNK_BYTES):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            truncated = True
+            break
+
+    response._content = b"".join(chunks)[:max_bytes]
+    if truncated:
+        response.close()
+    return truncated
+
+
+def _get_timeout() -> tuple:
+    return (
+        float(os.getenv("ENDPOINT_HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT_SECONDS)),
+        float(os.getenv("ENDPOINT_HTTP_READ_TIMEOUT", DEFAULT_READ_TIMEOUT_SECONDS)),
+    )
+
+
+def _get_pool_size() -> int:
+    return int(os.getenv("ENDPOINT_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE))
+
+
+def _use_http2(origin: str) -> bool:
+    if os.getenv("ENDPOINT_HTTP2", "false").lower() != "true" or not origin.startswith("https"):
+        return False
+    try:
+        import h2  # noqa: F401
+
+        return True
+    except ImportError:
+        logger.warning("ENDPOINT_HTTP2 is enabled but the h2 package is not installed")
+        return False
+
+
+def _get_origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _create_transport(origin: str) -> HttpTransport:
+    if _use_http2(origin):
+        return Http2Transport(origin, _get_pool_size(), _get_timeout())
+    return HttpTransport(origin, _get_pool_size(), _get_timeout())
+
+
+def get_transport(url: str) -> HttpTransport:
+    """Get the pooled transport for the origin of `url`, creating it on first use."""
+    global _transports_pid
+
+    origin = _get_origin(url)
+
+    with _lock:
+        # Connections can't be shared with a forked child process
+        if _transports_pid != os.getpid():
+            _transports.clear()
+            _transports_pid = os.getpid()
+
+        transport = _transports.get(origin)
+        if transport is None:
+            transport = _create_transport(origin)
+            _transports[origin] = transport
+        return transport
+
+
+def get_async_transport(url: str) -> AsyncHttpTransport:
+    """Get the async transport for the origin of `url` on the running event loop."""
+    origin = _get_origin(url)
+    loop = asyncio.get_running_loop()
+
+    with _lock:
+        transports = _async_transports.setdefault(loop, {})
+        transport = transports.get(origin)
+        if transport is None:
+            transport = AsyncHttpTransport(
+                origin, _get_pool_size(), _get_timeout(), http2=_use_http2(origin)
+            )
+            transports[origin] = transport
+        return transport
+
+
+def get_transport_stats() -> Dict[str, Dict[str, Any]]:
+    """Pool statistics of this process' transports by origin."""
+    with _lock:
+        transports = list(_transports.values()) if _transports_pid == os.getpid() else []
+    return {transport.origin: transport.stats() for transport in transports}
+
+
+def reset_transports() -> None:
+    """Close all transports of this process (e.g. in tests)."""
+    with _lock:
+        for transport in _transports.values():
+            transport.close()
+        _transports.clear()
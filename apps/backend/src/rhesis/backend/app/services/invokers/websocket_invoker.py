@@ -6,17 +6,23 @@ import uuid
 from typing import Any, Dict, Optional
 
 from sqlalchemy.orm import Session
-from websockets.asyncio.client import connect
 from websockets.exceptions import InvalidStatus
 
 from rhesis.backend.app.models.endpoint import Endpoint
+from rhesis.backend.app.utils.phase_timer import record_phase
 from rhesis.backend.logging import logger
 
-from .base import BaseEndpointInvoker
+from .base import BaseEndpointInvoker, get_endpoint_cache_key
+from .streaming import StreamTimer
+from .websocket_pool import get_connection_pool, run_in_worker_loop
 
 
 class WebSocketEndpointInvoker(BaseEndpointInvoker):
-    """WebSocket endpoint invoker with support for different auth types."""
+    """WebSocket endpoint invoker with support for different auth types.
+
+    Synchronous invocations run on the worker-level event loop and reuse pooled connections
+    to the same target once a previous response stream has ended cleanly.
+    """
 
     def __init__(self):
         super().__init__()
@@ -89,6 +95,13 @@ class WebSocketEndpointInvoker(BaseEndpointInvoker):
 
     def invoke(self, db: Session, endpoint: Endpoint, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Invoke the WebSocket endpoint with proper authentication."""
+        # Run the async WebSocket communication on the worker event loop
+        return run_in_worker_loop(self.ainvoke(db, endpoint, input_data))
+
+    async def ainvoke(
+        self, db: Session, endpoint: Endpoint, input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Invoke the WebSocket endpoint on the running event loop."""
         start_time = time.time()
 
         try:
@@ -99,8 +112,7 @@ class WebSocketEndpointInvoker(BaseEndpointInvoker):
             logger.info(f"Input data keys: {list(input_data.keys())}")
             logger.debug(f"Full input data: {json.dumps(input_data, indent=2, default=str)}")
 
-            # Run the async WebSocket communication in a sync context
-            result = asyncio.run(self._async_invoke(db, endpoint, input_data))
+            result = await self._async_invoke(db, endpoint, input_data)
 
             duration = time.time() - start_time
             logger.info(f"=== WebSocket invocation completed in {duration:.2f}s ===")
@@ -133,8 +145,10 @@ class WebSocketEndpointInvoker(BaseEndpointInvoker):
             # Get authentication token
             logger.debug("Getting authentication token...")
             auth_start_time = time.time()
-            auth_token = self._get_valid_token(db, endpoint)
+            # Token requests are blocking, keep them off the shared event loop
+            auth_token = await asyncio.to_thread(self._get_valid_token, db, endpoint)
             auth_duration = time.time() - auth_start_time
+            record_phase("auth_token", auth_duration)
 
             if auth_token:
                 logger.debug(
@@ -154,10 +168,13 @@ class WebSocketEndpointInvoker(BaseEndpointInvoker):
             logger.debug(f"Template context keys: {list(template_context.keys())}")
 
             message_data = self.template_renderer.render(
-                endpoint.request_body_template or {}, template_context
+                endpoint.request_body_template or {},
+                template_context,
+                get_endpoint_cache_key(endpoint, "request_body_template"),
             )
 
             template_duration = time.time() - template_start_time
+            record_phase("template_render", template_duration)
             logger.debug(f"Template rendered in {template_duration:.2f}s")
             logger.debug(
                 f"Rendered message data keys: {list(message_data.keys()) if isinstance(message_data, dict) else 'Not a dict'}"
@@ -183,14 +200,15 @@ class WebSocketEndpointInvoker(BaseEndpointInvoker):
             logger.debug(f"Additional headers: {json.dumps(additional_headers, indent=2)}")
 
             try:
-                # Use the new websockets.asyncio.client.connect API
                 logger.info(f"Attempting WebSocket connection to: {uri}")
                 connection_start_time = time.time()
 
-                async with connect(uri, additional_headers=additional_headers) as websocket:
+                async with get_connection_pool().connection(uri, additional_headers) as connection:
                     connection_duration = time.time() - connection_start_time
-                    logger.info(f"WebSocket connection established in {connection_duration:.2f}s")
-                    logger.debug(f"WebSocket state: {websocket.state}")
+                    logger.info(
+                        f"WebSocket connection {'reused' if connection.reused else 'established'} "
+                        f"in {connection_duration:.2f}s"
+                    )
 
                     # Send the message
                     logger.debug("Preparing to send WebSocket message...")
@@ -200,7 +218,9 @@ class WebSocketEndpointInvoker(BaseEndpointInvoker):
                     logger.debug(f"Message to send: {message_json}")
 
                     send_start_time = time.time()
-                    await websocket.send(message_json)
+                    stream_timer = StreamTimer()
+                    await connection.send(message_json)
+                    websocket = connection.websocket
                     send_duration = time.time() - send_start_time
                     logger.info(f"Message sent successfully in {send_duration:.2f}s")
 
@@ -252,6 +272,8 @@ class WebSocketEndpointInvoker(BaseEndpointInvoker):
                                 streaming_text_buffer = ""  # Reset buffer
 
                             responses.append(response_data)
+                            if isinstance(response_data, dict) and "content" in response_data:
+                                stream_timer.token()
 
                             # Extract conversation_id if present
                             if "conversation_id" in response_data:
@@ -268,11 +290,14 @@ class WebSocketEndpointInvoker(BaseEndpointInvoker):
                             # Check if this is the end message
                             if response_data.get("message") == "response ended":
                                 logger.info(f"Response stream ended at message #{message_count}")
+                                # Only a fully read connection can serve the next request
+                                connection.reusable = True
                                 break
 
                         except json.JSONDecodeError:
                             # This is a streaming text chunk, add it to buffer
                             streaming_text_buffer += message
+                            stream_timer.token()
                             logger.debug(
                                 f"Message #{message_count} added to streaming buffer (buffer size now: {len(streaming_text_buffer)} chars)"
                             )
@@ -293,6 +318,7 @@ class WebSocketEndpointInvoker(BaseEndpointInvoker):
                     total_response_time = (
                         last_message_time - send_start_time if last_message_time else 0
                     )
+                    record_phase("network", time.time() - connection_start_time)
                     logger.info(
                         f"Received {message_count} messages total in {total_response_time:.2f}s"
                     )
@@ -343,9 +369,13 @@ class WebSocketEndpointInvoker(BaseEndpointInvoker):
                     )
 
                     mapped_response = self.response_mapper.map_response(
-                        final_response, response_mappings
+                        final_response,
+                        response_mappings,
+                        get_endpoint_cache_key(endpoint, "response_mappings"),
                     )
                     mapping_duration = time.time() - mapping_start_time
+                    record_phase("response_mapping", mapping_duration)
+                    mapped_response["streaming"] = stream_timer.stats()
 
                     logger.debug(f"Response mapping completed in {mapping_duration:.2f}s")
 
@@ -0,0 +1,200 @@
+"""
+Worker-level event loop and pool of long-lived WebSocket connections.
+
+WebSocket invocations of a worker process run on a single event loop in a background
+thread instead of a new loop per invocation, so connections can outlive an invocation
+and be reused by the next one to the same target. The request/response protocol of the
+targets has no correlation id, so a connection is used by one invocation at a time and
+returned to the pool once its response stream ended cleanly.
+
+Configuration (environment variables):
+
+- `ENDPOINT_WS_POOL_SIZE`: idle connections kept per target (default 8)
+- `ENDPOINT_WS_IDLE_TIMEOUT`: seconds after which an idle connection is closed (default 60)
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Coroutine, Deque, Dict, Optional, Set, Tuple
+
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.exceptions import ConnectionClosed
+from websockets.protocol import State
+
+from rhesis.backend.logging import logger
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_IDLE_TIMEOUT_SECONDS = 60.0
+
+
+class WorkerEventLoop:
+    """An event loop running in a daemon thread for the lifetime of the process."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="websocket-event-loop", daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coro: Coroutine) -> Any:
+        """
+        Run a coroutine on the loop and wait for its result.
+
+        The coroutine runs in a copy of the caller's context, so context variables (such
+        as the active phase timer) are visible to it.
+        """
+        result: concurrent.futures.Future = concurrent.futures.Future()
+
+        def on_done(task: asyncio.Task) -> None:
+            if task.cancelled():
+                result.cancel()
+            elif task.exception() is not None:
+                result.set_exception(task.exception())
+            else:
+                result.set_result(task.result())
+
+        def start() -> None:
+            self.loop.create_task(coro).add_done_callback(on_done)
+
+        self.loop.call_soon_threadsafe(start, context=contextvars.copy_context())
+        return result.result()
+
+
+class PooledConnection:
+    """A connection checked out of the pool for one invocation."""
+
+    def __init__(
+        self,
+        pool: Optional["WebSocketConnectionPool"],
+        key: Tuple,
+        uri: str,
+        headers: Optional[Dict[str, str]],
+    ):
+        self._pool = pool
+        self._key = key
+        self._uri = uri
+        self._headers = headers
+        self.websocket: Optional[ClientConnection] = None
+        self.reused = False
+        # Set by the caller once the response was read completely
+        self.reusable = False
+
+    async def open(self) -> None:
+        if self._pool is not None:
+            self.websocket = self._pool._take_idle(self._key)
+        self.reused = self.websocket is not None
+        if self.websocket is None:
+            self.websocket = await connect(self._uri, additional_headers=self._headers)
+
+    async def send(self, message: str) -> None:
+        """Send a message, reconnecting once if a reused connection was closed by the server."""
+        try:
+            await self.websocket.send(message)
+        except ConnectionClosed:
+            if not self.reused:
+                raise
+            logger.debug(f"Pooled WebSocket connection to {self._uri} was closed, reconnecting")
+            self.reused = False
+            self.websocket = await connect(self._uri, additional_headers=self._headers)
+            await self.websocket.send(message)
+
+
+class WebSocketConnectionPool:
+    """Idle WebSocket connections by target, owned by the worker event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self.max_idle = int(os.getenv("ENDPOINT_WS_POOL_SIZE", DEFAULT_POOL_SIZE))
+        self.idle_timeout = float(
+            os.getenv("ENDPOINT_WS_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT_SECONDS)
+        )
+        self._idle: Dict[Tuple, Deque[Tuple[ClientConnection, float]]] = {}
+        # Closing stale connections runs in the background; the loop only keeps weak
+        # references to tasks, so they are kept here until done
+        self._closing: Set[asyncio.Task] = set()
+        self.stats = {"connections": 0, "reused": 0}
+
+    @staticmethod
+    def _key(uri: str, headers: Optional[Dict[str, str]]) -> Tuple:
+        return (uri, tuple(sorted((headers or {}).items())))
+
+    def _take_idle(self, key: Tuple) -> Optional[ClientConnection]:
+        idle = self._idle.get(key)
+        now = time.monotonic()
+        while idle:
+            websocket, released_at = idle.pop()
+            if websocket.state is State.OPEN and now - released_at < self.idle_timeout:
+                return websocket
+            self._close_in_background(websocket)
+        return None
+
+    def _close_in_background(self, websocket: ClientConnection) -> None:
+        task = self._loop.create_task(websocket.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _put_idle(self, key: Tuple, websocket: ClientConnection) -> bool:
+        idle = self._idle.setdefault(key, deque())
+        if websocket.state is not State.OPEN or len(idle) >= self.max_idle:
+            return False
+        idle.append((websocket, time.monotonic()))
+        return True
+
+    @asynccontextmanager
+    async def connection(
+        self, uri: str, headers: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[PooledConnection]:
+        """
+        Check out a connection to `uri`, opening one if no idle connection is available.
+
+        Connections are bound to the loop that opened them, so outside of the worker loop a
+        fresh connection is opened and closed after use.
+        """
+        pooled = asyncio.get_running_loop() is self._loop
+        key = self._key(uri, headers)
+        lease = PooledConnection(self if pooled else None, key, uri, headers)
+        await lease.open()
+        if pooled:
+            self.stats["reused" if lease.reused else "connections"] += 1
+
+        try:
+            yield lease
+        finally:
+            if not (pooled and lease.reusable and self._put_idle(key, lease.websocket)):
+                await lease.websocket.close()
+
+
+_worker_loop: Optional[WorkerEventLoop] = None
+_pool: Optional[WebSocketConnectionPool] = None
+_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _ensure_worker_loop() -> Tuple[WorkerEventLoop, WebSocketConnectionPool]:
+    global _worker_loop, _pool, _pid
+
+    with _lock:
+        # The loop thread and its connections don't survive a fork
+        if _worker_loop is None or _pid != os.getpid():
+            _worker_loop = WorkerEventLoop()
+            _pool = WebSocketConnectionPool(_worker_loop.loop)
+            _pid = os.getpid()
+        return _worker_loop, _pool
+
+
+def run_in_worker_loop(coro: Coroutine) -> Any:
+    """Run a coroutine on this process' WebSocket event loop and wait for its result."""
+    worker_loop, _ = _ensure_worker_loop()
+    return worker_loop.run(coro)
+
+
+def get_connection_pool() -> WebSocketConnectionPool:
+    """Get this process' WebSocket connection pool (to be used from the worker loop)."""
+    return _ensure_worker_loop()[1]
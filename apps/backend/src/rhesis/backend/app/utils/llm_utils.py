@@ -6,17 +6,30 @@ Helper functions for managing user-configured LLM models for different purposes
 """
 
 import logging
-from typing import Union
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
 from sqlalchemy.orm import Session
 
 from rhesis.backend.app import crud
 from rhesis.backend.app.constants import DEFAULT_GENERATION_MODEL
 from rhesis.backend.app.models.user import User
+from rhesis.backend.app.utils.redis_client import get_redis_client
 from rhesis.sdk.models.base import BaseLLM
 from rhesis.sdk.models.factory import get_model
 
 logger = logging.getLogger(__name__)
 
+# Worker-process cache of resolved evaluation models
+EVALUATION_MODEL_CACHE_TTL_SECONDS = 300
+MODEL_SETTINGS_VERSION_KEY = "rhesis:organization:{organization_id}:model_settings_version"
+
+# (organization_id, user_id) -> (settings_version, model_id, expires_at, model)
+_evaluation_model_cache: Dict[
+    Tuple[str, str], Tuple[int, Optional[str], float, Union[str, BaseLLM]]
+] = {}
+_evaluation_model_cache_lock = threading.Lock()
+
 
 def get_user_generation_model(db: Session, user: User) -> Union[str, BaseLLM]:
     """
@@ -127,3 +140,108 @@ def _get_user_model(
     logger.info(f"[LLM_UTILS] ✓ Falling back to default model: {default_model}")
     return default_model
 
+
+# ============================================================================
+# EVALUATION MODEL CACHE
+# ============================================================================
+
+
+def get_model_settings_version(organization_id: str) -> int:
+    """
+    Get the current model settings version of an organization.
+
+    The version is a Redis counter bumped whenever models or user model settings of
+    the organization change. Returns 0 if Redis is unavailable, in which case cached
+    models only expire through their TTL.
+    """
+    client = get_redis_client()
+    if client is None:
+        return 0
+
+    try:
+        version = client.get(MODEL_SETTINGS_VERSION_KEY.format(organization_id=organization_id))
+        return int(version) if version is not None else 0
+    except Exception as e:
+        logger.warning(f"[LLM_UTILS] Could not read model settings version: {str(e)}")
+        return 0
+
+
+def invalidate_model_settings(organization_id: str) -> None:
+    """
+    Invalidate cached models of an organization after its models or model settings changed.
+
+    Bumps the organization's settings version so that all worker processes drop their
+    cached models, and clears the cache of the current process.
+    """
+    organization_id = str(organization_id)
+
+    with _evaluation_model_cache_lock:
+        for key in [key for key in _evaluation_model_cache if key[0] == organization_id]:
+            del _evaluation_model_cache[key]
+
+    client = get_redis_client()
+    if client is None:
+        return
+
+    try:
+        client.incr(MODEL_SETTINGS_VERSION_KEY.format(organization_id=organization_id))
+    except Exception as e:
+        logger.warning(f"[LLM_UTILS] Could not bump model settings version: {str(e)}")
+
+
+def get_cached_evaluation_model(
+    organization_id: str, user_id: str
+) -> Optional[Tuple[Optional[str], Union[str, BaseLLM]]]:
+    """
+    Get a previously resolved evaluation model for a user.
+
+    Returns:
+        Tuple of (model_id, model) if a valid entry exists, otherwise None
+    """
+    key = (str(organization_id), str(user_id))
+    with _evaluation_model_cache_lock:
+        entry = _evaluation_model_cache.get(key)
+
+    if entry is None:
+        return None
+
+    version, model_id, expires_at, model = entry
+    if time.monotonic() >= expires_at or version != get_model_settings_version(key[0]):
+        with _evaluation_model_cache_lock:
+            if _evaluation_model_cache.get(key) is entry:
+                del _evaluation_model_cache[key]
+        return None
+
+    return model_id, model
+
+
+def cache_evaluation_model(
+    organization_id: str,
+    user_id: str,
+    model_id: Optional[str],
+    model: Union[str, BaseLLM],
+    version: Optional[int] = None,
+) -> None:
+    """
+    Cache a resolved evaluation model for a user.
+
+    Args:
+        organization_id: Organization of the user
+        user_id: User the model was resolved for
+        model_id: ID of the configured model (None for the default model)
+        model: Provider name or configured BaseLLM instance
+        version: Settings version read before resolving the model; pass it to avoid
+            caching a model resolved from settings that changed in the meantime
+    """
+    organization_id = str(organization_id)
+    if version is None:
+        version = get_model_settings_version(organization_id)
+
+    expires_at = time.monotonic() + EVALUATION_MODEL_CACHE_TTL_SECONDS
+    with _evaluation_model_cache_lock:
+        _evaluation_model_cache[(organization_id, str(user_id))] = (
+            version,
+            str(model_id) if model_id else None,
+            expires_at,
+            model,
+        )
@@ -0,0 +1,120 @@
+"""
+Per-phase timing of test executions.
+
+A `PhaseTimer` accumulates wall-clock durations (in milliseconds) by phase name. Code on
+the execution path reports phases to the timer active in the current context, so layers
+such as the endpoint invokers and metrics can be instrumented without passing the timer
+around:
+
+    timer = PhaseTimer()
+    with timer.activate():
+        with timed_phase("network"):
+            response = send_request()
+
+    timer.as_dict()  # {"network": 123.45}
+
+Reporting a phase while no timer is active is a no-op. Durations of a phase reported
+more than once (or concurrently from several threads) are summed.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+TIMING_PERCENTILES = (50, 95, 99)
+
+_current_timer: ContextVar[Optional["PhaseTimer"]] = ContextVar("phase_timer", default=None)
+
+
+class PhaseTimer:
+    """Accumulates durations in milliseconds per phase."""
+
+    def __init__(self):
+        self._phases: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, duration_ms: float) -> None:
+        with self._lock:
+            self._phases[phase] = self._phases.get(phase, 0.0) + duration_ms
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the block as phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    @contextmanager
+    def activate(self) -> Iterator["PhaseTimer"]:
+        """Make this the timer phases are reported to in the current context."""
+        token = _current_timer.set(self)
+        try:
+            yield self
+        finally:
+            _current_timer.reset(token)
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {phase: round(duration, 2) for phase, duration in self._phases.items()}
+
+
+def get_current_timer() -> Optional[PhaseTimer]:
+    """Return the timer active in the current context, if any."""
+    return _current_timer.get()
+
+
+@contextmanager
+def timed_phase(name: str) -> Iterator[None]:
+    """Time the block as phase `name` of the active timer."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+
+    with timer.phase(name):
+        yield
+
+
+def record_phase(name: str, duration_seconds: float) -> None:
+    """Report an already measured duration as phase `name` of the active timer."""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.add(name, duration_seconds * 1000)
+
+
+def _percentile(sorted_values: Sequence[float], percentile: float) -> float:
+    """Linearly interpolated percentile of an already sorted sequence."""
+    position = (len(sorted_values) - 1) * percentile / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (
+        position - lower
+    )
+
+
+def summarize_timings(
+    timings: Iterable[Optional[Dict[str, float]]],
+) -> Dict[str, Dict[str, float]]:
+    """
+    Aggregate per-test phase timings into percentiles per phase.
+
+    Returns:
+        Dictionary mapping each phase to its count and p50/p95/p99 in milliseconds
+    """
+    values_by_phase: Dict[str, list] = {}
+    for test_timings in timings:
+        for phase, duration in (test_timings or {}).items():
+            if isinstance(duration, (int, float)):
+                values_by_phase.setdefault(phase, []).append(float(duration))
+
+    summary = {}
+    for phase, values in sorted(values_by_phase.items()):
+        values.sort()
+        summary[phase] = {"count": len(values)}
+        for percentile in TIMING_PERCENTILES:
+            summary[phase][f"p{percentile}"] = round(_percentile(values, percentile), 2)
+    return summary
@@ -0,0 +1,77 @@
+"""
+Shared Redis client for application-level caching.
+
+Celery already depends on Redis as broker and result backend; this module exposes a
+lazily created, process-wide client for the same deployment so that workers can share
+small cached artifacts (execution plans, counters, ...) without hitting Postgres.
+
+The client is optional: when Redis is not reachable, `get_redis_client` returns None
+and callers are expected to fall back to the database.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+import redis
+
+from rhesis.backend.logging.rhesis_logger import logger
+
+# How long to wait before trying to reconnect after Redis was found unreachable
+REDIS_RETRY_INTERVAL_SECONDS = 30
+REDIS_SOCKET_TIMEOUT_SECONDS = 5
+
+_client: Optional[redis.Redis] = None
+_unavailable_until: float = 0.0
+_lock = threading.Lock()
+
+
+def get_redis_url() -> str:
+    """Return the Redis URL used for caching (REDIS_URL, falling back to BROKER_URL)."""
+    return os.getenv("REDIS_URL") or os.getenv("BROKER_URL", "redis://localhost:6379/0")
+
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """
+    Get the shared Redis client, creating it on first use.
+
+    Returns:
+        A connected Redis client, or None if Redis is currently unavailable
+    """
+    global _client, _unavailable_until
+
+    if _client is not None:
+        return _client
+
+    if time.monotonic() < _unavailable_until:
+        return None
+
+    with _lock:
+        if _client is not None:
+            return _client
+
+        try:
+            client = redis.Redis.from_url(
+                get_redis_url(),
+                socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                retry_on_timeout=True,
+            )
+            client.ping()
+            _client = client
+        except Exception as e:
+            logger.warning(f"Redis cache unavailable, falling back to database: {str(e)}")
+            _unavailable_until = time.monotonic() + REDIS_RETRY_INTERVAL_SECONDS
+            return None
+
+    return _client
+
+
+def reset_redis_client() -> None:
+    """Drop the cached client (e.g. after a fork or in tests)."""
+    global _client, _unavailable_until
+
+    with _lock:
+        _client = None
+        _unavailable_until = 0.0
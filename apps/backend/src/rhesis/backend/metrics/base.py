@@ -234,6 +234,25 @@ class BaseMetric(ABC):
         """
         pass
 
+    # Number of test cases `evaluate_batch` judges with one request (1: one by one)
+    batch_size: int = 1
+
+    def evaluate_batch(self, test_cases: List[Dict[str, Any]]) -> List[MetricResult]:
+        """
+        Evaluate the metric on several test cases.
+
+        The default implementation evaluates the test cases one by one. Metrics that can
+        judge several test cases with one request override it and set `batch_size`.
+
+        Args:
+            test_cases: Keyword arguments of `evaluate` per test case (input, output,
+                expected_output, context)
+
+        Returns:
+            List[MetricResult]: The evaluation results, in the order of the test cases
+        """
+        return [self.evaluate(**test_case) for test_case in test_cases]
+
 
 class BaseMetricFactory(ABC):
     """Base factory interface for creating metric instances."""
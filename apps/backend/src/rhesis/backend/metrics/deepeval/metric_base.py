@@ -1,3 +1,4 @@
+import copy
 from typing import Any, Dict, List, Optional, Union
 
 from deepeval.models import (
@@ -10,7 +11,7 @@ from deepeval.models import (
 )
 from deepeval.test_case import LLMTestCase
 
-from rhesis.backend.metrics.base import BaseMetric, MetricType
+from rhesis.backend.metrics.base import BaseMetric, MetricResult, MetricType
 from rhesis.backend.metrics.deepeval.model_factory import get_model_from_config
 
 
@@ -28,6 +29,8 @@ class DeepEvalMetricBase(BaseMetric):
         self._metric = None  # Will be set by child classes
         self.threshold = threshold  # Use setter for validation
         self._model = get_model_from_config(model_config)
+        # Judge provider, used by the evaluation scheduler's per-provider limits
+        self.provider = (model_config or {}).get("type", "gemini")
 
     @property
     def model(
@@ -83,3 +86,22 @@ class DeepEvalMetricBase(BaseMetric):
             expected_output=expected_output,
             retrieval_context=context,
         )
+
+    def _measure(self, test_case: LLMTestCase) -> MetricResult:
+        """
+        Measure a test case with a copy of the DeepEval metric.
+
+        DeepEval metrics store the score and reason of a measurement on the metric, so
+        every evaluation measures with its own shallow copy (sharing the model) and the
+        metric instance can be used by several threads at once.
+        """
+        metric = copy.copy(self._metric)
+        metric.measure(test_case)
+        return MetricResult(
+            score=metric.score,
+            details={
+                "reason": metric.reason,
+                "is_successful": metric.is_successful(),
+                "threshold": self._threshold,
+            },
+        )
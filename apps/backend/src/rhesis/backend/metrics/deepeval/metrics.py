@@ -29,15 +29,7 @@ class DeepEvalAnswerRelevancy(DeepEvalMetricBase):
         self, input: str, output: str, expected_output: Optional[str], context: List[str]
     ) -> MetricResult:
         test_case = self._create_test_case(input, output, expected_output, context)
-        self._metric.measure(test_case)
-        return MetricResult(
-            score=self._metric.score,
-            details={
-                "reason": self._metric.reason,
-                "is_successful": self._metric.is_successful(),
-                "threshold": self._threshold,
-            },
-        )
+        return self._measure(test_case)
 
     @property
     def requires_ground_truth(self) -> bool:
@@ -58,15 +50,7 @@ class DeepEvalFaithfulness(DeepEvalMetricBase):
         self, input: str, output: str, expected_output: Optional[str], context: List[str]
     ) -> MetricResult:
         test_case = self._create_test_case(input, output, expected_output, context)
-        self._metric.measure(test_case)
-        return MetricResult(
-            score=self._metric.score,
-            details={
-                "reason": self._metric.reason,
-                "is_successful": self._metric.is_successful(),
-                "threshold": self._threshold,
-            },
-        )
+        return self._measure(test_case)
 
     @property
     def requires_ground_truth(self) -> bool:
@@ -90,15 +74,7 @@ class DeepEvalContextualRelevancy(DeepEvalMetricBase):
         self, input: str, output: str, expected_output: Optional[str], context: List[str]
     ) -> MetricResult:
         test_case = self._create_test_case(input, output, expected_output, context)
-        self._metric.measure(test_case)
-        return MetricResult(
-            score=self._metric.score,
-            details={
-                "reason": self._metric.reason,
-                "is_successful": self._metric.is_successful(),
-                "threshold": self._threshold,
-            },
-        )
+        return self._measure(test_case)
 
     @property
     def requires_ground_truth(self) -> bool:
@@ -122,15 +98,7 @@ class DeepEvalContextualPrecision(DeepEvalMetricBase):
         self, input: str, output: str, expected_output: Optional[str], context: List[str]
     ) -> MetricResult:
         test_case = self._create_test_case(input, output, expected_output, context)
-        self._metric.measure(test_case)
-        return MetricResult(
-            score=self._metric.score,
-            details={
-                "reason": self._metric.reason,
-                "is_successful": self._metric.is_successful(),
-                "threshold": self._threshold,
-            },
-        )
+        return self._measure(test_case)
 
     @property
     def requires_ground_truth(self) -> bool:
@@ -154,15 +122,7 @@ class DeepEvalContextualRecall(DeepEvalMetricBase):
         self, input: str, output: str, expected_output: Optional[str], context: List[str]
     ) -> MetricResult:
         test_case = self._create_test_case(input, output, expected_output, context)
-        self._metric.measure(test_case)
-        return MetricResult(
-            score=self._metric.score,
-            details={
-                "reason": self._metric.reason,
-                "is_successful": self._metric.is_successful(),
-                "threshold": self._threshold,
-            },
-        )
+        return self._measure(test_case)
 
     @property
     def requires_ground_truth(self) -> bool:
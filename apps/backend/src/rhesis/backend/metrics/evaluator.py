@@ -1,14 +1,41 @@
 import concurrent.futures
-from typing import Any, Dict, List, Optional, Tuple, Union
+import contextvars
+import time
+from contextlib import nullcontext
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from uuid import UUID
 
 from sqlalchemy.orm import Session
 
+from rhesis.backend.app.utils.phase_timer import record_phase, timed_phase
 from rhesis.backend.logging.rhesis_logger import logger
 from rhesis.backend.metrics.base import BaseMetric, MetricConfig, MetricResult
+from rhesis.backend.metrics.judge_cache import judge_cache_scope
+from rhesis.backend.metrics.pool import metric_pool, model_identity
+from rhesis.backend.metrics.rhesis.fused_judge import evaluate_fused, get_fusion_key
+from rhesis.backend.metrics.scheduler import evaluation_scheduler, metric_provider
 from rhesis.backend.metrics.score_evaluator import ScoreEvaluator
 from rhesis.backend.metrics.utils import diagnose_invalid_metric
 
+
+def _fail_unresolved(futures: Iterable[concurrent.futures.Future], error: Exception) -> None:
+    """Fail the futures a scheduled task left unresolved, so waiting for them never hangs."""
+    for future in futures:
+        if not future.done():
+            future.set_exception(error)
+
+
 # Use inline factory creation to avoid circular imports
 # Implementation of the factory import will be delayed until needed
 
@@ -20,7 +47,9 @@ class MetricEvaluator:
         self, 
         model: Optional[Any] = None,
         db: Optional[Session] = None,
-        organization_id: Optional[str] = None
+        organization_id: Optional[str] = None,
+        judge_cache: bool = False,
+        fused_judging: bool = False,
     ):
         """
         Initialize evaluator with factory and score evaluator.
@@ -32,6 +61,10 @@ class MetricEvaluator:
                    - BaseLLM instance: Fully configured model
             db: Optional database session for fetching metric-specific models
             organization_id: Optional organization ID for secure model lookups
+            judge_cache: Reuse judgments of identical judge prompts from the organization's
+                judge cache (see `metrics/judge_cache.py`)
+            fused_judging: Judge the prompt metrics of a test that use the same judge model
+                with a single request (see `metrics/rhesis/fused_judge.py`)
         """
         # Lazy load factory to avoid circular imports
         self.factory = None
@@ -39,13 +72,15 @@ class MetricEvaluator:
         self.model = model  # Store default model for passing to metrics
         self.db = db  # Database session for fetching metric-specific models
         self.organization_id = organization_id  # For secure model lookups
+        self.judge_cache = judge_cache
+        self.fused_judging = fused_judging
 
     def _get_factory(self):
-        """Lazy load the MetricFactory to avoid circular imports."""
+        """Lazy load the process-wide MetricFactory to avoid circular imports."""
         if self.factory is None:
-            from rhesis.backend.metrics.factory import MetricFactory
+            from rhesis.backend.metrics.factory import get_metric_factory
 
-            self.factory = MetricFactory()
+            self.factory = get_metric_factory()
         return self.factory
 
     def evaluate(
@@ -81,7 +116,8 @@ class MetricEvaluator:
                             "description": "Measures how faithful the answer is to the context"
                         }
                     ]
-            max_workers: Maximum number of parallel workers for metric computation
+            max_workers: Unused; kept for compatibility. Metric evaluations are bounded by the
+                process-wide evaluation scheduler (see `metrics/scheduler.py`)
 
         Returns:
             Dictionary containing scores and details for each metric
@@ -90,6 +126,176 @@ class MetricEvaluator:
             logger.warning("No metrics provided for evaluation")
             return {}
 
+        metric_configs, invalid_metric_results = self._parse_metric_configs(metrics)
+
+        # Log summary
+        if invalid_metric_results:
+            logger.warning(
+                f"Found {len(invalid_metric_results)} invalid metrics that will be reported as errors"
+            )
+
+        logger.debug(
+            f"Using {len(metric_configs)} valid metrics and {len(invalid_metric_results)} invalid metrics"
+        )
+
+        if not metric_configs:
+            logger.warning("No valid metrics found after parsing")
+            if invalid_metric_results:
+                logger.warning(
+                    f"Returning {len(invalid_metric_results)} invalid metrics as error results"
+                )
+                return invalid_metric_results
+            else:
+                logger.warning("No metrics found at all, returning empty results")
+                return {}
+
+        # Prepare metrics for evaluation
+        metric_tasks = self._prepare_metrics(metric_configs, expected_output)
+
+        # Execute metrics in parallel and collect results
+        results = self._execute_metrics_in_parallel(
+            metric_tasks, input_text, output_text, expected_output, context
+        )
+
+        # Merge invalid metric results into the final results
+        results.update(invalid_metric_results)
+
+        return results
+
+    def evaluate_batch(self, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Compute the metrics of several tests, judging a metric for several tests at once.
+
+        Metrics with a `batch_size` above 1 (prompt metrics) are evaluated with their
+        `evaluate_batch` on up to `batch_size` tests per scheduled task, so a single judge
+        request covers several tests. All other metrics are evaluated per test as in
+        `evaluate`. Batching across tests takes precedence over fused judging.
+
+        Args:
+            test_cases: Arguments of `evaluate` per test (input_text, output_text,
+                expected_output, context and metrics)
+
+        Returns:
+            Per test, a dictionary containing scores and details for each metric
+        """
+        results: List[Dict[str, Any]] = [{} for _ in test_cases]
+        future_to_metric = {}
+        # Tests per metric instance; pooled instances are shared by tests with the same config
+        batched: Dict[int, List[Tuple[int, str, Tuple[str, BaseMetric, MetricConfig, str]]]] = {}
+
+        for index, test_case in enumerate(test_cases):
+            if not test_case.get("metrics"):
+                continue
+            metric_configs, invalid_metric_results = self._parse_metric_configs(
+                test_case["metrics"]
+            )
+            results[index].update(invalid_metric_results)
+
+            metric_tasks = self._prepare_metrics(metric_configs, test_case["expected_output"])
+            metric_keys = self._get_metric_keys(metric_tasks)
+            own_tasks, own_keys = [], []
+            for metric_task, metric_key in zip(metric_tasks, metric_keys):
+                if metric_task[1].batch_size > 1:
+                    batched.setdefault(id(metric_task[1]), []).append(
+                        (index, metric_key, metric_task)
+                    )
+                else:
+                    own_tasks.append(metric_task)
+                    own_keys.append(metric_key)
+
+            test_futures = self._submit_metrics(
+                own_tasks,
+                own_keys,
+                test_case["input_text"],
+                test_case["output_text"],
+                test_case["expected_output"],
+                test_case["context"],
+            )
+            future_to_metric.update(
+                {future: (index, *metric) for future, metric in test_futures.items()}
+            )
+
+        def evaluate_batch_timed(
+            metric: BaseMetric,
+            batch: List[Dict[str, Any]],
+            futures: List[concurrent.futures.Future],
+            submitted_at: float,
+        ) -> None:
+            record_phase("metric_queue", time.perf_counter() - submitted_at)
+            try:
+                with self._judge_cache_scope(), timed_phase(f"metric_batch:{metric.name}"):
+                    batch_results = metric.evaluate_batch(
+                        [
+                            {
+                                "input": test_case["input_text"],
+                                "output": test_case["output_text"],
+                                "expected_output": test_case["expected_output"],
+                                "context": test_case["context"],
+                            }
+                            for test_case in batch
+                        ]
+                    )
+                if len(batch_results) != len(futures):
+                    raise ValueError(
+                        f"Metric '{metric.name}' returned {len(batch_results)} results "
+                        f"for {len(futures)} tests"
+                    )
+                for future, result in zip(futures, batch_results):
+                    future.set_result(result)
+            except Exception as e:
+                _fail_unresolved(futures, e)
+
+        # Each batch of tests is one scheduled task, completing a future per test
+        for members in batched.values():
+            metric = members[0][2][1]
+            for start in range(0, len(members), metric.batch_size):
+                batch_futures = []
+                batch_members = members[start : start + metric.batch_size]
+                for index, metric_key, (class_name, _, metric_config, backend) in batch_members:
+                    future = concurrent.futures.Future()
+                    batch_futures.append(future)
+                    future_to_metric[future] = (
+                        index,
+                        metric_key,
+                        class_name,
+                        metric_config,
+                        backend,
+                    )
+                evaluation_scheduler.submit(
+                    contextvars.copy_context().run,
+                    evaluate_batch_timed,
+                    metric,
+                    [test_cases[index] for index, _, _ in batch_members],
+                    batch_futures,
+                    time.perf_counter(),
+                    provider=metric_provider(metric),
+                )
+
+        logger.info(
+            f"Starting evaluation of {len(future_to_metric)} metrics of {len(test_cases)} tests"
+        )
+
+        # Process results as they complete
+        for future in concurrent.futures.as_completed(future_to_metric):
+            index, unique_key, class_name, metric_config, backend = future_to_metric[future]
+            results[index][unique_key] = self._process_metric_result(
+                future, class_name, metric_config, backend
+            )
+
+        return results
+
+    def _parse_metric_configs(
+        self, metrics: List[Union[Dict[str, Any], MetricConfig]]
+    ) -> Tuple[List[MetricConfig], Dict[str, Any]]:
+        """
+        Convert metric configurations to MetricConfig objects.
+
+        Args:
+            metrics: List of MetricConfig objects or config dictionaries
+
+        Returns:
+            Tuple of the valid configurations and the error results of invalid ones
+        """
         # Convert any dict configs to MetricConfig objects, keeping track of invalid ones
         metric_configs = []
         invalid_metric_results = {}  # Store results for invalid metrics
@@ -150,39 +356,7 @@ class MetricEvaluator:
                     }
                     logger.warning(f"Failed to parse metric configuration {i}: {str(e)}")
 
-        # Log summary
-        if invalid_metric_results:
-            logger.warning(
-                f"Found {len(invalid_metric_results)} invalid metrics that will be reported as errors"
-            )
-
-        logger.debug(
-            f"Using {len(metric_configs)} valid metrics and {len(invalid_metric_results)} invalid metrics"
-        )
-
-        if not metric_configs:
-            logger.warning("No valid metrics found after parsing")
-            if invalid_metric_results:
-                logger.warning(
-                    f"Returning {len(invalid_metric_results)} invalid metrics as error results"
-                )
-                return invalid_metric_results
-            else:
-                logger.warning("No metrics found at all, returning empty results")
-                return {}
-
-        # Prepare metrics for evaluation
-        metric_tasks = self._prepare_metrics(metric_configs, expected_output)
-
-        # Execute metrics in parallel and collect results
-        results = self._execute_metrics_in_parallel(
-            metric_tasks, input_text, output_text, expected_output, context, max_workers
-        )
-
-        # Merge invalid metric results into the final results
-        results.update(invalid_metric_results)
-
-        return results
+        return metric_configs, invalid_metric_results
 
     def _prepare_metrics(
         self, metrics: List[Optional[MetricConfig]], expected_output: Optional[str]
@@ -217,61 +391,25 @@ class MetricEvaluator:
                     logger.error(f"Metric configuration missing backend: {metric_config}")
                     continue
 
-                # Prepare parameters for the metric
-                metric_params = {"threshold": metric_config.threshold, **metric_config.parameters}
-                
-                # Determine which model to use for this metric
-                # Priority: metric-specific model > user's default model > system default
-                metric_model = None
-                
-                # 1. Check if metric has a specific model configured
-                if metric_config.model_id and self.db:
-                    try:
-                        from rhesis.backend.app import crud
-                        from rhesis.sdk.models.factory import get_model
-                        
-                        # Fetch metric's preferred model from database
-                        model_record = crud.get_model(
-                            self.db, 
-                            UUID(metric_config.model_id) if isinstance(metric_config.model_id, str) else metric_config.model_id, 
-                            self.organization_id
-                        )
-                        
-                        if model_record and model_record.provider_type:
-                            # Create BaseLLM instance for this specific metric
-                            metric_model = get_model(
-                                provider=model_record.provider_type.type_value,
-                                model_name=model_record.model_name,
-                                api_key=model_record.key
-                            )
-                            logger.info(
-                                f"[METRIC_MODEL] Using metric-specific model for '{metric_config.name or class_name}': "
-                                f"{model_record.name} (provider={model_record.provider_type.type_value}, "
-                                f"model={model_record.model_name})"
-                            )
-                        else:
-                            logger.warning(
-                                f"[METRIC_MODEL] Model ID {metric_config.model_id} not found for metric '{metric_config.name or class_name}'"
-                            )
-                    except Exception as e:
-                        logger.warning(
-                            f"[METRIC_MODEL] Error fetching metric-specific model for '{metric_config.name or class_name}': {e}"
-                        )
-                
-                # 2. Fall back to user's default evaluation model if no metric-specific model
-                if metric_model is None and self.model is not None:
-                    metric_model = self.model
-                    logger.debug(
-                        f"[METRIC_MODEL] Using user's default model for '{metric_config.name or class_name}'"
-                    )
-                
-                # 3. Pass model to metric if available (will fall back to system default if None)
-                if metric_model is not None:
-                    metric_params["model"] = metric_model
+                build_model, model_key = self._resolve_metric_model(metric_config)
+
+                def create_metric(metric_config=metric_config, build_model=build_model):
+                    # Prepare parameters for the metric
+                    metric_params = {
+                        "threshold": metric_config.threshold,
+                        **metric_config.parameters,
+                    }
+                    # Pass model to metric if available (will fall back to system default if None)
+                    metric_model = build_model()
+                    if metric_model is not None:
+                        metric_params["model"] = metric_model
+
+                    # Instantiate the metric using the class name and backend
+                    backend_factory = self._get_factory().get_factory(metric_config.backend)
+                    return backend_factory.create(metric_config.class_name, **metric_params)
 
-                # Instantiate the metric using the class name and backend
-                backend_factory = self._get_factory().get_factory(backend)
-                metric = backend_factory.create(class_name, **metric_params)
+                # Reuse the pooled instance of this configuration and model, if any
+                metric = metric_pool.get_or_create(metric_config, model_key, create_metric)
 
                 # Skip metrics that require ground truth if it's not provided
                 if metric.requires_ground_truth and expected_output is None:
@@ -295,38 +433,77 @@ class MetricEvaluator:
 
         return metric_tasks
 
-    def _execute_metrics_in_parallel(
-        self,
-        metric_tasks: List[Tuple[str, BaseMetric, MetricConfig, str]],
-        input_text: str,
-        output_text: str,
-        expected_output: str,
-        context: List[str],
-        max_workers: int,
-    ) -> Dict[str, Any]:
+    def _resolve_metric_model(
+        self, metric_config: MetricConfig
+    ) -> Tuple[Callable[[], Any], Optional[Hashable]]:
         """
-        Execute metrics in parallel using ThreadPoolExecutor.
+        Determine the judge model of a metric.
+
+        Priority: metric-specific model > user's default model > system default. The model
+        of a metric-specific configuration is only constructed when the metric is created,
+        not for every test using a pooled instance.
 
         Args:
-            metric_tasks: List of prepared metric tasks
-            input_text: The input query or question
-            output_text: The actual output from the LLM
-            expected_output: The expected or reference output
-            context: List of context strings used for the response
-            max_workers: Maximum number of parallel workers
+            metric_config: Configuration of the metric
 
         Returns:
-            Dictionary of metric results
+            Tuple of a function returning the model (None for the system default) and the
+            identity of the model for the metric pool
         """
-        results = {}
+        metric_name = metric_config.name or metric_config.class_name
 
-        if not metric_tasks:
-            logger.warning("No metrics to evaluate")
-            return results
+        # 1. Check if metric has a specific model configured
+        if metric_config.model_id and self.db:
+            try:
+                from rhesis.backend.app import crud
+
+                # Fetch metric's preferred model from database
+                model_record = crud.get_model(
+                    self.db,
+                    UUID(metric_config.model_id)
+                    if isinstance(metric_config.model_id, str)
+                    else metric_config.model_id,
+                    self.organization_id,
+                )
 
-        logger.info(f"Starting parallel evaluation of {len(metric_tasks)} metrics using threads")
+                if model_record and model_record.provider_type:
+                    provider = model_record.provider_type.type_value
+                    model_name = model_record.model_name
+                    api_key = model_record.key
 
-        # Generate unique keys for each metric to avoid collisions
+                    def build_model():
+                        from rhesis.sdk.models.factory import get_model
+
+                        # Create BaseLLM instance for this specific metric
+                        return get_model(provider=provider, model_name=model_name, api_key=api_key)
+
+                    logger.info(
+                        f"[METRIC_MODEL] Using metric-specific model for '{metric_name}': "
+                        f"{model_record.name} (provider={provider}, model={model_name})"
+                    )
+                    return build_model, model_identity(provider, model_name, api_key)
+                else:
+                    logger.warning(
+                        f"[METRIC_MODEL] Model ID {metric_config.model_id} not found for "
+                        f"metric '{metric_name}'"
+                    )
+            except Exception as e:
+                logger.warning(
+                    f"[METRIC_MODEL] Error fetching metric-specific model for '{metric_name}': {e}"
+                )
+
+        # 2. Fall back to user's default evaluation model if no metric-specific model
+        if self.model is not None:
+            logger.debug(f"[METRIC_MODEL] Using user's default model for '{metric_name}'")
+
+        # 3. Otherwise the metric falls back to the system default model
+        model = self.model
+        return lambda: model, model_identity(model)
+
+    def _get_metric_keys(
+        self, metric_tasks: List[Tuple[str, BaseMetric, MetricConfig, str]]
+    ) -> List[str]:
+        """Unique result keys of prepared metrics: their name if set, otherwise class name."""
         metric_keys = []
         used_keys = set()  # Track all used keys to ensure uniqueness
         class_name_counts = {}
@@ -349,27 +526,156 @@ class MetricEvaluator:
             used_keys.add(unique_key)
             metric_keys.append(unique_key)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_metric = {
-                executor.submit(
-                    self._evaluate_metric, metric, input_text, output_text, expected_output, context
-                ): (unique_key, class_name, metric_config, backend)
-                for (class_name, metric, metric_config, backend), unique_key in zip(
-                    metric_tasks, metric_keys
-                )
-            }
+        return metric_keys
 
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_metric):
-                unique_key, class_name, metric_config, backend = future_to_metric[future]
-                results[unique_key] = self._process_metric_result(
-                    future, class_name, metric_config, backend
-                )
+    def _execute_metrics_in_parallel(
+        self,
+        metric_tasks: List[Tuple[str, BaseMetric, MetricConfig, str]],
+        input_text: str,
+        output_text: str,
+        expected_output: str,
+        context: List[str],
+    ) -> Dict[str, Any]:
+        """
+        Execute metrics in parallel on the process-wide evaluation scheduler.
+
+        The time each metric waits for a free slot is reported as phase `metric_queue`. With
+        fused judging, compatible prompt metrics are evaluated together as one scheduled task.
+
+        Args:
+            metric_tasks: List of prepared metric tasks
+            input_text: The input query or question
+            output_text: The actual output from the LLM
+            expected_output: The expected or reference output
+            context: List of context strings used for the response
+
+        Returns:
+            Dictionary of metric results
+        """
+        results = {}
+
+        if not metric_tasks:
+            logger.warning("No metrics to evaluate")
+            return results
+
+        logger.info(f"Starting parallel evaluation of {len(metric_tasks)} metrics")
+
+        # Generate unique keys for each metric to avoid collisions
+        metric_keys = self._get_metric_keys(metric_tasks)
+
+        future_to_metric = self._submit_metrics(
+            metric_tasks, metric_keys, input_text, output_text, expected_output, context
+        )
+
+        # Process results as they complete
+        for future in concurrent.futures.as_completed(future_to_metric):
+            unique_key, class_name, metric_config, backend = future_to_metric[future]
+            results[unique_key] = self._process_metric_result(
+                future, class_name, metric_config, backend
+            )
 
         logger.info(f"Completed parallel evaluation of {len(results)} metrics")
         return results
 
+    def _judge_cache_scope(self) -> ContextManager:
+        """Scope of the organization's judge cache if enabled (see `metrics/judge_cache.py`)."""
+        return judge_cache_scope(self.organization_id) if self.judge_cache else nullcontext()
+
+    def _submit_metrics(
+        self,
+        metric_tasks: List[Tuple[str, BaseMetric, MetricConfig, str]],
+        metric_keys: List[str],
+        input_text: str,
+        output_text: str,
+        expected_output: str,
+        context: List[str],
+    ) -> Dict[concurrent.futures.Future, Tuple[str, str, MetricConfig, str]]:
+        """
+        Submit the metrics of a test to the process-wide evaluation scheduler.
+
+        Returns:
+            Future of each metric's result, mapped to (key, class_name, metric_config, backend)
+        """
+
+        def evaluate_timed(
+            metric_key: str, metric: BaseMetric, submitted_at: float
+        ) -> MetricResult:
+            record_phase("metric_queue", time.perf_counter() - submitted_at)
+            with self._judge_cache_scope(), timed_phase(f"metric:{metric_key}"):
+                return self._evaluate_metric(
+                    metric, input_text, output_text, expected_output, context
+                )
+
+        def evaluate_fused_timed(
+            metrics: Dict[str, BaseMetric],
+            futures: Dict[str, concurrent.futures.Future],
+            submitted_at: float,
+        ) -> None:
+            record_phase("metric_queue", time.perf_counter() - submitted_at)
+            try:
+                with self._judge_cache_scope(), timed_phase("metric_fused"):
+                    fused_results = evaluate_fused(
+                        metrics, input_text, output_text, expected_output, context
+                    )
+                for metric_key, future in futures.items():
+                    if metric_key not in fused_results:
+                        raise ValueError(f"Fused judging returned no result for '{metric_key}'")
+                    result = fused_results[metric_key]
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            except Exception as e:
+                _fail_unresolved(futures.values(), e)
+
+        # Group compatible prompt metrics to be judged with a single request
+        fused_groups: Dict[Hashable, List[int]] = {}
+        if self.fused_judging:
+            for index, (_, metric, _, _) in enumerate(metric_tasks):
+                fusion_key = get_fusion_key(metric)
+                if fusion_key is not None:
+                    fused_groups.setdefault(fusion_key, []).append(index)
+        fused_groups = {key: group for key, group in fused_groups.items() if len(group) > 1}
+        fused_indexes = {index for group in fused_groups.values() for index in group}
+
+        # Submit all tasks to the process-wide scheduler, in a copy of the caller's context
+        # so phase timings are kept
+        future_to_metric = {
+            evaluation_scheduler.submit(
+                contextvars.copy_context().run,
+                evaluate_timed,
+                unique_key,
+                metric,
+                time.perf_counter(),
+                provider=metric_provider(metric),
+            ): (unique_key, class_name, metric_config, backend)
+            for index, ((class_name, metric, metric_config, backend), unique_key) in enumerate(
+                zip(metric_tasks, metric_keys)
+            )
+            if index not in fused_indexes
+        }
+
+        # Each fused group is one scheduled task, completing a future per metric
+        for group in fused_groups.values():
+            group_metrics = {metric_keys[index]: metric_tasks[index][1] for index in group}
+            group_futures = {}
+            for index in group:
+                class_name, _, metric_config, backend = metric_tasks[index]
+                future = concurrent.futures.Future()
+                group_futures[metric_keys[index]] = future
+                future_to_metric[future] = (metric_keys[index], class_name, metric_config, backend)
+            logger.debug(f"Judging metrics {', '.join(group_metrics)} with a single request")
+            evaluation_scheduler.submit(
+                contextvars.copy_context().run,
+                evaluate_fused_timed,
+                group_metrics,
+                group_futures,
+                time.perf_counter(),
+                provider=metric_provider(metric_tasks[group[0]][1]),
+            )
+
+        return future_to_metric
+
     def _evaluate_metric(
         self,
         metric: BaseMetric,
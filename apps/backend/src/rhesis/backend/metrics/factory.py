@@ -1,5 +1,6 @@
+import threading
 from importlib import import_module
-from typing import List
+from typing import List, Optional
 
 from .base import BaseMetric, BaseMetricFactory
 from .config.loader import MetricConfigLoader
@@ -29,7 +30,7 @@ class MetricFactory:
         if backend not in self._factories:
             if backend not in self.config.backends:
                 raise ValueError(f"Unknown backend: {backend}")
-            self._factories[backend] = self._load_factory(backend)
+            self._factories.setdefault(backend, self._load_factory(backend))
         return self._factories[backend]
 
     def list_supported_backends(self) -> List[str]:
@@ -112,3 +113,22 @@ class MetricFactory:
 
             return RhesisMetricFactory().list_supported_metrics()
         raise ValueError(f"Unsupported framework: {framework}")
+
+
+_shared_factory: Optional[MetricFactory] = None
+_shared_factory_lock = threading.Lock()
+
+
+def get_metric_factory() -> MetricFactory:
+    """
+    Get the MetricFactory shared by the evaluators of this process.
+
+    The backend configuration is loaded and the backend factories are imported once per
+    process instead of once per evaluator.
+    """
+    global _shared_factory
+    if _shared_factory is None:
+        with _shared_factory_lock:
+            if _shared_factory is None:
+                _shared_factory = MetricFactory()
+    return _shared_factory
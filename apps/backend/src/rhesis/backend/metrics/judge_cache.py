@@ -0,0 +1,104 @@
+"""
+Content-addressed cache of LLM-judge results.
+
+A judge prompt is fully determined by the test (input, output, expected output, context)
+and the metric configuration it is rendered from, so judging the same rendered prompt with
+the same judge model again yields nothing new. With `judge_cache` enabled in a test
+configuration, judgments are stored in Redis under a digest of the rendered prompt, the
+judge model and the response parameters, and reused by later evaluations:
+
+- Keys start with the organization id; entries expire after `JUDGE_CACHE_TTL_SECONDS`
+  (default 7 days).
+- Caching is only active inside `judge_cache_scope`, which `MetricEvaluator` enters for
+  the evaluations of a run with `judge_cache` enabled.
+- Without Redis, every evaluation calls the judge model.
+"""
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from rhesis.backend.app.utils.redis_client import get_redis_client
+from rhesis.backend.logging.rhesis_logger import logger
+
+JUDGE_CACHE_KEY_TEMPLATE = "rhesis:judge_cache:{organization_id}:{digest}"
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Organization whose judge cache is used in the current context, if caching is active
+_judge_cache_namespace: ContextVar[Optional[str]] = ContextVar(
+    "judge_cache_namespace", default=None
+)
+
+
+@contextmanager
+def judge_cache_scope(organization_id: Optional[str]) -> Iterator[None]:
+    """Use the judge cache of `organization_id` for evaluations in this context."""
+    token = _judge_cache_namespace.set(str(organization_id) if organization_id else "global")
+    try:
+        yield
+    finally:
+        _judge_cache_namespace.reset(token)
+
+
+def get_judge_cache_key(organization_id: str, prompt: str, parameters: Dict[str, Any]) -> str:
+    """Return the content-addressed cache key of a judge prompt."""
+    payload = json.dumps({"prompt": prompt, "parameters": parameters}, sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return JUDGE_CACHE_KEY_TEMPLATE.format(organization_id=organization_id, digest=digest)
+
+
+def get_cached_judgment(prompt: str, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Look up the stored judgment of a rendered judge prompt.
+
+    Args:
+        prompt: The rendered judge prompt
+        parameters: Judge model and response parameters the judgment depends on
+
+    Returns:
+        The stored judgment, or None if caching is inactive, on a miss or without Redis
+    """
+    namespace = _judge_cache_namespace.get()
+    if namespace is None:
+        return None
+
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    try:
+        payload = client.get(get_judge_cache_key(namespace, prompt, parameters))
+        return json.loads(payload) if payload is not None else None
+    except Exception as e:
+        logger.warning(f"Failed to read judge cache: {str(e)}")
+        return None
+
+
+def cache_judgment(prompt: str, parameters: Dict[str, Any], judgment: Dict[str, Any]) -> bool:
+    """
+    Store the judgment of a rendered judge prompt if caching is active.
+
+    Returns:
+        True if the judgment was stored
+    """
+    namespace = _judge_cache_namespace.get()
+    if namespace is None:
+        return False
+
+    client = get_redis_client()
+    if client is None:
+        return False
+
+    try:
+        client.set(
+            get_judge_cache_key(namespace, prompt, parameters),
+            json.dumps(judgment, default=str),
+            ex=int(os.getenv("JUDGE_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to store judgment in cache: {str(e)}")
+        return False
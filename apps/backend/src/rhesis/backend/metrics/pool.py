@@ -0,0 +1,118 @@
+"""
+Per-process pool of ready metric instances.
+
+Creating a metric is often more expensive than evaluating it: a DeepEval metric builds a
+judge model client and a Rhesis prompt metric sets up its template. The pool keeps the
+instances created by `MetricEvaluator` so that the tests of a run share them:
+
+- Entries are keyed by the full `MetricConfig` and the identity of the judge model, so
+  two configurations only share an instance if every field (including parameters and
+  thresholds) is equal. Model identities contain a hash of the API key, never the key.
+- Metric instances must be re-entrant: `evaluate` may be called by several threads at
+  once and must not keep per-evaluation state on the instance.
+- The pool holds up to `METRIC_POOL_SIZE` (default 256) instances and evicts the least
+  recently used one when full.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from rhesis.backend.metrics.base import BaseMetric, MetricConfig
+
+DEFAULT_POOL_SIZE = 256
+
+
+def _hash_key(api_key: Optional[str]) -> Optional[str]:
+    if not api_key:
+        return None
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def model_identity(
+    model: Any, model_name: Optional[str] = None, api_key: Optional[str] = None
+) -> Optional[Hashable]:
+    """
+    Identity of a judge model, used as part of the pool key.
+
+    Args:
+        model: None (system default), a provider name, a BaseLLM instance or a provider
+            name together with model_name and api_key
+        model_name: Model name, if model is a provider name of a configured model
+        api_key: API key, if model is a provider name of a configured model
+
+    Returns:
+        A hashable identity, or None for the system default model
+    """
+    if model is None:
+        return None
+    if isinstance(model, str):
+        return ("provider", model, model_name, _hash_key(api_key))
+    return (
+        type(model).__name__,
+        getattr(model, "model_name", None),
+        _hash_key(getattr(model, "api_key", None)),
+    )
+
+
+class MetricPool:
+    """LRU pool of metric instances by metric configuration and judge model."""
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or int(os.getenv("METRIC_POOL_SIZE", DEFAULT_POOL_SIZE))
+        self._entries: "OrderedDict[str, BaseMetric]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(config: MetricConfig, model: Optional[Hashable]) -> str:
+        return json.dumps(
+            {"config": dataclasses.asdict(config), "model": model}, sort_keys=True, default=str
+        )
+
+    def get_or_create(
+        self,
+        config: MetricConfig,
+        model: Optional[Hashable],
+        create: Callable[[], BaseMetric],
+    ) -> BaseMetric:
+        """
+        Get the pooled instance of a metric, creating it on the first use.
+
+        Args:
+            config: Configuration of the metric
+            model: Identity of the judge model (see `model_identity`)
+            create: Creates the metric instance if none is pooled
+
+        Returns:
+            The metric instance, shared with other callers using the same configuration
+        """
+        key = self._key(config, model)
+        with self._lock:
+            metric = self._entries.get(key)
+            if metric is not None:
+                self._entries.move_to_end(key)
+                return metric
+
+        # Created outside the lock; if another thread created the metric meanwhile,
+        # its instance is kept
+        metric = create()
+        with self._lock:
+            metric = self._entries.setdefault(key, metric)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return metric
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+metric_pool = MetricPool()
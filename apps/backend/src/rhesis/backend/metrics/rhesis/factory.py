@@ -33,6 +33,7 @@ class RhesisMetricFactory(BaseMetricFactory):
             "api_key",
             "metric_type",
             "name",
+            "batch_size",
         },
         "RhesisDetailedPromptMetric": {
             "threshold",
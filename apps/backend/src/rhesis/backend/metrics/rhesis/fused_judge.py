@@ -0,0 +1,166 @@
+"""
+Fused judging of the prompt metrics of a test.
+
+The prompt metrics of a behavior judge the same test (input, output, expected output and
+context) and usually use the same judge model, yet each of them sends its own judge
+request. With fused judging, compatible prompt metrics of a test are judged in a single
+request that contains the test once, the criteria of every metric, and asks for all scores
+and reasons as one JSON object:
+
+- Metrics are compatible if they are `RhesisPromptMetric`s with the same judge model
+  (see `get_fusion_key`).
+- Judgments are looked up in and stored to the judge cache per metric, under the metric's
+  own judge prompt, so only uncached metrics are fused.
+- Metrics whose judgment is missing or unparseable in the fused response, and tests with
+  empty output, fall back to individual evaluation.
+- A metric that fails is returned as its exception, without failing the other metrics.
+"""
+
+from typing import Dict, Hashable, List, Optional, Union
+
+from rhesis.backend.app.utils.phase_timer import timed_phase
+from rhesis.backend.logging.rhesis_logger import logger
+from rhesis.backend.metrics.base import BaseMetric, MetricResult
+from rhesis.backend.metrics.judge_cache import cache_judgment, get_cached_judgment
+from rhesis.backend.metrics.pool import model_identity
+from rhesis.backend.metrics.rhesis.prompt_metric import (
+    RhesisPromptMetric,
+    ScoreResponse,
+    _get_jinja_env,
+    parse_judgments,
+)
+
+
+def get_fusion_key(metric: BaseMetric) -> Optional[Hashable]:
+    """
+    Key under which a metric can be judged together with other metrics of a test.
+
+    Returns:
+        The identity of the metric's judge model, or None if the metric can't be fused
+    """
+    if not isinstance(metric, RhesisPromptMetric):
+        return None
+    if metric.model_instance is not None:
+        return model_identity(metric.model_instance)
+    return model_identity(metric.provider, metric.model, metric.api_key)
+
+
+def get_fused_prompt(
+    metrics: List[RhesisPromptMetric],
+    input: str,
+    output: str,
+    expected_output: str,
+    context: List[str],
+) -> str:
+    """Render the judge prompt of several metrics, with ids `metric_1`, `metric_2`, ..."""
+    template = _get_jinja_env().get_template("fused_prompt_metric.jinja")
+    return template.render(
+        input=input,
+        output=output,
+        expected_output=expected_output,
+        context_text="\n".join(context) if context else "No context provided.",
+        metrics=[
+            {
+                "id": f"metric_{index}",
+                "evaluation_prompt": metric.evaluation_prompt,
+                "evaluation_steps": metric.evaluation_steps,
+                "reasoning": metric.reasoning,
+                "evaluation_examples": metric.evaluation_examples,
+                "score_type": metric.score_type.value,
+                "min_score": metric.min_score,
+                "max_score": metric.max_score,
+            }
+            for index, metric in enumerate(metrics, start=1)
+        ],
+    )
+
+
+def evaluate_fused(
+    metrics: Dict[str, RhesisPromptMetric],
+    input: str,
+    output: str,
+    expected_output: Optional[str],
+    context: Optional[List[str]] = None,
+) -> Dict[str, Union[MetricResult, Exception]]:
+    """
+    Evaluate compatible prompt metrics of a test with a single judge request.
+
+    Args:
+        metrics: Metrics by result key, all with the same fusion key
+        input: The input query/question
+        output: The system output/response
+        expected_output: The expected or reference output (ground truth)
+        context: List of context chunks used for the response
+
+    Returns:
+        The evaluation result of every metric by result key, or the exception of a metric
+        that failed
+    """
+    context = context or []
+    results: Dict[str, Union[MetricResult, Exception]] = {}
+
+    def evaluate_individually(key: str) -> Union[MetricResult, Exception]:
+        try:
+            return metrics[key].evaluate(
+                input=input, output=output, expected_output=expected_output, context=context
+            )
+        except Exception as e:
+            logger.warning(f"[FUSED_JUDGE] Metric '{key}' failed: {e}")
+            return e
+
+    # Empty outputs are scored without a judge request
+    if not output or not output.strip():
+        return {key: evaluate_individually(key) for key in metrics}
+
+    # Take cached judgments from the judge cache, judge the others together
+    pending: Dict[str, str] = {}
+    for key, metric in metrics.items():
+        try:
+            prompt = metric.get_prompt_template(input, output, expected_output or "", context)
+        except Exception as e:
+            logger.warning(f"[FUSED_JUDGE] Metric '{key}' failed: {e}")
+            results[key] = e
+            continue
+        cached = get_cached_judgment(prompt, metric._get_judge_parameters())
+        if cached is not None:
+            results[key] = metric.score_judgment(prompt, ScoreResponse(**cached), cached=True)
+        else:
+            pending[key] = prompt
+
+    if len(pending) < 2:
+        results.update({key: evaluate_individually(key) for key in pending})
+        return results
+
+    keys = list(pending)
+    ids = [f"metric_{index}" for index in range(1, len(keys) + 1)]
+    fused_metrics = [metrics[key] for key in keys]
+    fused_prompt = get_fused_prompt(fused_metrics, input, output, expected_output or "", context)
+
+    try:
+        with timed_phase("judge_llm"):
+            response_text = fused_metrics[0].get_judge_model().generate(fused_prompt)
+        judgments = parse_judgments(str(response_text), ids)
+    except Exception as e:
+        logger.warning(f"[FUSED_JUDGE] Fused judge request failed, judging individually: {e}")
+        judgments = {}
+
+    fallback = []
+    for key, metric_id in zip(keys, ids):
+        metric = metrics[key]
+        if metric_id not in judgments:
+            fallback.append(key)
+            continue
+        judgment = judgments[metric_id]
+        cache_judgment(pending[key], metric._get_judge_parameters(), judgment.model_dump())
+        result = metric.score_judgment(fused_prompt, judgment)
+        result.details["fused"] = True
+        results[key] = result
+
+    if fallback:
+        logger.info(
+            f"[FUSED_JUDGE] Judging {len(fallback)} of {len(keys)} metrics individually: "
+            f"{', '.join(fallback)}"
+        )
+        results.update({key: evaluate_individually(key) for key in fallback})
+
+    return results
@@ -1,14 +1,21 @@
 import json
 import os
-from typing import Any, List, Optional, Union
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pydantic import BaseModel, Field
 
+from rhesis.backend.app.utils.phase_timer import timed_phase
 from rhesis.backend.logging.rhesis_logger import logger
 from rhesis.backend.metrics.base import MetricResult, retry_evaluation
+from rhesis.backend.metrics.judge_cache import cache_judgment, get_cached_judgment
 from rhesis.backend.metrics.rhesis.metric_base import RhesisMetricBase, ScoreType, ThresholdOperator
 
+PARSE_FAILURE_REASON = "Failed to parse model response"
+DEFAULT_JUDGE_BATCH_SIZE = 10
+
 
 class ScoreResponse(BaseModel):
     """Model for structured score response from LLM evaluation."""
@@ -17,6 +24,61 @@ class ScoreResponse(BaseModel):
     reason: str = Field(description="Explanation for the score", default="")
 
 
+def get_judge_batch_size() -> int:
+    """Test cases a prompt metric judges with one request, unless configured per metric."""
+    return int(os.getenv("PROMPT_METRIC_BATCH_SIZE", DEFAULT_JUDGE_BATCH_SIZE))
+
+
+@lru_cache(maxsize=None)
+def _get_jinja_env() -> Environment:
+    templates_dir = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates"
+    )
+    return Environment(
+        loader=FileSystemLoader(templates_dir),
+        autoescape=select_autoescape(["html", "xml"]),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+
+
+def parse_judgments(response_text: str, ids: List[str]) -> Dict[str, ScoreResponse]:
+    """
+    Parse a judge response holding several judgments, as a JSON object keyed by id.
+
+    Args:
+        response_text: The raw response of the judge model
+        ids: The ids of the requested judgments
+
+    Returns:
+        The parsed judgments by id; ids without a valid judgment are left out
+    """
+    json_start = response_text.find("{")
+    json_end = response_text.rfind("}") + 1
+    if json_start < 0 or json_end <= json_start:
+        logger.warning(f"[METRIC_EVAL] No JSON object found in response: {response_text}")
+        return {}
+
+    try:
+        entries = json.loads(response_text[json_start:json_end])
+    except json.JSONDecodeError as e:
+        logger.warning(f"[METRIC_EVAL] Failed to parse JSON response: {e}")
+        return {}
+    if not isinstance(entries, dict):
+        return {}
+
+    judgments = {}
+    for judgment_id in ids:
+        entry = entries.get(judgment_id)
+        if not isinstance(entry, dict) or entry.get("score") is None:
+            continue
+        try:
+            judgments[judgment_id] = ScoreResponse(**entry)
+        except ValueError as e:
+            logger.warning(f"[METRIC_EVAL] Invalid judgment for {judgment_id}: {e}")
+    return judgments
+
+
 class RhesisPromptMetric(RhesisMetricBase):
     """
     A generic metric that evaluates outputs based on a custom prompt template.
@@ -40,6 +102,7 @@ class RhesisPromptMetric(RhesisMetricBase):
         model: Optional[Union[str, Any]] = None,
         api_key: Optional[str] = None,
         metric_type="rag",
+        batch_size: Optional[int] = None,
         **kwargs,
     ):
         from rhesis.backend.app.constants import DEFAULT_GENERATION_MODEL, DEFAULT_MODEL_NAME
@@ -143,19 +206,18 @@ class RhesisPromptMetric(RhesisMetricBase):
         self.evaluation_examples = evaluation_examples
         self.provider = provider
 
+        # Test cases judged with one request by evaluate_batch
+        self.batch_size = batch_size or get_judge_batch_size()
+
         # Store additional parameters for future use
         self.additional_params = kwargs.copy()
 
-        # Set up Jinja environment
-        templates_dir = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates"
-        )
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(templates_dir),
-            autoescape=select_autoescape(["html", "xml"]),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
+        # Jinja environment shared by all prompt metrics (templates are compiled once)
+        self.jinja_env = _get_jinja_env()
+
+        # SDK model created on first use if no BaseLLM instance was passed
+        self._sdk_model = None
+        self._sdk_model_lock = threading.Lock()
 
     @property
     def requires_ground_truth(self) -> bool:
@@ -201,24 +263,60 @@ class RhesisPromptMetric(RhesisMetricBase):
 
         return prompt
 
+    def get_batch_prompt(self, test_cases: List[Dict[str, Any]]) -> str:
+        """
+        Generate the prompt judging several test cases, with ids `test_case_1`, `test_case_2`, ...
+        """
+        template = self.jinja_env.get_template("batch_prompt_metric.jinja")
+        return template.render(
+            evaluation_prompt=self.evaluation_prompt,
+            evaluation_steps=self.evaluation_steps,
+            reasoning=self.reasoning,
+            evaluation_examples=self.evaluation_examples,
+            score_type=self.score_type.value,
+            min_score=self.min_score,
+            max_score=self.max_score,
+            test_cases=[
+                {
+                    "id": f"test_case_{index}",
+                    "input": test_case["input"],
+                    "output": test_case["output"],
+                    "expected_output": test_case.get("expected_output") or "",
+                    "context_text": "\n".join(test_case.get("context") or [])
+                    or "No context provided.",
+                }
+                for index, test_case in enumerate(test_cases, start=1)
+            ],
+        )
+
+    def _get_sdk_model(self) -> Any:
+        """Create the model instance from the SDK once and reuse it for all evaluations."""
+        with self._sdk_model_lock:
+            if self._sdk_model is None:
+                from rhesis.sdk.models.factory import get_model
+
+                logger.debug(
+                    f"[METRIC_EVAL] Creating model from SDK: provider={self.provider}, "
+                    f"model={self.model}"
+                )
+                self._sdk_model = get_model(
+                    provider=self.provider, model_name=self.model, api_key=self.api_key
+                )
+            return self._sdk_model
+
+    def get_judge_model(self) -> Any:
+        """Return the BaseLLM instance if available, otherwise the model created from the SDK."""
+        if self.model_instance:
+            logger.debug(f"[METRIC_EVAL] Using stored BaseLLM instance")
+            return self.model_instance
+        return self._get_sdk_model()
+
     def run_evaluation(self, prompt: str) -> ScoreResponse:
         """
         Run the evaluation using the model instance directly.
         Returns a ScoreResponse with score and reason.
         """
-        # Use the BaseLLM instance if available, otherwise create one from SDK
-        if self.model_instance:
-            model_to_use = self.model_instance
-            logger.debug(f"[METRIC_EVAL] Using stored BaseLLM instance")
-        else:
-            # Create model instance from SDK
-            from rhesis.sdk.models.factory import get_model
-            logger.debug(f"[METRIC_EVAL] Creating model from SDK: provider={self.provider}, model={self.model}")
-            model_to_use = get_model(
-                provider=self.provider,
-                model_name=self.model,
-                api_key=self.api_key
-            )
+        model_to_use = self.get_judge_model()
         
         # Add JSON formatting instruction to the prompt
         json_prompt = f"""{prompt}
@@ -232,7 +330,8 @@ IMPORTANT: You must respond with ONLY a valid JSON object in this exact format:
 Do not include any other text before or after the JSON object."""
         
         # Call the model directly
-        response_text = model_to_use.generate(json_prompt)
+        with timed_phase("judge_llm"):
+            response_text = model_to_use.generate(json_prompt)
         
         # Parse the JSON response
         try:
@@ -251,9 +350,34 @@ Do not include any other text before or after the JSON object."""
             # Return a fallback response
             return ScoreResponse(
                 score=0.0,
-                reason=f"Failed to parse model response: {str(e)}"
+                reason=f"{PARSE_FAILURE_REASON}: {str(e)}"
             )
 
+    def _get_judge_parameters(self) -> Dict[str, Any]:
+        """Judge model and response parameters a judgment depends on, besides the prompt."""
+        return {
+            "provider": self.provider,
+            "model": getattr(self.model_instance, "model_name", None) or self.model,
+            "score_type": self.score_type.value,
+        }
+
+    def _judge(self, prompt: str) -> Tuple[ScoreResponse, bool]:
+        """
+        Get the judgment of a prompt from the judge cache or by running the evaluation.
+
+        Returns:
+            Tuple of the response and whether it was taken from the judge cache
+        """
+        parameters = self._get_judge_parameters()
+        cached = get_cached_judgment(prompt, parameters)
+        if cached is not None:
+            return ScoreResponse(**cached), True
+
+        response = self.run_evaluation(prompt)
+        if not response.reason.startswith(PARSE_FAILURE_REASON):
+            cache_judgment(prompt, parameters, response.model_dump())
+        return response, False
+
     def _process_score(self, raw_score: Union[float, str, int]) -> Union[float, str]:
         """
         Process the raw score based on the score type.
@@ -293,6 +417,167 @@ Do not include any other text before or after the JSON object."""
 
         return str(raw_score)
 
+    def score_judgment(
+        self, prompt: str, response: ScoreResponse, cached: bool = False
+    ) -> MetricResult:
+        """
+        Build the metric result from the judge model's response to a prompt.
+
+        Args:
+            prompt: The judge prompt the response was given to
+            response: The parsed response of the judge model
+            cached: Whether the response was taken from the judge cache
+
+        Returns:
+            MetricResult: The evaluation result
+        """
+        # Get the score and process it based on score type
+        raw_score = response.score
+        processed_score = self._process_score(raw_score)
+        reason = (
+            response.reason
+            if hasattr(response, "reason") and response.reason
+            else f"Score: {raw_score}"
+        )
+
+        # Handle evaluation based on score type
+        if self.score_type == ScoreType.NUMERIC:
+            # For numeric scores, use the processed score directly (no normalization)
+            evaluation_score = processed_score
+
+            # Use raw threshold for comparison with raw scores (no normalization)
+            raw_threshold = getattr(self, "raw_threshold", self.threshold)
+
+            # Check if the evaluation meets the threshold using the base class method
+            is_successful = self.evaluate_score(
+                score=evaluation_score,
+                score_type=self.score_type,
+                threshold=raw_threshold,
+                threshold_operator=self.threshold_operator,
+            )
+
+        else:  # BINARY or CATEGORICAL
+            # For binary/categorical scores, use the processed score directly
+            evaluation_score = processed_score
+
+            # Check if the evaluation meets the reference score using the base class method
+            is_successful = self.evaluate_score(
+                score=evaluation_score,
+                score_type=self.score_type,
+                reference_score=self.reference_score,
+                threshold_operator=self.threshold_operator,
+            )
+
+        # Get the original LLM response content for debugging
+        llm_response_content = f"Score: {raw_score}, Reason: {reason}"
+
+        # Prepare details based on score type
+        details = {
+            "raw_score": raw_score,
+            "processed_score": processed_score,
+            "score_type": self.score_type.value,
+            "llm_response": llm_response_content,
+            "prompt": prompt,
+            "reason": reason,
+            "is_successful": is_successful,
+            "threshold_operator": self.threshold_operator.value
+            if self.threshold_operator
+            else None,
+            "cached": cached,
+        }
+
+        # Add score type specific details
+        if self.score_type == ScoreType.NUMERIC:
+            raw_threshold = getattr(self, "raw_threshold", self.threshold)
+            details.update(
+                {
+                    "final_score": evaluation_score,  # Raw score (not normalized)
+                    "min_score": self.min_score,
+                    "max_score": self.max_score,
+                    "threshold": raw_threshold,  # Raw threshold for comparison
+                    "normalized_threshold": self.threshold,  # Keep for reference
+                    "raw_threshold": raw_threshold,
+                }
+            )
+        else:  # BINARY or CATEGORICAL
+            details.update(
+                {
+                    "reference_score": self.reference_score,
+                }
+            )
+
+        return MetricResult(score=evaluation_score, details=details)
+
+    def evaluate_batch(self, test_cases: List[Dict[str, Any]]) -> List[MetricResult]:
+        """
+        Evaluate several test cases, judging up to `batch_size` of them with one request.
+
+        Test cases with empty output or without required ground truth are evaluated
+        individually, as are test cases whose judgment is missing or can't be parsed in the
+        batch response. Judgments are looked up in and stored to the judge cache per test
+        case, under its own judge prompt.
+
+        Args:
+            test_cases: Keyword arguments of `evaluate` per test case (input, output,
+                expected_output, context)
+
+        Returns:
+            List[MetricResult]: The evaluation results, in the order of the test cases
+        """
+        results: List[Optional[MetricResult]] = [None] * len(test_cases)
+        parameters = self._get_judge_parameters()
+
+        # Take cached judgments from the judge cache, collect the others for batches
+        pending: List[Tuple[int, str]] = []
+        for index, test_case in enumerate(test_cases):
+            output = test_case.get("output")
+            expected_output = test_case.get("expected_output")
+            if not output or not output.strip() or (
+                expected_output is None and self.requires_ground_truth
+            ):
+                results[index] = self.evaluate(**test_case)
+                continue
+
+            prompt = self.get_prompt_template(
+                test_case["input"], output, expected_output or "", test_case.get("context") or []
+            )
+            cached = get_cached_judgment(prompt, parameters)
+            if cached is not None:
+                results[index] = self.score_judgment(prompt, ScoreResponse(**cached), cached=True)
+            else:
+                pending.append((index, prompt))
+
+        batch_size = max(1, self.batch_size)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            if len(batch) == 1:
+                results[batch[0][0]] = self.evaluate(**test_cases[batch[0][0]])
+                continue
+
+            ids = [f"test_case_{position}" for position in range(1, len(batch) + 1)]
+            batch_prompt = self.get_batch_prompt([test_cases[index] for index, _ in batch])
+            try:
+                with timed_phase("judge_llm"):
+                    response_text = self.get_judge_model().generate(batch_prompt)
+                judgments = parse_judgments(str(response_text), ids)
+            except Exception as e:
+                logger.warning(f"[METRIC_EVAL] Batch judge request of {self.name} failed: {e}")
+                judgments = {}
+
+            for (index, prompt), judgment_id in zip(batch, ids):
+                judgment = judgments.get(judgment_id)
+                if judgment is None:
+                    # Retry the test case with its own judge request
+                    results[index] = self.evaluate(**test_cases[index])
+                    continue
+                cache_judgment(prompt, parameters, judgment.model_dump())
+                # The batch prompt holds other test cases, so the result keeps its own prompt
+                result = self.score_judgment(prompt, judgment)
+                result.details["batched"] = True
+                results[index] = result
+
+        return results
+
     @retry_evaluation(
         retry_exceptions=(
             ConnectionError,
@@ -366,84 +651,10 @@ Do not include any other text before or after the JSON object."""
         prompt = self.get_prompt_template(input, output, expected_output or "", context or [])
 
         try:
-            # Run the evaluation using the model directly
-            response = self.run_evaluation(prompt)
-
-            # Get the score and process it based on score type
-            raw_score = response.score
-            processed_score = self._process_score(raw_score)
-            reason = (
-                response.reason
-                if hasattr(response, "reason") and response.reason
-                else f"Score: {raw_score}"
-            )
-
-            # Handle evaluation based on score type
-            if self.score_type == ScoreType.NUMERIC:
-                # For numeric scores, use the processed score directly (no normalization)
-                evaluation_score = processed_score
-
-                # Use raw threshold for comparison with raw scores (no normalization)
-                raw_threshold = getattr(self, "raw_threshold", self.threshold)
-
-                # Check if the evaluation meets the threshold using the base class method
-                is_successful = self.evaluate_score(
-                    score=evaluation_score,
-                    score_type=self.score_type,
-                    threshold=raw_threshold,
-                    threshold_operator=self.threshold_operator,
-                )
-
-            else:  # BINARY or CATEGORICAL
-                # For binary/categorical scores, use the processed score directly
-                evaluation_score = processed_score
-
-                # Check if the evaluation meets the reference score using the base class method
-                is_successful = self.evaluate_score(
-                    score=evaluation_score,
-                    score_type=self.score_type,
-                    reference_score=self.reference_score,
-                    threshold_operator=self.threshold_operator,
-                )
-
-            # Get the original LLM response content for debugging
-            llm_response_content = f"Score: {raw_score}, Reason: {reason}"
-
-            # Prepare details based on score type
-            details = {
-                "raw_score": raw_score,
-                "processed_score": processed_score,
-                "score_type": self.score_type.value,
-                "llm_response": llm_response_content,
-                "prompt": prompt,
-                "reason": reason,
-                "is_successful": is_successful,
-                "threshold_operator": self.threshold_operator.value
-                if self.threshold_operator
-                else None,
-            }
-
-            # Add score type specific details
-            if self.score_type == ScoreType.NUMERIC:
-                raw_threshold = getattr(self, "raw_threshold", self.threshold)
-                details.update(
-                    {
-                        "final_score": evaluation_score,  # Raw score (not normalized)
-                        "min_score": self.min_score,
-                        "max_score": self.max_score,
-                        "threshold": raw_threshold,  # Raw threshold for comparison
-                        "normalized_threshold": self.threshold,  # Keep for reference
-                        "raw_threshold": raw_threshold,
-                    }
-                )
-            else:  # BINARY or CATEGORICAL
-                details.update(
-                    {
-                        "reference_score": self.reference_score,
-                    }
-                )
+            # Run the evaluation using the model directly, unless the judgment is cached
+            response, cached = self._judge(prompt)
 
-            return MetricResult(score=evaluation_score, details=details)
+            return self.score_judgment(prompt, response, cached)
 
         except Exception as e:
             # Log the error for debugging with full traceback
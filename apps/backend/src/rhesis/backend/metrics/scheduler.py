@@ -0,0 +1,241 @@
+"""
+Process-wide scheduler for metric evaluations.
+
+All evaluators of a worker process submit their metric evaluations to one scheduler
+instead of creating a thread pool per test. The scheduler runs them on a long-lived
+thread pool and bounds how many evaluations (and thus judge LLM calls) run at once:
+
+- in total, to `METRIC_EVALUATION_CONCURRENCY` (default 16)
+- per judge provider, to `METRIC_PROVIDER_CONCURRENCY` (default 8), overridden for single
+  providers by `METRIC_PROVIDER_LIMITS` (e.g. `openai=4,gemini=10`)
+
+Evaluations waiting for a provider with no free slot don't hold a thread, so other
+providers keep being served. Waiting evaluations of different providers are started in
+turn. The thread pool is created lazily and recreated after a fork.
+
+`get_stats()` reports queued, running and completed evaluations and their wait times per
+provider; the statistics are logged every 100 evaluations.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional
+
+from rhesis.backend.logging.rhesis_logger import logger
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_PROVIDER_CONCURRENCY = 8
+DEFAULT_PROVIDER = "default"
+# Log the scheduler statistics every this many evaluations
+STATS_LOG_INTERVAL = 100
+
+
+def _parse_provider_limits(value: Optional[str]) -> Dict[str, int]:
+    """Parse `provider=limit` pairs separated by commas."""
+    limits = {}
+    for pair in (value or "").split(","):
+        provider, _, limit = pair.partition("=")
+        if provider.strip() and limit.strip():
+            try:
+                limits[provider.strip().lower()] = max(int(limit), 1)
+            except ValueError:
+                logger.warning(f"Ignoring invalid metric provider limit: {pair!r}")
+    return limits
+
+
+def metric_provider(metric: Any) -> str:
+    """
+    Judge provider of a metric instance, used to apply per-provider limits.
+
+    Configured models have names of the form "provider/model"; otherwise the metric's
+    `provider` attribute is used.
+    """
+    model = getattr(metric, "model_instance", None)
+    model_name = getattr(model, "model_name", None)
+    if isinstance(model_name, str) and "/" in model_name:
+        return model_name.split("/")[0].lower()
+
+    provider = getattr(metric, "provider", None)
+    if isinstance(provider, str) and provider:
+        return provider.lower()
+    return DEFAULT_PROVIDER
+
+
+@dataclass
+class _Evaluation:
+    future: Future
+    fn: Callable[..., Any]
+    args: tuple
+    kwargs: dict
+    provider: str
+    submitted_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class _ProviderStats:
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+
+
+class EvaluationScheduler:
+    """Runs metric evaluations with a global and a per-provider concurrency limit."""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        provider_concurrency: Optional[int] = None,
+        provider_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.max_concurrency = max(
+            max_concurrency
+            or int(os.getenv("METRIC_EVALUATION_CONCURRENCY", DEFAULT_CONCURRENCY)),
+            1,
+        )
+        self.provider_concurrency = max(
+            provider_concurrency
+            or int(os.getenv("METRIC_PROVIDER_CONCURRENCY", DEFAULT_PROVIDER_CONCURRENCY)),
+            1,
+        )
+        self.provider_limits = (
+            provider_limits
+            if provider_limits is not None
+            else _parse_provider_limits(os.getenv("METRIC_PROVIDER_LIMITS"))
+        )
+        # Waiting evaluations by provider, in the order providers are served
+        self._queues: "OrderedDict[str, Deque[_Evaluation]]" = OrderedDict()
+        self._stats: Dict[str, _ProviderStats] = {}
+        self._running = 0
+        self._completed = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get_provider_limit(self, provider: str) -> int:
+        limit = self.provider_limits.get(provider, self.provider_concurrency)
+        return min(limit, self.max_concurrency)
+
+    def submit(
+        self, fn: Callable[..., Any], *args: Any, provider: Optional[str] = None, **kwargs: Any
+    ) -> Future:
+        """
+        Schedule `fn(*args, **kwargs)` as an evaluation using a judge of `provider`.
+
+        Returns:
+            A future of the evaluation result
+        """
+        provider = (provider or DEFAULT_PROVIDER).lower()
+        evaluation = _Evaluation(Future(), fn, args, kwargs, provider)
+        with self._lock:
+            self._queues.setdefault(provider, deque()).append(evaluation)
+            self._stats.setdefault(provider, _ProviderStats()).queued += 1
+            self._dispatch()
+        return evaluation.future
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Threads don't survive a fork, so a forked worker process creates its own pool
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="metric-evaluation"
+            )
+            if self._executor_pid not in (None, os.getpid()):
+                # Evaluations running in the parent process don't run here
+                self._running = 0
+                for stats in self._stats.values():
+                    stats.running = 0
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _dispatch(self) -> None:
+        """Start waiting evaluations while slots are free (called with the lock held)."""
+        while self._running < self.max_concurrency:
+            evaluation = None
+            for provider, queue in self._queues.items():
+                if queue and self._stats[provider].running < self.get_provider_limit(provider):
+                    evaluation = queue.popleft()
+                    # Serve the other providers first next time
+                    self._queues.move_to_end(provider)
+                    break
+            if evaluation is None:
+                return
+
+            stats = self._stats[evaluation.provider]
+            stats.queued -= 1
+            stats.running += 1
+            self._running += 1
+            self._get_executor().submit(self._run, evaluation)
+
+    def _run(self, evaluation: _Evaluation) -> None:
+        wait_ms = (time.perf_counter() - evaluation.submitted_at) * 1000
+        if not evaluation.future.set_running_or_notify_cancel():
+            self._finish(evaluation, wait_ms)
+            return
+
+        try:
+            result = evaluation.fn(*evaluation.args, **evaluation.kwargs)
+        except BaseException as exc:
+            # Statistics are updated before the caller sees the outcome
+            self._finish(evaluation, wait_ms)
+            evaluation.future.set_exception(exc)
+        else:
+            self._finish(evaluation, wait_ms)
+            evaluation.future.set_result(result)
+
+    def _finish(self, evaluation: _Evaluation, wait_ms: float) -> None:
+        with self._lock:
+            stats = self._stats[evaluation.provider]
+            stats.running -= 1
+            stats.completed += 1
+            stats.wait_ms_total += wait_ms
+            stats.wait_ms_max = max(stats.wait_ms_max, wait_ms)
+            self._running -= 1
+            self._completed += 1
+            completed = self._completed
+            self._dispatch()
+        if completed % STATS_LOG_INTERVAL == 0:
+            logger.info(f"Metric evaluation scheduler statistics: {self.get_stats()}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queued, running and completed evaluations and wait times, in total and per provider."""
+        with self._lock:
+            providers = {
+                provider: {
+                    "limit": self.get_provider_limit(provider),
+                    "queued": stats.queued,
+                    "running": stats.running,
+                    "completed": stats.completed,
+                    "wait_ms_avg": round(stats.wait_ms_total / stats.completed, 2)
+                    if stats.completed
+                    else 0.0,
+                    "wait_ms_max": round(stats.wait_ms_max, 2),
+                }
+                for provider, stats in self._stats.items()
+            }
+            return {
+                "max_concurrency": self.max_concurrency,
+                "queued": sum(stats.queued for stats in self._stats.values()),
+                "running": self._running,
+                "completed": self._completed,
+                "providers": providers,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the thread pool of this process (e.g. in tests); waiting evaluations are kept."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+evaluation_scheduler = EvaluationScheduler()
+
+
+def get_scheduler_stats() -> Dict[str, Any]:
+    """Statistics of this process' evaluation scheduler."""
+    return evaluation_scheduler.get_stats()
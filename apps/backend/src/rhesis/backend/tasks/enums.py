@@ -5,6 +5,17 @@ from enum import Enum
 # Metrics constants
 DEFAULT_METRIC_WORKERS = 5
 
+# Batched parallel execution
+DEFAULT_TEST_BATCH_SIZE = 1  # 1 = one Celery task per test (no batching)
+DEFAULT_BATCH_CONCURRENCY = 4  # Tests executed concurrently inside one batch task
+MAX_BATCH_CONCURRENCY = 32
+DEFAULT_BATCH_SOFT_TIME_LIMIT_PER_TEST = 300  # 5 minutes per sequential slot in a batch
+
+# Pipelined execution
+DEFAULT_PIPELINE_MAX_IN_FLIGHT = 4  # Concurrent endpoint invocations
+DEFAULT_PIPELINE_EVALUATION_WORKERS = 4  # Concurrent metric evaluations and result writes
+MAX_PIPELINE_CONCURRENCY = 32
+
 # Task status constants
 DEFAULT_RESULT_STATUS = "Completed"
 DEFAULT_RUN_STATUS_PROGRESS = "Progress"
@@ -39,3 +50,4 @@ class ExecutionMode(str, Enum):
 
     SEQUENTIAL = "Sequential"
     PARALLEL = "Parallel"
+    PIPELINED = "Pipelined"
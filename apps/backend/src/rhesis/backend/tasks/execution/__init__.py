@@ -1,5 +1,6 @@
 """Execution module for test configuration tasks."""
 
+from rhesis.backend.tasks.execution.batch import execute_test_batch
 from rhesis.backend.tasks.execution.config import (
     TestConfigurationError,
     get_production_redis_urls,
@@ -23,6 +24,7 @@ from rhesis.backend.tasks.execution.test_execution import execute_test
 
 __all__ = [
     "execute_single_test",
+    "execute_test_batch",
     "get_test_configuration",
     "TestConfigurationError",
     "create_test_run",
@@ -0,0 +1,440 @@
+"""
+Batched test execution task for parallel mode.
+
+Instead of one Celery task per test, a batch task receives a slice of test IDs,
+runs them with bounded in-task concurrency and returns the per-test results in
+the same shape `collect_results` expects from `execute_single_test`.
+
+The tests of a slice are invoked one by one, or in groups of up to
+`Endpoint.batch_size` inputs per request if the endpoint has a batch mode. The
+metrics of the invoked tests are evaluated in groups of up to
+`evaluation_group_size` tests, so prompt metrics judge several tests with one
+request; the results are stored per test.
+"""
+
+import concurrent.futures
+from typing import Any, Dict, List, Optional, Union
+
+from rhesis.backend.app.database import get_db_with_tenant_variables
+from rhesis.backend.app.dependencies import get_endpoint_service
+from rhesis.backend.logging.rhesis_logger import logger
+from rhesis.backend.metrics.rhesis.prompt_metric import get_judge_batch_size
+from rhesis.backend.tasks.base import SilentTask
+from rhesis.backend.tasks.enums import DEFAULT_BATCH_CONCURRENCY
+from rhesis.backend.tasks.execution.shared import create_failure_result
+from rhesis.backend.tasks.execution.test import resolve_evaluation_model
+from rhesis.backend.tasks.execution.test_execution import (
+    PreparedTest,
+    check_existing_result,
+    evaluate_test_batch,
+    execute_test,
+    invoke_test,
+    invoke_test_batch,
+    prepare_test,
+    store_test_result,
+)
+from rhesis.backend.tasks.utils import increment_test_run_progress
+from rhesis.backend.worker import app
+
+
+def _record_progress(
+    test_run_id: str,
+    test_id: str,
+    result: Dict[str, Any],
+    organization_id: Optional[str],
+    user_id: Optional[str],
+) -> None:
+    was_successful = result.get("status") != "failed"
+    try:
+        with get_db_with_tenant_variables(organization_id, user_id) as db:
+            increment_test_run_progress(
+                db=db,
+                test_run_id=test_run_id,
+                test_id=test_id,
+                was_successful=was_successful,
+                organization_id=organization_id,
+                user_id=user_id,
+            )
+    except Exception as progress_error:
+        logger.error(f"Failed to update progress for test {test_id}: {str(progress_error)}")
+
+
+def _execute_test_in_batch(
+    test_config_id: str,
+    test_run_id: str,
+    test_id: str,
+    endpoint_id: str,
+    organization_id: Optional[str],
+    user_id: Optional[str],
+    model: Optional[Any],
+) -> Dict[str, Any]:
+    """
+    Execute one test of a batch in its own tenant-aware session.
+
+    Failures are converted into failure results so a single broken test never
+    fails (or retries) the whole batch.
+    """
+    try:
+        with get_db_with_tenant_variables(organization_id, user_id) as db:
+            result = execute_test(
+                db=db,
+                test_config_id=test_config_id,
+                test_run_id=test_run_id,
+                test_id=test_id,
+                endpoint_id=endpoint_id,
+                organization_id=organization_id,
+                user_id=user_id,
+                model=model,
+            )
+
+        if not isinstance(result, dict):
+            logger.error(f"execute_test returned non-dict type {type(result)} for test {test_id}")
+            result = create_failure_result(
+                test_id, TypeError(f"execute_test returned non-dict type: {type(result)}")
+            )
+    except Exception as e:
+        logger.error(f"Test {test_id} failed inside batch: {str(e)}", exc_info=True)
+        result = create_failure_result(test_id, e)
+
+    _record_progress(test_run_id, test_id, result, organization_id, user_id)
+    return result
+
+
+def _prepare_and_invoke_test(
+    test_config_id: str,
+    test_run_id: str,
+    test_id: str,
+    endpoint_id: str,
+    organization_id: Optional[str],
+    user_id: Optional[str],
+) -> Union[PreparedTest, Dict[str, Any]]:
+    """
+    Invoke the endpoint for one test of a batch.
+
+    Returns:
+        The invoked test, its stored result if one exists, or a failure result
+    """
+    try:
+        with get_db_with_tenant_variables(organization_id, user_id) as db:
+            existing_result = check_existing_result(
+                db, test_config_id, test_run_id, test_id, organization_id, user_id
+            )
+            if existing_result:
+                logger.info(f"Found existing result for test {test_id}")
+                return existing_result
+
+            prepared = prepare_test(
+                db, test_config_id, test_run_id, test_id, organization_id, user_id
+            )
+        # Invoke outside of the preparation transaction so no connection is held while waiting
+        with get_db_with_tenant_variables(organization_id, user_id) as db:
+            return invoke_test(db, prepared, endpoint_id)
+    except Exception as e:
+        logger.error(f"Test {test_id} failed inside batch: {str(e)}", exc_info=True)
+        return create_failure_result(test_id, e)
+
+
+def _get_endpoint_batch_size(
+    endpoint_id: str, organization_id: Optional[str], user_id: Optional[str]
+) -> int:
+    """Inputs per request accepted by the endpoint; 1 if it cannot be determined."""
+    try:
+        with get_db_with_tenant_variables(organization_id, user_id) as db:
+            return get_endpoint_service().get_batch_size(db, endpoint_id, organization_id)
+    except Exception as e:
+        logger.warning(f"Failed to get batch size of endpoint {endpoint_id}: {str(e)}")
+        return 1
+
+
+def _prepare_and_invoke_group(
+    test_config_id: str,
+    test_run_id: str,
+    test_ids: List[str],
+    endpoint_id: str,
+    organization_id: Optional[str],
+    user_id: Optional[str],
+) -> List[Union[PreparedTest, Dict[str, Any]]]:
+    """
+    Invoke the endpoint once for a group of tests.
+
+    Returns:
+        Per test, the invoked test, its stored result if one exists, or a failure result
+    """
+    stage_results: Dict[int, Union[PreparedTest, Dict[str, Any]]] = {}
+    prepared_tests: Dict[int, PreparedTest] = {}
+    with get_db_with_tenant_variables(organization_id, user_id) as db:
+        for index, test_id in enumerate(test_ids):
+            try:
+                existing_result = check_existing_result(
+                    db, test_config_id, test_run_id, test_id, organization_id, user_id
+                )
+                if existing_result:
+                    logger.info(f"Found existing result for test {test_id}")
+                    stage_results[index] = existing_result
+                else:
+                    prepared_tests[index] = prepare_test(
+                        db, test_config_id, test_run_id, test_id, organization_id, user_id
+                    )
+            except Exception as e:
+                logger.error(f"Test {test_id} failed during preparation: {str(e)}")
+                stage_results[index] = create_failure_result(test_id, e)
+
+    if prepared_tests:
+        # Invoke outside of the preparation transaction so no connection is held while waiting
+        try:
+            with get_db_with_tenant_variables(organization_id, user_id) as db:
+                invoke_test_batch(db, list(prepared_tests.values()), endpoint_id)
+            stage_results.update(prepared_tests)
+        except Exception as e:
+            logger.error(f"Batch invocation of {len(prepared_tests)} tests failed: {str(e)}")
+            for index in prepared_tests:
+                stage_results[index] = create_failure_result(test_ids[index], e)
+
+    return [stage_results[index] for index in range(len(test_ids))]
+
+
+def _evaluate_group(
+    test_run_id: str,
+    test_ids: List[str],
+    stage_results: List[Union[PreparedTest, Dict[str, Any]]],
+    organization_id: Optional[str],
+    user_id: Optional[str],
+    model: Optional[Any],
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate the invoked tests of a group together and store each result.
+
+    Each result is stored in its own session, and failures are converted into
+    failure results, so a single broken test never fails the others.
+    """
+    prepared_indexes = [
+        index
+        for index, stage_result in enumerate(stage_results)
+        if isinstance(stage_result, PreparedTest)
+    ]
+    metrics_results: Dict[int, Union[Dict, Exception]] = {}
+    if prepared_indexes:
+        try:
+            with get_db_with_tenant_variables(organization_id, user_id) as db:
+                evaluated = evaluate_test_batch(
+                    db, [stage_results[index] for index in prepared_indexes], model
+                )
+            metrics_results = dict(zip(prepared_indexes, evaluated))
+        except Exception as e:
+            logger.error(
+                f"Evaluation of {len(prepared_indexes)} tests failed: {str(e)}", exc_info=True
+            )
+            metrics_results = {index: e for index in prepared_indexes}
+
+    results = []
+    for index, (test_id, stage_result) in enumerate(zip(test_ids, stage_results)):
+        result = stage_result
+        if index in metrics_results:
+            try:
+                if isinstance(metrics_results[index], Exception):
+                    raise metrics_results[index]
+                with get_db_with_tenant_variables(organization_id, user_id) as db:
+                    result = store_test_result(db, stage_result, metrics_results[index])
+            except Exception as e:
+                logger.error(f"Test {test_id} failed during evaluation: {str(e)}", exc_info=True)
+                result = create_failure_result(test_id, e)
+
+        _record_progress(test_run_id, test_id, result, organization_id, user_id)
+        results.append(result)
+
+    return results
+
+
+def _future_results(
+    future: concurrent.futures.Future, indexes: List[int], test_ids: List[str]
+) -> List[Any]:
+    """
+    Results of a completed future, one per test index it was submitted for.
+
+    The submitted functions convert failures into failure results themselves; a future
+    that raised anyway gets failure results, so the chord always receives a result per
+    test.
+    """
+    try:
+        results = future.result()
+    except Exception as e:
+        return [create_failure_result(test_ids[index], e) for index in indexes]
+    return results if isinstance(results, list) else [results]
+
+
+def _execute_tests_in_groups(
+    test_config_id: str,
+    test_run_id: str,
+    test_ids: List[str],
+    endpoint_id: str,
+    organization_id: Optional[str],
+    user_id: Optional[str],
+    model: Optional[Any],
+    concurrency: int,
+    evaluation_group_size: int,
+    endpoint_batch_size: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    Invoke the tests of a slice and evaluate the invoked tests in groups.
+
+    Tests are invoked one by one, or `endpoint_batch_size` per request, with up to
+    `concurrency` invocations at once. Invoked tests are collected in order of
+    completion, and every `evaluation_group_size` of them (and the rest once all tests
+    were invoked) are evaluated together while the next tests are invoked. Tests that
+    were not invoked (stored or failed) are counted right away.
+    """
+    invocations = [
+        list(range(start, min(start + endpoint_batch_size, len(test_ids))))
+        for start in range(0, len(test_ids), endpoint_batch_size)
+    ]
+    max_invocations = max(1, min(concurrency, len(invocations)))
+    results: List[Any] = [None] * len(test_ids)
+    pending: List[int] = []
+    # Running invocations and evaluations, mapped to the indexes of their tests
+    invoking: Dict[concurrent.futures.Future, List[int]] = {}
+    evaluating: Dict[concurrent.futures.Future, List[int]] = {}
+
+    # Evaluations run next to at most `max_invocations` invocations
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2 * max_invocations) as executor:
+
+        def invoke_next() -> None:
+            if not invocations:
+                return
+            indexes = invocations.pop(0)
+            if endpoint_batch_size > 1:
+                future = executor.submit(
+                    _prepare_and_invoke_group,
+                    test_config_id,
+                    test_run_id,
+                    [test_ids[index] for index in indexes],
+                    endpoint_id,
+                    organization_id,
+                    user_id,
+                )
+            else:
+                future = executor.submit(
+                    _prepare_and_invoke_test,
+                    test_config_id,
+                    test_run_id,
+                    test_ids[indexes[0]],
+                    endpoint_id,
+                    organization_id,
+                    user_id,
+                )
+            invoking[future] = indexes
+
+        def evaluate_pending() -> None:
+            group = list(pending)
+            pending.clear()
+            future = executor.submit(
+                _evaluate_group,
+                test_run_id,
+                [test_ids[index] for index in group],
+                [results[index] for index in group],
+                organization_id,
+                user_id,
+                model,
+            )
+            evaluating[future] = group
+
+        for _ in range(max_invocations):
+            invoke_next()
+
+        while invoking or evaluating:
+            done, _ = concurrent.futures.wait(
+                [*invoking, *evaluating], return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                if future in evaluating:
+                    group = evaluating.pop(future)
+                    for index, result in zip(group, _future_results(future, group, test_ids)):
+                        results[index] = result
+                    continue
+
+                indexes = invoking.pop(future)
+                invoke_next()
+                for index, result in zip(indexes, _future_results(future, indexes, test_ids)):
+                    results[index] = result
+                    if isinstance(result, PreparedTest):
+                        pending.append(index)
+                        if len(pending) >= evaluation_group_size:
+                            evaluate_pending()
+                    else:
+                        _record_progress(
+                            test_run_id, test_ids[index], result, organization_id, user_id
+                        )
+
+            if pending and not invoking:
+                evaluate_pending()
+
+    return results
+
+
+@app.task(
+    name="rhesis.backend.tasks.execute_test_batch",
+    base=SilentTask,
+    bind=True,
+    display_name="Batched Test Execution",
+)
+def execute_test_batch(
+    self,
+    test_config_id: str,
+    test_run_id: str,
+    test_ids: List[str],
+    endpoint_id: str,
+    organization_id: str = None,  # Make this explicit so it's preserved on retries
+    user_id: str = None,  # Make this explicit so it's preserved on retries
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    evaluation_group_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Execute a slice of tests and return one result dict per test.
+
+    The user and evaluation model are resolved once per batch and shared by all
+    tests in it. Results are returned in the same order as `test_ids`.
+    `evaluation_group_size` defaults to the prompt metric judge batch size.
+    """
+    task = self.request
+    user_id = user_id or getattr(task, "user_id", None)
+    organization_id = organization_id or getattr(task, "organization_id", None)
+
+    batch_label = f"batch of {len(test_ids)} tests in run {test_run_id}"
+    logger.info(f"Starting {batch_label} with concurrency {concurrency}")
+
+    # Resolve the evaluation model once for the whole batch
+    with get_db_with_tenant_variables(organization_id, user_id) as db:
+        model = resolve_evaluation_model(db, user_id, batch_label, organization_id)
+
+    if len(test_ids) == 1:
+        results = [
+            _execute_test_in_batch(
+                test_config_id,
+                test_run_id,
+                test_ids[0],
+                endpoint_id,
+                organization_id,
+                user_id,
+                model,
+            )
+        ]
+    else:
+        endpoint_batch_size = _get_endpoint_batch_size(endpoint_id, organization_id, user_id)
+        if endpoint_batch_size > 1:
+            logger.info(f"Sending {batch_label} to the endpoint in groups of {endpoint_batch_size}")
+        results = _execute_tests_in_groups(
+            test_config_id,
+            test_run_id,
+            test_ids,
+            endpoint_id,
+            organization_id,
+            user_id,
+            model,
+            concurrency,
+            evaluation_group_size or get_judge_batch_size(),
+            endpoint_batch_size,
+        )
+
+    failed = sum(1 for result in results if result.get("status") == "failed")
+    logger.info(f"Completed {batch_label}: {len(results) - failed} succeeded, {failed} failed")
+
+    return results
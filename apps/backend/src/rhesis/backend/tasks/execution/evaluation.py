@@ -56,3 +56,37 @@ def evaluate_prompt_response(
         # Continue with empty metrics results
 
     return metrics_results
+
+
+def evaluate_prompt_responses(
+    metrics_evaluator: MetricEvaluator,
+    test_cases: List[Dict[str, Any]],
+) -> List[Dict]:
+    """
+    Evaluate the responses of several tests, judging prompt metrics for several tests at once.
+
+    Args:
+        metrics_evaluator: The metrics evaluator instance
+        test_cases: Arguments of `evaluate_prompt_response` per test (prompt_content,
+            expected_response, context, result and metrics)
+
+    Returns:
+        Per test, a dictionary containing the evaluation results
+    """
+    try:
+        return metrics_evaluator.evaluate_batch(
+            [
+                {
+                    "input_text": test_case["prompt_content"],
+                    "expected_output": test_case["expected_response"],
+                    "output_text": extract_response_with_fallback(test_case["result"]),
+                    "context": test_case["context"],
+                    "metrics": test_case["metrics"],
+                }
+                for test_case in test_cases
+            ]
+        )
+    except Exception as e:
+        logger.warning(f"Error evaluating metrics of {len(test_cases)} tests: {str(e)}")
+        # Continue with empty metrics results
+        return [{} for _ in test_cases]
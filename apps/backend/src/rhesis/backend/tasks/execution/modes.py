@@ -5,13 +5,23 @@ This module provides helper functions for working with execution modes
 in test configurations.
 """
 
+from typing import Any, Dict
 
 from sqlalchemy.orm import Session
 
 from rhesis.backend.app import crud
 from rhesis.backend.app.models.test_configuration import TestConfiguration
 from rhesis.backend.logging.rhesis_logger import logger
-from rhesis.backend.tasks.enums import ExecutionMode
+from rhesis.backend.metrics.rhesis.prompt_metric import get_judge_batch_size
+from rhesis.backend.tasks.enums import (
+    DEFAULT_BATCH_CONCURRENCY,
+    DEFAULT_PIPELINE_EVALUATION_WORKERS,
+    DEFAULT_PIPELINE_MAX_IN_FLIGHT,
+    DEFAULT_TEST_BATCH_SIZE,
+    MAX_BATCH_CONCURRENCY,
+    MAX_PIPELINE_CONCURRENCY,
+    ExecutionMode,
+)
 from rhesis.backend.tasks.utils import safe_uuid_convert
 
 
@@ -24,7 +34,7 @@ def get_execution_mode(test_config: TestConfiguration) -> ExecutionMode:
         test_config: TestConfiguration object
 
     Returns:
-        ExecutionMode: The execution mode (Sequential or Parallel)
+        ExecutionMode: The execution mode (Sequential, Parallel or Pipelined)
     """
     if not test_config.attributes:
         return ExecutionMode.PARALLEL
@@ -44,6 +54,168 @@ def get_execution_mode(test_config: TestConfiguration) -> ExecutionMode:
     return execution_mode if isinstance(execution_mode, ExecutionMode) else ExecutionMode.PARALLEL
 
 
+def _get_positive_int_attribute(
+    test_config: TestConfiguration, key: str, default: int, maximum: int = None
+) -> int:
+    """Read a positive integer from test configuration attributes, falling back to a default."""
+    if not test_config.attributes or key not in test_config.attributes:
+        return default
+
+    value = test_config.attributes.get(key)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        logger.warning(
+            f"Invalid {key} '{value}' in test config {test_config.id}, defaulting to {default}"
+        )
+        return default
+
+    if value < 1:
+        logger.warning(
+            f"Invalid {key} '{value}' in test config {test_config.id}, defaulting to {default}"
+        )
+        return default
+
+    return min(value, maximum) if maximum else value
+
+
+def get_batch_size(test_config: TestConfiguration) -> int:
+    """
+    Get the number of tests each parallel Celery task should execute.
+
+    A value of 1 (the default) keeps the classic one-task-per-test behavior.
+
+    Args:
+        test_config: TestConfiguration object
+
+    Returns:
+        int: Number of tests per batch task
+    """
+    return _get_positive_int_attribute(test_config, "batch_size", DEFAULT_TEST_BATCH_SIZE)
+
+
+def get_batch_concurrency(test_config: TestConfiguration) -> int:
+    """
+    Get the number of tests a batch task may execute concurrently.
+
+    Args:
+        test_config: TestConfiguration object
+
+    Returns:
+        int: Maximum in-task concurrency for batch execution
+    """
+    return _get_positive_int_attribute(
+        test_config, "batch_concurrency", DEFAULT_BATCH_CONCURRENCY, MAX_BATCH_CONCURRENCY
+    )
+
+
+def get_evaluation_group_size(test_config: TestConfiguration) -> int:
+    """
+    Get the number of invoked tests of a batch task whose metrics are evaluated together.
+
+    Defaults to the number of test cases a prompt metric judges with one request
+    (`PROMPT_METRIC_BATCH_SIZE`), so batched judging gets full batches.
+
+    Args:
+        test_config: TestConfiguration object
+
+    Returns:
+        int: Invoked tests per evaluation group
+    """
+    return _get_positive_int_attribute(
+        test_config, "evaluation_group_size", get_judge_batch_size()
+    )
+
+
+def get_pipeline_max_in_flight(test_config: TestConfiguration) -> int:
+    """
+    Get the maximum number of concurrent endpoint invocations in pipelined mode.
+
+    Args:
+        test_config: TestConfiguration object
+
+    Returns:
+        int: Maximum number of in-flight endpoint calls
+    """
+    return _get_positive_int_attribute(
+        test_config, "max_in_flight", DEFAULT_PIPELINE_MAX_IN_FLIGHT, MAX_PIPELINE_CONCURRENCY
+    )
+
+
+def get_pipeline_evaluation_workers(test_config: TestConfiguration) -> int:
+    """
+    Get the number of concurrent metric evaluations and result writes in pipelined mode.
+
+    Args:
+        test_config: TestConfiguration object
+
+    Returns:
+        int: Number of evaluation workers
+    """
+    return _get_positive_int_attribute(
+        test_config,
+        "evaluation_workers",
+        DEFAULT_PIPELINE_EVALUATION_WORKERS,
+        MAX_PIPELINE_CONCURRENCY,
+    )
+
+
+def get_replay_settings(test_config: TestConfiguration) -> Dict[str, Any]:
+    """
+    Get the replay settings of a test configuration.
+
+    Replay works with all execution modes: endpoint outputs are taken from an earlier
+    test run (`replay_test_run_id`) and/or from the content-addressed response cache
+    (`response_cache`), and only the metrics are evaluated again. With
+    `deduplicate_prompts`, tests sending the same request within the run share a single
+    endpoint invocation.
+
+    Args:
+        test_config: TestConfiguration object
+
+    Returns:
+        Dictionary with `source_test_run_id` (str or None), `response_cache` (bool)
+        and `deduplicate_prompts` (bool)
+    """
+    attributes = test_config.attributes or {}
+
+    source_test_run_id = attributes.get("replay_test_run_id")
+    source_uuid = safe_uuid_convert(source_test_run_id)
+    if source_test_run_id and not source_uuid:
+        logger.warning(
+            f"Invalid replay_test_run_id '{source_test_run_id}' in test config {test_config.id}, "
+            "ignoring replay source"
+        )
+
+    return {
+        "source_test_run_id": str(source_uuid) if source_uuid else None,
+        "response_cache": bool(attributes.get("response_cache", False)),
+        "deduplicate_prompts": bool(attributes.get("deduplicate_prompts", False)),
+    }
+
+
+def get_evaluation_settings(test_config: TestConfiguration) -> Dict[str, Any]:
+    """
+    Get the metric evaluation settings of a test configuration.
+
+    With `judge_cache`, metric judgments of identical judge prompts are reused from the
+    organization's judge cache, and with `fused_judging` the prompt metrics of a test that
+    use the same judge model are judged with a single request.
+
+    Args:
+        test_config: TestConfiguration object
+
+    Returns:
+        Dictionary with `judge_cache` (bool) and `fused_judging` (bool)
+    """
+    attributes = test_config.attributes or {}
+
+    return {
+        "judge_cache": bool(attributes.get("judge_cache", False)),
+        "fused_judging": bool(attributes.get("fused_judging", False)),
+    }
+
+
 def set_execution_mode(db: Session, test_config_id: str, execution_mode: ExecutionMode, organization_id: str = None, user_id: str = None) -> bool:
     """
     Set the execution mode for a test configuration.
@@ -107,6 +279,10 @@ def get_mode_description(execution_mode: ExecutionMode) -> str:
             "Tests are executed simultaneously using multiple workers. "
             "This is faster but may overwhelm endpoints with high load."
         ),
+        ExecutionMode.PIPELINED: (
+            "Tests are executed by a single worker that overlaps endpoint calls with "
+            "metric evaluation, with a configurable cap on concurrent endpoint calls."
+        ),
     }
 
     return descriptions.get(execution_mode, "Unknown execution mode")
@@ -161,4 +337,20 @@ def get_mode_recommendations() -> dict:
                 "May hit rate limits",
             ],
         },
+        ExecutionMode.PIPELINED: {
+            "use_when": [
+                "Endpoints with rate limiting or limited concurrency",
+                "Metric evaluation takes a significant part of the test time",
+                "You want predictable endpoint load without waiting for sequential runs",
+            ],
+            "pros": [
+                "Bounded, configurable endpoint load",
+                "Metric evaluation overlaps with endpoint calls",
+                "No per-test task or chord overhead",
+            ],
+            "cons": [
+                "Limited to the resources of a single worker",
+                "Slower than parallel mode for endpoints that scale",
+            ],
+        },
     }
@@ -2,7 +2,7 @@
 Main orchestration module for test execution.
 
 This module determines the execution mode and delegates to the appropriate
-execution strategy (parallel or sequential).
+execution strategy (parallel, sequential or pipelined).
 """
 
 from typing import Any, Dict
@@ -14,15 +14,18 @@ from rhesis.backend.app.models.test_run import TestRun
 from rhesis.backend.app.services.test_set import get_test_set
 from rhesis.backend.logging.rhesis_logger import logger
 from rhesis.backend.tasks.enums import ExecutionMode
-from rhesis.backend.tasks.execution.modes import get_execution_mode
+from rhesis.backend.tasks.execution.modes import get_evaluation_settings, get_execution_mode
 from rhesis.backend.tasks.execution.parallel import execute_tests_in_parallel
+from rhesis.backend.tasks.execution.pipelined import execute_tests_pipelined
+from rhesis.backend.tasks.execution.plan import build_execution_plan, store_execution_plan
+from rhesis.backend.tasks.execution.replay import get_duplicate_statistics, prepare_replay
 from rhesis.backend.tasks.execution.sequential import execute_tests_sequentially
 
 
 def execute_test_cases(
     session: Session, test_config: TestConfiguration, test_run: TestRun
 ) -> Dict[str, Any]:
-    """Execute test cases based on the configured execution mode (Sequential or Parallel)."""
+    """Execute test cases based on the configured execution mode."""
 
     # Get test set and tests
     test_set = get_test_set(session, str(test_config.test_set_id))
@@ -37,6 +40,9 @@ def execute_test_cases(
             "total_tests": 0,
         }
 
+    # Prefetch test data for the whole run so workers don't query it test by test
+    prepare_execution_plan(session, test_config, test_run)
+
     # Determine execution mode
     execution_mode = get_execution_mode(test_config)
     logger.info(f"Executing test configuration {test_config.id} in {execution_mode.value} mode")
@@ -44,5 +50,34 @@ def execute_test_cases(
     # Delegate to the appropriate execution strategy
     if execution_mode == ExecutionMode.SEQUENTIAL:
         return execute_tests_sequentially(session, test_config, test_run, tests)
+    elif execution_mode == ExecutionMode.PIPELINED:
+        return execute_tests_pipelined(session, test_config, test_run, tests)
     else:
         return execute_tests_in_parallel(session, test_config, test_run, tests)
+
+
+def prepare_execution_plan(
+    session: Session, test_config: TestConfiguration, test_run: TestRun
+) -> None:
+    """Build and cache the run-scoped execution plan; failures fall back to per-test loading."""
+    organization_id = str(test_config.organization_id) if test_config.organization_id else None
+    try:
+        plan = build_execution_plan(session, str(test_config.test_set_id), organization_id)
+        plan["replay"] = prepare_replay(session, test_config, str(test_run.id))
+        plan["evaluation"] = get_evaluation_settings(test_config)
+        if plan["replay"].get("deduplicate_prompts"):
+            record_duplicate_statistics(test_run, plan)
+        if not store_execution_plan(str(test_run.id), plan):
+            logger.info(f"Execution plan for test run {test_run.id} is only cached in-process")
+    except Exception as e:
+        logger.warning(f"Failed to prepare execution plan for test run {test_run.id}: {str(e)}")
+
+
+def record_duplicate_statistics(test_run: TestRun, plan: Dict[str, Any]) -> None:
+    """Keep the duplicate statistics of the run; they are stored with its start attributes."""
+    statistics = get_duplicate_statistics(plan)
+    logger.info(
+        f"Test run {test_run.id} sends {statistics['unique_requests']} unique requests for "
+        f"{statistics['total_tests']} tests ({statistics['duplicate_tests']} duplicates)"
+    )
+    test_run.attributes = {**(test_run.attributes or {}), "prompt_deduplication": statistics}
@@ -0,0 +1,149 @@
+"""
+Offload of oversized values from test outputs.
+
+Endpoint responses are stored with each test result in `test_output`. String values
+longer than `TEST_OUTPUT_MAX_FIELD_CHARS` (default 64 KiB characters), such as large
+error pages embedded in error responses, are written to the `StorageService` instead.
+The stored output keeps a preview of the value followed by a truncation marker, and an
+`offloaded` list with a reference to the full content of every offloaded value, located
+by the keys and list indexes leading to it:
+
+    {"field": ["error", "details", 0], "path": "<storage path>", "size": 4194304}
+
+A value is only replaced with its preview once it has been stored; if storing fails, the
+full value is kept in the output. `restore_offloaded_fields` loads the full values back
+into a stored output, e.g. before it is replayed.
+"""
+
+import asyncio
+import copy
+import os
+from typing import Any, Dict, List, Optional, Union
+
+from rhesis.backend.app.services.storage_service import StorageService
+from rhesis.backend.logging.rhesis_logger import logger
+
+DEFAULT_MAX_FIELD_CHARS = 64 * 1024
+PREVIEW_CHARS = 2048
+TRUNCATION_MARKER = "\n... [truncated: {size} characters, full content offloaded]"
+
+FieldPath = List[Union[str, int]]
+
+_storage_service: Optional[StorageService] = None
+
+
+def get_max_field_chars() -> int:
+    return int(os.getenv("TEST_OUTPUT_MAX_FIELD_CHARS", DEFAULT_MAX_FIELD_CHARS))
+
+
+def _get_storage_service() -> StorageService:
+    global _storage_service
+    if _storage_service is None:
+        _storage_service = StorageService()
+    return _storage_service
+
+
+def _field_name(field: FieldPath) -> str:
+    return ".".join(str(part) for part in field)
+
+
+def _store(content: str, organization_id: Optional[str], source_id: str, field: FieldPath) -> str:
+    storage = _get_storage_service()
+    file_name = "_".join(str(part).replace(".", "_") for part in field)
+    file_path = storage.get_file_path(organization_id or "shared", source_id, f"{file_name}.txt")
+    return asyncio.run(storage.save_file(content.encode("utf-8"), file_path))
+
+
+def _load(path: str) -> str:
+    return asyncio.run(_get_storage_service().get_file(path)).decode("utf-8")
+
+
+def offload_large_fields(
+    result: Optional[Dict],
+    organization_id: Optional[str],
+    test_run_id: str,
+    test_id: str,
+) -> Optional[Dict]:
+    """
+    Replace oversized string values of an endpoint result with previews.
+
+    Containers along the path to an offloaded value are copied, so the original result
+    is left unchanged.
+
+    Returns:
+        The result to store; the result itself if nothing exceeded the limit
+    """
+    if not result:
+        return result
+
+    max_chars = get_max_field_chars()
+    offloaded: List[Dict[str, Any]] = []
+
+    def visit(value: Any, field: FieldPath) -> Any:
+        if isinstance(value, str):
+            if len(value) <= max_chars:
+                return value
+            try:
+                path = _store(value, organization_id, f"{test_run_id}_{test_id}", field)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to offload {_field_name(field)} of test {test_id}, "
+                    f"keeping it inline: {str(e)}"
+                )
+                return value
+            offloaded.append({"field": field, "path": path, "size": len(value)})
+            preview = value[: min(PREVIEW_CHARS, max_chars)]
+            return preview + TRUNCATION_MARKER.format(size=len(value))
+
+        if isinstance(value, dict):
+            visited = {key: visit(item, field + [key]) for key, item in value.items()}
+            changed = any(visited[key] is not value[key] for key in value)
+            return visited if changed else value
+
+        if isinstance(value, list):
+            visited = [visit(item, field + [index]) for index, item in enumerate(value)]
+            changed = any(new is not old for new, old in zip(visited, value))
+            return visited if changed else value
+
+        return value
+
+    processed = visit(result, [])
+    if offloaded:
+        processed["offloaded"] = offloaded
+        logger.info(f"Offloaded {len(offloaded)} oversized values of test {test_id}")
+    return processed
+
+
+def restore_offloaded_fields(output: Optional[Dict]) -> Optional[Dict]:
+    """
+    Replace the previews of a stored output with the full offloaded values.
+
+    Returns:
+        The output with its full values and without `offloaded`; the output itself if
+        nothing was offloaded, or None if an offloaded value can't be loaded
+    """
+    if not output or not output.get("offloaded"):
+        return output
+
+    restored = copy.deepcopy(output)
+    offloaded = restored.pop("offloaded")
+    for reference in offloaded:
+        field = reference.get("field") or []
+        try:
+            if not isinstance(field, list) or not field:
+                raise ValueError(f"Invalid field path {field!r}")
+            *parents, name = field
+            container = restored
+            for part in parents:
+                container = container[part]
+            if isinstance(container, list):
+                if not isinstance(name, int) or not 0 <= name < len(container):
+                    raise IndexError(f"No item {name} in {_field_name(field)}")
+            elif name not in container:
+                raise KeyError(_field_name(field))
+            container[name] = _load(reference["path"])
+        except Exception as e:
+            logger.warning(f"Failed to restore offloaded value {field}: {str(e)}")
+            return None
+
+    return restored
@@ -2,6 +2,7 @@
 Parallel execution implementation for test cases using Celery chord.
 """
 
+import math
 from datetime import datetime
 from typing import Any, Dict, List
 
@@ -11,7 +12,13 @@ from sqlalchemy.orm import Session
 from rhesis.backend.app.models.test_configuration import TestConfiguration
 from rhesis.backend.app.models.test_run import TestRun
 from rhesis.backend.logging.rhesis_logger import logger
-from rhesis.backend.tasks.enums import ExecutionMode
+from rhesis.backend.tasks.enums import DEFAULT_BATCH_SOFT_TIME_LIMIT_PER_TEST, ExecutionMode
+from rhesis.backend.tasks.execution.batch import execute_test_batch
+from rhesis.backend.tasks.execution.modes import (
+    get_batch_concurrency,
+    get_batch_size,
+    get_evaluation_group_size,
+)
 from rhesis.backend.tasks.execution.results import collect_results
 from rhesis.backend.tasks.execution.shared import create_execution_result, update_test_run_start
 from rhesis.backend.tasks.execution.test import execute_single_test
@@ -23,20 +30,37 @@ def execute_tests_in_parallel(
     """Execute test cases in parallel using Celery workers with Redis native chord support."""
     logger.info(f"Starting parallel execution for test run {test_run.id} with {len(tests)} tests")
 
+    organization_id = str(test_config.organization_id) if test_config.organization_id else None
+    user_id = str(test_config.user_id) if test_config.user_id else None
+    batch_size = get_batch_size(test_config)
+
     # Create tasks for parallel execution
-    tasks = []
-    for test in tests:
-        task = execute_single_test.s(
-            test_config_id=str(test_config.id),
-            test_run_id=str(test_run.id),
-            test_id=str(test.id),
-            endpoint_id=str(test_config.endpoint_id),
-            organization_id=str(test_config.organization_id)
-            if test_config.organization_id
-            else None,
-            user_id=str(test_config.user_id) if test_config.user_id else None,
+    if batch_size > 1:
+        tasks = _create_batch_tasks(
+            test_config, test_run, tests, batch_size, organization_id, user_id
         )
-        tasks.append(task)
+        batch_attributes = {
+            "batch_size": batch_size,
+            "batch_concurrency": get_batch_concurrency(test_config),
+            "total_batches": len(tasks),
+        }
+        logger.info(
+            f"Batched parallel execution: {len(tests)} tests in {len(tasks)} tasks "
+            f"of up to {batch_size} tests"
+        )
+    else:
+        tasks = [
+            execute_single_test.s(
+                test_config_id=str(test_config.id),
+                test_run_id=str(test_run.id),
+                test_id=str(test.id),
+                endpoint_id=str(test_config.endpoint_id),
+                organization_id=organization_id,
+                user_id=user_id,
+            )
+            for test in tests
+        ]
+        batch_attributes = {}
 
     # Create callback task with correct parameters and context for collect_results
     # CRITICAL: For chord callbacks, Celery automatically passes results as first parameter
@@ -64,18 +88,53 @@ def execute_tests_in_parallel(
         session,
         test_run,
         ExecutionMode.PARALLEL,
-        len(tasks),
+        len(tests),
         start_time,
         chord_id=job.id,
         chord_parent_id=job.parent.id if job.parent else None,
+        **batch_attributes,
     )
 
     # Return standardized result using shared utility
     return create_execution_result(
         test_run,
         test_config,
-        len(tasks),
+        len(tests),
         ExecutionMode.PARALLEL,
         chord_id=job.id,
         chord_parent_id=job.parent.id if job.parent else None,
+        **batch_attributes,
     )
+
+
+def _create_batch_tasks(
+    test_config: TestConfiguration,
+    test_run: TestRun,
+    tests: List,
+    batch_size: int,
+    organization_id: str,
+    user_id: str,
+) -> List:
+    """Split tests into slices of batch_size and create one batch task signature per slice."""
+    concurrency = get_batch_concurrency(test_config)
+    evaluation_group_size = get_evaluation_group_size(test_config)
+    # Each batch runs ceil(batch_size / concurrency) tests back to back per worker thread
+    sequential_slots = math.ceil(batch_size / concurrency)
+    soft_time_limit = DEFAULT_BATCH_SOFT_TIME_LIMIT_PER_TEST * sequential_slots
+
+    tasks = []
+    for start in range(0, len(tests), batch_size):
+        test_ids = [str(test.id) for test in tests[start : start + batch_size]]
+        task = execute_test_batch.s(
+            test_config_id=str(test_config.id),
+            test_run_id=str(test_run.id),
+            test_ids=test_ids,
+            endpoint_id=str(test_config.endpoint_id),
+            organization_id=organization_id,
+            user_id=user_id,
+            concurrency=concurrency,
+            evaluation_group_size=evaluation_group_size,
+        ).set(soft_time_limit=soft_time_limit, time_limit=soft_time_limit * 2)
+        tasks.append(task)
+
+    return tasks
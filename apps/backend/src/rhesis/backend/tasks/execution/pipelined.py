@@ -0,0 +1,205 @@
+"""
+Pipelined execution implementation for test cases.
+
+A single orchestrating worker runs the execution stages of all tests as a pipeline:
+endpoint invocations run in a bounded pool (`max_in_flight`), and metric evaluation
+and result storage for finished invocations run in a separate pool
+(`evaluation_workers`). Evaluating one test therefore overlaps with invoking the
+next ones, while the load on the endpoint stays capped.
+"""
+
+import concurrent.futures
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy.orm import Session
+
+from rhesis.backend.app.database import get_db_with_tenant_variables
+from rhesis.backend.app.models.test_configuration import TestConfiguration
+from rhesis.backend.app.models.test_run import TestRun
+from rhesis.backend.logging.rhesis_logger import logger
+from rhesis.backend.tasks.enums import ExecutionMode
+from rhesis.backend.tasks.execution.modes import (
+    get_pipeline_evaluation_workers,
+    get_pipeline_max_in_flight,
+)
+from rhesis.backend.tasks.execution.shared import (
+    create_execution_result,
+    create_failure_result,
+    trigger_results_collection,
+    update_test_run_start,
+)
+from rhesis.backend.tasks.execution.test import resolve_evaluation_model
+from rhesis.backend.tasks.execution.test_execution import (
+    PreparedTest,
+    check_existing_result,
+    evaluate_and_store_test,
+    invoke_test,
+    prepare_test,
+)
+from rhesis.backend.tasks.utils import increment_test_run_progress
+
+
+def _prepare_and_invoke(
+    test_config_id: str,
+    test_run_id: str,
+    test_id: str,
+    endpoint_id: str,
+    organization_id: Optional[str],
+    user_id: Optional[str],
+) -> Union[PreparedTest, Dict[str, Any]]:
+    """Invocation stage: returns the invoked test, or the stored result if one exists."""
+    with get_db_with_tenant_variables(organization_id, user_id) as db:
+        existing_result = check_existing_result(
+            db, test_config_id, test_run_id, test_id, organization_id, user_id
+        )
+        if existing_result:
+            logger.info(f"Found existing result for test {test_id}")
+            return existing_result
+
+        prepared = prepare_test(db, test_config_id, test_run_id, test_id, organization_id, user_id)
+
+    # Invoke outside of the preparation transaction so no connection is held while waiting
+    with get_db_with_tenant_variables(organization_id, user_id) as db:
+        return invoke_test(db, prepared, endpoint_id)
+
+
+def _evaluate_and_store(
+    stage_result: Union[PreparedTest, Dict[str, Any]], model: Optional[Any]
+) -> Dict[str, Any]:
+    """Evaluation stage: evaluates metrics and stores the result of an invoked test."""
+    if not isinstance(stage_result, PreparedTest):
+        return stage_result
+
+    with get_db_with_tenant_variables(stage_result.organization_id, stage_result.user_id) as db:
+        return evaluate_and_store_test(db, stage_result, model)
+
+
+def _record_progress(
+    test_run_id: str,
+    test_id: str,
+    result: Dict[str, Any],
+    organization_id: Optional[str],
+    user_id: Optional[str],
+) -> None:
+    was_successful = result.get("status") != "failed"
+    try:
+        with get_db_with_tenant_variables(organization_id, user_id) as db:
+            increment_test_run_progress(
+                db=db,
+                test_run_id=test_run_id,
+                test_id=test_id,
+                was_successful=was_successful,
+                organization_id=organization_id,
+                user_id=user_id,
+            )
+    except Exception as e:
+        logger.error(f"Failed to update progress for test {test_id}: {str(e)}")
+
+
+def execute_tests_pipelined(
+    session: Session, test_config: TestConfiguration, test_run: TestRun, tests: List
+) -> Dict[str, Any]:
+    """Execute test cases in a single worker, pipelining invocation and evaluation."""
+    max_in_flight = get_pipeline_max_in_flight(test_config)
+    evaluation_workers = get_pipeline_evaluation_workers(test_config)
+    logger.info(
+        f"Starting pipelined execution for test run {test_run.id} with {len(tests)} tests "
+        f"(max_in_flight={max_in_flight}, evaluation_workers={evaluation_workers})"
+    )
+
+    start_time = datetime.utcnow()
+    test_config_id = str(test_config.id)
+    test_run_id = str(test_run.id)
+    endpoint_id = str(test_config.endpoint_id)
+    organization_id = str(test_config.organization_id) if test_config.organization_id else None
+    user_id = str(test_config.user_id) if test_config.user_id else None
+    test_ids = [str(test.id) for test in tests]
+
+    update_test_run_start(
+        session,
+        test_run,
+        ExecutionMode.PIPELINED,
+        len(tests),
+        start_time,
+        max_in_flight=max_in_flight,
+        evaluation_workers=evaluation_workers,
+    )
+
+    # Resolve the evaluation model once for the whole run
+    model = resolve_evaluation_model(session, user_id, f"test run {test_run_id}", organization_id)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(test_ids)
+    # Bound the number of tests between invocation and storage, so that invoked
+    # responses don't pile up in memory when evaluation is slower than the endpoint
+    pipeline_slots = threading.BoundedSemaphore(max_in_flight + 2 * evaluation_workers)
+
+    def finish(index: int, result: Dict[str, Any]) -> None:
+        results[index] = result
+        _record_progress(test_run_id, test_ids[index], result, organization_id, user_id)
+        pipeline_slots.release()
+
+    def run_evaluation(index: int, stage_result: Union[PreparedTest, Dict[str, Any]]) -> None:
+        try:
+            result = _evaluate_and_store(stage_result, model)
+        except Exception as e:
+            logger.error(f"Test {test_ids[index]} failed during evaluation: {str(e)}")
+            result = create_failure_result(test_ids[index], e)
+        finish(index, result)
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=evaluation_workers, thread_name_prefix="pipeline-evaluate"
+    ) as evaluation_pool:
+
+        def on_invoked(index: int, future: concurrent.futures.Future) -> None:
+            try:
+                stage_result = future.result()
+            except Exception as e:
+                logger.error(f"Test {test_ids[index]} failed during invocation: {str(e)}")
+                finish(index, create_failure_result(test_ids[index], e))
+                return
+            evaluation_pool.submit(run_evaluation, index, stage_result)
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="pipeline-invoke"
+        ) as invocation_pool:
+            for index, test_id in enumerate(test_ids):
+                pipeline_slots.acquire()
+                future = invocation_pool.submit(
+                    _prepare_and_invoke,
+                    test_config_id,
+                    test_run_id,
+                    test_id,
+                    endpoint_id,
+                    organization_id,
+                    user_id,
+                )
+                future.add_done_callback(lambda f, index=index: on_invoked(index, f))
+
+    end_time = datetime.utcnow()
+    execution_time = (end_time - start_time).total_seconds()
+    failed = sum(1 for result in results if result and result.get("status") == "failed")
+
+    logger.info(
+        f"Pipelined execution completed for test run {test_run.id} in {execution_time:.2f} "
+        f"seconds: {len(results) - failed} succeeded, {failed} failed"
+    )
+
+    # Trigger results collection to get the same processing as parallel execution
+    try:
+        collection_task = trigger_results_collection(test_config, test_run_id, results)
+        logger.info(f"Results collection task started: {collection_task.id}")
+    except Exception as e:
+        logger.error(f"Error triggering results collection: {str(e)}")
+
+    return create_execution_result(
+        test_run,
+        test_config,
+        len(tests),
+        ExecutionMode.PIPELINED,
+        execution_time=execution_time,
+        completed_at=end_time.isoformat(),
+        max_in_flight=max_in_flight,
+        evaluation_workers=evaluation_workers,
+    )
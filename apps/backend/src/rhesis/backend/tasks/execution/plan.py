@@ -0,0 +1,228 @@
+"""
+Run-scoped execution plan for test runs.
+
+At the start of a test run, all data that workers need to execute a test (prompt
+content, expected response and metric configurations) is loaded for the whole test
+set with a few set-based queries. The resulting plan is stored as a compact,
+compressed artifact in Redis keyed by the test run ID, so that workers can execute
+tests without querying tests, prompts, behaviors and metrics one by one.
+
+Workers read the plan through a small in-process cache. If the plan is missing (Redis
+unavailable, expired key, ...) execution falls back to the per-test database path.
+"""
+
+import copy
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from rhesis.backend.app.models.behavior import Behavior
+from rhesis.backend.app.models.metric import Metric
+from rhesis.backend.app.models.model import Model
+from rhesis.backend.app.models.test import Test, test_test_set_association
+from rhesis.backend.app.utils.redis_client import get_redis_client
+from rhesis.backend.logging.rhesis_logger import logger
+from rhesis.backend.tasks.execution.metrics_utils import create_metric_config_from_model
+
+PLAN_VERSION = 1
+PLAN_KEY_TEMPLATE = "rhesis:test_run:{test_run_id}:plan"
+PLAN_TTL_SECONDS = 24 * 60 * 60
+# Number of plans kept in memory per worker process
+PLAN_CACHE_SIZE = 16
+
+_plan_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def get_plan_key(test_run_id: str) -> str:
+    """Return the Redis key of the execution plan for a test run."""
+    return PLAN_KEY_TEMPLATE.format(test_run_id=test_run_id)
+
+
+# ============================================================================
+# PLAN CONSTRUCTION
+# ============================================================================
+
+
+def build_execution_plan(
+    session: Session, test_set_id: str, organization_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Load everything needed to execute the tests of a test set in set-based queries.
+
+    Metric configurations are computed once per behavior and shared by all tests
+    with that behavior.
+
+    Returns:
+        Dictionary with the plan version, a `tests` mapping (test ID to prompt data
+        and behavior ID) and a `behaviors` mapping (behavior ID to metric configs)
+    """
+    query = (
+        session.query(Test)
+        .join(test_test_set_association, Test.id == test_test_set_association.c.test_id)
+        .filter(test_test_set_association.c.test_set_id == UUID(str(test_set_id)))
+        .options(
+            joinedload(Test.prompt),
+            selectinload(Test.behavior)
+            .selectinload(Behavior.metrics)
+            .options(
+                joinedload(Metric.backend_type),
+                joinedload(Metric.model).joinedload(Model.provider_type),
+            ),
+        )
+    )
+    if organization_id:
+        query = query.filter(Test.organization_id == UUID(str(organization_id)))
+
+    tests: Dict[str, Dict[str, Any]] = {}
+    behaviors: Dict[str, list] = {}
+
+    for test in query.all():
+        prompt = test.prompt
+        if not prompt:
+            # Leave it to the per-test path to report the missing prompt
+            continue
+
+        behavior = test.behavior
+        behavior_id = str(behavior.id) if behavior else None
+        if behavior is not None and behavior_id not in behaviors:
+            raw_metrics = [create_metric_config_from_model(metric) for metric in behavior.metrics]
+            behaviors[behavior_id] = [metric for metric in raw_metrics if metric is not None]
+
+        tests[str(test.id)] = {
+            "prompt_id": str(test.prompt_id) if test.prompt_id else None,
+            "prompt_content": prompt.content,
+            "expected_response": prompt.expected_response or "",
+            "behavior_id": behavior_id,
+        }
+
+    logger.info(
+        f"Built execution plan for test set {test_set_id}: "
+        f"{len(tests)} tests, {len(behaviors)} behaviors"
+    )
+    return {"version": PLAN_VERSION, "tests": tests, "behaviors": behaviors}
+
+
+# ============================================================================
+# PLAN STORAGE
+# ============================================================================
+
+
+def _encode_plan(plan: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(plan, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def _decode_plan(payload: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+def _cache_plan(test_run_id: str, plan: Dict[str, Any]) -> None:
+    with _plan_cache_lock:
+        _plan_cache[test_run_id] = plan
+        _plan_cache.move_to_end(test_run_id)
+        while len(_plan_cache) > PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+
+
+def store_execution_plan(test_run_id: str, plan: Dict[str, Any]) -> bool:
+    """
+    Store the execution plan of a test run in Redis.
+
+    Returns:
+        True if the plan was stored, False if Redis is unavailable
+    """
+    test_run_id = str(test_run_id)
+    _cache_plan(test_run_id, plan)
+
+    client = get_redis_client()
+    if client is None:
+        return False
+
+    try:
+        payload = _encode_plan(plan)
+        client.set(get_plan_key(test_run_id), payload, ex=PLAN_TTL_SECONDS)
+        logger.debug(f"Stored execution plan for test run {test_run_id} ({len(payload)} bytes)")
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to store execution plan for test run {test_run_id}: {str(e)}")
+        return False
+
+
+def load_execution_plan(test_run_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the execution plan of a test run, from the in-process cache or Redis.
+
+    Returns:
+        The plan dictionary, or None if no usable plan is available
+    """
+    test_run_id = str(test_run_id)
+
+    with _plan_cache_lock:
+        plan = _plan_cache.get(test_run_id)
+        if plan is not None:
+            _plan_cache.move_to_end(test_run_id)
+            return plan
+
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    try:
+        payload = client.get(get_plan_key(test_run_id))
+        if payload is None:
+            return None
+        plan = _decode_plan(payload)
+    except Exception as e:
+        logger.warning(f"Failed to load execution plan for test run {test_run_id}: {str(e)}")
+        return None
+
+    if plan.get("version") != PLAN_VERSION:
+        logger.warning(f"Ignoring execution plan with unsupported version for run {test_run_id}")
+        return None
+
+    _cache_plan(test_run_id, plan)
+    return plan
+
+
+def get_plan_entry(test_run_id: str, test_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the prefetched data for a single test of a run.
+
+    Returns:
+        Dictionary with `prompt_id`, `prompt_content`, `expected_response` and
+        `metrics` (list of metric config dicts), or None if the test is not planned
+    """
+    plan = load_execution_plan(test_run_id)
+    if not plan:
+        return None
+
+    entry = plan.get("tests", {}).get(str(test_id))
+    if entry is None:
+        return None
+
+    behavior_id = entry.get("behavior_id")
+    metrics = plan.get("behaviors", {}).get(behavior_id, []) if behavior_id else []
+    # Copy so evaluation never mutates the configs shared through the cached plan
+    return {**entry, "metrics": copy.deepcopy(metrics)}
+
+
+def delete_execution_plan(test_run_id: str) -> None:
+    """Remove the execution plan of a test run from all caches."""
+    test_run_id = str(test_run_id)
+
+    with _plan_cache_lock:
+        _plan_cache.pop(test_run_id, None)
+
+    client = get_redis_client()
+    if client is None:
+        return
+
+    try:
+        client.delete(get_plan_key(test_run_id))
+    except Exception as e:
+        logger.warning(f"Failed to delete execution plan for test run {test_run_id}: {str(e)}")
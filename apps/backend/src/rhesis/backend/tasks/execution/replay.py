@@ -0,0 +1,422 @@
+"""
+Record/replay of endpoint outputs for metrics-only reruns.
+
+Replay is configured through test configuration attributes and works with all
+execution modes:
+
+- `replay_test_run_id`: reuse the `test_output` stored for each test in an earlier
+  test run instead of invoking the endpoint.
+- `response_cache`: record endpoint responses in a content-addressed Redis cache keyed
+  by organization, endpoint request configuration and input, and reuse them when the
+  same request is sent again.
+- `deduplicate_prompts`: tests of a run sending the same request share one endpoint
+  invocation. The first test to send a request invokes the endpoint while the others
+  wait for its response (single-flight), which is shared through Redis for the run.
+
+Tests without a replayable output are executed against the endpoint as usual.
+"""
+
+import hashlib
+import json
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy.orm import Session
+
+from rhesis.backend.app import crud
+from rhesis.backend.app.models.endpoint import Endpoint
+from rhesis.backend.app.models.test_configuration import TestConfiguration
+from rhesis.backend.app.models.test_result import TestResult
+from rhesis.backend.app.utils.redis_client import get_redis_client
+from rhesis.backend.logging.rhesis_logger import logger
+from rhesis.backend.tasks.execution.modes import get_replay_settings
+from rhesis.backend.tasks.execution.plan import load_execution_plan
+
+REPLAY_OUTPUTS_KEY_TEMPLATE = "rhesis:test_run:{test_run_id}:replay"
+RESPONSE_CACHE_KEY_TEMPLATE = "rhesis:response_cache:{organization_id}:{digest}"
+DEDUP_RESPONSE_KEY_TEMPLATE = "rhesis:test_run:{test_run_id}:dedup:{digest}"
+DEDUP_LOCK_KEY_TEMPLATE = "rhesis:test_run:{test_run_id}:dedup:{digest}:lock"
+REPLAY_OUTPUTS_TTL_SECONDS = 24 * 60 * 60
+RESPONSE_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+REPLAY_OUTPUTS_CHUNK_SIZE = 500
+# A test waiting for a duplicate request gives up and invokes the endpoint itself
+# after this long; the lock expires in case the invoking worker dies
+DEDUP_WAIT_SECONDS = 10 * 60
+DEDUP_LOCK_TTL_SECONDS = 10 * 60
+DEDUP_POLL_MIN_SECONDS = 0.1
+DEDUP_POLL_MAX_SECONDS = 2.0
+# Number of runs whose replay settings are kept in memory per worker process
+REPLAY_SETTINGS_CACHE_SIZE = 16
+
+# Endpoint fields that shape the request sent and the response mapped from it
+_FINGERPRINT_FIELDS = (
+    "protocol",
+    "url",
+    "method",
+    "endpoint_path",
+    "request_headers",
+    "query_params",
+    "request_body_template",
+    "input_mappings",
+    "response_format",
+    "response_mappings",
+)
+
+_settings_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_settings_cache_lock = threading.Lock()
+
+
+def _encode(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def _decode(payload: bytes) -> Any:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+# ============================================================================
+# RESPONSE CACHE
+# ============================================================================
+
+
+def get_endpoint_fingerprint(endpoint: Endpoint) -> str:
+    """Hash the endpoint configuration that determines the request and mapped response."""
+    config = {field: getattr(endpoint, field, None) for field in _FINGERPRINT_FIELDS}
+    config["id"] = str(endpoint.id)
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_response_cache_key(
+    organization_id: Optional[str], endpoint_fingerprint: str, input_data: Dict[str, Any]
+) -> str:
+    """Return the content-addressed cache key of an endpoint request."""
+    request = json.dumps(
+        {"endpoint": endpoint_fingerprint, "input": input_data}, sort_keys=True, default=str
+    )
+    digest = hashlib.sha256(request.encode("utf-8")).hexdigest()
+    return RESPONSE_CACHE_KEY_TEMPLATE.format(
+        organization_id=organization_id or "global", digest=digest
+    )
+
+
+def get_cached_response(
+    organization_id: Optional[str], endpoint_fingerprint: str, input_data: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Look up a recorded endpoint response.
+
+    Returns:
+        The recorded response, or None on a cache miss or if Redis is unavailable
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    try:
+        key = get_response_cache_key(organization_id, endpoint_fingerprint, input_data)
+        payload = client.get(key)
+        return _decode(payload) if payload is not None else None
+    except Exception as e:
+        logger.warning(f"Failed to read response cache: {str(e)}")
+        return None
+
+
+def cache_response(
+    organization_id: Optional[str],
+    endpoint_fingerprint: str,
+    input_data: Dict[str, Any],
+    response: Dict[str, Any],
+) -> bool:
+    """
+    Record an endpoint response. Error responses are never recorded.
+
+    Returns:
+        True if the response was recorded
+    """
+    if not response or response.get("error"):
+        return False
+
+    client = get_redis_client()
+    if client is None:
+        return False
+
+    try:
+        client.set(
+            get_response_cache_key(organization_id, endpoint_fingerprint, input_data),
+            _encode(response),
+            ex=RESPONSE_CACHE_TTL_SECONDS,
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to record response in cache: {str(e)}")
+        return False
+
+
+# ============================================================================
+# REPLAY FROM AN EARLIER TEST RUN
+# ============================================================================
+
+
+def _query_source_outputs(
+    db: Session, source_test_run_id: str, organization_id: Optional[str], test_id: str = None
+):
+    query = db.query(TestResult.test_id, TestResult.test_output).filter(
+        TestResult.test_run_id == UUID(source_test_run_id),
+        TestResult.deleted_at.is_(None),
+        TestResult.test_output.isnot(None),
+    )
+    if organization_id:
+        query = query.filter(TestResult.organization_id == UUID(str(organization_id)))
+    if test_id:
+        query = query.filter(TestResult.test_id == UUID(str(test_id)))
+    # Later results win if a test was stored more than once
+    return query.order_by(TestResult.created_at)
+
+
+def prepare_replay_outputs(
+    db: Session, test_run_id: str, source_test_run_id: str, organization_id: Optional[str]
+) -> int:
+    """
+    Load the outputs of the source run in one query and cache them for the workers.
+
+    Returns:
+        Number of outputs available for replay
+    """
+    outputs = {
+        str(test_id): output
+        for test_id, output in _query_source_outputs(db, source_test_run_id, organization_id)
+    }
+
+    client = get_redis_client()
+    if client is None or not outputs:
+        return len(outputs)
+
+    key = REPLAY_OUTPUTS_KEY_TEMPLATE.format(test_run_id=test_run_id)
+    items = list(outputs.items())
+    try:
+        pipe = client.pipeline(transaction=False)
+        for start in range(0, len(items), REPLAY_OUTPUTS_CHUNK_SIZE):
+            chunk = items[start : start + REPLAY_OUTPUTS_CHUNK_SIZE]
+            pipe.hset(key, mapping={test_id: _encode(output) for test_id, output in chunk})
+        pipe.expire(key, REPLAY_OUTPUTS_TTL_SECONDS)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to cache replay outputs for test run {test_run_id}: {str(e)}")
+
+    return len(outputs)
+
+
+def get_replay_output(
+    db: Session,
+    test_run_id: str,
+    source_test_run_id: str,
+    test_id: str,
+    organization_id: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Get the output recorded for a test in the replay source run.
+
+    Returns:
+        The stored endpoint output, or None if the source run has no output for the test
+    """
+    client = get_redis_client()
+    if client is not None:
+        try:
+            payload = client.hget(
+                REPLAY_OUTPUTS_KEY_TEMPLATE.format(test_run_id=test_run_id), str(test_id)
+            )
+            if payload is not None:
+                return _decode(payload)
+        except Exception as e:
+            logger.warning(f"Failed to read replay output for test {test_id}: {str(e)}")
+
+    row = (
+        _query_source_outputs(db, source_test_run_id, organization_id, test_id=test_id)
+        .order_by(None)
+        .order_by(TestResult.created_at.desc())
+        .first()
+    )
+    return row.test_output if row else None
+
+
+# ============================================================================
+# PROMPT DEDUPLICATION WITHIN A RUN
+# ============================================================================
+
+
+def _get_request_digest(input_data: Dict[str, Any]) -> str:
+    request = json.dumps(input_data, sort_keys=True, default=str)
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+
+def get_duplicate_statistics(plan: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Count the tests of an execution plan that send the same request as another test.
+
+    Returns:
+        Dictionary with the number of tests, unique requests and duplicate tests
+    """
+    requests = Counter(entry["prompt_content"] for entry in plan.get("tests", {}).values())
+    total = sum(requests.values())
+    return {
+        "total_tests": total,
+        "unique_requests": len(requests),
+        "duplicate_tests": total - len(requests),
+    }
+
+
+def invoke_deduplicated(
+    test_run_id: str, input_data: Dict[str, Any], invoke: Callable[[], Dict[str, Any]]
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Invoke the endpoint once per distinct request of a run.
+
+    The first caller for a request invokes the endpoint and shares its response with
+    the run; concurrent callers for the same request wait for it. Error responses are
+    not shared, so a waiting caller takes over and invokes the endpoint itself.
+
+    Returns:
+        Tuple of (response, shared) where shared is True if the response was sent for
+        another test of the run
+    """
+    client = get_redis_client()
+    if client is None:
+        return invoke(), False
+
+    digest = _get_request_digest(input_data)
+    response_key = DEDUP_RESPONSE_KEY_TEMPLATE.format(test_run_id=test_run_id, digest=digest)
+    lock_key = DEDUP_LOCK_KEY_TEMPLATE.format(test_run_id=test_run_id, digest=digest)
+    deadline = time.monotonic() + DEDUP_WAIT_SECONDS
+    delay = DEDUP_POLL_MIN_SECONDS
+
+    locked = False
+    try:
+        while True:
+            payload = client.get(response_key)
+            if payload is not None:
+                return _decode(payload), True
+
+            locked = bool(client.set(lock_key, "1", nx=True, ex=DEDUP_LOCK_TTL_SECONDS))
+            if locked:
+                break
+
+            if time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting for duplicate request in run {test_run_id}")
+                break
+
+            time.sleep(delay)
+            delay = min(delay * 2, DEDUP_POLL_MAX_SECONDS)
+    except Exception as e:
+        logger.warning(f"Prompt deduplication unavailable for run {test_run_id}: {str(e)}")
+
+    if not locked:
+        return invoke(), False
+
+    try:
+        response = invoke()
+        if response and not response.get("error"):
+            try:
+                client.set(response_key, _encode(response), ex=REPLAY_OUTPUTS_TTL_SECONDS)
+            except RedisError as e:
+                logger.warning(f"Failed to share response in run {test_run_id}: {str(e)}")
+        return response, False
+    finally:
+        try:
+            client.delete(lock_key)
+        except RedisError as e:
+            logger.warning(f"Failed to release deduplication lock in run {test_run_id}: {e}")
+
+
+# ============================================================================
+# RUN SETTINGS
+# ============================================================================
+
+
+def _resolve_replay_settings(
+    db: Session, test_config: TestConfiguration, organization_id: Optional[str]
+) -> Dict[str, Any]:
+    settings = get_replay_settings(test_config)
+    settings["endpoint_fingerprint"] = None
+
+    if settings["response_cache"]:
+        endpoint = crud.get_endpoint(
+            db, test_config.endpoint_id, organization_id=organization_id, user_id=None
+        )
+        if endpoint:
+            settings["endpoint_fingerprint"] = get_endpoint_fingerprint(endpoint)
+        else:
+            settings["response_cache"] = False
+
+    return settings
+
+
+def prepare_replay(
+    db: Session, test_config: TestConfiguration, test_run_id: str
+) -> Dict[str, Any]:
+    """
+    Resolve the replay settings of a run and preload the outputs of the source run.
+
+    Returns:
+        Replay settings to be shared with the workers through the execution plan
+    """
+    organization_id = str(test_config.organization_id) if test_config.organization_id else None
+    settings = _resolve_replay_settings(db, test_config, organization_id)
+
+    if settings["source_test_run_id"]:
+        count = prepare_replay_outputs(
+            db, test_run_id, settings["source_test_run_id"], organization_id
+        )
+        logger.info(
+            f"Replaying {count} outputs from test run {settings['source_test_run_id']} "
+            f"in test run {test_run_id}"
+        )
+
+    return settings
+
+
+def get_run_replay_settings(
+    db: Session, test_run_id: str, test_config_id: str, organization_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get the replay settings of a run, from the execution plan or the test configuration.
+
+    Returns:
+        Dictionary with `source_test_run_id`, `response_cache`, `deduplicate_prompts` and
+        `endpoint_fingerprint`
+    """
+    test_run_id = str(test_run_id)
+
+    with _settings_cache_lock:
+        settings = _settings_cache.get(test_run_id)
+    if settings is not None:
+        return settings
+
+    plan = load_execution_plan(test_run_id)
+    settings = plan.get("replay") if plan else None
+
+    if settings is None:
+        test_config = crud.get_test_configuration(
+            db, UUID(str(test_config_id)), organization_id=organization_id
+        )
+        if test_config is None:
+            settings = {
+                "source_test_run_id": None,
+                "response_cache": False,
+                "deduplicate_prompts": False,
+                "endpoint_fingerprint": None,
+            }
+        else:
+            settings = _resolve_replay_settings(db, test_config, organization_id)
+
+    with _settings_cache_lock:
+        _settings_cache[test_run_id] = settings
+        while len(_settings_cache) > REPLAY_SETTINGS_CACHE_SIZE:
+            _settings_cache.popitem(last=False)
+
+    return settings
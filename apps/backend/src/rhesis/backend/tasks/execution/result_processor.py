@@ -6,40 +6,104 @@ calculating statistics, determining status, and formatting data for reporting.
 """
 
 from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, text
+from sqlalchemy.orm import Session
 
 from rhesis.backend.app import crud
+from rhesis.backend.app.models.status import Status
+from rhesis.backend.app.models.test_result import TestResult
 from rhesis.backend.app.models.test_run import TestRun
+from rhesis.backend.app.utils.phase_timer import summarize_timings
 from rhesis.backend.tasks.enums import RunStatus
+from rhesis.backend.tasks.progress import get_test_run_progress
 from rhesis.backend.tasks.utils import format_execution_time, format_execution_time_from_ms
 
+# Per-metric pass counts over the metric results stored in test_result.test_metrics
+_METRIC_BREAKDOWN_SQL = text(
+    """
+    SELECT m.key AS name,
+           COUNT(*) AS total,
+           COUNT(*) FILTER (WHERE m.value->>'is_successful' = 'true') AS passed
+    FROM test_result AS tr
+    CROSS JOIN LATERAL jsonb_each(
+        CASE
+            WHEN jsonb_typeof(tr.test_metrics->'metrics') = 'object'
+            THEN tr.test_metrics->'metrics'
+            ELSE '{}'::jsonb
+        END
+    ) AS m(key, value)
+    WHERE tr.test_run_id = CAST(:test_run_id AS uuid) AND tr.deleted_at IS NULL
+    GROUP BY m.key
+    ORDER BY m.key
+    """
+)
+
+
+def get_result_counts(db: Session, test_run_id: str) -> Tuple[int, int, int]:
+    """
+    Count the results of a test run by status with a single aggregate query.
+
+    Returns:
+        Tuple of (total_results, results_passed, results_failed)
+    """
+    total, passed, failed = (
+        db.query(
+            func.count(TestResult.id),
+            func.count(case((Status.name == "passed", 1))),
+            func.count(case((Status.name == "failed", 1))),
+        )
+        .select_from(TestResult)
+        .outerjoin(Status, TestResult.status_id == Status.id)
+        .filter(TestResult.test_run_id == test_run_id, TestResult.deleted_at.is_(None))
+        .one()
+    )
+    return total or 0, passed or 0, failed or 0
+
+
+def get_metric_breakdown(db: Session, test_run_id: str) -> List[Dict[str, Any]]:
+    """
+    Aggregate pass/fail counts per metric across all results of a test run.
+
+    Returns:
+        List of dictionaries with `name`, `total`, `passed`, `failed` and `pass_rate`
+        (percentage), ordered by metric name
+    """
+    rows = db.execute(_METRIC_BREAKDOWN_SQL, {"test_run_id": str(test_run_id)}).all()
+    return [
+        {
+            "name": row.name,
+            "total": row.total,
+            "passed": row.passed,
+            "failed": row.total - row.passed,
+            "pass_rate": round(row.passed / row.total * 100, 1) if row.total else 0.0,
+        }
+        for row in rows
+    ]
 
-def get_test_statistics(test_run: TestRun) -> Tuple[int, int, int]:
+
+def get_test_statistics(db: Session, test_run: TestRun) -> Tuple[int, int, int]:
     """
     Calculate test statistics from test run data.
 
+    Results are counted in the database, so test results are never loaded.
+
     Args:
+        db: Database session
         test_run: The test run to analyze
 
     Returns:
         Tuple of (total_tests, tests_passed, tests_failed)
     """
-    # Get all test results for this test run
-    test_results = test_run.test_results or []
+    total_tests, tests_passed, tests_failed = get_result_counts(db, test_run.id)
 
-    # Calculate summary statistics from test results
-    total_tests = len(test_results)
-    tests_passed = sum(
-        1 for result in test_results if result.status and result.status.name == "passed"
-    )
-    tests_failed = sum(
-        1 for result in test_results if result.status and result.status.name == "failed"
-    )
-
-    # Check attributes for more accurate counts (updated by individual test tasks)
+    # Check progress counters for more accurate counts (updated by individual test tasks).
+    # Live counters in Redis take precedence over the periodically flushed attributes.
     if test_run.attributes and isinstance(test_run.attributes, dict):
-        attr_completed = test_run.attributes.get("completed_tests", 0)
-        attr_failed = test_run.attributes.get("failed_tests", 0)
+        progress = get_test_run_progress(str(test_run.id)) or test_run.attributes
+        attr_completed = progress.get("completed_tests", 0)
+        attr_failed = progress.get("failed_tests", 0)
         attr_total = test_run.attributes.get("total_tests", total_tests)
 
         # Use attribute counts if they seem more accurate
@@ -192,6 +256,7 @@ def update_test_run_status(
     completion_time: datetime,
     execution_time: Optional[str],
     logger_func,
+    phase_timings: Optional[Dict[str, Dict[str, float]]] = None,
 ) -> None:
     """
     Update the test run with final status and completion information.
@@ -203,6 +268,7 @@ def update_test_run_status(
         completion_time: The completion time
         execution_time: The calculated execution time
         logger_func: Logging function for debug messages
+        phase_timings: Per-phase timing percentiles of the run's tests
     """
     from rhesis.backend.app.utils.crud_utils import get_or_create_status
 
@@ -228,6 +294,8 @@ def update_test_run_status(
             "updated_at": completion_time_iso,
         }
     )
+    if phase_timings:
+        updated_attributes["phase_timings"] = phase_timings
 
     # Add total_execution_time_ms for future clients if we calculated it
     if execution_time and updated_attributes.get("started_at"):
@@ -296,6 +364,8 @@ def build_summary_data(
     endpoint_url: str,
     project_name: str,
     completion_time: datetime,
+    metrics_summary: Optional[List[Dict[str, Any]]] = None,
+    phase_timings: Optional[Dict[str, Dict[str, float]]] = None,
 ) -> Dict[str, Any]:
     """
     Build the summary data dictionary to return from the task.
@@ -312,6 +382,8 @@ def build_summary_data(
         endpoint_url: URL of the endpoint
         project_name: Name of the project
         completion_time: Completion timestamp
+        metrics_summary: Per-metric pass/fail breakdown
+        phase_timings: Per-phase timing percentiles of the run's tests
 
     Returns:
         Dictionary containing test execution summary
@@ -329,6 +401,8 @@ def build_summary_data(
         "endpoint_url": endpoint_url,
         "project_name": project_name,
         "completed_at": completion_time.strftime("%Y-%m-%d %H:%M:%S"),
+        "metrics_summary": metrics_summary or [],
+        "phase_timings": phase_timings or {},
     }
 
 
@@ -350,7 +424,12 @@ class TestRunProcessor:
         self.logger_func = logger_func
 
     def process_test_run_results(
-        self, db, test_run: TestRun, test_run_id: str, completion_time: datetime
+        self,
+        db,
+        test_run: TestRun,
+        test_run_id: str,
+        completion_time: datetime,
+        results: Optional[List[Dict[str, Any]]] = None,
     ) -> Dict[str, Any]:
         """
         Process all aspects of test run result collection.
@@ -360,12 +439,13 @@ class TestRunProcessor:
             test_run: The test run to process
             test_run_id: ID of the test run
             completion_time: When the processing completed
+            results: Per-test results of the execution tasks, used for timing percentiles
 
         Returns:
             Dictionary containing test execution summary
         """
         # Calculate test statistics
-        total_tests, tests_passed, tests_failed = get_test_statistics(test_run)
+        total_tests, tests_passed, tests_failed = get_test_statistics(db, test_run)
         self.logger_func(
             "debug",
             f"Test statistics: total={total_tests}, passed={tests_passed}, failed={tests_failed}",
@@ -377,6 +457,16 @@ class TestRunProcessor:
         )
         self.logger_func("info", f"Determined status: {overall_status} (email: {email_status})")
 
+        # Aggregate per-metric results for the summary
+        metrics_summary = get_metric_breakdown(db, test_run_id)
+        self.logger_func("debug", f"Metric breakdown: {metrics_summary}")
+
+        # Aggregate per-phase timings (p50/p95/p99) of the executed tests
+        phase_timings = summarize_timings(
+            result.get("timings") for result in results or [] if isinstance(result, dict)
+        )
+        self.logger_func("debug", f"Phase timings: {phase_timings}")
+
         # Get test context information
         test_configuration = test_run.test_configuration
         test_set_name, endpoint_name, endpoint_url, project_name = get_test_context(
@@ -388,7 +478,13 @@ class TestRunProcessor:
 
         # Update test run status and attributes
         update_test_run_status(
-            db, test_run, overall_status, completion_time, execution_time, self.logger_func
+            db,
+            test_run,
+            overall_status,
+            completion_time,
+            execution_time,
+            self.logger_func,
+            phase_timings,
         )
 
         # Build and return summary data
@@ -404,4 +500,6 @@ class TestRunProcessor:
             endpoint_url,
             project_name,
             completion_time,
+            metrics_summary,
+            phase_timings,
         )
@@ -3,7 +3,7 @@ Task for collecting and processing test execution results.
 """
 
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List
 from uuid import UUID
 
 from rhesis.backend.app import crud
@@ -11,9 +11,29 @@ from rhesis.backend.app.database import get_db_with_tenant_variables
 from rhesis.backend.notifications.email.template_service import EmailTemplate
 from rhesis.backend.tasks.base import BaseTask, email_notification
 from rhesis.backend.tasks.execution.result_processor import TestRunProcessor
+from rhesis.backend.tasks.progress import flush_test_run_progress
 from rhesis.backend.worker import app
 
 
+def flatten_results(results: Any) -> List[Dict[str, Any]]:
+    """
+    Flatten chord results into a flat list of per-test result dicts.
+
+    Batch tasks return a list of per-test results, so a chord over batch tasks
+    yields a list of lists. Single-test tasks yield dicts, which are kept as-is.
+    """
+    if not results:
+        return []
+
+    flattened = []
+    for result in results:
+        if isinstance(result, list):
+            flattened.extend(result)
+        else:
+            flattened.append(result)
+    return flattened
+
+
 @email_notification(
     template=EmailTemplate.TEST_EXECUTION_SUMMARY,
     subject_template="Test Execution Complete: {test_set_name} - {status}",
@@ -38,7 +58,7 @@ def collect_results(self, *args, **kwargs) -> Dict[str, Any]:
 
     # Extract results from args (should be first argument)
     if len(args) >= 1:
-        results = args[0]
+        results = flatten_results(args[0])
     else:
         results = []
         self.log_with_context("warning", "No results received in chord callback")
@@ -60,6 +80,9 @@ def collect_results(self, *args, **kwargs) -> Dict[str, Any]:
     try:
         # Use tenant-aware database session with explicit organization_id and user_id
         with get_db_with_tenant_variables(org_id or "", user_id or "") as db:
+            # Write the final progress counters before the run is loaded and summarized
+            flush_test_run_progress(db, test_run_id, organization_id=org_id)
+
             # Get test run with tenant context
             test_run = crud.get_test_run(
                 db, UUID(test_run_id), organization_id=org_id, user_id=user_id
@@ -73,7 +96,7 @@ def collect_results(self, *args, **kwargs) -> Dict[str, Any]:
             # Process test run results using the dedicated processor
             processor = TestRunProcessor(self.log_with_context)
             summary_data = processor.process_test_run_results(
-                db, test_run, test_run_id, completion_time
+                db, test_run, test_run_id, completion_time, results
             )
 
             self.log_with_context("info", f"Test run update completed for: {test_run_id}")
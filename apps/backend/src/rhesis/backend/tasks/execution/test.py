@@ -1,6 +1,15 @@
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+
 from rhesis.backend.app import crud
 from rhesis.backend.app.database import get_db_with_tenant_variables
-from rhesis.backend.app.utils.llm_utils import get_user_evaluation_model
+from rhesis.backend.app.utils.llm_utils import (
+    cache_evaluation_model,
+    get_cached_evaluation_model,
+    get_model_settings_version,
+    get_user_evaluation_model,
+)
 from rhesis.backend.logging.rhesis_logger import logger
 from rhesis.backend.tasks.base import SilentTask
 from rhesis.backend.tasks.execution.test_execution import execute_test
@@ -8,6 +17,89 @@ from rhesis.backend.tasks.utils import increment_test_run_progress
 from rhesis.backend.worker import app
 
 
+def resolve_evaluation_model(
+    db: Session, user_id: Optional[str], test_id: str, organization_id: Optional[str] = None
+) -> Optional[Any]:
+    """
+    Resolve the user's configured evaluation model for metric evaluation.
+
+    Resolved models are cached per worker process, keyed by organization and user and
+    validated against the organization's model settings version, so that a test run
+    doesn't look up the user and model and construct a new client for every test.
+
+    Falls back to None (system default model) if the user or model cannot be found.
+
+    Args:
+        db: Database session
+        user_id: UUID string of the user executing the test
+        test_id: Test ID (or batch label) used for log context
+        organization_id: UUID string of the user's organization (enables caching)
+
+    Returns:
+        A provider name string, a configured BaseLLM instance, or None
+    """
+    settings_version = None
+    if organization_id and user_id:
+        cached = get_cached_evaluation_model(organization_id, user_id)
+        if cached is not None:
+            model_id, model = cached
+            logger.debug(
+                f"[MODEL_SELECTION] Using cached evaluation model for test {test_id}: id={model_id}"
+            )
+            return model
+        settings_version = get_model_settings_version(organization_id)
+
+    model = None
+    try:
+        user = crud.get_user(db, user_id=user_id)
+        if user:
+            # Get model settings to log the model name
+            model_settings = user.settings.models.evaluation
+            model_id = model_settings.model_id
+
+            # Fetch the actual model
+            model = get_user_evaluation_model(db, user)
+
+            # Log detailed model selection information
+            if isinstance(model, str):
+                logger.info(f"[MODEL_SELECTION] Using default provider '{model}' for test {test_id}")
+            else:
+                # It's a BaseLLM instance - log detailed info
+                provider = model.model_name.split('/')[0] if '/' in model.model_name else 'unknown'
+                model_name = model.model_name.split('/')[1] if '/' in model.model_name else model.model_name
+
+                # Try to get the user-friendly name from database
+                if model_id:
+                    db_model = crud.get_model(db, model_id=str(model_id), organization_id=str(user.organization_id))
+                    if db_model:
+                        logger.info(
+                            f"[MODEL_SELECTION] Using user-configured model for test {test_id}: "
+                            f"name='{db_model.name}', provider={provider}, model={model_name}, id={model_id}"
+                        )
+                    else:
+                        logger.info(
+                            f"[MODEL_SELECTION] Using evaluation model for test {test_id}: "
+                            f"provider={provider}, model={model_name}, id={model_id}"
+                        )
+                else:
+                    logger.info(
+                        f"[MODEL_SELECTION] Using evaluation model for test {test_id}: "
+                        f"provider={provider}, model={model_name}"
+                    )
+
+            if organization_id and str(user.organization_id) == str(organization_id):
+                cache_evaluation_model(
+                    organization_id, user_id, model_id, model, version=settings_version
+                )
+        else:
+            logger.warning(f"[MODEL_SELECTION] User {user_id} not found, will use default model")
+    except Exception as e:
+        logger.warning(f"[MODEL_SELECTION] Error fetching user model for test {test_id}: {str(e)}, will use default")
+        return None
+
+    return model
+
+
 @app.task(
     name="rhesis.backend.tasks.execute_single_test",
     base=SilentTask,
@@ -44,49 +136,8 @@ def execute_single_test(
         # Use tenant-aware database session with explicit organization_id and user_id
         with get_db_with_tenant_variables(organization_id, user_id) as db:
             # Fetch user's evaluation model for metrics
-            model = None
-            try:
-                user = crud.get_user(db, user_id=user_id)
-                if user:
-                    # Get model settings to log the model name
-                    model_settings = user.settings.models.evaluation
-                    model_id = model_settings.model_id
-                    
-                    # Fetch the actual model
-                    model = get_user_evaluation_model(db, user)
-                    
-                    # Log detailed model selection information
-                    if isinstance(model, str):
-                        logger.info(f"[MODEL_SELECTION] Using default provider '{model}' for test {test_id}")
-                    else:
-                        # It's a BaseLLM instance - log detailed info
-                        provider = model.model_name.split('/')[0] if '/' in model.model_name else 'unknown'
-                        model_name = model.model_name.split('/')[1] if '/' in model.model_name else model.model_name
-                        
-                        # Try to get the user-friendly name from database
-                        if model_id:
-                            db_model = crud.get_model(db, model_id=str(model_id), organization_id=str(user.organization_id))
-                            if db_model:
-                                logger.info(
-                                    f"[MODEL_SELECTION] Using user-configured model for test {test_id}: "
-                                    f"name='{db_model.name}', provider={provider}, model={model_name}, id={model_id}"
-                                )
-                            else:
-                                logger.info(
-                                    f"[MODEL_SELECTION] Using evaluation model for test {test_id}: "
-                                    f"provider={provider}, model={model_name}, id={model_id}"
-                                )
-                        else:
-                            logger.info(
-                                f"[MODEL_SELECTION] Using evaluation model for test {test_id}: "
-                                f"provider={provider}, model={model_name}"
-                            )
-                else:
-                    logger.warning(f"[MODEL_SELECTION] User {user_id} not found, will use default model")
-            except Exception as e:
-                logger.warning(f"[MODEL_SELECTION] Error fetching user model for test {test_id}: {str(e)}, will use default")
-                model = None
-            
+            model = resolve_evaluation_model(db, user_id, test_id, organization_id)
+
             # Call the main execution function from the dedicated module
             result = execute_test(
                 db=db,
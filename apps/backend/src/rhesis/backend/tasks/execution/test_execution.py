@@ -10,6 +10,7 @@ This module handles the execution of individual tests, including:
 """
 
 import copy
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
@@ -22,13 +23,30 @@ from rhesis.backend.app.database import get_db
 from rhesis.backend.app.dependencies import get_endpoint_service
 from rhesis.backend.app.models.test import Test
 from rhesis.backend.app.utils.crud_utils import get_or_create_status
+from rhesis.backend.app.utils.phase_timer import PhaseTimer
 from rhesis.backend.logging.rhesis_logger import logger
 from rhesis.backend.metrics.base import MetricConfig
 from rhesis.backend.metrics.config import load_default_metrics
 from rhesis.backend.metrics.evaluator import MetricEvaluator
 from rhesis.backend.tasks.enums import ResultStatus
-from rhesis.backend.tasks.execution.evaluation import evaluate_prompt_response
+from rhesis.backend.tasks.execution.evaluation import (
+    evaluate_prompt_response,
+    evaluate_prompt_responses,
+)
 from rhesis.backend.tasks.execution.metrics_utils import create_metric_config_from_model
+from rhesis.backend.tasks.execution.modes import get_evaluation_settings
+from rhesis.backend.tasks.execution.output_offload import (
+    offload_large_fields,
+    restore_offloaded_fields,
+)
+from rhesis.backend.tasks.execution.plan import get_plan_entry, load_execution_plan
+from rhesis.backend.tasks.execution.replay import (
+    cache_response,
+    get_cached_response,
+    get_replay_output,
+    get_run_replay_settings,
+    invoke_deduplicated,
+)
 from rhesis.backend.tasks.execution.response_extractor import extract_response_with_fallback
 
 # ============================================================================
@@ -103,6 +121,36 @@ def get_test_metrics(test: Test) -> List[Dict]:
     return metrics
 
 
+def get_test_execution_data(
+    db: Session, test_run_id: str, test_id: str, organization_id: Optional[str] = None
+) -> Tuple[Optional[str], str, str, List[Dict]]:
+    """
+    Retrieve the prompt and metric configurations needed to execute a test.
+
+    Uses the run-scoped execution plan when available and falls back to loading
+    the test, prompt, behavior and metrics from the database.
+
+    Returns:
+        Tuple of (prompt_id, prompt_content, expected_response, metrics)
+    """
+    plan_entry = get_plan_entry(test_run_id, test_id)
+    if plan_entry:
+        metrics = plan_entry["metrics"]
+        if not metrics:
+            logger.warning(f"No valid metrics found for test {test_id}, using defaults")
+            metrics = load_default_metrics()
+        return (
+            plan_entry["prompt_id"],
+            plan_entry["prompt_content"],
+            plan_entry["expected_response"],
+            metrics,
+        )
+
+    test, prompt_content, expected_response = get_test_and_prompt(db, test_id, organization_id)
+    prompt_id = str(test.prompt_id) if test.prompt_id else None
+    return prompt_id, prompt_content, expected_response, get_test_metrics(test)
+
+
 def check_existing_result(
     db: Session, test_config_id: str, test_run_id: str, test_id: str, organization_id: str = None, user_id: str = None
 ) -> Optional[Dict[str, Any]]:
@@ -118,6 +166,7 @@ def check_existing_result(
         "test_id": test_id,
         "execution_time": existing_result.test_metrics.get("execution_time"),
         "metrics": existing_result.test_metrics.get("metrics", {}),
+        "timings": existing_result.test_metrics.get("timings", {}),
     }
 
 
@@ -161,6 +210,89 @@ def prepare_metric_configs(metrics: List[Dict], test_id: str) -> List[MetricConf
     return metric_configs
 
 
+# ============================================================================
+# ENDPOINT INVOCATION
+# ============================================================================
+
+
+def get_endpoint_response(
+    db: Session,
+    test_config_id: str,
+    test_run_id: str,
+    test_id: str,
+    endpoint_id: str,
+    input_data: Dict[str, Any],
+    organization_id: Optional[str] = None,
+) -> Tuple[Dict, Optional[str]]:
+    """
+    Get the endpoint response for a test, replaying a recorded output when configured.
+
+    Returns:
+        Tuple of (response, replay_source) where replay_source describes where a
+        replayed response came from ("deduplicated" if it was sent for another test of
+        the run), or is None if the endpoint was invoked for this test
+    """
+    replay = get_run_replay_settings(db, test_run_id, test_config_id, organization_id)
+
+    replayed = get_replayed_response(db, replay, test_run_id, test_id, input_data, organization_id)
+    if replayed[0] is not None:
+        return replayed
+
+    fingerprint = replay.get("endpoint_fingerprint") if replay.get("response_cache") else None
+
+    def invoke() -> Dict:
+        return get_endpoint_service().invoke_endpoint(
+            db=db, endpoint_id=endpoint_id, input_data=input_data, organization_id=organization_id
+        )
+
+    replay_source = None
+    if replay.get("deduplicate_prompts"):
+        result, shared = invoke_deduplicated(test_run_id, input_data, invoke)
+        if shared:
+            replay_source = "deduplicated"
+    else:
+        result = invoke()
+
+    if fingerprint and not replay_source:
+        cache_response(organization_id, fingerprint, input_data, result)
+
+    return result, replay_source
+
+
+def get_replayed_response(
+    db: Session,
+    replay: Dict[str, Any],
+    test_run_id: str,
+    test_id: str,
+    input_data: Dict[str, Any],
+    organization_id: Optional[str] = None,
+) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Get the recorded output of a test from the run's replay source or response cache.
+
+    Returns:
+        Tuple of (response, replay_source), or (None, None) if the endpoint must be invoked
+    """
+    source_test_run_id = replay.get("source_test_run_id")
+    if source_test_run_id:
+        output = get_replay_output(db, test_run_id, source_test_run_id, test_id, organization_id)
+        # Stored outputs keep previews of offloaded values; replay them in full only
+        output = restore_offloaded_fields(output)
+        if output is not None:
+            return output, f"test_run:{source_test_run_id}"
+        logger.info(f"No complete output to replay for test {test_id}, invoking endpoint")
+
+    fingerprint = replay.get("endpoint_fingerprint") if replay.get("response_cache") else None
+    if fingerprint:
+        cached = restore_offloaded_fields(
+            get_cached_response(organization_id, fingerprint, input_data)
+        )
+        if cached is not None:
+            return cached, "response_cache"
+
+    return None, None
+
+
 # ============================================================================
 # RESPONSE PROCESSING
 # ============================================================================
@@ -198,7 +330,7 @@ def process_endpoint_result(result: Dict) -> Dict:
 
 def create_test_result_record(
     db: Session,
-    test: Test,
+    prompt_id: Optional[str],
     test_config_id: str,
     test_run_id: str,
     test_id: str,
@@ -207,6 +339,8 @@ def create_test_result_record(
     execution_time: float,
     metrics_results: Dict,
     processed_result: Dict,
+    replay_source: Optional[str] = None,
+    timings: Optional[Dict[str, float]] = None,
 ) -> None:
     """Create and store the test result record in the database."""
     test_result_status = get_or_create_status(db, ResultStatus.PASS.value, "TestResult", organization_id=organization_id)
@@ -215,13 +349,17 @@ def create_test_result_record(
         "test_configuration_id": UUID(test_config_id),
         "test_run_id": UUID(test_run_id),
         "test_id": UUID(test_id),
-        "prompt_id": test.prompt_id,
+        "prompt_id": UUID(prompt_id) if prompt_id else None,
         "status_id": test_result_status.id,
         "user_id": UUID(user_id) if user_id else None,
         "organization_id": UUID(organization_id) if organization_id else None,
         "test_metrics": {"execution_time": execution_time, "metrics": metrics_results},
         "test_output": processed_result,
     }
+    if replay_source:
+        test_result_data["test_metrics"]["replay_source"] = replay_source
+    if timings:
+        test_result_data["test_metrics"]["timings"] = timings
 
     try:
         result = crud.create_test_result(db, schemas.TestResultCreate(**test_result_data), organization_id=organization_id, user_id=user_id)
@@ -233,6 +371,339 @@ def create_test_result_record(
         raise
 
 
+# ============================================================================
+# EXECUTION STAGES
+# ============================================================================
+
+
+@dataclass
+class PreparedTest:
+    """
+    Data carried through the execution stages of a single test.
+
+    Holds only plain values (no ORM objects), so the stages of one test can run in
+    different threads with different database sessions. The phase timer is activated
+    by each stage, so phases are attributed to the test wherever the stage runs.
+    """
+
+    test_config_id: str
+    test_run_id: str
+    test_id: str
+    organization_id: Optional[str]
+    user_id: Optional[str]
+    prompt_id: Optional[str]
+    prompt_content: str
+    expected_response: str
+    metric_configs: List[MetricConfig]
+    start_time: datetime
+    result: Optional[Dict] = None
+    replay_source: Optional[str] = None
+    execution_time: Optional[float] = None
+    timer: PhaseTimer = field(default_factory=PhaseTimer)
+
+
+def prepare_test(
+    db: Session,
+    test_config_id: str,
+    test_run_id: str,
+    test_id: str,
+    organization_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+) -> PreparedTest:
+    """
+    Stage 1: retrieve the prompt and metric configurations of a test.
+
+    Raises:
+        ValueError: If test or prompt is not found
+    """
+    timer = PhaseTimer()
+    with timer.phase("db_read"):
+        prompt_id, prompt_content, expected_response, metrics = get_test_execution_data(
+            db, test_run_id, test_id, organization_id
+        )
+    logger.debug(f"Retrieved test data - prompt length: {len(prompt_content)}")
+
+    metric_configs = prepare_metric_configs(metrics, test_id)
+    logger.debug(f"Prepared {len(metric_configs)} valid metrics")
+
+    return PreparedTest(
+        test_config_id=test_config_id,
+        test_run_id=test_run_id,
+        test_id=test_id,
+        organization_id=organization_id,
+        user_id=user_id,
+        prompt_id=prompt_id,
+        prompt_content=prompt_content,
+        expected_response=expected_response,
+        metric_configs=metric_configs,
+        start_time=start_time or datetime.utcnow(),
+        timer=timer,
+    )
+
+
+def invoke_test(db: Session, prepared: PreparedTest, endpoint_id: str) -> PreparedTest:
+    """Stage 2: invoke the endpoint (or replay a recorded response) for a prepared test."""
+    input_data = {"input": prepared.prompt_content}
+    with prepared.timer.activate():
+        prepared.result, prepared.replay_source = get_endpoint_response(
+            db=db,
+            test_config_id=prepared.test_config_id,
+            test_run_id=prepared.test_run_id,
+            test_id=prepared.test_id,
+            endpoint_id=endpoint_id,
+            input_data=input_data,
+            organization_id=prepared.organization_id,
+        )
+    if prepared.replay_source:
+        logger.debug(
+            f"Replayed response for test {prepared.test_id} from {prepared.replay_source}"
+        )
+
+    # Calculate execution time
+    prepared.execution_time = (datetime.utcnow() - prepared.start_time).total_seconds() * 1000
+    logger.debug(f"Endpoint execution completed in {prepared.execution_time:.2f}ms")
+
+    return prepared
+
+
+def invoke_test_batch(
+    db: Session, prepared_tests: List[PreparedTest], endpoint_id: str
+) -> List[PreparedTest]:
+    """
+    Stage 2 for tests of one run: invoke the endpoint once for all of them.
+
+    Tests with a replayed or cached response are not sent. The endpoint accepts the
+    others in one request (see `EndpointService.invoke_endpoint_batch`), so the phases of
+    that request are attributed to every test sent with it. Prompt deduplication does
+    not apply to batched tests.
+    """
+    if not prepared_tests:
+        return prepared_tests
+
+    first = prepared_tests[0]
+    organization_id = first.organization_id
+    replay = get_run_replay_settings(db, first.test_run_id, first.test_config_id, organization_id)
+
+    pending = []
+    for prepared in prepared_tests:
+        input_data = {"input": prepared.prompt_content}
+        with prepared.timer.activate():
+            prepared.result, prepared.replay_source = get_replayed_response(
+                db, replay, prepared.test_run_id, prepared.test_id, input_data, organization_id
+            )
+        if prepared.result is None:
+            pending.append(prepared)
+
+    if pending:
+        inputs = [{"input": prepared.prompt_content} for prepared in pending]
+        batch_timer = PhaseTimer()
+        with batch_timer.activate():
+            results = get_endpoint_service().invoke_endpoint_batch(
+                db=db, endpoint_id=endpoint_id, inputs=inputs, organization_id=organization_id
+            )
+        logger.debug(f"Invoked endpoint with a batch of {len(pending)} tests")
+
+        fingerprint = replay.get("endpoint_fingerprint") if replay.get("response_cache") else None
+        batch_timings = batch_timer.as_dict()
+        for prepared, input_data, result in zip(pending, inputs, results):
+            prepared.result = result
+            for phase, duration in batch_timings.items():
+                prepared.timer.add(phase, duration)
+            if fingerprint:
+                cache_response(organization_id, fingerprint, input_data, result)
+
+    now = datetime.utcnow()
+    for prepared in prepared_tests:
+        prepared.execution_time = (now - prepared.start_time).total_seconds() * 1000
+
+    return prepared_tests
+
+
+def get_run_evaluation_settings(
+    db: Session, test_run_id: str, test_config_id: str, organization_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get the evaluation settings of a run, from the execution plan or the test configuration.
+
+    Returns:
+        Dictionary with `judge_cache` and `fused_judging` (see `get_evaluation_settings`)
+    """
+    plan = load_execution_plan(str(test_run_id))
+    if plan and "evaluation" in plan:
+        return plan["evaluation"]
+
+    test_config = crud.get_test_configuration(
+        db, UUID(str(test_config_id)), organization_id=organization_id
+    )
+    if test_config is None:
+        return {"judge_cache": False, "fused_judging": False}
+    return get_evaluation_settings(test_config)
+
+
+def get_metrics_evaluator(
+    db: Session,
+    prepared: PreparedTest,
+    evaluation_settings: Dict[str, Any],
+    model: Optional[Any] = None,
+) -> MetricEvaluator:
+    """Create the metrics evaluator of a test, with the evaluation settings of its run."""
+    # Pass user's configured model, db session, and org ID to evaluator
+    # This allows metrics to use their own configured models if available
+    metrics_evaluator = MetricEvaluator(
+        model=model,
+        db=db,
+        organization_id=prepared.organization_id,
+        judge_cache=evaluation_settings.get("judge_cache", False),
+        fused_judging=evaluation_settings.get("fused_judging", False),
+    )
+
+    # Log model being used for metrics evaluation
+    if model:
+        model_info = (
+            model
+            if isinstance(model, str)
+            else f"{type(model).__name__}(model_name={model.model_name})"
+        )
+        logger.debug(
+            f"[METRICS_EVALUATION] Evaluating test {prepared.test_id} "
+            f"with default model: {model_info}"
+        )
+    else:
+        logger.debug(
+            f"[METRICS_EVALUATION] Evaluating test {prepared.test_id} with system default model"
+        )
+
+    return metrics_evaluator
+
+
+def store_test_result(
+    db: Session, prepared: PreparedTest, metrics_results: Dict
+) -> Dict[str, Any]:
+    """
+    Store the result of an evaluated test.
+
+    The phase timings are stored with the result. Writing the result itself is only
+    measured once it is stored, so the `persistence` phase is only part of the returned
+    timings, which are aggregated per run when results are collected.
+
+    Returns:
+        Dictionary with test_id, execution_time, metrics and timings
+    """
+    test_id = prepared.test_id
+
+    # Process result and store, with oversized values offloaded to storage
+    processed_result = process_endpoint_result(
+        offload_large_fields(
+            prepared.result, prepared.organization_id, prepared.test_run_id, test_id
+        )
+    )
+
+    timings = prepared.timer.as_dict()
+    with prepared.timer.phase("persistence"):
+        create_test_result_record(
+            db=db,
+            prompt_id=prepared.prompt_id,
+            test_config_id=prepared.test_config_id,
+            test_run_id=prepared.test_run_id,
+            test_id=test_id,
+            organization_id=prepared.organization_id,
+            user_id=prepared.user_id,
+            execution_time=prepared.execution_time,
+            metrics_results=metrics_results,
+            processed_result=processed_result,
+            replay_source=prepared.replay_source,
+            timings=timings,
+        )
+
+    # Return execution summary
+    return {
+        "test_id": test_id,
+        "execution_time": prepared.execution_time,
+        "metrics": metrics_results,
+        "timings": prepared.timer.as_dict(),
+    }
+
+
+def evaluate_and_store_test(
+    db: Session, prepared: PreparedTest, model: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Stage 3: evaluate the metrics of an invoked test and store its result.
+
+    Returns:
+        Dictionary with test_id, execution_time, metrics and timings
+    """
+    result = prepared.result
+
+    # Evaluate metrics
+    context = result.get("context", []) if result else []
+    evaluation_settings = get_run_evaluation_settings(
+        db, prepared.test_run_id, prepared.test_config_id, prepared.organization_id
+    )
+    metrics_evaluator = get_metrics_evaluator(db, prepared, evaluation_settings, model)
+
+    with prepared.timer.activate():
+        metrics_results = evaluate_prompt_response(
+            metrics_evaluator=metrics_evaluator,
+            prompt_content=prepared.prompt_content,
+            expected_response=prepared.expected_response,
+            context=context,
+            result=result,
+            metrics=prepared.metric_configs,
+        )
+
+    return store_test_result(db, prepared, metrics_results)
+
+
+def evaluate_test_batch(
+    db: Session, prepared_tests: List[PreparedTest], model: Optional[Any] = None
+) -> List[Dict]:
+    """
+    Stage 3 for tests of one run: evaluate their metrics together.
+
+    Prompt metrics judge several of the tests with one request (see
+    `MetricEvaluator.evaluate_batch`), so every test of the batch is attributed an equal
+    share of the evaluation's phases. Each result is stored separately with
+    `store_test_result`.
+
+    Returns:
+        The metric results of each test
+    """
+    if not prepared_tests:
+        return []
+
+    first = prepared_tests[0]
+    evaluation_settings = get_run_evaluation_settings(
+        db, first.test_run_id, first.test_config_id, first.organization_id
+    )
+    metrics_evaluator = get_metrics_evaluator(db, first, evaluation_settings, model)
+
+    batch_timer = PhaseTimer()
+    with batch_timer.activate():
+        metrics_results = evaluate_prompt_responses(
+            metrics_evaluator,
+            [
+                {
+                    "prompt_content": prepared.prompt_content,
+                    "expected_response": prepared.expected_response,
+                    "context": prepared.result.get("context", []) if prepared.result else [],
+                    "result": prepared.result,
+                    "metrics": prepared.metric_configs,
+                }
+                for prepared in prepared_tests
+            ],
+        )
+    logger.debug(f"Evaluated metrics of a batch of {len(prepared_tests)} tests")
+
+    batch_timings = batch_timer.as_dict()
+    for prepared in prepared_tests:
+        for phase, duration in batch_timings.items():
+            prepared.timer.add(phase, duration / len(prepared_tests))
+
+    return metrics_results
+
+
 # ============================================================================
 # MAIN EXECUTION FUNCTION
 # ============================================================================
@@ -252,12 +723,10 @@ def execute_test(
     Execute a single test and return its results.
 
     This function orchestrates the entire test execution process:
-    1. Set up tenant context
-    2. Check for existing results
-    3. Retrieve test data
-    4. Invoke the endpoint
-    5. Evaluate metrics
-    6. Process and store results
+    1. Check for existing results
+    2. Retrieve test data (prepare_test)
+    3. Invoke the endpoint (invoke_test)
+    4. Evaluate metrics, process and store results (evaluate_and_store_test)
 
     Args:
         db: Database session
@@ -290,76 +759,11 @@ def execute_test(
             logger.info(f"Found existing result for test {test_id}")
             return existing_result
 
-        # Retrieve test data
-        test, prompt_content, expected_response = get_test_and_prompt(db, test_id, organization_id)
-        logger.debug(f"Retrieved test data - prompt length: {len(prompt_content)}")
-
-        # Prepare metrics
-        metrics = get_test_metrics(test)
-        metric_configs = prepare_metric_configs(metrics, test_id)
-        logger.debug(f"Prepared {len(metric_configs)} valid metrics")
-
-        # Execute endpoint
-        endpoint_service = get_endpoint_service()
-        input_data = {"input": prompt_content}
-
-        result = endpoint_service.invoke_endpoint(
-            db=db, endpoint_id=endpoint_id, input_data=input_data, organization_id=organization_id
-        )
-
-        # Calculate execution time
-        execution_time = (datetime.utcnow() - start_time).total_seconds() * 1000
-        logger.debug(f"Endpoint execution completed in {execution_time:.2f}ms")
-
-        # Evaluate metrics
-        context = result.get("context", []) if result else []
-        
-        # Pass user's configured model, db session, and org ID to evaluator
-        # This allows metrics to use their own configured models if available
-        metrics_evaluator = MetricEvaluator(
-            model=model,
-            db=db,
-            organization_id=organization_id
-        )
-        
-        # Log model being used for metrics evaluation
-        if model:
-            model_info = model if isinstance(model, str) else f"{type(model).__name__}(model_name={model.model_name})"
-            logger.debug(f"[METRICS_EVALUATION] Evaluating test {test_id} with default model: {model_info}")
-        else:
-            logger.debug(f"[METRICS_EVALUATION] Evaluating test {test_id} with system default model")
-
-        metrics_results = evaluate_prompt_response(
-            metrics_evaluator=metrics_evaluator,
-            prompt_content=prompt_content,
-            expected_response=expected_response,
-            context=context,
-            result=result,
-            metrics=metric_configs,
-        )
-
-        # Process result and store
-        processed_result = process_endpoint_result(result)
-
-        create_test_result_record(
-            db=db,
-            test=test,
-            test_config_id=test_config_id,
-            test_run_id=test_run_id,
-            test_id=test_id,
-            organization_id=organization_id,
-            user_id=user_id,
-            execution_time=execution_time,
-            metrics_results=metrics_results,
-            processed_result=processed_result,
+        prepared = prepare_test(
+            db, test_config_id, test_run_id, test_id, organization_id, user_id, start_time
         )
-
-        # Return execution summary
-        result_summary = {
-            "test_id": test_id,
-            "execution_time": execution_time,
-            "metrics": metrics_results,
-        }
+        invoke_test(db, prepared, endpoint_id)
+        result_summary = evaluate_and_store_test(db, prepared, model)
 
         logger.info(f"Test execution completed successfully for test {test_id}")
         return result_summary
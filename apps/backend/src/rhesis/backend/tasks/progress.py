@@ -0,0 +1,263 @@
+"""
+Atomic test run progress counters.
+
+Progress of a test run is counted in a Redis hash (`HINCRBY`), so concurrent workers
+never contend on, or overwrite, the test run row. Counters are flushed to
+`TestRun.attributes` periodically (at most once per flush interval across all workers)
+and when results are collected, using a single-statement JSONB update.
+
+When Redis is unavailable, progress is incremented directly in the database with a
+single-statement JSONB increment instead of a read-modify-write of the attributes.
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from rhesis.backend.app.models.test_run import TestRun
+from rhesis.backend.app.utils.redis_client import get_redis_client
+from rhesis.backend.logging.rhesis_logger import logger
+
+PROGRESS_KEY_TEMPLATE = "rhesis:test_run:{test_run_id}:progress"
+PROGRESS_FLUSH_LOCK_KEY_TEMPLATE = "rhesis:test_run:{test_run_id}:progress:flush"
+PROGRESS_TTL_SECONDS = 24 * 60 * 60
+PROGRESS_FLUSH_INTERVAL_SECONDS = 5
+
+_TENANT_FILTER = (
+    "CAST(:organization_id AS uuid) IS NULL OR organization_id = CAST(:organization_id AS uuid)"
+)
+
+# Increment the counters in place; used when Redis is unavailable
+_INCREMENT_PROGRESS_SQL = text(
+    f"""
+    UPDATE test_run
+    SET attributes = COALESCE(attributes, '{{}}'::jsonb) || jsonb_build_object(
+            'completed_tests', COALESCE((attributes->>'completed_tests')::int, 0) + :completed,
+            'failed_tests', COALESCE((attributes->>'failed_tests')::int, 0) + :failed,
+            'last_completed_test_id', CAST(:test_id AS text),
+            'last_update', CAST(:now AS text),
+            'progress_updated_at', CAST(:now AS text)
+        ),
+        updated_at = now()
+    WHERE id = CAST(:test_run_id AS uuid) AND ({_TENANT_FILTER})
+    """
+)
+
+# Write absolute counters from Redis; GREATEST keeps out-of-order flushes from going back
+_FLUSH_PROGRESS_SQL = text(
+    f"""
+    UPDATE test_run
+    SET attributes = COALESCE(attributes, '{{}}'::jsonb) || jsonb_build_object(
+            'completed_tests',
+            GREATEST(COALESCE((attributes->>'completed_tests')::int, 0), :completed),
+            'failed_tests',
+            GREATEST(COALESCE((attributes->>'failed_tests')::int, 0), :failed),
+            'last_completed_test_id', CAST(:test_id AS text),
+            'last_update', CAST(:last_update AS text),
+            'progress_updated_at', CAST(:now AS text)
+        ),
+        updated_at = now()
+    WHERE id = CAST(:test_run_id AS uuid) AND ({_TENANT_FILTER})
+    """
+)
+
+
+def get_progress_key(test_run_id: str) -> str:
+    """Return the Redis key of the progress counters of a test run."""
+    return PROGRESS_KEY_TEMPLATE.format(test_run_id=test_run_id)
+
+
+def _decode(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _expire_cached_attributes(db: Session, test_run_id: str) -> None:
+    """Make sure a TestRun loaded in this session doesn't write stale attributes back."""
+    instance = db.identity_map.get(identity_key(TestRun, UUID(str(test_run_id))))
+    if instance is not None:
+        db.expire(instance, ["attributes"])
+
+
+# ============================================================================
+# FAST STORE (REDIS)
+# ============================================================================
+
+
+def record_test_progress(
+    test_run_id: str, test_id: str, was_successful: bool
+) -> Optional[Dict[str, Any]]:
+    """
+    Atomically count a finished test in Redis.
+
+    Returns:
+        The updated progress, or None if Redis is unavailable
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    key = get_progress_key(test_run_id)
+    counter = "completed_tests" if was_successful else "failed_tests"
+    now = datetime.utcnow().isoformat()
+
+    try:
+        pipe = client.pipeline(transaction=True)
+        pipe.hincrby(key, counter, 1)
+        pipe.hset(key, mapping={"last_completed_test_id": str(test_id), "last_update": now})
+        pipe.expire(key, PROGRESS_TTL_SECONDS)
+        pipe.hgetall(key)
+        progress = pipe.execute()[-1]
+    except Exception as e:
+        logger.warning(f"Failed to record progress in Redis for test run {test_run_id}: {str(e)}")
+        return None
+
+    return _parse_progress(progress)
+
+
+def _parse_progress(raw: Dict[Any, Any]) -> Dict[str, Any]:
+    progress = {_decode(field): _decode(value) for field, value in raw.items()}
+    progress["completed_tests"] = int(progress.get("completed_tests", 0))
+    progress["failed_tests"] = int(progress.get("failed_tests", 0))
+    return progress
+
+
+def get_test_run_progress(test_run_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the live progress counters of a test run from Redis.
+
+    Returns:
+        Dictionary with `completed_tests`, `failed_tests`, `last_completed_test_id` and
+        `last_update`, or None if no counters exist or Redis is unavailable
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    try:
+        raw = client.hgetall(get_progress_key(str(test_run_id)))
+    except Exception as e:
+        logger.warning(f"Failed to read progress from Redis for test run {test_run_id}: {str(e)}")
+        return None
+
+    return _parse_progress(raw) if raw else None
+
+
+def _acquire_flush_slot(test_run_id: str) -> bool:
+    """Allow one periodic flush per test run and flush interval across all workers."""
+    client = get_redis_client()
+    if client is None:
+        return False
+
+    try:
+        return bool(
+            client.set(
+                PROGRESS_FLUSH_LOCK_KEY_TEMPLATE.format(test_run_id=test_run_id),
+                str(time.time()),
+                nx=True,
+                ex=PROGRESS_FLUSH_INTERVAL_SECONDS,
+            )
+        )
+    except Exception:
+        return False
+
+
+# ============================================================================
+# DATABASE
+# ============================================================================
+
+
+def increment_progress_in_database(
+    db: Session,
+    test_run_id: str,
+    test_id: str,
+    was_successful: bool,
+    organization_id: Optional[str] = None,
+) -> bool:
+    """
+    Increment the progress counters in `TestRun.attributes` with a single statement.
+
+    Returns:
+        True if the test run row was updated
+    """
+    now = datetime.utcnow().isoformat()
+    result = db.execute(
+        _INCREMENT_PROGRESS_SQL,
+        {
+            "completed": 1 if was_successful else 0,
+            "failed": 0 if was_successful else 1,
+            "test_id": str(test_id),
+            "now": now,
+            "test_run_id": str(test_run_id),
+            "organization_id": str(organization_id) if organization_id else None,
+        },
+    )
+    _expire_cached_attributes(db, test_run_id)
+    return result.rowcount > 0
+
+
+def flush_test_run_progress(
+    db: Session,
+    test_run_id: str,
+    organization_id: Optional[str] = None,
+    progress: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """
+    Write the Redis progress counters of a test run to `TestRun.attributes`.
+
+    Args:
+        db: Database session
+        test_run_id: Test run UUID
+        organization_id: Organization of the test run (tenant filter)
+        progress: Already fetched progress; read from Redis if not given
+
+    Returns:
+        True if counters were flushed, False if there was nothing to flush
+    """
+    progress = progress or get_test_run_progress(test_run_id)
+    if not progress:
+        return False
+
+    result = db.execute(
+        _FLUSH_PROGRESS_SQL,
+        {
+            "completed": progress["completed_tests"],
+            "failed": progress["failed_tests"],
+            "test_id": progress.get("last_completed_test_id"),
+            "last_update": progress.get("last_update"),
+            "now": datetime.utcnow().isoformat(),
+            "test_run_id": str(test_run_id),
+            "organization_id": str(organization_id) if organization_id else None,
+        },
+    )
+    _expire_cached_attributes(db, test_run_id)
+    return result.rowcount > 0
+
+
+def update_test_run_progress(
+    db: Session,
+    test_run_id: str,
+    test_id: str,
+    was_successful: bool,
+    organization_id: Optional[str] = None,
+) -> bool:
+    """
+    Count a finished test, flushing counters to the database at most once per interval.
+
+    Returns:
+        True if the progress was recorded
+    """
+    progress = record_test_progress(test_run_id, test_id, was_successful)
+    if progress is None:
+        return increment_progress_in_database(
+            db, test_run_id, test_id, was_successful, organization_id
+        )
+
+    if _acquire_flush_slot(test_run_id):
+        flush_test_run_progress(db, test_run_id, organization_id, progress=progress)
+
+    return True
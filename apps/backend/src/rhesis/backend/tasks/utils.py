@@ -2,7 +2,6 @@
 Utility functions for task operations and common patterns.
 """
 
-from datetime import datetime
 from typing import Any, Dict, Optional, Tuple
 from uuid import UUID
 
@@ -10,6 +9,7 @@ from sqlalchemy.orm import Session
 
 from rhesis.backend.app import crud
 from rhesis.backend.tasks.enums import RunStatus
+from rhesis.backend.tasks.progress import update_test_run_progress
 
 
 def safe_uuid_convert(value: Any) -> Optional[UUID]:
@@ -93,10 +93,11 @@ def increment_test_run_progress(
     db: Session, test_run_id: str, test_id: str, was_successful: bool = True, organization_id: str = None, user_id: str = None
 ) -> bool:
     """
-    Atomically increment the completed_tests counter in test run attributes.
+    Atomically increment the completed_tests or failed_tests counter of a test run.
 
-    This function safely updates the test run progress as individual tests complete,
-    providing real-time progress tracking.
+    Progress is counted in Redis and periodically flushed to the test run attributes,
+    so concurrent workers don't serialize on (or overwrite) the test run row. Without
+    Redis, the counters are incremented in the database with a single statement.
 
     Args:
         db: Database session
@@ -108,52 +109,18 @@ def increment_test_run_progress(
         True if update succeeded, False otherwise
     """
     try:
-        # Get the test run
         test_run_uuid = safe_uuid_convert(test_run_id)
         if not test_run_uuid:
             return False
 
-        test_run = crud.get_test_run(db, test_run_uuid, organization_id=organization_id, user_id=user_id)
-        if not test_run:
-            return False
-
-        # Get current attributes
-        current_attributes = test_run.attributes.copy() if test_run.attributes else {}
-
-        # Initialize counters if they don't exist
-        completed_tests = current_attributes.get("completed_tests", 0)
-        failed_tests = current_attributes.get("failed_tests", 0)
-
-        # Increment appropriate counter
-        if was_successful:
-            completed_tests += 1
-        else:
-            failed_tests += 1
-
-        # Update attributes with new progress
-        current_attributes.update(
-            {
-                "completed_tests": completed_tests,
-                "failed_tests": failed_tests,
-                "last_completed_test_id": test_id,
-                "last_update": datetime.utcnow().isoformat(),
-                "progress_updated_at": datetime.utcnow().isoformat(),
-            }
-        )
-
-        # Update the test run
-        update_data = {"attributes": current_attributes}
-
-        crud.update_test_run(
-            db, 
-            test_run.id, 
-            crud.schemas.TestRunUpdate(**update_data),
-            organization_id=str(test_run.organization_id) if test_run.organization_id else None,
-            user_id=str(test_run.user_id) if test_run.user_id else None
+        return update_test_run_progress(
+            db,
+            str(test_run_uuid),
+            test_id,
+            was_successful=was_successful,
+            organization_id=organization_id,
         )
 
-        return True
-
     except Exception as e:
         # Log error but don't raise - progress update failure shouldn't break test execution
         from rhesis.backend.logging.rhesis_logger import logger
@@ -88,6 +88,10 @@ app.conf.update(
             "soft_time_limit": 300,  # 5 minutes
             "time_limit": 600,  # 10 minutes
         },
+        # Batch tasks set their own time limits based on batch size and concurrency
+        "rhesis.backend.tasks.execute_test_batch": {
+            "max_retries": 0,  # Per-test failures are captured inside the batch
+        },
     },
     # Task discovery
     include=[
@@ -96,6 +100,7 @@ app.conf.update(
         "rhesis.backend.tasks.test_set",
         "rhesis.backend.tasks.execution.results",
         "rhesis.backend.tasks.execution.test",
+        "rhesis.backend.tasks.execution.batch",
     ],
 )
 
@@ -26,6 +26,11 @@ export interface Endpoint {
   response_mappings?: Record<string, string>;
   validation_rules?: Record<string, any>;
 
+  // Batch Mode
+  batch_size?: number;
+  batch_request_body_template?: Record<string, any>;
+  batch_response_path?: string;
+
   status_id?: string;
   user_id?: string;
   organization_id?: string;
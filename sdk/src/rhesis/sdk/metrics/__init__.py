@@ -13,6 +13,7 @@ from rhesis.sdk.metrics.providers.ragas import (  # Re-export Ragas metrics
 )
 
 from .base import BaseMetric, MetricConfig, MetricResult
+from .cache import InMemoryJudgeCache, JudgeCache, get_judge_cache, set_judge_cache
 from .config.loader import MetricConfigLoader
 from .constants import OPERATOR_MAP, VALID_OPERATORS_BY_SCORE_TYPE, ScoreType, ThresholdOperator
 from .evaluator import MetricEvaluator as Evaluator
@@ -31,6 +32,11 @@ __all__ = [
     "Evaluator",
     "ScoreEvaluator",
     "run_evaluation",
+    # Judge cache
+    "JudgeCache",
+    "InMemoryJudgeCache",
+    "get_judge_cache",
+    "set_judge_cache",
     # Types and utilities
     "ScoreType",
     "ThresholdOperator",
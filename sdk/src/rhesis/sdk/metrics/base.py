@@ -216,6 +216,21 @@ class BaseMetric(ABC):
             MetricResult: The evaluation result
         """
 
+    def evaluate_batch(self, test_cases: List[Dict[str, Any]]) -> List[MetricResult]:
+        """
+        Evaluate the metric on several test cases.
+
+        The default implementation evaluates the test cases one by one. Metrics that can
+        judge several test cases with one request override it.
+
+        Args:
+            test_cases (List[Dict[str, Any]]): Keyword arguments of ``evaluate`` per test case
+
+        Returns:
+            List[MetricResult]: The evaluation results, in the order of the test cases
+        """
+        return [self.evaluate(**test_case) for test_case in test_cases]
+
 
 class BaseMetricFactory(ABC):
     """Base factory interface for creating metric instances."""
@@ -0,0 +1,121 @@
+"""Result cache for LLM-judge metrics.
+
+Prompt metrics send a rendered judge prompt to a model. When the same prompt is judged again
+by the same model (reruns, duplicated tests), a judge cache returns the stored judgment
+instead of calling the model again.
+
+Caching is opt-in: either pass a cache to a metric (``cache=...``) or set a cache for all
+metrics with ``set_judge_cache``. Custom storage is plugged in by subclassing ``JudgeCache``.
+
+Example:
+    >>> from rhesis.sdk.metrics.cache import InMemoryJudgeCache, set_judge_cache
+    >>> set_judge_cache(InMemoryJudgeCache(max_size=1000, ttl_seconds=3600))
+"""
+
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def get_judge_cache_key(prompt: str, model: Any, schema: Optional[Any] = None) -> str:
+    """
+    Build the content-addressed key of a judgment.
+
+    Args:
+        prompt (str): The fully rendered judge prompt
+        model (Any): The judge model (a BaseLLM instance or a model name)
+        schema (Optional[Any]): The response schema the model is asked for
+
+    Returns:
+        str: A SHA-256 hex digest of the prompt, the model and the schema
+    """
+    if isinstance(model, str):
+        model_identity = model
+    else:
+        model_identity = f"{type(model).__name__}:{getattr(model, 'model_name', None)}"
+
+    schema_identity = None
+    if schema is not None:
+        try:
+            schema_identity = schema.model_json_schema()
+        except AttributeError:
+            schema_identity = getattr(schema, "__name__", str(schema))
+
+    payload = json.dumps(
+        {"prompt": prompt, "model": model_identity, "schema": schema_identity},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JudgeCache(ABC):
+    """Storage interface for judge results."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the judgment stored under ``key``, or None."""
+
+    @abstractmethod
+    def set(self, key: str, judgment: Dict[str, Any]) -> None:
+        """Store a judgment (the parsed model response) under ``key``."""
+
+
+class InMemoryJudgeCache(JudgeCache):
+    """Thread-safe LRU judge cache in process memory.
+
+    Args:
+        max_size (int): Maximum number of stored judgments
+        ttl_seconds (Optional[float]): Time after which judgments expire. Defaults to None
+            (judgments don't expire).
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, judgment = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(judgment)
+
+    def set(self, key: str, judgment: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), dict(judgment))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_judge_cache: Optional[JudgeCache] = None
+
+
+def set_judge_cache(cache: Optional[JudgeCache]) -> None:
+    """Set the judge cache used by metrics without their own cache (None disables caching)."""
+    global _judge_cache
+    _judge_cache = cache
+
+
+def get_judge_cache() -> Optional[JudgeCache]:
+    """Return the judge cache set with ``set_judge_cache``, if any."""
+    return _judge_cache
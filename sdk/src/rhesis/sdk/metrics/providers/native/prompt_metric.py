@@ -2,15 +2,19 @@ import logging
 import traceback
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
+from pydantic import BaseModel, Field, create_model
 
 from rhesis.sdk.client import Client, Endpoints, Methods
 from rhesis.sdk.metrics.base import BaseMetric, MetricConfig, MetricResult, MetricType, ScoreType
+from rhesis.sdk.metrics.cache import JudgeCache, get_judge_cache, get_judge_cache_key
 from rhesis.sdk.metrics.utils import backend_config_to_sdk_config, sdk_config_to_backend_config
 from rhesis.sdk.models.base import BaseLLM
 
+DEFAULT_BATCH_SIZE = 10
+
 
 class RhesisPromptMetricBase(BaseMetric):
     """
@@ -29,6 +33,8 @@ class RhesisPromptMetricBase(BaseMetric):
         reasoning: Optional[str] = None,
         evaluation_examples: Optional[List[str]] = None,
         model: Optional[Union[BaseLLM, str]] = None,
+        cache: Optional[JudgeCache] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
         **kwargs,
     ):
         super().__init__(
@@ -44,6 +50,10 @@ class RhesisPromptMetricBase(BaseMetric):
         self.evaluation_steps = evaluation_steps
         self.reasoning = reasoning
         self.evaluation_examples = evaluation_examples
+        # Judge cache of this metric; falls back to the cache set with set_judge_cache
+        self.cache = cache
+        # Test cases judged with one request by evaluate_batch
+        self.batch_size = batch_size
 
     def __repr__(self) -> str:
         return str(self.to_config())
@@ -51,6 +61,138 @@ class RhesisPromptMetricBase(BaseMetric):
     def evaluate(self):
         pass
 
+    def evaluate_batch(self, test_cases: List[Dict[str, Any]]) -> List[MetricResult]:
+        """
+        Evaluate several test cases, judging up to ``batch_size`` of them with one request.
+
+        Judgments are looked up in and stored to the judge cache per test case, under its own
+        prompt. Test cases whose judgment is missing or invalid in the batch response are
+        evaluated individually.
+
+        Args:
+            test_cases (List[Dict[str, Any]]): Keyword arguments of ``evaluate`` per test case
+                (input, output, expected_output, context)
+
+        Returns:
+            List[MetricResult]: The evaluation results, in the order of the test cases
+
+        Raises:
+            ValueError: If the inputs of a test case are invalid (see ``evaluate``)
+        """
+        results: List[Optional[MetricResult]] = [None] * len(test_cases)
+        cache = self._get_judge_cache()
+        schema = self._get_response_schema()
+
+        # Take cached judgments from the judge cache, collect the others for batches
+        pending: List[Tuple[int, str]] = []
+        for index, test_case in enumerate(test_cases):
+            self._validate_evaluate_inputs(**test_case)
+            prompt = self._get_prompt_template(
+                test_case["input"],
+                test_case["output"],
+                test_case.get("expected_output") or "",
+                test_case.get("context") or [],
+            )
+            judgment = cache.get(get_judge_cache_key(prompt, self.model, schema)) if cache else None
+            if judgment is not None:
+                results[index] = self._score_judgment(judgment, self._get_details(prompt), True)
+            else:
+                pending.append((index, prompt))
+
+        batch_size = max(1, self.batch_size)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            if len(batch) == 1:
+                results[batch[0][0]] = self.evaluate(**test_cases[batch[0][0]])
+                continue
+
+            judgments = self._generate_batch_judgments(
+                [test_cases[index] for index, _ in batch], schema
+            )
+            for position, (index, prompt) in enumerate(batch, start=1):
+                try:
+                    judgment = schema(**judgments[position]).model_dump()
+                except Exception:
+                    # Retry the test case with its own judge request
+                    results[index] = self.evaluate(**test_cases[index])
+                    continue
+                if cache is not None:
+                    cache.set(get_judge_cache_key(prompt, self.model, schema), judgment)
+                results[index] = self._score_judgment(judgment, self._get_details(prompt))
+                results[index].details["batched"] = True
+
+        return results
+
+    def _generate_batch_judgments(
+        self, test_cases: List[Dict[str, Any]], schema: Type[BaseModel]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Judge several test cases with one request.
+
+        Args:
+            test_cases (List[Dict[str, Any]]): The test cases, numbered from 1 in the prompt
+            schema (Type[BaseModel]): The response schema of a single judgment
+
+        Returns:
+            Dict[int, Dict[str, Any]]: The judgments by test case number; empty if the
+                request failed
+        """
+        BatchJudgment = create_model(
+            "BatchJudgment",
+            __base__=schema,
+            test_case=(int, Field(description="Number of the test case")),
+        )
+        BatchResponse = create_model("BatchResponse", judgments=(List[BatchJudgment], ...))
+
+        prompt = self._get_batch_prompt_template(test_cases)
+        try:
+            response = self.model.generate(prompt, schema=BatchResponse)
+        except Exception as e:
+            logging.getLogger(__name__).warning(
+                f"Batch judge request of {self.name} failed, judging individually: {e}"
+            )
+            return {}
+
+        if not isinstance(response, dict):
+            return {}
+        judgments = {}
+        for judgment in response.get("judgments") or []:
+            if isinstance(judgment, dict) and isinstance(judgment.get("test_case"), int):
+                judgments[judgment["test_case"]] = judgment
+        return judgments
+
+    def _get_judge_cache(self) -> Optional[JudgeCache]:
+        """Return the judge cache of this metric, or the one set with ``set_judge_cache``."""
+        return self.cache if self.cache is not None else get_judge_cache()
+
+    def _get_response_schema(self) -> Type[BaseModel]:
+        """Return the pydantic model of a judgment. Subclasses should override this method."""
+        raise NotImplementedError("Subclasses should override this method")
+
+    def _get_score_template_vars(self) -> Dict[str, Any]:
+        """Return the score type specific template variables."""
+        return {}
+
+    def _get_details(self, prompt: str) -> Dict[str, Any]:
+        """Return the details of a result before judging. Subclasses may add fields."""
+        return self._get_base_details(prompt)
+
+    def _score_judgment(
+        self, judgment: Dict[str, Any], details: Dict[str, Any], cached: bool = False
+    ) -> MetricResult:
+        """
+        Build the result of a judgment. Subclasses should override this method.
+
+        Args:
+            judgment (Dict[str, Any]): The judgment of the model, matching the response schema
+            details (Dict[str, Any]): The details of the result, updated with the judgment
+            cached (bool): Whether the judgment was taken from the judge cache
+
+        Returns:
+            MetricResult: The evaluation result
+        """
+        raise NotImplementedError("Subclasses should override this method")
+
     def _validate_evaluate_inputs(
         self,
         input: str,
@@ -133,6 +275,31 @@ class RhesisPromptMetricBase(BaseMetric):
 
         return MetricResult(score=default_score, details=details)
 
+    def _generate_judgment(self, prompt: str, schema: Any) -> Tuple[Dict[str, Any], bool]:
+        """
+        Get the model's judgment of a prompt, from the judge cache if possible.
+
+        Args:
+            prompt (str): The rendered evaluation prompt
+            schema (Any): The pydantic model of the expected response
+
+        Returns:
+            Tuple[Dict[str, Any], bool]: The judgment, and whether it was taken from the cache
+        """
+        cache = self._get_judge_cache()
+        if cache is None:
+            return self.model.generate(prompt, schema=schema), False
+
+        key = get_judge_cache_key(prompt, self.model, schema)
+        judgment = cache.get(key)
+        if judgment is not None:
+            return judgment, True
+
+        judgment = self.model.generate(prompt, schema=schema)
+        # Only judgments matching the schema are stored
+        cache.set(key, schema(**judgment).model_dump())
+        return judgment, False
+
     def _setup_jinja_environment(self) -> None:
         """
         Set up Jinja environment for template rendering.
@@ -213,6 +380,36 @@ class RhesisPromptMetricBase(BaseMetric):
 
         return prompt
 
+    def _get_batch_prompt_template(self, test_cases: List[Dict[str, Any]]) -> str:
+        """
+        Generate the prompt judging several test cases, numbered from 1.
+
+        Args:
+            test_cases (List[Dict[str, Any]]): Keyword arguments of ``evaluate`` per test case
+
+        Returns:
+            str: The rendered prompt template ready to be sent to the LLM
+        """
+        template = self.jinja_env.get_template("batch_prompt_metric.jinja")
+        return template.render(
+            evaluation_prompt=self.evaluation_prompt,
+            evaluation_steps=self.evaluation_steps,
+            reasoning=self.reasoning,
+            evaluation_examples=self.evaluation_examples,
+            score_type=self.score_type.value,
+            test_cases=[
+                {
+                    "id": index,
+                    "input": test_case["input"],
+                    "output": test_case["output"],
+                    "expected_output": test_case.get("expected_output") or "",
+                    "context_text": "\n".join(test_case.get("context") or []),
+                }
+                for index, test_case in enumerate(test_cases, start=1)
+            ],
+            **self._get_score_template_vars(),
+        )
+
     def to_config(self) -> MetricConfig:
         """Convert the metric to a MetricConfig."""
         """Subclasses should override this method to add their own parameters."""
@@ -1,6 +1,6 @@
-from typing import List, Literal, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Type, Union
 
-from pydantic import create_model
+from pydantic import BaseModel, create_model
 
 from rhesis.sdk.metrics.base import MetricConfig, MetricResult, MetricType, ScoreType
 from rhesis.sdk.metrics.providers.native.prompt_metric import (
@@ -167,10 +167,61 @@ class RhesisPromptMetricCategorical(RhesisPromptMetricBase):
             output=output,
             expected_output=expected_output,
             context=context,
-            categories=self.categories,
+            **self._get_score_template_vars(),
+        )
+
+    def _get_score_template_vars(self) -> Dict[str, Any]:
+        return {"categories": self.categories, "passing_categories": self.passing_categories}
+
+    def _get_response_schema(self) -> Type[BaseModel]:
+        # Create a proper Literal type from the possible scores
+        if len(self.categories) == 1:
+            score_literal = Literal[self.categories[0]]
+        else:
+            # Create individual string literals - use a more compatible approach
+            score_literal = Literal[tuple(self.categories)]
+
+        return create_model(
+            "ScoreResponseCategorical", score=(score_literal, ...), reason=(str, ...)
+        )
+
+    def _get_details(self, prompt: str) -> Dict[str, Any]:
+        details = self._get_base_details(prompt)
+        details.update(
+            {
+                "categories": self.categories,
+                "passing_categories": self.passing_categories,
+            }
+        )
+        return details
+
+    def _score_judgment(
+        self, judgment: Dict[str, Any], details: Dict[str, Any], cached: bool = False
+    ) -> MetricResult:
+        response = self._get_response_schema()(**judgment)
+
+        # Get the score directly from the response
+        score = response.score
+        reason = response.reason
+
+        # Check if the evaluation meets the reference score using the base class method
+        is_successful = self._evaluate_score(
+            score=score,
             passing_categories=self.passing_categories,
         )
 
+        # Update details with success-specific fields
+        details.update(
+            {
+                "score": score,
+                "reason": reason,
+                "is_successful": is_successful,
+                "cached": cached,
+            }
+        )
+
+        return MetricResult(score=score, details=details)
+
     def evaluate(
         self,
         input: str,
@@ -228,49 +279,12 @@ class RhesisPromptMetricCategorical(RhesisPromptMetricBase):
         prompt = self._get_prompt_template(input, output, expected_output or "", context or [])
 
         # Initialize common details fields
-        details = self._get_base_details(prompt)
-        details.update(
-            {
-                "categories": self.categories,
-                "passing_categories": self.passing_categories,
-            }
-        )
+        details = self._get_details(prompt)
 
         try:
             # Run the evaluation with structured response model
-            # Create a proper Literal type from the possible scores
-            if len(self.categories) == 1:
-                score_literal = Literal[self.categories[0]]
-            else:
-                # Create individual string literals - use a more compatible approach
-                score_literal = Literal[tuple(self.categories)]
-
-            ScoreResponseCategorical = create_model(
-                "ScoreResponseCategorical", score=(score_literal, ...), reason=(str, ...)
-            )
-            response = self.model.generate(prompt, schema=ScoreResponseCategorical)
-            response = ScoreResponseCategorical(**response)
-
-            # Get the score directly from the response
-            score = response.score
-            reason = response.reason
-
-            # Check if the evaluation meets the reference score using the base class method
-            is_successful = self._evaluate_score(
-                score=score,
-                passing_categories=self.passing_categories,
-            )
-
-            # Update details with success-specific fields
-            details.update(
-                {
-                    "score": score,
-                    "reason": reason,
-                    "is_successful": is_successful,
-                }
-            )
-
-            return MetricResult(score=score, details=details)
+            response, cached = self._generate_judgment(prompt, self._get_response_schema())
+            return self._score_judgment(response, details, cached)
 
         except Exception as e:
             return self._handle_evaluation_error(e, details, "error")
@@ -1,4 +1,4 @@
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Type, Union
 
 from pydantic import BaseModel, Field
 
@@ -175,10 +175,53 @@ class RhesisPromptMetricNumeric(RhesisPromptMetricBase):
             output=output,
             expected_output=expected_output,
             context=context,
-            min_score=self.min_score,
-            max_score=self.max_score,
+            **self._get_score_template_vars(),
         )
 
+    def _get_score_template_vars(self) -> Dict[str, Any]:
+        return {"min_score": self.min_score, "max_score": self.max_score}
+
+    def _get_response_schema(self) -> Type[BaseModel]:
+        return NumericScoreResponse
+
+    def _get_details(self, prompt: str) -> Dict[str, Any]:
+        details = self._get_base_details(prompt)
+        details.update(
+            {
+                "threshold_operator": (
+                    self.threshold_operator.value if self.threshold_operator else None
+                ),
+                "min_score": self.min_score,
+                "max_score": self.max_score,
+                "threshold": self.threshold,
+            }
+        )
+        return details
+
+    def _score_judgment(
+        self, judgment: Dict[str, Any], details: Dict[str, Any], cached: bool = False
+    ) -> MetricResult:
+        response = NumericScoreResponse(**judgment)
+
+        # Get the score directly from the response
+        score = response.score
+        reason = response.reason
+
+        # Check if the evaluation meets the threshold using the base class method
+        is_successful = self._evaluate_score(score=score)
+
+        # Update details with success-specific fields
+        details.update(
+            {
+                "score": score,
+                "reason": reason,
+                "is_successful": is_successful,
+                "cached": cached,
+            }
+        )
+
+        return MetricResult(score=score, details=details)
+
     def evaluate(
         self, input: str, output: str, expected_output: Optional[str], context: List[str] = None
     ) -> MetricResult:
@@ -230,40 +273,12 @@ class RhesisPromptMetricNumeric(RhesisPromptMetricBase):
         prompt = self._get_prompt_template(input, output, expected_output or "", context or [])
 
         # Base details dictionary with common fields
-        details = self._get_base_details(prompt)
-        details.update(
-            {
-                "threshold_operator": (
-                    self.threshold_operator.value if self.threshold_operator else None
-                ),
-                "min_score": self.min_score,
-                "max_score": self.max_score,
-                "threshold": self.threshold,
-            }
-        )
+        details = self._get_details(prompt)
 
         try:
             # Run the evaluation with structured response model
-            response = self.model.generate(prompt, schema=NumericScoreResponse)
-            response = NumericScoreResponse(**response)
-
-            # Get the score directly from the response
-            score = response.score
-            reason = response.reason
-
-            # Check if the evaluation meets the threshold using the base class method
-            is_successful = self._evaluate_score(score=score)
-
-            # Update details with success-specific fields
-            details.update(
-                {
-                    "score": score,
-                    "reason": reason,
-                    "is_successful": is_successful,
-                }
-            )
-
-            return MetricResult(score=score, details=details)
+            response, cached = self._generate_judgment(prompt, NumericScoreResponse)
+            return self._score_judgment(response, details, cached)
 
         except Exception as e:
             return self._handle_evaluation_error(e, details, 0.0)
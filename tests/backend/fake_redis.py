@@ -0,0 +1,82 @@
+"""
+In-memory stand-in for the Redis client returned by `get_redis_client()`.
+
+Covers the string, counter and hash commands used by the backend's caches, locks and
+progress counters. Values are kept as given rather than encoded to bytes, and expiry
+times are recorded in `expiry` instead of being applied.
+"""
+
+import threading
+
+
+class FakePipeline:
+    """Queues commands and runs them against the fake client on execute"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the Redis commands used by the backend"""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.expiry = {}
+        self._lock = threading.Lock()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        with self._lock:
+            if nx and key in self.values:
+                return None
+            self.values[key] = value
+            self.expiry[key] = ex
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(
+                self.values.pop(key, None) is not None or self.hashes.pop(key, None) is not None
+                for key in keys
+            )
+
+    def incr(self, key):
+        with self._lock:
+            self.values[key] = int(self.values.get(key, 0)) + 1
+            return self.values[key]
+
+    def expire(self, key, seconds):
+        self.expiry[key] = seconds
+        return True
+
+    def hincrby(self, key, field, amount):
+        with self._lock:
+            fields = self.hashes.setdefault(key, {})
+            fields[field] = str(int(fields.get(field, 0)) + amount).encode()
+            return int(fields[field])
+
+    def hset(self, key, mapping):
+        with self._lock:
+            self.hashes.setdefault(key, {}).update(
+                {field: str(value).encode() for field, value in mapping.items()}
+            )
+
+    def hgetall(self, key):
+        return {field.encode(): value for field, value in self.hashes.get(key, {}).items()}
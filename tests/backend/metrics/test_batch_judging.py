@@ -0,0 +1,210 @@
+"""
+Tests for judging several test cases with one request
+
+This module tests:
+- Batched evaluation of prompt metrics with RhesisPromptMetric.evaluate_batch
+- Retrying test cases individually when their judgment is missing
+- The default one-by-one evaluate_batch of BaseMetric
+- Batching metrics across tests in MetricEvaluator.evaluate_batch
+- Failing the tests of a batch that returned too few results instead of waiting forever
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from rhesis.sdk.models.base import BaseLLM
+
+from rhesis.backend.metrics import evaluator as evaluator_module
+from rhesis.backend.metrics.base import BaseMetric, MetricConfig, MetricResult
+from rhesis.backend.metrics.evaluator import MetricEvaluator
+from rhesis.backend.metrics.pool import MetricPool
+from rhesis.backend.metrics.rhesis.prompt_metric import RhesisPromptMetric
+from rhesis.backend.metrics.scheduler import EvaluationScheduler
+
+SINGLE_RESPONSE = json.dumps({"score": 1, "reason": "Judged alone"})
+
+
+class BatchJudge(BaseLLM):
+    """Judge model scoring each test case of a batch prompt with its position + 1"""
+
+    def __init__(self, model_name="fake/judge", skip=()):
+        super().__init__(model_name)
+        self.skip = set(skip)
+        self.prompts = []
+
+    def load_model(self, *args, **kwargs):
+        return None
+
+    def generate(self, prompt, *args, **kwargs):
+        self.prompts.append(prompt)
+        count = prompt.count('Test case "test_case_')
+        if not count:
+            return SINGLE_RESPONSE
+        return json.dumps(
+            {
+                f"test_case_{position}": {"score": position + 1, "reason": "Batched"}
+                for position in range(1, count + 1)
+                if position not in self.skip
+            }
+        )
+
+
+def _metric(judge, batch_size=None):
+    return RhesisPromptMetric(
+        name="quality",
+        evaluation_prompt="Rate the answer",
+        evaluation_steps="Read",
+        reasoning="Quality",
+        min_score=1,
+        max_score=5,
+        threshold=3,
+        threshold_operator=">=",
+        model=judge,
+        batch_size=batch_size,
+    )
+
+
+def _test_cases(count):
+    return [
+        {
+            "input": f"Question {index}",
+            "output": f"Answer {index}",
+            "expected_output": "Answer",
+            "context": [],
+        }
+        for index in range(count)
+    ]
+
+
+class TestPromptMetricBatch:
+    """Test batched evaluation of prompt metrics"""
+
+    @pytest.mark.unit
+    def test_test_cases_judged_in_batches(self):
+        judge = BatchJudge()
+
+        results = _metric(judge, batch_size=3).evaluate_batch(_test_cases(5))
+
+        assert len(judge.prompts) == 2
+        assert "Question 2" in judge.prompts[0] and "Question 3" in judge.prompts[1]
+        assert [result.score for result in results] == [2, 3, 4, 2, 3]
+        assert all(result.details["batched"] for result in results)
+        assert results[0].details["prompt"].count("Question") == 1
+        assert results[0].details["is_successful"] is False
+        assert results[1].details["is_successful"] is True
+
+    @pytest.mark.unit
+    def test_missing_judgments_retried_individually(self):
+        judge = BatchJudge(skip={2})
+
+        results = _metric(judge, batch_size=3).evaluate_batch(_test_cases(3))
+
+        assert len(judge.prompts) == 2
+        assert [result.score for result in results] == [2, 1, 4]
+        assert "batched" not in results[1].details
+
+    @pytest.mark.unit
+    def test_empty_outputs_not_judged(self):
+        judge = BatchJudge()
+        test_cases = _test_cases(3)
+        test_cases[1]["output"] = ""
+
+        results = _metric(judge).evaluate_batch(test_cases)
+
+        assert len(judge.prompts) == 1
+        assert results[1].details["empty_output_detected"] is True
+        assert [results[0].score, results[2].score] == [2, 3]
+
+    @pytest.mark.unit
+    def test_batch_size_from_environment(self, monkeypatch):
+        monkeypatch.setenv("PROMPT_METRIC_BATCH_SIZE", "4")
+
+        assert _metric(BatchJudge()).batch_size == 4
+        assert _metric(BatchJudge(), batch_size=2).batch_size == 2
+
+    @pytest.mark.unit
+    def test_base_metric_evaluates_one_by_one(self):
+        class LengthMetric(BaseMetric):
+            requires_ground_truth = False
+
+            def evaluate(self, input, output, expected_output, context):
+                return MetricResult(score=len(output))
+
+        results = LengthMetric("length").evaluate_batch(_test_cases(2))
+
+        assert LengthMetric("length").batch_size == 1
+        assert [result.score for result in results] == [8, 8]
+
+
+def _evaluator_test_cases(count):
+    config = MetricConfig(
+        class_name="RhesisPromptMetric",
+        backend="rhesis",
+        threshold=3,
+        name="quality",
+        parameters={
+            "evaluation_prompt": "Rate the answer",
+            "evaluation_steps": "Read",
+            "reasoning": "Quality",
+            "min_score": 1,
+            "max_score": 5,
+            "threshold_operator": ">=",
+            "batch_size": 2,
+        },
+    )
+    return [
+        {
+            "input_text": f"Question {index}",
+            "output_text": f"Answer {index}",
+            "expected_output": "Answer",
+            "context": [],
+            "metrics": [config],
+        }
+        for index in range(count)
+    ]
+
+
+def _evaluate_batch(judge, test_cases):
+    scheduler = EvaluationScheduler(max_concurrency=2, provider_concurrency=2)
+    try:
+        with patch.object(evaluator_module, "metric_pool", MetricPool()):
+            with patch.object(evaluator_module, "evaluation_scheduler", scheduler):
+                return MetricEvaluator(model=judge).evaluate_batch(test_cases)
+    finally:
+        scheduler.shutdown()
+
+
+class TestEvaluatorBatch:
+    """Test evaluating the metrics of several tests together"""
+
+    @pytest.mark.unit
+    def test_metrics_batched_across_tests(self):
+        judge = BatchJudge()
+        test_cases = _evaluator_test_cases(3)
+        test_cases.append({**test_cases[0], "metrics": []})
+
+        results = _evaluate_batch(judge, test_cases)
+
+        assert len(judge.prompts) == 2
+        assert [result["quality"]["score"] for result in results[:3]] == [2, 3, 1]
+        assert [result["quality"]["is_successful"] for result in results[:3]] == [
+            False,
+            True,
+            False,
+        ]
+        assert results[3] == {}
+
+    @pytest.mark.unit
+    def test_missing_batch_results_fail_tests(self):
+        with patch.object(
+            RhesisPromptMetric, "evaluate_batch", return_value=[MetricResult(score=5)]
+        ):
+            results = _evaluate_batch(BatchJudge(), _evaluator_test_cases(2))
+
+        # The results can't be attributed to tests, so both tests of the batch fail
+        assert [result["quality"]["exception_type"] for result in results] == [
+            "ValueError",
+            "ValueError",
+        ]
+        assert "returned 1 results for 2 tests" in results[0]["quality"]["error"]
@@ -0,0 +1,149 @@
+"""
+Tests for the process-wide metric evaluation scheduler in rhesis.backend.metrics.scheduler
+
+This module tests:
+- The global and per-provider concurrency limits
+- Serving other providers while one provider is at its limit
+- Results, errors and statistics of scheduled evaluations
+- Metric evaluations of MetricEvaluator running on the scheduler
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from rhesis.backend.app.utils.phase_timer import PhaseTimer
+from rhesis.backend.metrics import evaluator as evaluator_module
+from rhesis.backend.metrics.base import MetricConfig, MetricResult
+from rhesis.backend.metrics.evaluator import MetricEvaluator
+from rhesis.backend.metrics.scheduler import (
+    EvaluationScheduler,
+    _parse_provider_limits,
+    metric_provider,
+)
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = EvaluationScheduler(
+        max_concurrency=4, provider_concurrency=2, provider_limits={"slow": 1}
+    )
+    yield scheduler
+    scheduler.shutdown()
+
+
+class _Tracker:
+    """Records the highest number of concurrently running calls per provider"""
+
+    def __init__(self):
+        self.running = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+
+    def call(self, provider, duration=0.05):
+        with self.lock:
+            self.running[provider] = self.running.get(provider, 0) + 1
+            self.peak[provider] = max(self.peak.get(provider, 0), self.running[provider])
+            total = sum(self.running.values())
+            self.peak["total"] = max(self.peak.get("total", 0), total)
+        time.sleep(duration)
+        with self.lock:
+            self.running[provider] -= 1
+        return provider
+
+
+class TestEvaluationScheduler:
+    """Test scheduling of evaluations"""
+
+    @pytest.mark.unit
+    def test_limits_respected(self, scheduler):
+        tracker = _Tracker()
+        futures = [
+            scheduler.submit(tracker.call, provider, provider=provider)
+            for provider in ["openai", "gemini", "slow"] * 4
+        ]
+
+        assert [future.result(timeout=5) for future in futures] == [
+            "openai",
+            "gemini",
+            "slow",
+        ] * 4
+        assert tracker.peak["total"] <= 4
+        assert tracker.peak["openai"] <= 2
+        assert tracker.peak["slow"] == 1
+
+    @pytest.mark.unit
+    def test_other_providers_served_while_one_is_busy(self, scheduler):
+        release = threading.Event()
+        blocked = [scheduler.submit(release.wait, 5, provider="slow") for _ in range(3)]
+
+        fast = scheduler.submit(lambda: "done", provider="openai")
+
+        assert fast.result(timeout=1) == "done"
+        assert scheduler.get_stats()["providers"]["slow"]["queued"] == 2
+        release.set()
+        assert all(future.result(timeout=5) for future in blocked)
+
+    @pytest.mark.unit
+    def test_errors_and_statistics(self, scheduler):
+        def fail():
+            raise ValueError("judge failed")
+
+        future = scheduler.submit(fail, provider="OpenAI")
+
+        with pytest.raises(ValueError, match="judge failed"):
+            future.result(timeout=5)
+        scheduler.submit(lambda: None).result(timeout=5)
+
+        stats = scheduler.get_stats()
+        assert stats["completed"] == 2
+        assert stats["running"] == 0
+        assert stats["providers"]["openai"]["completed"] == 1
+        assert stats["providers"]["default"]["limit"] == 2
+        assert stats["providers"]["openai"]["wait_ms_max"] >= 0
+
+    @pytest.mark.unit
+    def test_provider_configuration(self):
+        assert _parse_provider_limits("openai=4, Gemini=10,bad,x=y") == {
+            "openai": 4,
+            "gemini": 10,
+        }
+        configured = SimpleNamespace(model_instance=SimpleNamespace(model_name="openai/gpt-4o"))
+        assert metric_provider(configured) == "openai"
+        assert metric_provider(SimpleNamespace(provider="Gemini")) == "gemini"
+        assert metric_provider(SimpleNamespace()) == "default"
+
+
+class _Metric:
+    requires_ground_truth = False
+    provider = "gemini"
+
+    def __init__(self, name):
+        self.name = name
+
+    def evaluate(self, input, output, expected_output, context):
+        thread = threading.current_thread().name
+        return MetricResult(score=1.0, details={"reason": f"{self.name} on {thread}"})
+
+
+class TestEvaluatorScheduling:
+    """Test metric evaluation through the scheduler"""
+
+    @pytest.mark.unit
+    def test_metrics_evaluated_on_scheduler(self, scheduler):
+        configs = [MetricConfig(class_name=name, backend="rhesis", threshold=0.5) for name in "ab"]
+        tasks = [
+            (config.class_name, _Metric(config.class_name), config, "rhesis") for config in configs
+        ]
+        timer = PhaseTimer()
+
+        with patch.object(evaluator_module, "evaluation_scheduler", scheduler), timer.activate():
+            results = MetricEvaluator()._execute_metrics_in_parallel(tasks, "q", "o", "e", [])
+
+        assert set(results) == {"a", "b"}
+        assert all("metric-evaluation" in result["reason"] for result in results.values())
+        assert {"metric_queue", "metric:a", "metric:b"} <= set(timer.as_dict())
+        assert scheduler.get_stats()["providers"]["gemini"]["completed"] == 2
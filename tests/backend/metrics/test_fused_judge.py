@@ -0,0 +1,234 @@
+"""
+Tests for fused judging of prompt metrics in rhesis.backend.metrics.rhesis.fused_judge
+
+This module tests:
+- Judging compatible prompt metrics of a test with a single request
+- Falling back to individual requests for missing or unparseable judgments
+- Grouping metrics by judge model
+- Fused judging through MetricEvaluator
+- Failing only the metrics a fused evaluation returned no result for or that failed
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from rhesis.sdk.models.base import BaseLLM
+
+from rhesis.backend.metrics import evaluator as evaluator_module
+from rhesis.backend.metrics.base import MetricConfig, MetricResult
+from rhesis.backend.metrics.evaluator import MetricEvaluator
+from rhesis.backend.metrics.pool import MetricPool
+from rhesis.backend.metrics.rhesis.fused_judge import evaluate_fused, get_fusion_key
+from rhesis.backend.metrics.rhesis.prompt_metric import RhesisPromptMetric, parse_judgments
+from rhesis.backend.metrics.scheduler import EvaluationScheduler
+
+FUSED_RESPONSE = json.dumps(
+    {
+        "metric_1": {"score": 4, "reason": "Accurate"},
+        "metric_2": {"score": "true", "reason": "Polite"},
+    }
+)
+SINGLE_RESPONSE = json.dumps({"score": 2, "reason": "Judged alone"})
+
+
+class RecordingJudge(BaseLLM):
+    """Judge model answering fused prompts with `fused` and others with `single`"""
+
+    def __init__(self, model_name="fake/judge", fused=FUSED_RESPONSE, single=SINGLE_RESPONSE):
+        super().__init__(model_name)
+        self.fused = fused
+        self.single = single
+        self.prompts = []
+
+    def load_model(self, *args, **kwargs):
+        return None
+
+    def generate(self, prompt, *args, **kwargs):
+        self.prompts.append(prompt)
+        return self.fused if 'Metric "metric_1"' in prompt else self.single
+
+
+def _numeric_metric(judge, name="accuracy"):
+    return RhesisPromptMetric(
+        name=name,
+        evaluation_prompt=f"Rate the {name}",
+        evaluation_steps="Read",
+        reasoning=name,
+        min_score=1,
+        max_score=5,
+        threshold=3,
+        threshold_operator=">=",
+        model=judge,
+    )
+
+
+def _binary_metric(judge, name="politeness"):
+    return RhesisPromptMetric(
+        name=name,
+        evaluation_prompt=f"Is the answer showing {name}?",
+        evaluation_steps="Read",
+        reasoning=name,
+        score_type="binary",
+        threshold_operator="=",
+        model=judge,
+    )
+
+
+def _evaluate(metrics, output="Paris"):
+    return evaluate_fused(metrics, "Capital of France?", output, "Paris", ["France"])
+
+
+class TestFusedJudge:
+    """Test fused judging of prompt metrics"""
+
+    @pytest.mark.unit
+    def test_metrics_judged_with_single_request(self):
+        judge = RecordingJudge()
+        results = _evaluate({"a": _numeric_metric(judge), "b": _binary_metric(judge)})
+
+        assert len(judge.prompts) == 1
+        assert judge.prompts[0].count("Capital of France?") == 1
+        assert "Rate the accuracy" in judge.prompts[0]
+        assert "Is the answer showing politeness?" in judge.prompts[0]
+        assert results["a"].score == 4
+        assert results["a"].details["is_successful"] is True
+        assert results["a"].details["fused"] is True
+        assert results["b"].score == "true"
+        assert results["b"].details["reason"] == "Polite"
+
+    @pytest.mark.unit
+    def test_missing_judgment_falls_back(self):
+        judge = RecordingJudge(fused=json.dumps({"metric_1": {"score": 5, "reason": "Great"}}))
+        results = _evaluate({"a": _numeric_metric(judge), "b": _numeric_metric(judge, "tone")})
+
+        assert len(judge.prompts) == 2
+        assert results["a"].score == 5
+        assert results["b"].score == 2
+        assert "fused" not in results["b"].details
+
+    @pytest.mark.unit
+    def test_unparseable_response_falls_back(self):
+        judge = RecordingJudge(fused="I cannot answer in JSON")
+        results = _evaluate({"a": _numeric_metric(judge), "b": _numeric_metric(judge, "tone")})
+
+        assert len(judge.prompts) == 3
+        assert results["a"].score == results["b"].score == 2
+
+    @pytest.mark.unit
+    def test_failed_fallback_fails_only_its_metric(self):
+        judge = RecordingJudge(fused=json.dumps({"metric_1": {"score": 5, "reason": "Great"}}))
+        failing = _numeric_metric(judge, "tone")
+        with patch.object(failing, "evaluate", side_effect=RuntimeError("judge down")):
+            results = _evaluate({"a": _numeric_metric(judge), "b": failing})
+
+        assert results["a"].score == 5
+        assert isinstance(results["b"], RuntimeError)
+
+    @pytest.mark.unit
+    def test_empty_output_not_judged(self):
+        judge = RecordingJudge()
+        results = _evaluate({"a": _numeric_metric(judge), "b": _binary_metric(judge)}, output=" ")
+
+        assert judge.prompts == []
+        assert results["a"].details["empty_output_detected"] is True
+
+    @pytest.mark.unit
+    def test_parse_judgments(self):
+        response = 'Result: {"metric_1": {"score": 3}, "metric_2": {"reason": "no score"}}'
+
+        judgments = parse_judgments(response, ["metric_1", "metric_2", "metric_3"])
+
+        assert list(judgments) == ["metric_1"]
+        assert judgments["metric_1"].score == 3
+
+    @pytest.mark.unit
+    def test_fusion_key_depends_on_judge_model(self):
+        judge = RecordingJudge()
+
+        assert get_fusion_key(_numeric_metric(judge)) == get_fusion_key(_binary_metric(judge))
+        assert get_fusion_key(_numeric_metric(judge)) != get_fusion_key(
+            _numeric_metric(RecordingJudge("fake/other"))
+        )
+        assert get_fusion_key(object()) is None
+
+
+class TestEvaluatorFusedJudging:
+    """Test fused judging through the metric evaluator"""
+
+    @staticmethod
+    def _configs(names):
+        return [
+            MetricConfig(
+                class_name="RhesisPromptMetric",
+                backend="rhesis",
+                threshold=3,
+                name=name,
+                parameters={
+                    "evaluation_prompt": f"Rate the {name}",
+                    "evaluation_steps": "Read",
+                    "reasoning": name,
+                    "min_score": 1,
+                    "max_score": 5,
+                    "threshold_operator": ">=",
+                },
+            )
+            for name in names
+        ]
+
+    @staticmethod
+    def _evaluate(judge, configs):
+        scheduler = EvaluationScheduler(max_concurrency=2, provider_concurrency=2)
+        evaluator = MetricEvaluator(model=judge, fused_judging=True)
+        try:
+            with patch.object(evaluator_module, "metric_pool", MetricPool()):
+                with patch.object(evaluator_module, "evaluation_scheduler", scheduler):
+                    return evaluator.evaluate("Capital of France?", "Paris", "Paris", [], configs)
+        finally:
+            scheduler.shutdown()
+
+    @pytest.mark.unit
+    def test_evaluator_fuses_prompt_metrics(self):
+        judge = RecordingJudge()
+        configs = self._configs(["accuracy", "tone", "style"])
+        judge.fused = json.dumps(
+            {f"metric_{index}": {"score": index + 2, "reason": "ok"} for index in range(1, 4)}
+        )
+
+        results = self._evaluate(judge, configs)
+
+        assert len(judge.prompts) == 1
+        assert {key: result["score"] for key, result in results.items()} == {
+            "accuracy": 3,
+            "tone": 4,
+            "style": 5,
+        }
+        assert all(result["is_successful"] for result in results.values())
+
+    @pytest.mark.unit
+    def test_missing_fused_result_fails_only_its_metric(self):
+        def evaluate_first_only(metrics, *args):
+            key = next(iter(metrics))
+            return {key: MetricResult(score=4, details={"reason": "ok"})}
+
+        with patch.object(evaluator_module, "evaluate_fused", side_effect=evaluate_first_only):
+            results = self._evaluate(RecordingJudge(), self._configs(["accuracy", "tone"]))
+
+        assert results["accuracy"]["score"] == 4
+        assert "error" not in results["accuracy"]
+        assert results["tone"]["exception_type"] == "ValueError"
+
+    @pytest.mark.unit
+    def test_failed_fused_metric_fails_only_its_metric(self):
+        def fail_second(metrics, *args):
+            first, second = metrics
+            return {
+                first: MetricResult(score=4, details={"reason": "ok"}),
+                second: RuntimeError("judge down"),
+            }
+
+        with patch.object(evaluator_module, "evaluate_fused", side_effect=fail_second):
+            results = self._evaluate(RecordingJudge(), self._configs(["accuracy", "tone"]))
+
+        assert results["accuracy"]["score"] == 4
+        assert results["tone"]["exception_type"] == "RuntimeError"
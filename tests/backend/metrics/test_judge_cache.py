@@ -0,0 +1,149 @@
+"""
+Tests for the LLM-judge result cache in rhesis.backend.metrics.judge_cache
+
+This module tests:
+- Reusing judgments of identical judge prompts within an organization
+- Namespacing of judgments by organization and judge model
+- Caching only inside a judge cache scope and only for parsed responses
+- Enabling the judge cache through MetricEvaluator
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from rhesis.sdk.models.base import BaseLLM
+from tests.backend.fake_redis import FakeRedis
+
+from rhesis.backend.metrics import evaluator as evaluator_module
+from rhesis.backend.metrics import judge_cache
+from rhesis.backend.metrics.base import MetricConfig
+from rhesis.backend.metrics.evaluator import MetricEvaluator
+from rhesis.backend.metrics.judge_cache import judge_cache_scope
+from rhesis.backend.metrics.pool import MetricPool
+from rhesis.backend.metrics.rhesis.prompt_metric import RhesisPromptMetric
+
+
+class CountingJudge(BaseLLM):
+    """Judge model returning a fixed response and counting its calls"""
+
+    def __init__(self, model_name="fake/judge", response=None):
+        super().__init__(model_name)
+        self.response = response or json.dumps({"score": 4, "reason": "Good"})
+        self.calls = 0
+
+    def load_model(self, *args, **kwargs):
+        return None
+
+    def generate(self, prompt, *args, **kwargs):
+        self.calls += 1
+        return self.response
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch.object(judge_cache, "get_redis_client", return_value=fake):
+        yield fake
+
+
+def _metric(judge):
+    return RhesisPromptMetric(
+        name="quality",
+        evaluation_prompt="Rate the answer",
+        evaluation_steps="Read",
+        reasoning="Quality",
+        min_score=1,
+        max_score=5,
+        threshold=3,
+        threshold_operator=">=",
+        model=judge,
+    )
+
+
+def _evaluate(metric, output="Paris"):
+    return metric.evaluate(
+        input="Capital of France?", output=output, expected_output="Paris", context=[]
+    )
+
+
+class TestJudgeCache:
+    """Test caching of judge results"""
+
+    @pytest.mark.unit
+    def test_identical_prompts_judged_once(self, redis):
+        judge = CountingJudge()
+        metric = _metric(judge)
+
+        with judge_cache_scope("org-1"):
+            first = _evaluate(metric)
+            second = _evaluate(metric)
+
+        assert judge.calls == 1
+        assert first.details["cached"] is False
+        assert second.details["cached"] is True
+        assert second.score == first.score == 4
+        assert second.details["is_successful"] is True
+        assert list(redis.expiry.values()) == [judge_cache.DEFAULT_TTL_SECONDS]
+
+    @pytest.mark.unit
+    def test_judgments_namespaced_by_organization_and_model(self, redis):
+        judge = CountingJudge()
+        metric = _metric(judge)
+
+        with judge_cache_scope("org-1"):
+            _evaluate(metric)
+        with judge_cache_scope("org-2"):
+            assert _evaluate(metric).details["cached"] is False
+        with judge_cache_scope("org-1"):
+            assert _evaluate(metric, output="Lyon").details["cached"] is False
+            assert _evaluate(_metric(CountingJudge("fake/other"))).details["cached"] is False
+
+        assert judge.calls == 3
+        assert all(key.startswith("rhesis:judge_cache:org-") for key in redis.values)
+
+    @pytest.mark.unit
+    def test_nothing_cached_outside_scope(self, redis):
+        judge = CountingJudge()
+        metric = _metric(judge)
+
+        _evaluate(metric)
+        _evaluate(metric)
+
+        assert judge.calls == 2
+        assert redis.values == {}
+
+    @pytest.mark.unit
+    def test_unparsed_responses_not_cached(self, redis):
+        judge = CountingJudge(response="no judgment")
+
+        with judge_cache_scope("org-1"):
+            _evaluate(_metric(judge))
+
+        assert redis.values == {}
+
+    @pytest.mark.unit
+    def test_evaluator_enables_cache(self, redis):
+        judge = CountingJudge()
+        config = MetricConfig(
+            class_name="RhesisPromptMetric",
+            backend="rhesis",
+            threshold=3,
+            name="quality",
+            parameters={
+                "evaluation_prompt": "Rate the answer",
+                "evaluation_steps": "Read",
+                "reasoning": "Quality",
+                "min_score": 1,
+                "max_score": 5,
+                "threshold_operator": ">=",
+            },
+        )
+        evaluator = MetricEvaluator(model=judge, organization_id="org-1", judge_cache=True)
+
+        with patch.object(evaluator_module, "metric_pool", MetricPool()):
+            for _ in range(2):
+                evaluator.evaluate("Capital of France?", "Paris", "Paris", [], [config])
+
+        assert judge.calls == 1
+        assert len(redis.values) == 1
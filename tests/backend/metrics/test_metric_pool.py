@@ -0,0 +1,172 @@
+"""
+Tests for the metric-instance pool in rhesis.backend.metrics.pool
+
+This module tests:
+- Sharing metric instances between evaluators with the same configuration and model
+- Separate instances for different configurations and judge models
+- LRU eviction of pooled instances
+- Concurrent evaluations with one RhesisPromptMetric instance
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from rhesis.sdk.models.base import BaseLLM
+
+from rhesis.backend.metrics import evaluator as evaluator_module
+from rhesis.backend.metrics.base import MetricConfig
+from rhesis.backend.metrics.evaluator import MetricEvaluator
+from rhesis.backend.metrics.pool import MetricPool, model_identity
+from rhesis.backend.metrics.rhesis.factory import RhesisMetricFactory
+from rhesis.backend.metrics.rhesis.prompt_metric import RhesisPromptMetric
+
+
+class EchoJudge(BaseLLM):
+    """Judge model scoring a response with the number of words of the output"""
+
+    def __init__(self, model_name="fake/judge", api_key="secret"):
+        super().__init__(model_name)
+        self.api_key = api_key
+        self.barrier = None
+
+    def load_model(self, *args, **kwargs):
+        return None
+
+    def generate(self, prompt, *args, **kwargs):
+        if self.barrier:
+            self.barrier.wait(timeout=5)
+        output = prompt.split("OUTPUT<")[1].split(">")[0]
+        return json.dumps({"score": len(output.split()), "reason": output})
+
+
+def _config(**overrides):
+    values = dict(
+        class_name="RhesisPromptMetric",
+        backend="rhesis",
+        threshold=2,
+        name="words",
+        parameters={
+            "evaluation_prompt": "Count the words",
+            "evaluation_steps": "Count",
+            "reasoning": "Words",
+            "evaluation_examples": "",
+            "score_type": "numeric",
+            "min_score": 0,
+            "max_score": 10,
+            "threshold_operator": ">=",
+        },
+    )
+    values.update(overrides)
+    return MetricConfig(**values)
+
+
+@pytest.fixture
+def pool():
+    fresh = MetricPool(max_size=8)
+    with patch.object(evaluator_module, "metric_pool", fresh):
+        yield fresh
+
+
+class TestMetricPool:
+    """Test pooling of metric instances"""
+
+    @pytest.mark.unit
+    def test_evaluators_share_instances(self, pool):
+        judge = EchoJudge()
+        create = RhesisMetricFactory.create
+        with patch.object(
+            RhesisMetricFactory, "create", autospec=True, side_effect=create
+        ) as mock_create:
+            first = MetricEvaluator(model=judge)._prepare_metrics([_config()], "expected")
+            second = MetricEvaluator(model=judge)._prepare_metrics([_config()], "expected")
+
+        assert first[0][1] is second[0][1]
+        assert mock_create.call_count == 1
+        assert len(pool) == 1
+
+    @pytest.mark.unit
+    def test_configurations_and_models_not_shared(self, pool):
+        judge = EchoJudge()
+        metric = MetricEvaluator(model=judge)._prepare_metrics([_config()], "x")[0][1]
+
+        changed = _config(parameters={**_config().parameters, "max_score": 5})
+        other_key = EchoJudge(api_key="other")
+
+        assert MetricEvaluator(model=judge)._prepare_metrics([changed], "x")[0][1] is not metric
+        other = MetricEvaluator(model=other_key)._prepare_metrics([_config()], "x")[0][1]
+        assert other is not metric
+        assert len(pool) == 3
+
+    @pytest.mark.unit
+    def test_model_identity_does_not_contain_keys(self):
+        identity = model_identity(EchoJudge(api_key="secret"))
+
+        assert "secret" not in repr(identity)
+        assert identity != model_identity(EchoJudge(api_key="other"))
+        assert identity == model_identity(EchoJudge(api_key="secret"))
+        assert model_identity(None) is None
+
+    @pytest.mark.unit
+    def test_least_recently_used_evicted(self):
+        pool = MetricPool(max_size=2)
+        created = []
+
+        def get(name):
+            return pool.get_or_create(
+                _config(name=name), None, lambda: created.append(name) or object()
+            )
+
+        get("a")
+        get("b")
+        get("a")
+        get("c")
+        get("a")
+        get("b")
+
+        assert len(pool) == 2
+        assert created == ["a", "b", "c", "b"]
+
+
+class TestReentrantEvaluation:
+    """Test concurrent evaluations with one metric instance"""
+
+    @pytest.mark.unit
+    def test_prompt_metric_scores_concurrent_tests(self):
+        judge = EchoJudge()
+        judge.barrier = threading.Barrier(4)
+        metric = RhesisPromptMetric(
+            name="words",
+            evaluation_prompt="Count the words",
+            evaluation_steps="Count",
+            reasoning="Words",
+            min_score=0,
+            max_score=10,
+            threshold=2,
+            threshold_operator=">=",
+            model=judge,
+        )
+        outputs = ["one", "one two", "one two three", "one two three four"]
+
+        with patch.object(
+            RhesisPromptMetric, "get_prompt_template", lambda self, i, o, e, c: f"OUTPUT<{o}>"
+        ), ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(
+                    lambda output: metric.evaluate(
+                        input="q", output=output, expected_output="e", context=[]
+                    ),
+                    outputs,
+                )
+            )
+
+        assert [result.score for result in results] == [1, 2, 3, 4]
+        assert [result.details["reason"] for result in results] == outputs
+        assert [result.details["is_successful"] for result in results] == [
+            False,
+            True,
+            True,
+            True,
+        ]
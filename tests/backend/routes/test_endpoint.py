@@ -95,8 +95,8 @@ class TestEndpointInvocation(EndpointTestMixin, BaseEntityTests):
     
     def test_invoke_endpoint_success(self, authenticated_client: TestClient, working_endpoint):
         """🔗🔥 Test successful endpoint invocation with proper mocking"""
-        # Mock the requests library that the REST invoker actually uses
-        with patch('requests.post') as mock_requests_post:
+        # Mock the pooled requests session that the REST invoker actually uses
+        with patch('requests.Session.request') as mock_requests_post:
             # Configure the mock HTTP response
             mock_response = Mock()
             mock_response.status_code = 200
@@ -172,7 +172,7 @@ class TestEndpointInvocation(EndpointTestMixin, BaseEntityTests):
     def test_invoke_endpoint_service_exception(self, authenticated_client: TestClient, working_endpoint):
         """🔗💥 Test endpoint invocation when external service throws exception"""
         # Mock requests library to throw exception
-        with patch('requests.post') as mock_requests_post:
+        with patch('requests.Session.request') as mock_requests_post:
             mock_requests_post.side_effect = Exception("External API connection failed")
             
             input_data = {"input": "Test query"}
@@ -459,7 +459,7 @@ class TestEndpointHealthChecks(EndpointTestMixin, BaseEntityTests):
         assert response.status_code == status.HTTP_200_OK
         
         # Test invoke endpoint with valid data and proper mocking
-        with patch('requests.post') as mock_requests_post:
+        with patch('requests.Session.request') as mock_requests_post:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"result": "health check passed"}
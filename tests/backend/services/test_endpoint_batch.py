@@ -0,0 +1,174 @@
+"""
+Tests for the batch mode of REST endpoints in rhesis.backend.app.services.invokers
+
+This module tests:
+- Rendering batch request templates with several inputs
+- Splitting batch responses into mapped per-input responses
+- Sending several inputs in one request with RestEndpointInvoker.invoke_batch
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from rhesis.backend.app.services.invokers import base, transport
+from rhesis.backend.app.services.invokers.base import ResponseMapper, TemplateRenderer
+from rhesis.backend.app.services.invokers.rest_invoker import RestEndpointInvoker
+
+
+class _BatchHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append(body)
+        if body.get("fail"):
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        results = [{"text": prompt.upper(), "tokens": len(prompt)} for prompt in body["prompts"]]
+        if body.get("drop_last"):
+            results = results[:-1]
+        data = json.dumps({"model": "m1", "results": results}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def clear_plans():
+    base._template_plans.clear()
+    base._mapping_plans.clear()
+    yield
+    base._template_plans.clear()
+    base._mapping_plans.clear()
+
+
+@pytest.fixture
+def server_url():
+    _BatchHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BatchHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    transport.reset_transports()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    transport.reset_transports()
+    server.shutdown()
+    server.server_close()
+
+
+def _endpoint(url, **overrides):
+    values = dict(
+        id=None,
+        name="batch",
+        url=url,
+        endpoint_path="/generate",
+        method="POST",
+        auth_type=None,
+        request_headers={"Content-Type": "application/json"},
+        request_body_template={"prompt": "{{ input }}"},
+        response_mappings={"output": "$.text"},
+        batch_size=8,
+        batch_request_body_template={"prompts": "{{ inputs }}", "options": {"n": 1}},
+        batch_response_path="$.results",
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestBatchTemplates:
+    """Test rendering and mapping of batch requests and responses"""
+
+    @pytest.mark.unit
+    def test_single_expressions_keep_their_type(self):
+        rendered = TemplateRenderer().render_batch(
+            {"prompts": "{{ inputs }}", "meta": {"count": "{{ inputs | length }}"}, "tag": "x"},
+            [{"input": "a"}, {"input": "b"}],
+        )
+        assert rendered == {"prompts": ["a", "b"], "meta": {"count": 2}, "tag": "x"}
+
+    @pytest.mark.unit
+    def test_text_templates_render_to_strings(self):
+        rendered = TemplateRenderer().render_batch(
+            {"prompt": "Answer: {{ inputs | join(' | ') }}"}, [{"input": "a"}, {"input": "b"}]
+        )
+        assert rendered == {"prompt": "Answer: a | b"}
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("items_path", ["$.results", "$.results[*]"])
+    def test_items_mapped_individually(self, items_path):
+        response = {"results": [{"text": "A", "id": 1}, {"text": "B", "id": 2}]}
+        mapped = ResponseMapper().map_batch_response(response, items_path, {"output": "$.text"})
+        assert mapped == [{"output": "A"}, {"output": "B"}]
+
+    @pytest.mark.unit
+    def test_plain_items_become_outputs(self):
+        mapped = ResponseMapper().map_batch_response({"outputs": ["A", "B"]}, "$.outputs", {})
+        assert mapped == [{"output": "A"}, {"output": "B"}]
+
+
+class TestRestInvokeBatch:
+    """Test batched invocation of REST endpoints"""
+
+    @pytest.mark.unit
+    def test_batch_size_requires_batch_configuration(self):
+        invoker = RestEndpointInvoker()
+        assert invoker.get_batch_size(_endpoint("http://x")) == 8
+        assert invoker.get_batch_size(_endpoint("http://x", batch_response_path=None)) == 1
+        assert invoker.get_batch_size(_endpoint("http://x", batch_size=None)) == 1
+
+    @pytest.mark.unit
+    def test_inputs_sent_in_one_request(self, server_url):
+        results = RestEndpointInvoker().invoke_batch(
+            None, _endpoint(server_url), [{"input": "hi"}, {"input": "there"}]
+        )
+
+        assert results == [{"output": "HI"}, {"output": "THERE"}]
+        assert _BatchHandler.requests == [{"prompts": ["hi", "there"], "options": {"n": 1}}]
+
+    @pytest.mark.unit
+    def test_request_failure_reported_for_every_input(self, server_url):
+        endpoint = _endpoint(
+            server_url, batch_request_body_template={"prompts": "{{ inputs }}", "fail": True}
+        )
+        results = RestEndpointInvoker().invoke_batch(
+            None, endpoint, [{"input": "a"}, {"input": "b"}]
+        )
+
+        assert [result["status_code"] for result in results] == [503, 503]
+        assert results[0] is not results[1]
+
+    @pytest.mark.unit
+    def test_missing_outputs_are_errors(self, server_url):
+        endpoint = _endpoint(
+            server_url, batch_request_body_template={"prompts": "{{ inputs }}", "drop_last": True}
+        )
+        results = RestEndpointInvoker().invoke_batch(
+            None, endpoint, [{"input": "a"}, {"input": "b"}]
+        )
+
+        assert [result["error_type"] for result in results] == ["batch_response_error"] * 2
+
+    @pytest.mark.unit
+    def test_without_batch_mode_inputs_sent_one_by_one(self, server_url):
+        endpoint = _endpoint(
+            server_url,
+            batch_size=None,
+            request_body_template={"prompts": "{{ input }}"},
+            response_mappings={"output": "$.model"},
+        )
+        results = RestEndpointInvoker().invoke_batch(
+            None, endpoint, [{"input": "a"}, {"input": "b"}]
+        )
+
+        assert results == [{"output": "m1"}, {"output": "m1"}]
+        assert len(_BatchHandler.requests) == 2
@@ -0,0 +1,140 @@
+"""
+Tests for the endpoint configuration cache in rhesis.backend.app.services.endpoint_cache
+
+This module tests:
+- Detached endpoint snapshots shared by invocations
+- Separation of cache entries by organization
+- Invalidation across processes and expiry of entries
+- Invalidation of endpoints changed by committed sessions
+"""
+
+import uuid
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from tests.backend.fake_redis import FakeRedis
+
+from rhesis.backend.app.models.endpoint import Endpoint
+from rhesis.backend.app.services import endpoint_cache as endpoint_cache_module
+from rhesis.backend.app.services.endpoint_cache import EndpointCache
+
+
+def _endpoint():
+    return Endpoint(
+        id=uuid.uuid4(),
+        name="chat",
+        protocol="REST",
+        url="https://example.com",
+        request_headers={"Authorization": "Bearer {{ auth_token }}"},
+        updated_at=datetime(2025, 1, 1),
+    )
+
+
+@pytest.fixture
+def redis_client():
+    client = FakeRedis()
+    with patch.object(endpoint_cache_module, "get_redis_client", return_value=client):
+        yield client
+
+
+class TestEndpointCache:
+    """Test caching of endpoint configurations and invokers"""
+
+    @pytest.mark.unit
+    def test_snapshot_shared_by_hits(self, redis_client):
+        cache = EndpointCache()
+        endpoint = _endpoint()
+        invoker = object()
+
+        entry = cache.put("org-1", endpoint, invoker, cache.get_generation(endpoint.id))
+        hit = cache.get("org-1", endpoint.id)
+
+        assert hit is entry
+        assert hit.invoker is invoker
+        assert hit.endpoint is not endpoint
+        assert hit.endpoint.request_headers == endpoint.request_headers
+        assert hit.endpoint.request_headers is not endpoint.request_headers
+        assert hit.updated_at == endpoint.updated_at
+
+    @pytest.mark.unit
+    def test_entries_separated_by_organization(self, redis_client):
+        cache = EndpointCache()
+        endpoint = _endpoint()
+        cache.put("org-1", endpoint, object(), 0)
+
+        assert cache.get("org-2", endpoint.id) is None
+        assert cache.get(None, endpoint.id) is None
+
+    @pytest.mark.unit
+    def test_invalidation_reaches_other_processes(self, redis_client):
+        # Two caches stand in for two worker processes sharing Redis
+        worker, api = EndpointCache(), EndpointCache()
+        endpoint = _endpoint()
+        worker.put("org-1", endpoint, object(), worker.get_generation(endpoint.id))
+        api.put("org-1", endpoint, object(), api.get_generation(endpoint.id))
+
+        api.invalidate(endpoint.id)
+
+        assert api.get("org-1", endpoint.id) is None
+        assert worker.get("org-1", endpoint.id) is None
+
+    @pytest.mark.unit
+    def test_entries_expire(self, redis_client):
+        cache = EndpointCache()
+        endpoint = _endpoint()
+        cache.put("org-1", endpoint, object(), cache.get_generation(endpoint.id))
+        assert cache.get("org-1", endpoint.id) is not None
+
+        cache.ttl = 0
+        assert cache.get("org-1", endpoint.id) is None
+
+    @pytest.mark.unit
+    def test_nothing_cached_without_redis(self):
+        cache = EndpointCache()
+        endpoint = _endpoint()
+        with patch.object(endpoint_cache_module, "get_redis_client", return_value=None):
+            assert cache.put("org-1", endpoint, object(), cache.get_generation(endpoint.id)) is None
+            assert cache.get("org-1", endpoint.id) is None
+
+    @pytest.mark.unit
+    def test_least_recently_used_entries_evicted(self, redis_client):
+        cache = EndpointCache(max_size=2)
+        endpoints = [_endpoint() for _ in range(3)]
+        for endpoint in endpoints:
+            cache.put("org-1", endpoint, object(), 0)
+
+        assert cache.get("org-1", endpoints[0].id) is None
+        assert cache.get("org-1", endpoints[2].id) is not None
+
+
+class TestSessionInvalidation:
+    """Test invalidation of endpoints changed in database sessions"""
+
+    def _session(self, dirty=(), deleted=()):
+        return Mock(dirty=list(dirty), deleted=list(deleted), info={})
+
+    @pytest.mark.unit
+    def test_changed_endpoints_invalidated_on_commit(self):
+        updated, deleted = _endpoint(), _endpoint()
+        session = self._session(dirty=[updated, object()], deleted=[deleted])
+
+        with patch.object(endpoint_cache_module.endpoint_cache, "invalidate") as mock_invalidate:
+            endpoint_cache_module._collect_changed_endpoints(session, None)
+            mock_invalidate.assert_not_called()
+            endpoint_cache_module._invalidate_changed_endpoints(session)
+
+        invalidated = {call.args[0] for call in mock_invalidate.call_args_list}
+        assert invalidated == {str(updated.id), str(deleted.id)}
+        assert session.info == {}
+
+    @pytest.mark.unit
+    def test_rolled_back_changes_not_invalidated(self):
+        session = self._session(dirty=[_endpoint()])
+
+        with patch.object(endpoint_cache_module.endpoint_cache, "invalidate") as mock_invalidate:
+            endpoint_cache_module._collect_changed_endpoints(session, None)
+            endpoint_cache_module._forget_changed_endpoints(session)
+            endpoint_cache_module._invalidate_changed_endpoints(session)
+
+        mock_invalidate.assert_not_called()
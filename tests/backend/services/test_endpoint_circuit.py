@@ -0,0 +1,140 @@
+"""
+Tests for the endpoint circuit breaker in rhesis.backend.app.services.invokers.circuit
+
+This module tests:
+- Classification of invoker results as unavailability signals
+- Admission, probes and recorded outcomes through Redis
+- Failing fast with an endpoint_unavailable error while the circuit is open
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rhesis.backend.app.services import endpoint as endpoint_service_module
+from rhesis.backend.app.services.endpoint import EndpointService
+from rhesis.backend.app.services.invokers import circuit
+from rhesis.backend.app.services.invokers.circuit import (
+    EndpointCircuitBreaker,
+    is_unavailable_response,
+)
+
+
+class TestIsUnavailableResponse:
+    """Test unavailability classification of invoker results"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "result",
+        [
+            {"error": True, "error_type": "network_error"},
+            {"error": True, "error_type": "http_error", "status_code": 503},
+            {"error": True, "error_type": "websocket_connection_error", "status_code": 502},
+            {"error": True, "error_type": "websocket_communication_error"},
+        ],
+    )
+    def test_unavailable_results(self, result):
+        assert is_unavailable_response(result)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "result",
+        [
+            {"output": "Hello"},
+            {"error": True, "error_type": "http_error", "status_code": 429},
+            {"error": True, "error_type": "http_error", "status_code": 500},
+            {"error": True, "error_type": "json_parsing_error", "status_code": 200},
+            None,
+        ],
+    )
+    def test_regular_results(self, result):
+        assert not is_unavailable_response(result)
+
+
+class TestEndpointCircuitBreaker:
+    """Test admission and outcome recording of the circuit breaker"""
+
+    @pytest.mark.unit
+    def test_passes_without_redis(self):
+        breaker = EndpointCircuitBreaker()
+        with patch.object(circuit, "get_redis_client", return_value=None):
+            with breaker.call("endpoint") as call:
+                call.record({"error": True, "error_type": "network_error"})
+
+        assert not call.rejected
+
+    @pytest.mark.unit
+    def test_records_failure_of_admitted_call(self):
+        breaker = EndpointCircuitBreaker()
+        client = Mock()
+        client.eval.side_effect = [[b"pass", b"0"], b"opened"]
+
+        with patch.object(circuit, "get_redis_client", return_value=client):
+            with breaker.call("endpoint") as call:
+                call.record({"error": True, "error_type": "network_error"})
+
+        record_args = client.eval.call_args.args
+        assert record_args[0] == circuit._RECORD_SCRIPT
+        assert record_args[2] == "rhesis:endpoint:endpoint:circuit"
+        assert record_args[4:6] == ("failure", "0")
+
+    @pytest.mark.unit
+    def test_probe_outcome_recorded(self):
+        breaker = EndpointCircuitBreaker()
+        client = Mock()
+        client.eval.side_effect = [[b"probe", b"0"], b"closed"]
+
+        with patch.object(circuit, "get_redis_client", return_value=client):
+            with breaker.call("endpoint") as call:
+                call.record({"output": "Hello"})
+
+        assert call.probe
+        assert client.eval.call_args.args[4:6] == ("success", "1")
+
+    @pytest.mark.unit
+    def test_rejected_call_not_recorded(self):
+        breaker = EndpointCircuitBreaker()
+        client = Mock()
+        client.eval.return_value = [b"reject", b"12.5"]
+
+        with patch.object(circuit, "get_redis_client", return_value=client):
+            with breaker.call("endpoint") as call:
+                response = call.unavailable_response()
+
+        assert call.rejected
+        assert client.eval.call_count == 1
+        assert response["error"] is True
+        assert response["error_type"] == "endpoint_unavailable"
+        assert response["retry_after"] == 12.5
+
+    @pytest.mark.unit
+    def test_passes_when_redis_fails(self):
+        breaker = EndpointCircuitBreaker()
+        client = Mock()
+        client.eval.side_effect = ConnectionError("redis down")
+
+        with patch.object(circuit, "get_redis_client", return_value=client):
+            assert not breaker.allow("endpoint").rejected
+
+
+class TestEndpointServiceCircuit:
+    """Test fast failure of invocations while the circuit is open"""
+
+    @pytest.mark.unit
+    def test_open_circuit_skips_invocation(self):
+        service = EndpointService()
+        invoker = Mock()
+        endpoint = Mock(id="endpoint")
+        client = Mock()
+        client.eval.return_value = [b"reject", b"30"]
+
+        with patch.object(
+            service, "_get_endpoint_and_invoker", return_value=(endpoint, invoker)
+        ), patch.object(circuit, "get_redis_client", return_value=client), patch.object(
+            endpoint_service_module, "concurrency_controller"
+        ) as controller:
+            result = service.invoke_endpoint(Mock(), "endpoint", {"input": "Hi"}, "org")
+
+        assert result["error_type"] == "endpoint_unavailable"
+        invoker.invoke.assert_not_called()
+        controller.slot.assert_not_called()
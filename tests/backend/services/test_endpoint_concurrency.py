@@ -0,0 +1,149 @@
+"""
+Tests for adaptive endpoint concurrency in rhesis.backend.app.services.invokers.concurrency
+
+This module tests:
+- Classification of invoker results as overload signals
+- Slot acquisition, waiting and release through Redis
+- Falling back to unlimited invocations when Redis is unavailable or the controller is disabled
+"""
+
+import asyncio
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rhesis.backend.app.services.invokers import concurrency
+from rhesis.backend.app.services.invokers.concurrency import (
+    EndpointConcurrencyController,
+    is_overload_response,
+)
+
+
+class TestIsOverloadResponse:
+    """Test overload classification of invoker results"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "result",
+        [
+            {"error": True, "error_type": "http_error", "status_code": 429},
+            {"error": True, "error_type": "http_error", "status_code": 503},
+            {"error": True, "error_type": "websocket_connection_error", "status_code": 502},
+            {"error": True, "error_type": "network_error"},
+        ],
+    )
+    def test_overload_results(self, result):
+        assert is_overload_response(result)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "result",
+        [
+            {"output": "Hello"},
+            {"error": True, "error_type": "http_error", "status_code": 400},
+            {"error": True, "error_type": "json_parsing_error", "status_code": 200},
+            None,
+        ],
+    )
+    def test_regular_results(self, result):
+        assert not is_overload_response(result)
+
+
+class TestEndpointConcurrencyController:
+    """Test slot handling of the concurrency controller"""
+
+    @pytest.fixture(autouse=True)
+    def enabled(self, monkeypatch):
+        monkeypatch.setenv("ENDPOINT_CONCURRENCY_ENABLED", "true")
+
+    @pytest.mark.unit
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("ENDPOINT_CONCURRENCY_ENABLED")
+        controller = EndpointConcurrencyController()
+        client = Mock()
+
+        with patch.object(concurrency, "get_redis_client", return_value=client):
+            slot = controller.acquire("endpoint")
+
+        assert not slot.acquired
+        client.eval.assert_not_called()
+
+    @pytest.mark.unit
+    def test_slot_wait_capped(self, monkeypatch):
+        monkeypatch.setenv("ENDPOINT_CONCURRENCY_WAIT_SECONDS", "600")
+
+        controller = EndpointConcurrencyController()
+
+        assert controller.slot_wait_seconds == concurrency.MAX_SLOT_WAIT_SECONDS
+
+    @pytest.mark.unit
+    def test_unlimited_without_redis(self):
+        controller = EndpointConcurrencyController()
+        with patch.object(concurrency, "get_redis_client", return_value=None):
+            with controller.slot("endpoint") as slot:
+                slot.record({"output": "Hello"})
+
+        assert not slot.acquired
+
+    @pytest.mark.unit
+    def test_waits_for_slot_and_releases_with_outcome(self):
+        controller = EndpointConcurrencyController()
+        client = Mock()
+        # Two failed acquisition attempts, then a slot; the release returns the new limit
+        client.eval.side_effect = [0, 0, 1, "2.0"]
+
+        with patch.object(concurrency, "get_redis_client", return_value=client), patch.object(
+            concurrency.time, "sleep"
+        ) as mock_sleep:
+            with controller.slot("endpoint") as slot:
+                slot.record({"error": True, "error_type": "http_error", "status_code": 429})
+
+        assert slot.acquired
+        assert mock_sleep.call_count == 2
+        release_args = client.eval.call_args.args
+        assert release_args[0] == concurrency._RELEASE_SCRIPT
+        assert release_args[5] == slot.token
+        assert release_args[6] == "overloaded"
+
+    @pytest.mark.unit
+    def test_gives_up_waiting_after_timeout(self):
+        controller = EndpointConcurrencyController()
+        controller.slot_wait_seconds = 0
+        client = Mock()
+        client.eval.return_value = 0
+
+        with patch.object(concurrency, "get_redis_client", return_value=client):
+            slot = controller.acquire("endpoint")
+
+        assert not slot.acquired
+        assert controller.release(slot) is None
+
+    @pytest.mark.unit
+    def test_async_slot_waits_without_blocking(self):
+        controller = EndpointConcurrencyController()
+        client = Mock()
+        results = iter([0, 1, "4.0"])
+        eval_threads = []
+
+        def fake_eval(*args):
+            eval_threads.append(threading.get_ident())
+            return next(results)
+
+        client.eval.side_effect = fake_eval
+
+        async def hold_slot():
+            async with controller.aslot("endpoint") as slot:
+                slot.record({"output": "Hello"})
+            return slot, threading.get_ident()
+
+        with patch.object(concurrency, "get_redis_client", return_value=client), patch.object(
+            concurrency.time, "sleep"
+        ) as mock_sleep:
+            slot, loop_thread = asyncio.run(hold_slot())
+
+        assert slot.acquired
+        mock_sleep.assert_not_called()
+        assert client.eval.call_args.args[6] == "ok"
+        # Redis round trips don't block the event loop
+        assert len(eval_threads) == 3 and loop_thread not in eval_threads
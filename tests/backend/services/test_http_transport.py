@@ -0,0 +1,229 @@
+"""
+Tests for the pooled HTTP transport in rhesis.backend.app.services.invokers.transport
+
+This module tests:
+- One transport per origin
+- Connection reuse across requests and the reported pool statistics
+- Cookies set by targets are not kept
+- Reading response bodies of the httpx transports up to the size limit
+- Async invocations of REST endpoints
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from rhesis.backend.app.services.invokers import transport
+from rhesis.backend.app.services.invokers.rest_invoker import RestEndpointInvoker
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.dumps(
+            {"received": json.loads(self.rfile.read(length)), "cookie": self.headers.get("Cookie")}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=abc")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _LargeBodyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body_bytes = 64 * 1024 * 1024
+    chunk = b"x" * 64 * 1024
+    completed = []
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(self.body_bytes))
+        self.end_headers()
+        try:
+            for _ in range(self.body_bytes // len(self.chunk)):
+                self.wfile.write(self.chunk)
+            self.completed.append(True)
+        except OSError:
+            # The client closed the connection once it had read enough
+            self.completed.append(False)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    transport.reset_transports()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    transport.reset_transports()
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpTransport:
+    """Test pooled transports"""
+
+    @pytest.mark.unit
+    def test_transport_per_origin(self, server_url):
+        assert transport.get_transport(f"{server_url}/a") is transport.get_transport(
+            f"{server_url}/b?x=1"
+        )
+        assert transport.get_transport("https://example.com/a") is not transport.get_transport(
+            f"{server_url}/a"
+        )
+
+    @pytest.mark.unit
+    def test_connections_are_reused_without_cookies(self, server_url):
+        url = f"{server_url}/chat"
+        for i in range(3):
+            response = transport.get_transport(url).request(
+                "POST", url, headers={"Content-Type": "application/json"}, json={"input": i}
+            )
+            assert response.status_code == 200
+            assert response.json() == {"received": {"input": i}, "cookie": None}
+
+        stats = transport.get_transport_stats()[server_url]
+        assert stats["requests"] == 3
+        assert stats["connections"] == 1
+        assert stats["reused"] == 2
+
+    @pytest.mark.unit
+    def test_http2_transport_without_cookies(self, server_url):
+        url = f"{server_url}/chat"
+        # Plain HTTP targets are served over HTTP/1.1 by the HTTP/2 client as well
+        http2_transport = transport.Http2Transport(server_url, 2, transport._get_timeout())
+        try:
+            for i in range(2):
+                response = http2_transport.request("POST", url, headers={}, json={"input": i})
+                assert response.json() == {"received": {"input": i}, "cookie": None}
+        finally:
+            http2_transport.close()
+
+    @pytest.mark.unit
+    def test_async_transport_without_cookies(self, server_url):
+        url = f"{server_url}/chat"
+
+        async def send_all():
+            responses = await asyncio.gather(
+                *(
+                    transport.get_async_transport(url).request(
+                        "POST", url, headers={"Content-Type": "application/json"}, json={"input": i}
+                    )
+                    for i in range(3)
+                )
+            )
+            second = await transport.get_async_transport(url).request("POST", url, {}, json={})
+            return [response.json() for response in responses], second.json()
+
+        results, second = asyncio.run(send_all())
+
+        assert results == [{"received": {"input": i}, "cookie": None} for i in range(3)]
+        assert second["cookie"] is None
+
+
+@pytest.fixture
+def large_body_url(monkeypatch):
+    monkeypatch.setenv("ENDPOINT_MAX_RESPONSE_BYTES", "4096")
+    _LargeBodyHandler.completed = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LargeBodyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/large"
+    server.shutdown()
+    server.server_close()
+
+
+def _body_sent_completely(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not _LargeBodyHandler.completed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return _LargeBodyHandler.completed == [True]
+
+
+class TestResponseSizeLimit:
+    """Test reading bodies of the httpx transports up to the size limit"""
+
+    @pytest.mark.unit
+    def test_http2_transport_stops_reading_at_limit(self, large_body_url):
+        http2_transport = transport.Http2Transport(large_body_url, 2, transport._get_timeout())
+        try:
+            response = http2_transport.request("GET", large_body_url, headers={}, stream=True)
+            assert transport.read_limited_body(response)
+        finally:
+            http2_transport.close()
+
+        assert len(response.content) == 4096
+        assert not _body_sent_completely()
+
+    @pytest.mark.unit
+    def test_async_transport_stops_reading_at_limit(self, large_body_url):
+        async def send():
+            return await transport.get_async_transport(large_body_url).request(
+                "GET", large_body_url, headers={}
+            )
+
+        response = asyncio.run(send())
+
+        assert transport.read_limited_body(response)
+        assert len(response.content) == 4096
+        assert not _body_sent_completely()
+
+
+class TestRestAsyncInvocation:
+    """Test the async REST invoker"""
+
+    @staticmethod
+    def _endpoint(url):
+        return SimpleNamespace(
+            id=None,
+            name="chat",
+            url=url,
+            endpoint_path="/chat",
+            method="POST",
+            auth_type=None,
+            last_token=None,
+            last_token_expires_at=None,
+            request_headers={"Content-Type": "application/json"},
+            request_body_template={"query": "{{ input }}"},
+            response_mappings={"output": "$.received.query"},
+        )
+
+    @pytest.mark.unit
+    def test_ainvoke_matches_invoke(self, server_url):
+        invoker = RestEndpointInvoker()
+        endpoint = self._endpoint(server_url)
+
+        async def invoke_many():
+            return await asyncio.gather(
+                *(invoker.ainvoke(None, endpoint, {"input": f"q{i}"}) for i in range(5))
+            )
+
+        responses = asyncio.run(invoke_many())
+
+        assert [response["output"] for response in responses] == [f"q{i}" for i in range(5)]
+        assert responses[0] == invoker.invoke(None, endpoint, {"input": "q0"})
+
+    @pytest.mark.unit
+    def test_ainvoke_network_error_response(self):
+        invoker = RestEndpointInvoker()
+        # Nothing listens on the discard port
+        response = asyncio.run(invoker.ainvoke(None, self._endpoint("http://127.0.0.1:9"), {}))
+
+        assert response["error"] is True
+        assert response["error_type"] == "network_error"
@@ -0,0 +1,92 @@
+"""
+Tests for compiled request templates and response mappings in
+rhesis.backend.app.services.invokers.base
+
+This module tests:
+- Rendering of string and dictionary request templates
+- Reusing compiled templates and JSONPath expressions per endpoint version
+"""
+
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rhesis.backend.app.services.invokers import base
+from rhesis.backend.app.services.invokers.base import (
+    ResponseMapper,
+    TemplateRenderer,
+    get_endpoint_cache_key,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_plans():
+    base._template_plans.clear()
+    base._mapping_plans.clear()
+    yield
+    base._template_plans.clear()
+    base._mapping_plans.clear()
+
+
+class TestTemplateRenderer:
+    """Test request template rendering"""
+
+    @pytest.mark.unit
+    def test_renders_dict_and_string_templates(self):
+        renderer = TemplateRenderer()
+        assert renderer.render({"q": "{{ input }}", "n": 1}, {"input": "Hi"}) == {"q": "Hi", "n": 1}
+        assert renderer.render('{"q": "{{ input }}"}', {"input": "Hi"}) == {"q": "Hi"}
+        assert renderer.render("{{ input }}!", {"input": "Hi"}) == "Hi!"
+
+    @pytest.mark.unit
+    def test_generates_missing_session_id(self):
+        rendered = TemplateRenderer().render(
+            {"q": "{{ input }}", "session": "{{ session_id }}"}, {"input": "Hi"}
+        )
+        assert rendered["session"]
+
+    @pytest.mark.unit
+    def test_compiled_template_is_reused_until_endpoint_changes(self):
+        endpoint = Mock(id="endpoint", updated_at=datetime(2025, 1, 1))
+        renderer = TemplateRenderer()
+
+        with patch.object(
+            TemplateRenderer, "_compile", wraps=TemplateRenderer._compile
+        ) as mock_compile:
+            for _ in range(3):
+                key = get_endpoint_cache_key(endpoint, "request_body_template")
+                assert renderer.render({"q": "{{ input }}"}, {"input": "Hi"}, key) == {"q": "Hi"}
+            assert mock_compile.call_count == 1
+
+            endpoint.updated_at = datetime(2025, 1, 2)
+            key = get_endpoint_cache_key(endpoint, "request_body_template")
+            assert renderer.render({"question": "{{ input }}"}, {"input": "Hi"}, key) == {
+                "question": "Hi"
+            }
+            assert mock_compile.call_count == 2
+
+    @pytest.mark.unit
+    def test_unsaved_endpoint_has_no_cache_key(self):
+        assert get_endpoint_cache_key(Mock(id=None, updated_at=None), "x") is None
+
+
+class TestResponseMapper:
+    """Test response mapping"""
+
+    @pytest.mark.unit
+    def test_jsonpath_expressions_are_parsed_once(self):
+        endpoint = Mock(id="endpoint", updated_at=datetime(2025, 1, 1))
+        mappings = {"output": "$.data.text", "missing": "$.nope"}
+        mapper = ResponseMapper()
+
+        with patch.object(base.jsonpath_ng, "parse", wraps=base.jsonpath_ng.parse) as mock_parse:
+            for _ in range(3):
+                result = mapper.map_response(
+                    {"data": {"text": "Hello"}},
+                    mappings,
+                    get_endpoint_cache_key(endpoint, "response_mappings"),
+                )
+                assert result == {"output": "Hello", "missing": None}
+
+        assert mock_parse.call_count == len(mappings)
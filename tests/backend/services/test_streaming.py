@@ -0,0 +1,193 @@
+"""
+Tests for streamed responses in rhesis.backend.app.services.invokers.streaming
+
+This module tests:
+- Splitting server-sent events and JSON lines into event payloads
+- Assembling the mapped response from streamed events
+- Incremental consumption of a streamed REST response with time to first token, in
+  `invoke` and `ainvoke`
+- Stopping streamed REST responses at the response size limit
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from rhesis.backend.app.services.invokers import transport
+from rhesis.backend.app.services.invokers.base import ResponseMapper
+from rhesis.backend.app.services.invokers.rest_invoker import RestEndpointInvoker
+from rhesis.backend.app.services.invokers.streaming import (
+    StreamAssembler,
+    is_streaming_content_type,
+    iter_stream_events,
+)
+from rhesis.backend.app.utils.phase_timer import PhaseTimer
+
+TOKEN_DELAY_SECONDS = 0.05
+
+
+class _StreamingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        events = [{"id": "chat-1", "delta": token} for token in ("Hel", "lo", " world")]
+        for event in events:
+            self._write_chunk(f"data: {json.dumps(event)}\n\n")
+            time.sleep(TOKEN_DELAY_SECONDS)
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StreamingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    transport.reset_transports()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    transport.reset_transports()
+    server.shutdown()
+    server.server_close()
+
+
+class TestStreamParsing:
+    """Test splitting and assembling streamed bodies"""
+
+    @pytest.mark.unit
+    def test_streaming_content_types(self):
+        assert is_streaming_content_type("text/event-stream; charset=utf-8")
+        assert is_streaming_content_type("application/x-ndjson")
+        assert not is_streaming_content_type("application/json")
+        assert not is_streaming_content_type(None)
+
+    @pytest.mark.unit
+    def test_server_sent_events(self):
+        lines = [": keep-alive", "event: token", "data: a", "data: b", "", "data: [DONE]", ""]
+        assert list(iter_stream_events(lines, "text/event-stream")) == ["a\nb"]
+
+    @pytest.mark.unit
+    def test_json_lines(self):
+        lines = ['{"delta": "a"}', "", '{"delta": "b"}']
+        assert list(iter_stream_events(lines, "application/x-ndjson")) == [
+            '{"delta": "a"}',
+            '{"delta": "b"}',
+        ]
+
+    @pytest.mark.unit
+    def test_output_concatenated_and_fields_kept(self):
+        assembler = StreamAssembler(
+            ResponseMapper(),
+            {"output": "$.choices[0].delta.content", "conversation_id": "$.id"},
+            None,
+        )
+        for token in ("Hi", " there"):
+            assembler.add(json.dumps({"id": "c1", "choices": [{"delta": {"content": token}}]}))
+        assembler.add(json.dumps({"id": "c1", "choices": [{"delta": {}}]}))
+
+        assert assembler.result() == {"output": "Hi there", "conversation_id": "c1"}
+
+    @pytest.mark.unit
+    def test_text_events_without_mappings(self):
+        assembler = StreamAssembler(ResponseMapper(), {}, None)
+        assembler.add("plain ")
+        assembler.add("text")
+
+        assert assembler.result() == {"output": "plain text"}
+
+
+def _streaming_endpoint(url):
+    return SimpleNamespace(
+        id=None,
+        name="chat",
+        url=url,
+        endpoint_path="/chat",
+        method="POST",
+        auth_type=None,
+        last_token=None,
+        last_token_expires_at=None,
+        request_headers={"Content-Type": "application/json"},
+        request_body_template={"query": "{{ input }}"},
+        response_mappings={"output": "$.delta", "conversation_id": "$.id"},
+    )
+
+
+class TestRestStreaming:
+    """Test incremental consumption of streamed REST responses"""
+
+    @pytest.mark.unit
+    def test_streamed_response_with_time_to_first_token(self, server_url):
+        endpoint = _streaming_endpoint(server_url)
+
+        timer = PhaseTimer()
+        with timer.activate():
+            response = RestEndpointInvoker().invoke(None, endpoint, {"input": "Hi"})
+
+        assert response["output"] == "Hello world"
+        assert response["conversation_id"] == "chat-1"
+        streaming = response["streaming"]
+        assert streaming["tokens"] == 3
+        # The first token arrives before the rest of the stream
+        assert streaming["time_to_first_token_ms"] < streaming["duration_ms"]
+        assert streaming["duration_ms"] >= 2 * TOKEN_DELAY_SECONDS * 1000
+        assert streaming["tokens_per_second"] > 0
+        assert "time_to_first_token" in timer.as_dict()
+
+    @pytest.mark.unit
+    def test_streamed_response_stops_at_size_limit(self, server_url, monkeypatch):
+        # Each event of the test stream is about 50 bytes
+        monkeypatch.setenv("ENDPOINT_MAX_RESPONSE_BYTES", "80")
+
+        response = RestEndpointInvoker().invoke(
+            None, _streaming_endpoint(server_url), {"input": "Hi"}
+        )
+
+        assert response["error"] is True
+        assert response["error_type"] == "response_too_large"
+        assert response["response_truncated"] is True
+
+    @pytest.mark.unit
+    def test_async_streamed_response_with_time_to_first_token(self, server_url):
+        endpoint = _streaming_endpoint(server_url)
+
+        timer = PhaseTimer()
+        with timer.activate():
+            response = asyncio.run(RestEndpointInvoker().ainvoke(None, endpoint, {"input": "Hi"}))
+
+        assert response["output"] == "Hello world"
+        assert response["conversation_id"] == "chat-1"
+        streaming = response["streaming"]
+        assert streaming["tokens"] == 3
+        assert streaming["time_to_first_token_ms"] < streaming["duration_ms"]
+        assert streaming["duration_ms"] >= 2 * TOKEN_DELAY_SECONDS * 1000
+        assert "time_to_first_token" in timer.as_dict()
+
+    @pytest.mark.unit
+    def test_async_streamed_response_stops_at_size_limit(self, server_url, monkeypatch):
+        monkeypatch.setenv("ENDPOINT_MAX_RESPONSE_BYTES", "80")
+
+        response = asyncio.run(
+            RestEndpointInvoker().ainvoke(None, _streaming_endpoint(server_url), {"input": "Hi"})
+        )
+
+        assert response["error"] is True
+        assert response["error_type"] == "response_too_large"
+        assert response["response_truncated"] is True
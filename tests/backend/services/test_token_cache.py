@@ -0,0 +1,141 @@
+"""
+Tests for the shared client credentials token cache in
+rhesis.backend.app.services.invokers.token_cache
+
+This module tests:
+- Requesting a token once for many concurrent callers and processes
+- Proactive renewal ahead of expiry, falling back to the current token on failure
+- New tokens when the credentials change
+"""
+
+import concurrent.futures
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from cryptography.fernet import Fernet
+from tests.backend.fake_redis import FakeRedis
+
+from rhesis.backend.app.services.invokers import token_cache as token_cache_module
+from rhesis.backend.app.services.invokers.token_cache import (
+    CachedToken,
+    ClientCredentialsTokenCache,
+)
+
+
+class _TokenProvider:
+    """Counts token requests and hands out numbered tokens"""
+
+    def __init__(self, expires_in=3600, delay=0.0):
+        self.requests = 0
+        self.expires_in = expires_in
+        self.delay = delay
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("identity provider unavailable")
+        with self._lock:
+            self.requests += 1
+            return f"token-{self.requests}", self.expires_in
+
+
+def _endpoint(**overrides):
+    values = dict(
+        id=uuid.uuid4(),
+        token_url="https://idp.example.com/token",
+        client_id="client",
+        client_secret="secret",
+        audience=None,
+        scopes=None,
+        extra_payload=None,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    monkeypatch.setenv("DB_ENCRYPTION_KEY", Fernet.generate_key().decode())
+    client = FakeRedis()
+    with patch.object(token_cache_module, "get_redis_client", return_value=client):
+        yield client
+
+
+class TestClientCredentialsTokenCache:
+    """Test sharing and renewal of client credentials tokens"""
+
+    @pytest.mark.unit
+    def test_single_request_for_concurrent_workers(self, redis_client):
+        endpoint = _endpoint()
+        provider = _TokenProvider(delay=0.05)
+        # Separate caches stand in for separate worker processes sharing Redis
+        workers = [ClientCredentialsTokenCache() for _ in range(4)]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+            futures = [
+                executor.submit(workers[i % 4].get_token, endpoint, provider) for i in range(16)
+            ]
+            tokens = {future.result().access_token for future in futures}
+
+        assert tokens == {"token-1"}
+        assert provider.requests == 1
+
+    @pytest.mark.unit
+    def test_token_renewed_before_expiry(self, redis_client):
+        endpoint = _endpoint()
+        provider = _TokenProvider(expires_in=3600)
+        cache = ClientCredentialsTokenCache()
+
+        token = cache.get_token(endpoint, provider)
+        # Lifetime of one hour renews 6 minutes ahead of expiry
+        assert token.expires_at - token.refresh_at == pytest.approx(360)
+        assert cache.get_token(endpoint, provider) is token
+
+        with patch.object(token_cache_module.time, "time", return_value=token.refresh_at + 1):
+            assert cache.get_token(endpoint, provider).access_token == "token-2"
+        assert provider.requests == 2
+
+    @pytest.mark.unit
+    def test_failed_renewal_keeps_current_token(self):
+        endpoint = _endpoint()
+        provider = _TokenProvider()
+        cache = ClientCredentialsTokenCache()
+
+        with patch.object(token_cache_module, "get_redis_client", return_value=None):
+            token = cache.get_token(endpoint, provider)
+            provider.fail = True
+            with patch.object(token_cache_module.time, "time", return_value=token.refresh_at + 1):
+                assert cache.get_token(endpoint, provider) is token
+            with patch.object(
+                token_cache_module.time, "time", return_value=token.expires_at
+            ), pytest.raises(RuntimeError):
+                cache.get_token(endpoint, provider)
+
+    @pytest.mark.unit
+    def test_changed_credentials_request_new_token(self, redis_client):
+        endpoint = _endpoint()
+        provider = _TokenProvider()
+        cache = ClientCredentialsTokenCache()
+
+        assert cache.get_token(endpoint, provider).access_token == "token-1"
+        endpoint.client_secret = "rotated"
+        assert cache.get_token(endpoint, provider).access_token == "token-2"
+
+    @pytest.mark.unit
+    def test_tokens_encrypted_in_redis(self, redis_client):
+        ClientCredentialsTokenCache().get_token(_endpoint(), _TokenProvider())
+
+        (payload,) = redis_client.values.values()
+        assert "token-1" not in payload
+        assert CachedToken.decode(payload).access_token == "token-1"
+
+    @pytest.mark.unit
+    def test_short_lived_token_margin(self):
+        token = CachedToken.issued("token", 30)
+        assert token.expires_at - token.refresh_at == pytest.approx(15)
@@ -0,0 +1,167 @@
+"""
+Tests for WebSocket connection reuse in rhesis.backend.app.services.invokers.websocket_pool
+
+This module tests:
+- Reusing a connection after a cleanly ended response stream
+- Not reusing connections whose response was not read completely
+- Replacing idle connections that were closed by the server
+- Closing idle connections that expired
+- Not pooling connections opened outside of the worker event loop
+"""
+
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from websockets.sync.server import serve
+
+from rhesis.backend.app.services.invokers.websocket_invoker import WebSocketEndpointInvoker
+from rhesis.backend.app.services.invokers.websocket_pool import (
+    get_connection_pool,
+    run_in_worker_loop,
+)
+
+
+class _ChatServer:
+    """Answers each message with a streamed reply and counts the connections it accepted."""
+
+    def __init__(self):
+        self.connections = 0
+        self.closed = 0
+        self._server = serve(self._handle, "127.0.0.1", 0)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self.url = f"ws://127.0.0.1:{self._server.socket.getsockname()[1]}"
+
+    def _handle(self, websocket):
+        self.connections += 1
+        try:
+            for message in websocket:
+                request = json.loads(message)
+                websocket.send(f"echo: {request['query']}")
+                if request["query"] == "close":
+                    websocket.close()
+                    return
+                websocket.send(json.dumps({"message": "response ended"}))
+                if request["query"] == "bye":
+                    websocket.close()
+                    return
+        finally:
+            self.closed += 1
+
+    def shutdown(self):
+        self._server.shutdown()
+
+
+@pytest.fixture
+def chat_server():
+    server = _ChatServer()
+    yield server
+    server.shutdown()
+
+
+def _endpoint(url):
+    return SimpleNamespace(
+        id=None,
+        name="chat",
+        url=url,
+        endpoint_path=None,
+        auth_type=None,
+        last_token=None,
+        last_token_expires_at=None,
+        request_headers=None,
+        request_body_template={"query": "{{ input }}"},
+        response_mappings={"output": "$.output"},
+    )
+
+
+class TestWebSocketConnectionPool:
+    """Test connection reuse by the WebSocket invoker"""
+
+    @pytest.mark.unit
+    def test_connection_reused_across_invocations(self, chat_server):
+        invoker = WebSocketEndpointInvoker()
+        endpoint = _endpoint(chat_server.url)
+
+        first = invoker.invoke(None, endpoint, {"input": "hello"})
+        second = invoker.invoke(None, endpoint, {"input": "again"})
+
+        assert first["output"] == "echo: hello"
+        assert second["output"] == "echo: again"
+        assert first["streaming"]["tokens"] == 1
+        assert chat_server.connections == 1
+
+    @pytest.mark.unit
+    def test_connection_closed_by_server_is_not_reused(self, chat_server):
+        invoker = WebSocketEndpointInvoker()
+        endpoint = _endpoint(chat_server.url)
+
+        invoker.invoke(None, endpoint, {"input": "close"})
+        response = invoker.invoke(None, endpoint, {"input": "hello"})
+
+        assert response["output"] == "echo: hello"
+        assert chat_server.connections == 2
+
+    @pytest.mark.unit
+    def test_idle_connection_dropped_by_server_is_replaced(self, chat_server):
+        invoker = WebSocketEndpointInvoker()
+        endpoint = _endpoint(chat_server.url)
+
+        invoker.invoke(None, endpoint, {"input": "bye"})
+        time.sleep(0.2)
+        response = invoker.invoke(None, endpoint, {"input": "hello"})
+
+        assert response["output"] == "echo: hello"
+        assert chat_server.connections == 2
+
+    @pytest.mark.unit
+    def test_expired_idle_connection_is_closed(self, chat_server):
+        invoker = WebSocketEndpointInvoker()
+        endpoint = _endpoint(chat_server.url)
+        pool = get_connection_pool()
+
+        with patch.object(pool, "idle_timeout", 0.0):
+            invoker.invoke(None, endpoint, {"input": "hello"})
+            response = invoker.invoke(None, endpoint, {"input": "again"})
+
+        assert response["output"] == "echo: again"
+        assert chat_server.connections == 2
+        deadline = time.monotonic() + 5
+        while (chat_server.closed < 1 or pool._closing) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert chat_server.closed == 1
+        assert not pool._closing
+
+    @pytest.mark.unit
+    def test_no_pooling_outside_worker_loop(self, chat_server):
+        async def exchange():
+            async with get_connection_pool().connection(chat_server.url) as connection:
+                await connection.send(json.dumps({"query": "hello"}))
+                replies = [await connection.websocket.recv() for _ in range(2)]
+                connection.reusable = True
+                return replies[0]
+
+        assert asyncio.run(exchange()) == "echo: hello"
+        assert run_in_worker_loop(exchange()) == "echo: hello"
+        assert chat_server.connections == 2
+
+    @pytest.mark.unit
+    def test_concurrent_ainvoke_on_worker_loop(self, chat_server):
+        invoker = WebSocketEndpointInvoker()
+        endpoint = _endpoint(chat_server.url)
+
+        async def invoke_many():
+            return await asyncio.gather(
+                *(invoker.ainvoke(None, endpoint, {"input": f"q{i}"}) for i in range(4))
+            )
+
+        responses = run_in_worker_loop(invoke_many())
+        assert [response["output"] for response in responses] == [f"echo: q{i}" for i in range(4)]
+
+        # Connections opened concurrently are all kept for later invocations
+        run_in_worker_loop(invoke_many())
+        assert chat_server.connections == 4
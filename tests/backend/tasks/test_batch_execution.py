@@ -0,0 +1,295 @@
+"""
+Tests for batched parallel execution in rhesis.backend.tasks.execution
+
+This module tests:
+- Batch size / concurrency configuration parsing
+- Flattening of batch results for the chord callback
+- Per-test result ordering and failure isolation inside a batch task
+- Evaluating the invoked tests of a batch in groups of a configurable size
+- Executing a single test without grouping
+- Attributing the phases of a group evaluation to its tests
+- Grouping tests into batch requests for endpoints with a batch mode
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rhesis.backend.app.utils.phase_timer import record_phase
+from rhesis.backend.tasks.enums import DEFAULT_BATCH_CONCURRENCY, MAX_BATCH_CONCURRENCY
+from rhesis.backend.tasks.execution import batch, test_execution
+from rhesis.backend.tasks.execution.modes import (
+    get_batch_concurrency,
+    get_batch_size,
+    get_evaluation_group_size,
+)
+from rhesis.backend.tasks.execution.results import flatten_results
+from rhesis.backend.tasks.execution.test_execution import PreparedTest
+
+
+@contextmanager
+def _fake_session(*args, **kwargs):
+    yield Mock()
+
+
+def _fake_prepare(db, test_config_id, test_run_id, test_id, *args):
+    return PreparedTest(
+        test_config_id=test_config_id,
+        test_run_id=test_run_id,
+        test_id=test_id,
+        organization_id="org",
+        user_id="user",
+        prompt_id=None,
+        prompt_content=f"prompt {test_id}",
+        expected_response="",
+        metric_configs=[],
+        start_time=datetime.utcnow(),
+    )
+
+
+def _fake_store(db, prepared, metrics_results):
+    return {
+        "test_id": prepared.test_id,
+        "output": prepared.result["output"],
+        "metrics": metrics_results,
+    }
+
+
+class TestBatchConfiguration:
+    """Test batch configuration helpers"""
+
+    @pytest.mark.unit
+    def test_batch_size_defaults_to_single_test(self):
+        test_config = Mock(attributes=None)
+        assert get_batch_size(test_config) == 1
+
+    @pytest.mark.unit
+    def test_batch_size_from_attributes(self):
+        test_config = Mock(attributes={"batch_size": "25"})
+        assert get_batch_size(test_config) == 25
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("value", [0, -3, "abc", None])
+    def test_invalid_batch_size_falls_back_to_default(self, value):
+        test_config = Mock(attributes={"batch_size": value})
+        assert get_batch_size(test_config) == 1
+
+    @pytest.mark.unit
+    def test_batch_concurrency_is_capped(self):
+        test_config = Mock(attributes={"batch_concurrency": 10_000})
+        assert get_batch_concurrency(test_config) == MAX_BATCH_CONCURRENCY
+
+    @pytest.mark.unit
+    def test_batch_concurrency_default(self):
+        test_config = Mock(attributes={})
+        assert get_batch_concurrency(test_config) == DEFAULT_BATCH_CONCURRENCY
+
+    @pytest.mark.unit
+    def test_evaluation_group_size_defaults_to_judge_batch_size(self, monkeypatch):
+        monkeypatch.setenv("PROMPT_METRIC_BATCH_SIZE", "25")
+
+        assert get_evaluation_group_size(Mock(attributes={})) == 25
+        assert get_evaluation_group_size(Mock(attributes={"evaluation_group_size": 8})) == 8
+
+
+class TestFlattenResults:
+    """Test chord result flattening"""
+
+    @pytest.mark.unit
+    def test_flattens_batch_results(self):
+        results = [[{"test_id": "a"}, {"test_id": "b"}], [{"test_id": "c"}]]
+        assert [r["test_id"] for r in flatten_results(results)] == ["a", "b", "c"]
+
+    @pytest.mark.unit
+    def test_keeps_single_test_results(self):
+        results = [{"test_id": "a"}, {"test_id": "b"}]
+        assert flatten_results(results) == results
+
+    @pytest.mark.unit
+    def test_handles_empty_results(self):
+        assert flatten_results(None) == []
+
+
+class TestExecuteTestBatch:
+    """Test the batch task body"""
+
+    @pytest.mark.unit
+    def test_results_keep_order_and_isolate_failures(self):
+        def fake_invoke(db, prepared, endpoint_id):
+            if prepared.test_id == "t2":
+                raise RuntimeError("endpoint exploded")
+            prepared.result = {"output": prepared.prompt_content}
+            return prepared
+
+        with patch.object(batch, "get_db_with_tenant_variables", _fake_session), patch.object(
+            batch, "resolve_evaluation_model", return_value="gemini"
+        ) as mock_resolve, patch.object(
+            batch, "_get_endpoint_batch_size", return_value=1
+        ), patch.object(batch, "check_existing_result", return_value=None), patch.object(
+            batch, "prepare_test", side_effect=_fake_prepare
+        ), patch.object(batch, "invoke_test", side_effect=fake_invoke), patch.object(
+            batch, "evaluate_test_batch", side_effect=lambda db, tests, model: [{}] * len(tests)
+        ), patch.object(batch, "store_test_result", side_effect=_fake_store), patch.object(
+            batch, "increment_test_run_progress", return_value=True
+        ) as mock_progress:
+            results = batch.execute_test_batch.run(
+                test_config_id="config",
+                test_run_id="run",
+                test_ids=["t1", "t2", "t3"],
+                endpoint_id="endpoint",
+                organization_id="org",
+                user_id="user",
+                concurrency=2,
+            )
+
+        assert [r["test_id"] for r in results] == ["t1", "t2", "t3"]
+        assert results[1]["status"] == "failed"
+        assert "endpoint exploded" in results[1]["error"]
+        # Model is resolved once per batch, progress is updated once per test
+        mock_resolve.assert_called_once()
+        assert mock_progress.call_count == 3
+        successful_flags = {
+            call.kwargs["test_id"]: call.kwargs["was_successful"]
+            for call in mock_progress.call_args_list
+        }
+        assert successful_flags == {"t1": True, "t2": False, "t3": True}
+
+    @pytest.mark.unit
+    def test_invoked_tests_evaluated_in_groups(self):
+        evaluated_groups = []
+
+        def fake_invoke(db, prepared, endpoint_id):
+            prepared.result = {"output": prepared.prompt_content}
+            return prepared
+
+        def fake_evaluate_batch(db, prepared_tests, model):
+            evaluated_groups.append([prepared.test_id for prepared in prepared_tests])
+            return [{"score": 1.0} for _ in prepared_tests]
+
+        test_ids = [f"t{index}" for index in range(12)]
+        with patch.object(batch, "get_db_with_tenant_variables", _fake_session), patch.object(
+            batch, "resolve_evaluation_model", return_value="gemini"
+        ), patch.object(batch, "_get_endpoint_batch_size", return_value=1), patch.object(
+            batch, "check_existing_result", return_value=None
+        ), patch.object(batch, "prepare_test", side_effect=_fake_prepare), patch.object(
+            batch, "invoke_test", side_effect=fake_invoke
+        ), patch.object(
+            batch, "evaluate_test_batch", side_effect=fake_evaluate_batch
+        ), patch.object(batch, "store_test_result", side_effect=_fake_store), patch.object(
+            batch, "increment_test_run_progress", return_value=True
+        ) as mock_progress:
+            results = batch.execute_test_batch.run(
+                test_config_id="config",
+                test_run_id="run",
+                test_ids=test_ids,
+                endpoint_id="endpoint",
+                organization_id="org",
+                user_id="user",
+                concurrency=4,
+                evaluation_group_size=5,
+            )
+
+        assert [r["test_id"] for r in results] == test_ids
+        assert results[3] == {"test_id": "t3", "output": "prompt t3", "metrics": {"score": 1.0}}
+        assert sorted(len(group) for group in evaluated_groups) == [2, 5, 5]
+        assert sorted(sum(evaluated_groups, [])) == sorted(test_ids)
+        assert mock_progress.call_count == 12
+
+    @pytest.mark.unit
+    def test_endpoint_batches_group_invocations(self):
+        invoked_groups = []
+        evaluated_groups = []
+
+        def fake_existing_result(db, test_config_id, test_run_id, test_id, *args):
+            return {"test_id": test_id, "existing": True} if test_id == "t2" else None
+
+        def fake_invoke_batch(db, prepared_tests, endpoint_id):
+            invoked_groups.append([prepared.test_id for prepared in prepared_tests])
+            for prepared in prepared_tests:
+                prepared.result = {"output": prepared.prompt_content.upper()}
+            return prepared_tests
+
+        def fake_evaluate_batch(db, prepared_tests, model):
+            evaluated_groups.append([prepared.test_id for prepared in prepared_tests])
+            return [{"score": 1.0} for _ in prepared_tests]
+
+        with patch.object(batch, "get_db_with_tenant_variables", _fake_session), patch.object(
+            batch, "resolve_evaluation_model", return_value="gemini"
+        ), patch.object(batch, "_get_endpoint_batch_size", return_value=2), patch.object(
+            batch, "check_existing_result", side_effect=fake_existing_result
+        ), patch.object(batch, "prepare_test", side_effect=_fake_prepare), patch.object(
+            batch, "invoke_test_batch", side_effect=fake_invoke_batch
+        ), patch.object(
+            batch, "evaluate_test_batch", side_effect=fake_evaluate_batch
+        ), patch.object(batch, "store_test_result", side_effect=_fake_store), patch.object(
+            batch, "increment_test_run_progress", return_value=True
+        ) as mock_progress:
+            results = batch.execute_test_batch.run(
+                test_config_id="config",
+                test_run_id="run",
+                test_ids=["t1", "t2", "t3", "t4", "t5"],
+                endpoint_id="endpoint",
+                organization_id="org",
+                user_id="user",
+                concurrency=2,
+                evaluation_group_size=10,
+            )
+
+        assert [r["test_id"] for r in results] == ["t1", "t2", "t3", "t4", "t5"]
+        assert results[0]["output"] == "PROMPT T1"
+        assert results[0]["metrics"] == {"score": 1.0}
+        assert results[1] == {"test_id": "t2", "existing": True}
+        # Tests with a stored result are not sent again
+        assert sorted(invoked_groups) == [["t1"], ["t3", "t4"], ["t5"]]
+        # The invoked tests of all requests are evaluated together
+        assert len(evaluated_groups) == 1
+        assert sorted(evaluated_groups[0]) == ["t1", "t3", "t4", "t5"]
+        assert mock_progress.call_count == 5
+
+    @pytest.mark.unit
+    def test_single_test_executed_directly(self):
+        with patch.object(batch, "get_db_with_tenant_variables", _fake_session), patch.object(
+            batch, "resolve_evaluation_model", return_value="gemini"
+        ), patch.object(batch, "_get_endpoint_batch_size") as mock_batch_size, patch.object(
+            batch, "execute_test", return_value={"test_id": "t1", "metrics": {}}
+        ) as mock_execute, patch.object(batch, "increment_test_run_progress", return_value=True):
+            results = batch.execute_test_batch.run(
+                test_config_id="config",
+                test_run_id="run",
+                test_ids=["t1"],
+                endpoint_id="endpoint",
+                organization_id="org",
+                user_id="user",
+            )
+
+        assert results == [{"test_id": "t1", "metrics": {}}]
+        assert mock_execute.call_args.kwargs["model"] == "gemini"
+        mock_batch_size.assert_not_called()
+
+
+class TestEvaluateTestBatch:
+    """Test evaluating the metrics of a group of tests"""
+
+    @pytest.mark.unit
+    def test_phases_shared_by_tests(self):
+        prepared_tests = [_fake_prepare(None, "config", "run", f"t{index}") for index in range(4)]
+        prepared_tests[0].timer.add("network", 100.0)
+
+        def fake_evaluate(metrics_evaluator, test_cases):
+            # Phases of scheduled tasks covering all tests of the group
+            record_phase("metric_queue", 0.2)
+            record_phase("metric_batch:quality", 0.4)
+            return [{} for _ in test_cases]
+
+        with patch.object(test_execution, "get_run_evaluation_settings"), patch.object(
+            test_execution, "get_metrics_evaluator"
+        ), patch.object(test_execution, "evaluate_prompt_responses", side_effect=fake_evaluate):
+            test_execution.evaluate_test_batch(Mock(), prepared_tests)
+
+        for prepared in prepared_tests:
+            timings = prepared.timer.as_dict()
+            assert timings["metric_queue"] == 50.0
+            assert timings["metric_batch:quality"] == 100.0
+        assert prepared_tests[0].timer.as_dict()["network"] == 100.0
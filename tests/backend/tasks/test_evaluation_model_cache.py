@@ -0,0 +1,77 @@
+"""
+Tests for the worker-process evaluation model cache
+
+This module tests:
+- Reusing resolved evaluation models across tests of a run
+- Invalidation through the organization's model settings version
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from tests.backend.fake_redis import FakeRedis
+
+from rhesis.backend.app.utils import llm_utils
+from rhesis.backend.tasks.execution import test as test_task
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    llm_utils._evaluation_model_cache.clear()
+    with patch.object(llm_utils, "get_redis_client", return_value=fake):
+        yield fake
+    llm_utils._evaluation_model_cache.clear()
+
+
+@pytest.fixture
+def user():
+    user = Mock(organization_id="org")
+    user.settings.models.evaluation.model_id = None
+    return user
+
+
+class TestEvaluationModelCache:
+    """Test evaluation model resolution with caching"""
+
+    @pytest.mark.unit
+    def test_model_is_resolved_once_per_user(self, redis, user):
+        with patch.object(test_task.crud, "get_user", return_value=user) as mock_get_user:
+            with patch.object(
+                test_task, "get_user_evaluation_model", return_value="rhesis"
+            ) as mock_get_model:
+                for test_id in ["t1", "t2", "t3"]:
+                    model = test_task.resolve_evaluation_model(Mock(), "user", test_id, "org")
+                    assert model == "rhesis"
+
+        mock_get_user.assert_called_once()
+        mock_get_model.assert_called_once()
+
+    @pytest.mark.unit
+    def test_settings_change_invalidates_cached_model(self, redis, user):
+        with patch.object(test_task.crud, "get_user", return_value=user), patch.object(
+            test_task, "get_user_evaluation_model", side_effect=["old", "new"]
+        ) as mock_get_model:
+            assert test_task.resolve_evaluation_model(Mock(), "user", "t1", "org") == "old"
+            # Simulate another process changing the organization's model settings
+            redis.incr(llm_utils.MODEL_SETTINGS_VERSION_KEY.format(organization_id="org"))
+            assert test_task.resolve_evaluation_model(Mock(), "user", "t2", "org") == "new"
+
+        assert mock_get_model.call_count == 2
+
+    @pytest.mark.unit
+    def test_invalidate_clears_local_entries(self, redis):
+        llm_utils.cache_evaluation_model("org", "user", None, "rhesis")
+        llm_utils.cache_evaluation_model("other-org", "user", None, "rhesis")
+
+        llm_utils.invalidate_model_settings("org")
+
+        assert llm_utils.get_cached_evaluation_model("org", "user") is None
+        assert llm_utils.get_cached_evaluation_model("other-org", "user") == (None, "rhesis")
+
+    @pytest.mark.unit
+    def test_failed_resolution_is_not_cached(self, redis):
+        with patch.object(test_task.crud, "get_user", side_effect=RuntimeError("db down")):
+            assert test_task.resolve_evaluation_model(Mock(), "user", "t1", "org") is None
+
+        assert llm_utils.get_cached_evaluation_model("org", "user") is None
@@ -0,0 +1,148 @@
+"""
+Tests for the run-scoped execution plan in rhesis.backend.tasks.execution.plan
+
+This module tests:
+- Storing and loading plans through Redis and the in-process cache
+- Per-test plan entries with metric configs shared per behavior
+- Falling back to the database when no plan is available
+- Evaluation settings of a run kept in the plan
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from tests.backend.fake_redis import FakeRedis
+
+from rhesis.backend.tasks.execution import plan, test_execution
+from rhesis.backend.tasks.execution.modes import get_evaluation_settings
+
+PLAN = {
+    "version": plan.PLAN_VERSION,
+    "tests": {
+        "t1": {
+            "prompt_id": "p1",
+            "prompt_content": "Hello?",
+            "expected_response": "Hi",
+            "behavior_id": "b1",
+        },
+        "t2": {
+            "prompt_id": "p2",
+            "prompt_content": "Bye?",
+            "expected_response": "",
+            "behavior_id": None,
+        },
+    },
+    "behaviors": {"b1": [{"class_name": "RhesisPromptMetric", "backend": "rhesis"}]},
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_plan_cache():
+    plan._plan_cache.clear()
+    yield
+    plan._plan_cache.clear()
+
+
+class TestPlanStorage:
+    """Test plan round trips through Redis"""
+
+    @pytest.mark.unit
+    def test_plan_round_trip_through_redis(self):
+        redis = FakeRedis()
+        with patch.object(plan, "get_redis_client", return_value=redis):
+            assert plan.store_execution_plan("run", PLAN) is True
+            # Simulate another worker process with an empty in-process cache
+            plan._plan_cache.clear()
+            assert plan.load_execution_plan("run") == PLAN
+
+        assert isinstance(redis.values[plan.get_plan_key("run")], bytes)
+
+    @pytest.mark.unit
+    def test_plan_is_cached_in_process_without_redis(self):
+        with patch.object(plan, "get_redis_client", return_value=None):
+            assert plan.store_execution_plan("run", PLAN) is False
+            assert plan.load_execution_plan("run") == PLAN
+
+    @pytest.mark.unit
+    def test_missing_plan_returns_none(self):
+        with patch.object(plan, "get_redis_client", return_value=FakeRedis()):
+            assert plan.load_execution_plan("unknown") is None
+            assert plan.get_plan_entry("unknown", "t1") is None
+
+
+class TestPlanEntries:
+    """Test per-test entries resolved from the plan"""
+
+    @pytest.mark.unit
+    def test_entry_contains_behavior_metrics(self):
+        with patch.object(plan, "get_redis_client", return_value=None):
+            plan.store_execution_plan("run", PLAN)
+            entry = plan.get_plan_entry("run", "t1")
+
+        assert entry["prompt_content"] == "Hello?"
+        assert entry["metrics"] == PLAN["behaviors"]["b1"]
+        # Entries must not share metric configs with the cached plan
+        entry["metrics"][0]["class_name"] = "Changed"
+        assert PLAN["behaviors"]["b1"][0]["class_name"] == "RhesisPromptMetric"
+
+    @pytest.mark.unit
+    def test_execution_data_uses_defaults_when_behavior_has_no_metrics(self):
+        with patch.object(plan, "get_redis_client", return_value=None), patch.object(
+            test_execution, "load_default_metrics", return_value=[{"class_name": "Default"}]
+        ), patch.object(test_execution, "get_test_and_prompt") as mock_get_test:
+            plan.store_execution_plan("run", PLAN)
+            prompt_id, prompt, expected, metrics = test_execution.get_test_execution_data(
+                Mock(), "run", "t2"
+            )
+
+        mock_get_test.assert_not_called()
+        assert (prompt_id, prompt, expected) == ("p2", "Bye?", "")
+        assert metrics == [{"class_name": "Default"}]
+
+    @pytest.mark.unit
+    def test_execution_data_falls_back_to_database(self):
+        test = Mock(prompt_id="p9")
+        with patch.object(plan, "get_redis_client", return_value=None), patch.object(
+            test_execution, "get_test_and_prompt", return_value=(test, "From DB", "Expected")
+        ), patch.object(test_execution, "get_test_metrics", return_value=[{"class_name": "M"}]):
+            result = test_execution.get_test_execution_data(Mock(), "run", "t1")
+
+        assert result == ("p9", "From DB", "Expected", [{"class_name": "M"}])
+
+
+class TestEvaluationSettings:
+    """Test the evaluation settings of a run"""
+
+    @pytest.mark.unit
+    def test_evaluation_settings_from_attributes(self):
+        assert get_evaluation_settings(Mock(attributes=None)) == {
+            "judge_cache": False,
+            "fused_judging": False,
+        }
+        assert get_evaluation_settings(Mock(attributes={"fused_judging": True})) == {
+            "judge_cache": False,
+            "fused_judging": True,
+        }
+
+    @pytest.mark.unit
+    def test_run_settings_read_from_plan(self):
+        with patch.object(plan, "get_redis_client", return_value=None), patch.object(
+            test_execution.crud, "get_test_configuration"
+        ) as mock_get_config:
+            plan.store_execution_plan("run", {**PLAN, "evaluation": {"judge_cache": True}})
+            settings = test_execution.get_run_evaluation_settings(Mock(), "run", "config")
+
+        mock_get_config.assert_not_called()
+        assert settings == {"judge_cache": True}
+
+    @pytest.mark.unit
+    def test_run_settings_fall_back_to_test_configuration(self):
+        config_id = "4c6c3bd6-6b53-4d5e-9b8f-2f8b8d0b7a11"
+        with patch.object(plan, "get_redis_client", return_value=None), patch.object(
+            test_execution.crud,
+            "get_test_configuration",
+            return_value=Mock(attributes={"judge_cache": True}),
+        ):
+            settings = test_execution.get_run_evaluation_settings(Mock(), "run", config_id)
+
+        assert settings == {"judge_cache": True, "fused_judging": False}
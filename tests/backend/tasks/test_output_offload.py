@@ -0,0 +1,131 @@
+"""
+Tests for bounded response ingestion and offload of oversized test outputs
+
+This module tests:
+- Offloading oversized values of test outputs to storage
+- Keeping values inline when storage fails
+- Restoring offloaded values of stored outputs
+- Reading response bodies up to the configured limit
+"""
+
+import io
+from unittest.mock import patch
+
+import pytest
+import requests
+from urllib3.response import HTTPResponse
+
+from rhesis.backend.app.services.invokers.transport import read_limited_body
+from rhesis.backend.tasks.execution import output_offload
+from rhesis.backend.tasks.execution.output_offload import (
+    offload_large_fields,
+    restore_offloaded_fields,
+)
+
+
+def _streamed_response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 502
+    response.raw = HTTPResponse(body=io.BytesIO(body), preload_content=False)
+    return response
+
+
+class TestOffloadLargeFields:
+    """Test offload of oversized values"""
+
+    @pytest.fixture(autouse=True)
+    def small_limit(self, monkeypatch):
+        monkeypatch.setenv("TEST_OUTPUT_MAX_FIELD_CHARS", "100")
+
+    @pytest.mark.unit
+    def test_small_results_unchanged(self):
+        result = {"output": "Hello", "context": ["a", "b"]}
+        assert offload_large_fields(result, "org", "run", "test") is result
+
+    @pytest.mark.unit
+    def test_oversized_values_offloaded(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("LOCAL_STORAGE_PATH", str(tmp_path))
+        monkeypatch.setattr(output_offload, "_storage_service", None)
+        page = "<html>" + "x" * 5000 + "</html>"
+        result = {
+            "error": True,
+            "output": "short",
+            "response_content": page,
+            "request_details": {"body": ["ok", page]},
+        }
+
+        processed = offload_large_fields(result, "org", "run", "test")
+
+        assert result["response_content"] == page
+        assert processed["output"] == "short"
+        assert processed["response_content"].startswith("<html>")
+        assert "[truncated: 5013 characters" in processed["response_content"]
+        assert [entry["field"] for entry in processed["offloaded"]] == [
+            ["response_content"],
+            ["request_details", "body", 1],
+        ]
+        reference = processed["offloaded"][0]
+        assert reference["size"] == len(page)
+        with open(reference["path"], encoding="utf-8") as f:
+            assert f.read() == page
+
+    @pytest.mark.unit
+    def test_kept_inline_when_storage_fails(self):
+        result = {"output": "y" * 500}
+        with patch.object(output_offload, "_store", side_effect=OSError("disk full")):
+            processed = offload_large_fields(result, "org", "run", "test")
+
+        assert processed is result
+        assert processed["output"] == "y" * 500
+        assert "offloaded" not in processed
+
+    @pytest.mark.unit
+    def test_offloaded_values_restored(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("LOCAL_STORAGE_PATH", str(tmp_path))
+        monkeypatch.setattr(output_offload, "_storage_service", None)
+        result = {"output": "z" * 500, "request_details": {"body": ["ok", "w" * 300]}}
+        processed = offload_large_fields(result, "org", "run", "test")
+
+        restored = restore_offloaded_fields(processed)
+
+        assert restored == result
+        assert "offloaded" in processed
+
+    @pytest.mark.unit
+    def test_keys_with_dots_and_digits_restored(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("LOCAL_STORAGE_PATH", str(tmp_path))
+        monkeypatch.setattr(output_offload, "_storage_service", None)
+        result = {"headers": {"x.body": "a" * 300}, "items": {"0": "b" * 300}}
+        processed = offload_large_fields(result, "org", "run", "test")
+
+        assert [entry["field"] for entry in processed["offloaded"]] == [
+            ["headers", "x.body"],
+            ["items", "0"],
+        ]
+        assert restore_offloaded_fields(processed) == result
+
+    @pytest.mark.unit
+    def test_restore_fails_for_missing_content(self):
+        output = {
+            "output": "preview",
+            "offloaded": [{"field": ["output"], "path": None, "size": 500}],
+        }
+
+        assert restore_offloaded_fields(output) is None
+        assert restore_offloaded_fields({"output": "small"}) == {"output": "small"}
+
+
+class TestReadLimitedBody:
+    """Test bounded reading of response bodies"""
+
+    @pytest.mark.unit
+    def test_body_within_limit(self):
+        response = _streamed_response(b"small body")
+        assert read_limited_body(response, max_bytes=100) is False
+        assert response.text == "small body"
+
+    @pytest.mark.unit
+    def test_body_cut_at_limit(self):
+        response = _streamed_response(b"z" * 500_000)
+        assert read_limited_body(response, max_bytes=1000) is True
+        assert response.content == b"z" * 1000
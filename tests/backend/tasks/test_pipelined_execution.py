@@ -0,0 +1,109 @@
+"""
+Tests for pipelined execution in rhesis.backend.tasks.execution.pipelined
+
+This module tests:
+- Pipeline concurrency configuration parsing
+- The cap on concurrent endpoint invocations
+- Result ordering and failure isolation across pipeline stages
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rhesis.backend.tasks.enums import MAX_PIPELINE_CONCURRENCY, ExecutionMode
+from rhesis.backend.tasks.execution import pipelined
+from rhesis.backend.tasks.execution.modes import (
+    get_execution_mode,
+    get_pipeline_evaluation_workers,
+    get_pipeline_max_in_flight,
+)
+
+
+@contextmanager
+def _fake_session(*args, **kwargs):
+    yield Mock()
+
+
+class TestPipelineConfiguration:
+    """Test pipelined mode configuration helpers"""
+
+    @pytest.mark.unit
+    def test_pipelined_mode_from_attributes(self):
+        test_config = Mock(attributes={"execution_mode": "Pipelined"})
+        assert get_execution_mode(test_config) == ExecutionMode.PIPELINED
+
+    @pytest.mark.unit
+    def test_concurrency_settings(self):
+        test_config = Mock(attributes={"max_in_flight": 2, "evaluation_workers": 10_000})
+        assert get_pipeline_max_in_flight(test_config) == 2
+        assert get_pipeline_evaluation_workers(test_config) == MAX_PIPELINE_CONCURRENCY
+
+
+class TestExecuteTestsPipelined:
+    """Test the pipelined execution strategy"""
+
+    @pytest.mark.unit
+    def test_in_flight_cap_ordering_and_failures(self):
+        in_flight = 0
+        max_seen = 0
+        lock = threading.Lock()
+
+        def fake_prepare(db, test_config_id, test_run_id, test_id, *args):
+            return Mock(test_id=test_id, organization_id="org", user_id="user")
+
+        def fake_invoke(db, prepared, endpoint_id):
+            nonlocal in_flight, max_seen
+            with lock:
+                in_flight += 1
+                max_seen = max(max_seen, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            if prepared.test_id == "t3":
+                raise RuntimeError("endpoint exploded")
+            return prepared
+
+        def fake_evaluate(db, prepared, model):
+            if prepared.test_id == "t5":
+                raise RuntimeError("judge exploded")
+            return {"test_id": prepared.test_id, "execution_time": 1.0, "metrics": {}}
+
+        test_config = Mock(
+            id="config",
+            endpoint_id="endpoint",
+            organization_id="org",
+            user_id="user",
+            attributes={"execution_mode": "Pipelined", "max_in_flight": 2},
+        )
+        test_run = Mock(id="run")
+        tests = [Mock(id=f"t{i}") for i in range(1, 9)]
+
+        with patch.object(pipelined, "get_db_with_tenant_variables", _fake_session), patch.object(
+            pipelined, "check_existing_result", return_value=None
+        ), patch.object(pipelined, "prepare_test", side_effect=fake_prepare), patch.object(
+            pipelined, "invoke_test", side_effect=fake_invoke
+        ), patch.object(pipelined, "PreparedTest", Mock), patch.object(
+            pipelined, "evaluate_and_store_test", side_effect=fake_evaluate
+        ), patch.object(
+            pipelined, "increment_test_run_progress", return_value=True
+        ) as mock_progress, patch.object(
+            pipelined, "update_test_run_start"
+        ), patch.object(
+            pipelined, "resolve_evaluation_model", return_value=None
+        ), patch.object(
+            pipelined, "trigger_results_collection"
+        ) as mock_collect:
+            execution = pipelined.execute_tests_pipelined(Mock(), test_config, test_run, tests)
+
+        assert execution["execution_mode"] == ExecutionMode.PIPELINED.value
+        assert max_seen <= 2
+        assert mock_progress.call_count == len(tests)
+
+        results = mock_collect.call_args.args[2]
+        assert [r["test_id"] for r in results] == [f"t{i}" for i in range(1, 9)]
+        failed = {r["test_id"] for r in results if r.get("status") == "failed"}
+        assert failed == {"t3", "t5"}
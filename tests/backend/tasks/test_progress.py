@@ -0,0 +1,126 @@
+"""
+Tests for atomic test run progress counters in rhesis.backend.tasks.progress
+
+This module tests:
+- Recording progress in Redis and reading it back
+- Flushing the counters to the test run once per flush interval
+- Flushes writing absolute counters that never lower the stored ones
+- Falling back to a single-statement increment in the database without Redis
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from tests.backend.fake_redis import FakeRedis
+
+from rhesis.backend.tasks import progress
+
+TEST_RUN_ID = "4c6c3bd6-6b53-4d5e-9b8f-2f8b8d0b7a11"
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch.object(progress, "get_redis_client", return_value=fake):
+        yield fake
+
+
+def _db(rowcount=1):
+    db = Mock()
+    db.execute.return_value = Mock(rowcount=rowcount)
+    db.identity_map.get.return_value = None
+    return db
+
+
+class TestRedisProgress:
+    """Test recording and reading progress counters in Redis"""
+
+    @pytest.mark.unit
+    def test_record_and_read_progress(self, redis):
+        progress.record_test_progress(TEST_RUN_ID, "t1", was_successful=True)
+        progress.record_test_progress(TEST_RUN_ID, "t2", was_successful=False)
+        recorded = progress.record_test_progress(TEST_RUN_ID, "t3", was_successful=True)
+
+        live = progress.get_test_run_progress(TEST_RUN_ID)
+
+        assert recorded == live
+        assert live["completed_tests"] == 2
+        assert live["failed_tests"] == 1
+        assert live["last_completed_test_id"] == "t3"
+
+    @pytest.mark.unit
+    def test_no_progress_for_unknown_run(self, redis):
+        assert progress.get_test_run_progress(TEST_RUN_ID) is None
+
+    @pytest.mark.unit
+    def test_redis_unavailable(self):
+        with patch.object(progress, "get_redis_client", return_value=None):
+            assert progress.record_test_progress(TEST_RUN_ID, "t1", True) is None
+            assert progress.get_test_run_progress(TEST_RUN_ID) is None
+
+
+class TestProgressFlush:
+    """Test flushing the Redis counters to the test run"""
+
+    @pytest.mark.unit
+    def test_flush_writes_absolute_counters(self, redis):
+        db = _db()
+        for test_id in ["t1", "t2"]:
+            progress.record_test_progress(TEST_RUN_ID, test_id, was_successful=True)
+
+        assert progress.flush_test_run_progress(db, TEST_RUN_ID, "org")
+
+        statement, params = db.execute.call_args.args
+        assert statement is progress._FLUSH_PROGRESS_SQL
+        assert params["completed"] == 2
+        assert params["failed"] == 0
+        assert params["test_id"] == "t2"
+        assert params["organization_id"] == "org"
+
+    @pytest.mark.unit
+    def test_stale_flush_never_lowers_counters(self):
+        # A flush of older counters arriving late keeps the larger stored value
+        sql = str(progress._FLUSH_PROGRESS_SQL)
+        assert "GREATEST(COALESCE((attributes->>'completed_tests')::int, 0), :completed)" in sql
+        assert "GREATEST(COALESCE((attributes->>'failed_tests')::int, 0), :failed)" in sql
+
+    @pytest.mark.unit
+    def test_nothing_to_flush(self, redis):
+        db = _db()
+
+        assert not progress.flush_test_run_progress(db, TEST_RUN_ID)
+        db.execute.assert_not_called()
+
+    @pytest.mark.unit
+    def test_flushed_once_per_interval(self, redis):
+        db = _db()
+        for test_id in ["t1", "t2", "t3"]:
+            assert progress.update_test_run_progress(db, TEST_RUN_ID, test_id, True, "org")
+
+        # Only the first update acquires the flush slot of the interval
+        db.execute.assert_called_once()
+        assert db.execute.call_args.args[1]["completed"] == 1
+        assert progress.get_test_run_progress(TEST_RUN_ID)["completed_tests"] == 3
+
+
+class TestDatabaseFallback:
+    """Test progress updates without Redis"""
+
+    @pytest.mark.unit
+    def test_increments_in_database_without_redis(self):
+        db = _db()
+        with patch.object(progress, "get_redis_client", return_value=None):
+            assert progress.update_test_run_progress(db, TEST_RUN_ID, "t1", False, "org")
+
+        statement, params = db.execute.call_args.args
+        assert statement is progress._INCREMENT_PROGRESS_SQL
+        assert params["completed"] == 0
+        assert params["failed"] == 1
+        assert params["test_id"] == "t1"
+        assert params["test_run_id"] == TEST_RUN_ID
+
+    @pytest.mark.unit
+    def test_missing_test_run_not_updated(self):
+        db = _db(rowcount=0)
+
+        assert not progress.increment_progress_in_database(db, TEST_RUN_ID, "t1", True)
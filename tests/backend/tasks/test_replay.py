@@ -0,0 +1,211 @@
+"""
+Tests for record/replay execution in rhesis.backend.tasks.execution.replay
+
+This module tests:
+- Replay settings parsing from test configuration attributes
+- Content-addressed response cache keys
+- Choosing between replayed outputs, cached responses and live invocation
+- Deduplicating identical requests within a run
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from redis.exceptions import RedisError
+from tests.backend.fake_redis import FakeRedis
+
+from rhesis.backend.tasks.execution import replay, test_execution
+from rhesis.backend.tasks.execution.modes import get_replay_settings
+
+SOURCE_RUN_ID = "4c6c3bd6-6b53-4d5e-9b8f-2f8b8d0b7a11"
+
+
+def _settings(source_test_run_id=None, response_cache=False, endpoint_fingerprint=None):
+    return {
+        "source_test_run_id": source_test_run_id,
+        "response_cache": response_cache,
+        "endpoint_fingerprint": endpoint_fingerprint,
+    }
+
+
+class TestReplaySettings:
+    """Test replay configuration helpers"""
+
+    @pytest.mark.unit
+    def test_replay_disabled_by_default(self):
+        test_config = Mock(attributes=None)
+        assert get_replay_settings(test_config) == {
+            "source_test_run_id": None,
+            "response_cache": False,
+            "deduplicate_prompts": False,
+        }
+
+    @pytest.mark.unit
+    def test_replay_settings_from_attributes(self):
+        test_config = Mock(
+            attributes={"replay_test_run_id": SOURCE_RUN_ID, "response_cache": True}
+        )
+        assert get_replay_settings(test_config) == {
+            "source_test_run_id": SOURCE_RUN_ID,
+            "response_cache": True,
+            "deduplicate_prompts": False,
+        }
+
+    @pytest.mark.unit
+    def test_invalid_replay_run_id_is_ignored(self):
+        test_config = Mock(attributes={"replay_test_run_id": "not-a-uuid"})
+        assert get_replay_settings(test_config)["source_test_run_id"] is None
+
+
+class TestResponseCacheKey:
+    """Test content-addressed cache keys"""
+
+    @pytest.mark.unit
+    def test_key_is_stable_and_input_sensitive(self):
+        key = replay.get_response_cache_key("org", "fp", {"input": "Hello"})
+        assert key == replay.get_response_cache_key("org", "fp", {"input": "Hello"})
+        assert key != replay.get_response_cache_key("org", "fp", {"input": "Bye"})
+        assert key != replay.get_response_cache_key("other-org", "fp", {"input": "Hello"})
+
+    @pytest.mark.unit
+    def test_fingerprint_changes_with_request_template(self):
+        endpoint = Mock(id="endpoint", request_body_template={"q": "{{ input }}"})
+        fingerprint = replay.get_endpoint_fingerprint(endpoint)
+        endpoint.request_body_template = {"question": "{{ input }}"}
+        assert replay.get_endpoint_fingerprint(endpoint) != fingerprint
+
+    @pytest.mark.unit
+    def test_error_responses_are_not_recorded(self):
+        with patch.object(replay, "get_redis_client") as mock_client:
+            assert replay.cache_response("org", "fp", {}, {"error": True}) is False
+        mock_client.assert_not_called()
+
+
+class TestGetEndpointResponse:
+    """Test endpoint response selection in test execution"""
+
+    def _call(self):
+        return test_execution.get_endpoint_response(
+            db=Mock(),
+            test_config_id="config",
+            test_run_id="run",
+            test_id="test",
+            endpoint_id="endpoint",
+            input_data={"input": "Hello"},
+            organization_id="org",
+        )
+
+    @pytest.mark.unit
+    def test_replays_output_from_source_run(self):
+        with patch.object(
+            test_execution, "get_run_replay_settings", return_value=_settings(SOURCE_RUN_ID)
+        ), patch.object(
+            test_execution, "get_replay_output", return_value={"output": "recorded"}
+        ), patch.object(test_execution, "get_endpoint_service") as mock_service:
+            result, source = self._call()
+
+        assert result == {"output": "recorded"}
+        assert source == f"test_run:{SOURCE_RUN_ID}"
+        mock_service.assert_not_called()
+
+    @pytest.mark.unit
+    def test_truncated_output_not_replayed(self):
+        output = {"output": "preview", "offloaded": [{"field": ["output"], "path": None}]}
+        service = Mock()
+        service.invoke_endpoint.return_value = {"output": "live"}
+
+        with patch.object(
+            test_execution, "get_run_replay_settings", return_value=_settings(SOURCE_RUN_ID)
+        ), patch.object(test_execution, "get_replay_output", return_value=output), patch.object(
+            test_execution, "get_endpoint_service", return_value=service
+        ):
+            result, source = self._call()
+
+        assert result == {"output": "live"}
+        assert source is None
+
+    @pytest.mark.unit
+    def test_invokes_endpoint_and_records_on_cache_miss(self):
+        settings = _settings(response_cache=True, endpoint_fingerprint="fp")
+        service = Mock()
+        service.invoke_endpoint.return_value = {"output": "live"}
+
+        with patch.object(
+            test_execution, "get_run_replay_settings", return_value=settings
+        ), patch.object(test_execution, "get_cached_response", return_value=None), patch.object(
+            test_execution, "cache_response"
+        ) as mock_cache, patch.object(
+            test_execution, "get_endpoint_service", return_value=service
+        ):
+            result, source = self._call()
+
+        assert result == {"output": "live"}
+        assert source is None
+        mock_cache.assert_called_once_with("org", "fp", {"input": "Hello"}, {"output": "live"})
+
+    @pytest.mark.unit
+    def test_uses_cached_response(self):
+        settings = _settings(response_cache=True, endpoint_fingerprint="fp")
+        with patch.object(
+            test_execution, "get_run_replay_settings", return_value=settings
+        ), patch.object(
+            test_execution, "get_cached_response", return_value={"output": "cached"}
+        ), patch.object(test_execution, "get_endpoint_service") as mock_service:
+            result, source = self._call()
+
+        assert result == {"output": "cached"}
+        assert source == "response_cache"
+        mock_service.assert_not_called()
+
+
+class TestPromptDeduplication:
+    """Test single-flight invocation of duplicate requests"""
+
+    @pytest.mark.unit
+    def test_duplicate_statistics(self):
+        plan = {
+            "tests": {
+                "t1": {"prompt_content": "Hello"},
+                "t2": {"prompt_content": "Hello"},
+                "t3": {"prompt_content": "Bye"},
+            }
+        }
+        assert replay.get_duplicate_statistics(plan) == {
+            "total_tests": 3,
+            "unique_requests": 2,
+            "duplicate_tests": 1,
+        }
+
+    @pytest.mark.unit
+    def test_duplicate_request_shares_response(self):
+        invoke = Mock(return_value={"output": "live"})
+        with patch.object(replay, "get_redis_client", return_value=FakeRedis()):
+            first = replay.invoke_deduplicated("run", {"input": "Hello"}, invoke)
+            second = replay.invoke_deduplicated("run", {"input": "Hello"}, invoke)
+            other = replay.invoke_deduplicated("run", {"input": "Bye"}, invoke)
+
+        assert first == ({"output": "live"}, False)
+        assert second == ({"output": "live"}, True)
+        assert other == ({"output": "live"}, False)
+        assert invoke.call_count == 2
+
+    @pytest.mark.unit
+    def test_error_responses_are_not_shared(self):
+        invoke = Mock(return_value={"error": True, "status_code": 503})
+        with patch.object(replay, "get_redis_client", return_value=FakeRedis()):
+            replay.invoke_deduplicated("run", {"input": "Hello"}, invoke)
+            _, shared = replay.invoke_deduplicated("run", {"input": "Hello"}, invoke)
+
+        assert not shared
+        assert invoke.call_count == 2
+
+    @pytest.mark.unit
+    def test_redis_error_of_invocation_propagates(self):
+        client = FakeRedis()
+        invoke = Mock(side_effect=RedisError("limiter unavailable"))
+        with patch.object(replay, "get_redis_client", return_value=client):
+            with pytest.raises(RedisError):
+                replay.invoke_deduplicated("run", {"input": "Hello"}, invoke)
+
+        # The lock is released for the next caller
+        assert client.values == {}
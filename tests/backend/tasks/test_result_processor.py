@@ -0,0 +1,163 @@
+"""
+Tests for test run statistics in rhesis.backend.tasks.execution.result_processor
+
+This module tests:
+- Counting results by status with a single aggregate query
+- Per-metric pass/fail breakdown of a test run
+- Test statistics combining result counts and progress counters
+- The metric breakdown in the execution summary
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from rhesis.backend.tasks.execution import result_processor
+
+TEST_RUN_ID = "4c6c3bd6-6b53-4d5e-9b8f-2f8b8d0b7a11"
+
+
+class RecordingQuery:
+    """Builds a real ORM query and answers `one()` with a fixed row, recording the SQL"""
+
+    def __init__(self, query, row, executed):
+        self.query = query
+        self.row = row
+        self.executed = executed
+
+    def __getattr__(self, name):
+        def build(*args, **kwargs):
+            built = getattr(self.query, name)(*args, **kwargs)
+            return RecordingQuery(built, self.row, self.executed)
+
+        return build
+
+    def one(self):
+        self.executed.append(str(self.query.statement.compile(dialect=postgresql.dialect())))
+        return self.row
+
+
+def _db_with_counts(row):
+    db = Mock()
+    executed = []
+    db.query.side_effect = lambda *columns: RecordingQuery(
+        Session().query(*columns), row, executed
+    )
+    return db, executed
+
+
+def _metric_row(name, total, passed):
+    return SimpleNamespace(name=name, total=total, passed=passed)
+
+
+class TestResultCounts:
+    """Test counting results by status"""
+
+    @pytest.mark.unit
+    def test_counts_by_status_in_one_query(self):
+        db, executed = _db_with_counts((5, 3, 1))
+
+        assert result_processor.get_result_counts(db, TEST_RUN_ID) == (5, 3, 1)
+
+        # Results with other statuses (e.g. errors) are only part of the total
+        assert len(executed) == 1
+        sql = executed[0]
+        assert sql.count("count(CASE WHEN (status.name = ") == 2
+        assert "FROM test_result LEFT OUTER JOIN status" in sql
+        assert "test_result.test_run_id = " in sql
+        assert "test_result.deleted_at IS NULL" in sql
+
+    @pytest.mark.unit
+    def test_no_results(self):
+        db, _ = _db_with_counts((0, None, None))
+
+        assert result_processor.get_result_counts(db, TEST_RUN_ID) == (0, 0, 0)
+
+
+class TestMetricBreakdown:
+    """Test the per-metric pass/fail breakdown"""
+
+    @pytest.mark.unit
+    def test_breakdown_per_metric(self):
+        db = Mock()
+        db.execute.return_value.all.return_value = [
+            _metric_row("Accuracy", 4, 3),
+            _metric_row("Toxicity", 3, 0),
+        ]
+
+        breakdown = result_processor.get_metric_breakdown(db, TEST_RUN_ID)
+
+        statement, params = db.execute.call_args.args
+        assert statement is result_processor._METRIC_BREAKDOWN_SQL
+        assert params == {"test_run_id": TEST_RUN_ID}
+        assert breakdown == [
+            {"name": "Accuracy", "total": 4, "passed": 3, "failed": 1, "pass_rate": 75.0},
+            {"name": "Toxicity", "total": 3, "passed": 0, "failed": 3, "pass_rate": 0.0},
+        ]
+
+    @pytest.mark.unit
+    def test_empty_breakdown(self):
+        db = Mock()
+        db.execute.return_value.all.return_value = []
+
+        assert result_processor.get_metric_breakdown(db, TEST_RUN_ID) == []
+
+
+class TestTestStatistics:
+    """Test statistics combining result counts and progress counters"""
+
+    @pytest.mark.unit
+    def test_result_counts_without_progress(self):
+        test_run = SimpleNamespace(id=TEST_RUN_ID, attributes=None)
+        with patch.object(result_processor, "get_result_counts", return_value=(4, 3, 1)):
+            assert result_processor.get_test_statistics(Mock(), test_run) == (4, 3, 1)
+
+    @pytest.mark.unit
+    def test_live_progress_takes_precedence(self):
+        test_run = SimpleNamespace(
+            id=TEST_RUN_ID,
+            attributes={"total_tests": 10, "completed_tests": 2, "failed_tests": 0},
+        )
+        live = {"completed_tests": 7, "failed_tests": 2}
+        with patch.object(
+            result_processor, "get_result_counts", return_value=(8, 6, 2)
+        ), patch.object(result_processor, "get_test_run_progress", return_value=live):
+            assert result_processor.get_test_statistics(Mock(), test_run) == (10, 7, 2)
+
+    @pytest.mark.unit
+    def test_flushed_progress_without_redis(self):
+        test_run = SimpleNamespace(
+            id=TEST_RUN_ID,
+            attributes={"total_tests": 5, "completed_tests": 4, "failed_tests": 1},
+        )
+        with patch.object(
+            result_processor, "get_result_counts", return_value=(5, 3, 1)
+        ), patch.object(result_processor, "get_test_run_progress", return_value=None):
+            assert result_processor.get_test_statistics(Mock(), test_run) == (5, 4, 1)
+
+
+class TestExecutionSummary:
+    """Test the metric breakdown in the execution summary"""
+
+    @pytest.mark.unit
+    def test_summary_includes_metric_breakdown(self):
+        test_run = SimpleNamespace(id=TEST_RUN_ID, attributes={}, test_configuration=None)
+        breakdown = [{"name": "Accuracy", "total": 2, "passed": 2, "failed": 0, "pass_rate": 100.0}]
+        processor = result_processor.TestRunProcessor(Mock())
+
+        with patch.object(
+            result_processor, "get_result_counts", return_value=(2, 2, 0)
+        ), patch.object(
+            result_processor, "get_metric_breakdown", return_value=breakdown
+        ), patch.object(result_processor, "update_test_run_status"):
+            summary = processor.process_test_run_results(
+                Mock(), test_run, TEST_RUN_ID, datetime(2026, 1, 1)
+            )
+
+        assert summary["metrics_summary"] == breakdown
+        assert (summary["total_tests"], summary["tests_passed"]) == (2, 2)
+        assert summary["status"] == "success"
@@ -0,0 +1,76 @@
+"""
+Tests for per-phase timing in rhesis.backend.app.utils.phase_timer
+
+This module tests:
+- Accumulating phases reported to the active timer
+- Propagating the active timer into worker threads
+- Aggregating per-test timings into percentiles
+"""
+
+import concurrent.futures
+import contextvars
+
+import pytest
+
+from rhesis.backend.app.utils.phase_timer import (
+    PhaseTimer,
+    get_current_timer,
+    record_phase,
+    summarize_timings,
+    timed_phase,
+)
+
+
+class TestPhaseTimer:
+    """Test phase reporting to the active timer"""
+
+    @pytest.mark.unit
+    def test_phases_are_accumulated(self):
+        timer = PhaseTimer()
+        with timer.activate():
+            record_phase("network", 0.25)
+            record_phase("network", 0.5)
+            with timed_phase("template_render"):
+                pass
+
+        timings = timer.as_dict()
+        assert timings["network"] == 750.0
+        assert "template_render" in timings
+        assert get_current_timer() is None
+
+    @pytest.mark.unit
+    def test_reporting_without_active_timer_is_noop(self):
+        with timed_phase("network"):
+            record_phase("auth_token", 1.0)
+        assert get_current_timer() is None
+
+    @pytest.mark.unit
+    def test_timer_propagates_to_copied_context(self):
+        timer = PhaseTimer()
+        with timer.activate(), concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, record_phase, "judge_llm", 0.1)
+                for _ in range(4)
+            ]
+            concurrent.futures.wait(futures)
+
+        assert timer.as_dict() == {"judge_llm": 400.0}
+
+
+class TestSummarizeTimings:
+    """Test aggregation of timings into percentiles"""
+
+    @pytest.mark.unit
+    def test_percentiles_per_phase(self):
+        timings = [{"network": float(ms)} for ms in range(1, 101)]
+        timings.append({"db_read": 5.0})
+        timings.append(None)
+
+        summary = summarize_timings(timings)
+
+        assert summary["network"] == {"count": 100, "p50": 50.5, "p95": 95.05, "p99": 99.01}
+        assert summary["db_read"] == {"count": 1, "p50": 5.0, "p95": 5.0, "p99": 5.0}
+
+    @pytest.mark.unit
+    def test_empty(self):
+        assert summarize_timings([]) == {}
@@ -0,0 +1,127 @@
+from unittest.mock import patch
+
+import pytest
+from rhesis.sdk.metrics.cache import InMemoryJudgeCache
+from rhesis.sdk.metrics.providers.native.prompt_metric_categorical import (
+    RhesisPromptMetricCategorical,
+)
+from rhesis.sdk.metrics.providers.native.prompt_metric_numeric import RhesisPromptMetricNumeric
+
+
+@pytest.fixture
+def metric(monkeypatch):
+    monkeypatch.setenv("RHESIS_API_KEY", "test_api_key")
+    return RhesisPromptMetricNumeric(
+        name="test_metric",
+        evaluation_prompt="test_prompt",
+        evaluation_steps="test_steps",
+        reasoning="test_reasoning",
+        min_score=0.0,
+        max_score=10.0,
+        threshold=5.0,
+        batch_size=3,
+    )
+
+
+def _test_cases(count):
+    return [
+        {
+            "input": f"Question {index}",
+            "output": f"Answer {index}",
+            "expected_output": "Answer",
+            "context": ["Some context"],
+        }
+        for index in range(count)
+    ]
+
+
+def _batch_response(count, skip=()):
+    return {
+        "judgments": [
+            {"test_case": position, "score": position * 2, "reason": "Batched"}
+            for position in range(1, count + 1)
+            if position not in skip
+        ]
+    }
+
+
+def test_evaluate_batch_judges_test_cases_together(metric):
+    with patch.object(metric.model, "generate") as mock_generate:
+        mock_generate.side_effect = [_batch_response(3), _batch_response(2)]
+        results = metric.evaluate_batch(_test_cases(5))
+
+    assert mock_generate.call_count == 2
+    prompt = mock_generate.call_args_list[0].args[0]
+    assert "Test case 3" in prompt and "Question 2" in prompt
+    assert "judgments" in mock_generate.call_args_list[0].kwargs["schema"].model_fields
+    assert [result.score for result in results] == [2, 4, 6, 2, 4]
+    assert [result.details["is_successful"] for result in results] == [
+        False,
+        False,
+        True,
+        False,
+        False,
+    ]
+    assert all(result.details["batched"] for result in results)
+    assert results[1].details["prompt"].count("Question") == 1
+
+
+def test_evaluate_batch_retries_missing_judgments(metric):
+    with patch.object(metric.model, "generate") as mock_generate:
+        mock_generate.side_effect = [_batch_response(3, skip={2}), {"score": 9, "reason": "Alone"}]
+        results = metric.evaluate_batch(_test_cases(3))
+
+    assert mock_generate.call_count == 2
+    assert [result.score for result in results] == [2, 9, 6]
+    assert "batched" not in results[1].details
+
+
+def test_evaluate_batch_failed_request_judges_individually(metric):
+    with patch.object(metric.model, "generate") as mock_generate:
+        mock_generate.side_effect = [Exception("Timeout")] + [{"score": 7, "reason": "Good"}] * 2
+        results = metric.evaluate_batch(_test_cases(2))
+
+    assert mock_generate.call_count == 3
+    assert [result.score for result in results] == [7, 7]
+
+
+def test_evaluate_batch_uses_judge_cache(metric):
+    metric.cache = InMemoryJudgeCache()
+    with patch.object(metric.model, "generate") as mock_generate:
+        mock_generate.return_value = _batch_response(2)
+        metric.evaluate_batch(_test_cases(2))
+        single = metric.evaluate(**_test_cases(2)[1])
+        results = metric.evaluate_batch(_test_cases(2))
+
+    mock_generate.assert_called_once()
+    assert single.score == 4
+    assert single.details["cached"] is True
+    assert [result.details["cached"] for result in results] == [True, True]
+
+
+def test_evaluate_batch_categorical(monkeypatch):
+    monkeypatch.setenv("RHESIS_API_KEY", "test_api_key")
+    metric = RhesisPromptMetricCategorical(
+        name="test_metric",
+        evaluation_prompt="test_prompt",
+        categories=["good", "bad"],
+        passing_categories=["good"],
+    )
+    response = {
+        "judgments": [
+            {"test_case": 1, "score": "good", "reason": "Fine"},
+            {"test_case": 2, "score": "unknown", "reason": "Invalid category"},
+        ]
+    }
+    with patch.object(metric.model, "generate") as mock_generate:
+        mock_generate.side_effect = [response, {"score": "bad", "reason": "Alone"}]
+        results = metric.evaluate_batch(_test_cases(2))
+
+    assert [result.score for result in results] == ["good", "bad"]
+    assert results[0].details["is_successful"] is True
+    assert results[1].details["is_successful"] is False
+
+
+def test_evaluate_batch_validates_inputs(metric):
+    with pytest.raises(ValueError):
+        metric.evaluate_batch([{"input": "", "output": "Answer"}])
@@ -0,0 +1,124 @@
+from unittest.mock import patch
+
+import pytest
+from rhesis.sdk.metrics.cache import (
+    InMemoryJudgeCache,
+    get_judge_cache,
+    get_judge_cache_key,
+    set_judge_cache,
+)
+from rhesis.sdk.metrics.providers.native.prompt_metric_numeric import (
+    NumericScoreResponse,
+    RhesisPromptMetricNumeric,
+)
+
+
+@pytest.fixture
+def metric(monkeypatch):
+    monkeypatch.setenv("RHESIS_API_KEY", "test_api_key")
+    return RhesisPromptMetricNumeric(
+        name="test_metric",
+        evaluation_prompt="test_prompt",
+        evaluation_steps="test_steps",
+        reasoning="test_reasoning",
+        min_score=0.0,
+        max_score=10.0,
+        threshold=5.0,
+    )
+
+
+@pytest.fixture
+def global_cache():
+    cache = InMemoryJudgeCache()
+    set_judge_cache(cache)
+    yield cache
+    set_judge_cache(None)
+
+
+def _evaluate(metric, output="Paris is the capital of France"):
+    return metric.evaluate(
+        input="What is the capital of France?",
+        output=output,
+        expected_output="Paris",
+        context=["France is a country in Europe"],
+    )
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryJudgeCache(max_size=2)
+    cache.set("a", {"score": 1})
+    cache.set("b", {"score": 2})
+    assert cache.get("a") == {"score": 1}
+
+    cache.set("c", {"score": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"score": 1}
+    assert len(cache) == 2
+
+
+def test_in_memory_cache_expires_entries():
+    cache = InMemoryJudgeCache(ttl_seconds=10)
+    with patch("rhesis.sdk.metrics.cache.time.monotonic", return_value=100.0):
+        cache.set("a", {"score": 1})
+    with patch("rhesis.sdk.metrics.cache.time.monotonic", return_value=105.0):
+        assert cache.get("a") == {"score": 1}
+    with patch("rhesis.sdk.metrics.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+
+
+def test_cache_key_depends_on_prompt_model_and_schema():
+    key = get_judge_cache_key("prompt", "gpt-4o", NumericScoreResponse)
+
+    assert key == get_judge_cache_key("prompt", "gpt-4o", NumericScoreResponse)
+    assert key != get_judge_cache_key("other prompt", "gpt-4o", NumericScoreResponse)
+    assert key != get_judge_cache_key("prompt", "gpt-4o-mini", NumericScoreResponse)
+    assert key != get_judge_cache_key("prompt", "gpt-4o", None)
+
+
+def test_evaluate_without_cache_calls_model(metric):
+    assert get_judge_cache() is None
+    with patch.object(metric.model, "generate") as mock_generate:
+        mock_generate.return_value = {"score": 7.5, "reason": "Good"}
+        first = _evaluate(metric)
+        _evaluate(metric)
+
+    assert mock_generate.call_count == 2
+    assert first.details["cached"] is False
+
+
+def test_evaluate_with_metric_cache_reuses_judgment(metric):
+    metric.cache = InMemoryJudgeCache()
+    with patch.object(metric.model, "generate") as mock_generate:
+        mock_generate.return_value = {"score": 7.5, "reason": "Good"}
+        first = _evaluate(metric)
+        second = _evaluate(metric)
+        other = _evaluate(metric, output="Lyon")
+
+    assert mock_generate.call_count == 2
+    assert first.details["cached"] is False
+    assert second.details["cached"] is True
+    assert other.details["cached"] is False
+    assert second.score == 7.5
+    assert second.details["is_successful"] is True
+
+
+def test_evaluate_with_global_cache(metric, global_cache):
+    with patch.object(metric.model, "generate") as mock_generate:
+        mock_generate.return_value = {"score": 2, "reason": "Poor"}
+        _evaluate(metric)
+        result = _evaluate(metric)
+
+    mock_generate.assert_called_once()
+    assert result.details["cached"] is True
+    assert result.details["is_successful"] is False
+    assert len(global_cache) == 1
+
+
+def test_failed_evaluations_not_cached(metric, global_cache):
+    with patch.object(metric.model, "generate") as mock_generate:
+        mock_generate.side_effect = Exception("LLM service unavailable")
+        result = _evaluate(metric)
+
+    assert "error" in result.details
+    assert len(global_cache) == 0